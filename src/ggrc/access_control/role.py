@@ -136,6 +136,19 @@ def invalidate_acr_caches(mapper, content, target):
     del flask.g.global_ac_roles
 
 
+def invalidate_permission_caches(mapper, content, target):
+  # pylint: disable=unused-argument
+  """Drop cached permissions of all users if ACR permissions changed."""
+  state = inspect(target)
+  if not state.deleted and not any(
+      state.attrs[attr].history.has_changes()
+      for attr in ("read", "update", "delete")
+  ):
+    return
+  if flask.has_app_context():
+    flask.g.permissions_changed_all = True
+
+
 def acr_modified(obj, session):
   """Check if ACR object was changed or deleted"""
   changed = False
@@ -162,6 +175,10 @@ def invalidate_noneditable_change(session, flush_context, instances):
 sa.event.listen(AccessControlRole, "after_insert", invalidate_acr_caches)
 sa.event.listen(AccessControlRole, "after_delete", invalidate_acr_caches)
 sa.event.listen(AccessControlRole, "after_update", invalidate_acr_caches)
+sa.event.listen(AccessControlRole, "after_delete",
+                invalidate_permission_caches)
+sa.event.listen(AccessControlRole, "after_update",
+                invalidate_permission_caches)
 sa.event.listen(Session, 'before_flush', invalidate_noneditable_change)
 
 
@@ -277,8 +277,12 @@ def register_indexing():
           bg_task = background_task.create_task(
               name="indexing",
               url=url_for(bg_update_ft_records.__name__),
-              parameters={"models_ids": model_ids,
-                          "chunk_size": chunk_size},
+              parameters={
+                  "models_ids": model_ids,
+                  "models_properties":
+                      db.session.reindex_set.model_properties,
+                  "chunk_size": chunk_size,
+              },
               queued_callback=bg_update_ft_records
           )
           db.session.expunge_all()  # improves plain_commit time
@@ -3,6 +3,7 @@
 
 """Automapper generator."""
 
+import collections
 from datetime import datetime
 import logging
 
@@ -14,6 +15,7 @@ from ggrc.automapper import rules
 from ggrc import login
 from ggrc.models.audit import Audit
 from ggrc.models.automapping import Automapping
+from ggrc.models import relationship_adjacency
 from ggrc.models.relationship import Relationship, RelationshipsCache, Stub
 from ggrc.models.issue import Issue
 from ggrc.models import exceptions
@@ -33,6 +35,11 @@ class AutomapperGenerator(object):
 
   Note: we can rely on the order of src/dst pairs of queued and
   inserted mappings since we only queue ordered pairs (see `order`).
+
+  Queued mappings are processed level by level. Neighborhoods of all objects
+  of a level are fetched with a single query and update permission is
+  checked once for every object. Numbers of levels, examined edges and
+  neighborhood queries are counted in `counters`.
   """
 
   COUNT_LIMIT = 10000
@@ -48,19 +55,34 @@ class AutomapperGenerator(object):
     self.auto_mappings = set()
     self.automapping_ids = set()
     self.related_cache = RelationshipsCache()
+    self.update_allowed = {}
+    self.counters = collections.Counter()
 
   def related(self, obj):
     """Return obj's relationship stubs"""
-    if obj in self.related_cache.cache:
-      return self.related_cache.cache[obj]
+    if obj not in self.related_cache.cache:
+      self._populate_related({obj})
+    return self.related_cache.cache[obj]
 
-    # Pre-fetch neighborhood for enqueued objects since we're gonna need these
-    # results in a few steps. This drastically reduces number of queries.
-    stubs = {s for rel in self.queue for s in rel}
-    stubs.add(obj)
-    self.related_cache.populate_cache(stubs)
+  def _populate_related(self, stubs):
+    """Fetch neighborhoods of all not cached stubs with a single query."""
+    stubs = [stub for stub in stubs if stub not in self.related_cache.cache]
+    if stubs:
+      self.related_cache.populate_cache(stubs)
+      self.counters["queries"] += 1
+
+  def _check_update_permissions(self, stubs):
+    """Check update permission for stubs that were not checked yet."""
+    for stub in stubs:
+      if stub not in self.update_allowed:
+        self.update_allowed[stub] = permissions.is_allowed_update(
+            stub.type, stub.id, None
+        )
 
-    return self.related_cache.cache[obj]
+  def _needs_permission(self, entry):
+    """Check if the mapping is created only with permission to edit."""
+    return {stub.type for stub in entry} not in \
+        self._AUTOMAP_WITHOUT_PERMISSION
 
   @staticmethod
   def order(src, dst):
@@ -75,19 +97,39 @@ class AutomapperGenerator(object):
     # neighborhood
     src = Stub.from_source(relationship)
     dst = Stub.from_destination(relationship)
+    self._populate_related({src, dst})
     self._step(src, dst)
     self._step(dst, src)
-    while self.queue:
+    while self.queue and len(self.auto_mappings) <= self.COUNT_LIMIT:
+      level, self.queue = self.queue, set()
+      self._process_level(level)
+      self.queue -= self.processed
+
+    if len(self.auto_mappings) <= self.COUNT_LIMIT:
+      self._flush(relationship)
+    else:
+      logger.error("Automapping limit exceeded: limit=%s, count=%s",
+                   self.COUNT_LIMIT, len(self.auto_mappings))
+
+  def _process_level(self, level):
+    """Create mappings for one level of queued entries."""
+    self.counters["levels"] += 1
+    self._populate_related({stub for entry in level for stub in entry})
+    self._check_update_permissions({
+        stub for entry in level if self._needs_permission(entry)
+        for stub in entry
+    })
+    for entry in level:
       if len(self.auto_mappings) > self.COUNT_LIMIT:
         break
-      src, dst = entry = self.queue.pop()
+      self.counters["edges"] += 1
+      src, dst = entry
 
-      if {src.type, dst.type} not in self._AUTOMAP_WITHOUT_PERMISSION:
+      if self._needs_permission(entry):
         # Mapping between some objects should be created even if there is no
         # permission to edit (+map) this objects. Thus permissions check for
         # them should be skipped.
-        if not (permissions.is_allowed_update(src.type, src.id, None) and
-                permissions.is_allowed_update(dst.type, dst.id, None)):
+        if not (self.update_allowed[src] and self.update_allowed[dst]):
           continue
 
       created = self._ensure_relationship(src, dst)
@@ -99,12 +141,6 @@ class AutomapperGenerator(object):
       self._step(src, dst)
       self._step(dst, src)
 
-    if len(self.auto_mappings) <= self.COUNT_LIMIT:
-      self._flush(relationship)
-    else:
-      logger.error("Automapping limit exceeded: limit=%s, count=%s",
-                   self.COUNT_LIMIT, len(self.auto_mappings))
-
   def _flush(self, parent_relationship):
     """Manually INSERT generated automappings."""
     if not self.auto_mappings:
@@ -147,6 +183,9 @@ class AutomapperGenerator(object):
           "is_external": False}
           for src, dst in self.auto_mappings
           if (src, dst) != original]))  # (src, dst) is sorted
+      relationship_adjacency.add_relationships(
+          Relationship.automapping_id == automapping_id
+      )
 
       self._set_audit_id_for_issues(automapping_id)
 
@@ -267,6 +306,10 @@ def register_automapping_listeners():
       with benchmark("Automapping generate_automappings"):
         for obj in relationships:
           automapper.generate_automappings(obj)
+      counters = automapper.counters
+      logger.info("Automapping: %s levels, %s edges examined, "
+                  "%s neighborhood queries",
+                  counters["levels"], counters["edges"], counters["queries"])
       automapper.propagate_acl()
       if referenced_objects:
         flask.g.referenced_object_stubs = referenced_objects
@@ -13,6 +13,7 @@ import dateutil
 import sqlalchemy
 from sqlalchemy.ext.associationproxy import AssociationProxy
 from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm.properties import ColumnProperty
 from sqlalchemy.orm.properties import RelationshipProperty
 from werkzeug.exceptions import BadRequest
 
@@ -24,7 +25,10 @@ from ggrc.login import get_current_user_id
 from ggrc.models.reflection import AttributeInfo
 from ggrc.models.types import JsonType
 from ggrc.models.utils import PolymorphicRelationship
+from ggrc.utils import benchmark
+from ggrc.utils import benchmarks
 from ggrc.utils import referenced_objects
+from ggrc.utils import stub_cache
 from ggrc.utils import url_for
 from ggrc.utils import view_url_for
 
@@ -48,6 +52,10 @@ def get_json_builder(obj):
   return builder
 
 
+# Links published for every object by publish_base_properties.
+BASE_PROPERTIES = ('selfLink', 'viewLink')
+
+
 def publish_base_properties(obj):
   """Return a dict with selfLink and viewLink for obj."""
   ret = {}
@@ -482,37 +490,181 @@ def walk_representation(obj):  # noqa
         yield value, index, obj
 
 
+def _gather_stubs(resource):
+  """Get lazy stubs of the representation."""
+  return [val for val, _, _ in walk_representation(resource)
+          if isinstance(val, LazyStubRepresentation)]
+
+
 def gather_queries(resource):
-  queries = []
-  for val, _, _ in walk_representation(resource):
-    if isinstance(val, LazyStubRepresentation):
-      queries.append((val.type, val.conditions))
-  return queries
+  return [(stub.type, stub.conditions) for stub in _gather_stubs(resource)]
+
 
+def _is_id_stub(stub):
+  """Check if the stub is requested by id only."""
+  return stub.condition_key == ("id",)
 
-def reify_representation(resource, results, type_columns):
+
+def reify_representation(resource, results, type_columns, cached=None):
+  """Replace lazy stubs with stubs rendered from results or cached data."""
+  cached = cached or {}
   for val, key, obj in walk_representation(resource):
     if isinstance(val, LazyStubRepresentation):
-      obj[key] = val.render(results, type_columns)
+      data = None
+      if _is_id_stub(val):
+        data = cached.get((val.type, val.condition_val[0]))
+      if data is not None:
+        id_ = val.condition_val[0]
+        obj[key] = {
+            'type': data.type,
+            'id': id_,
+            'context_id': data.context_id,
+            'href': url_for(data.type, id=id_),
+        }
+      else:
+        obj[key] = val.render(results, type_columns)
   return resource
 
 
 def publish_representation(resource):
-  queries = gather_queries(resource)
+  """Render lazy stubs of the representation.
 
-  if not queries:
+  Stubs requested by id are looked up in the stub cache first, the union
+  query fetches only the missing ones.
+  """
+  stubs = _gather_stubs(resource)
+  if not stubs:
     return resource
 
-  results, type_columns, query = build_stub_union_query(queries)
-  rows = query.all()
-  for row in rows:
-    type_ = row[0]
-    for columns, matches in results[type_].items():
-      vals = tuple(row[type_columns[type_][c]] for c in columns)
-      if vals in matches:
-        matches[vals].append(row)
+  with benchmark("publish_representation"):
+    id_keys = {(stub.type, stub.condition_val[0])
+               for stub in stubs if _is_id_stub(stub)}
+    cached = stub_cache.get_many(id_keys)
+    queries = [
+        (stub.type, stub.conditions) for stub in stubs
+        if not _is_id_stub(stub) or
+        (stub.type, stub.condition_val[0]) not in cached
+    ]
+
+    results, type_columns, query = build_stub_union_query(queries)
+    fetched = {}
+    rows = query.all() if query is not None else []
+    for row in rows:
+      type_ = row[0]
+      for columns, matches in results[type_].items():
+        vals = tuple(row[type_columns[type_][c]] for c in columns)
+        if vals in matches:
+          matches[vals].append(row)
+          if columns == ("id",):
+            columns_indexes = type_columns[type_]
+            fetched[(type_, vals[0])] = stub_cache.StubData(
+                type_,
+                row[columns_indexes['context_id']],
+                row[columns_indexes['updated_at']],
+            )
+    stub_cache.set_many(fetched)
+    counters = stub_cache.get_counters()
+    benchmarks.logger.debug("Stub cache: %s hits, %s misses",
+                            counters["hits"], counters["misses"])
+
+    return reify_representation(resource, results, type_columns, cached)
+
+
+def _has_custom_publish(model, attr_name):
+  """Check if the attribute has custom publish logic."""
+  return any(attr_name in getattr(cls, '_custom_publish', {})
+             for cls in (model,) + model.__bases__)
+
+
+def _stub_getter(target_type, index):
+  """Get function publishing a stub from the foreign key in the row."""
+  def getter(row):
+    if row[index] is None:
+      return None
+    return LazyStubRepresentation(target_type, row[index])
+  return getter
+
 
-  return reify_representation(resource, results, type_columns)
+class FieldsProjection(object):
+  """Published fields of a model read from selected columns.
+
+  Fields published as plain column values or as stubs of not polymorphic
+  objects referenced by a foreign key are read from the table columns
+  without loading the objects. Other published fields and links of
+  BASE_PROPERTIES need the objects and are listed in `fallback_fields`.
+  Fields that are not published are always None.
+  """
+
+  def __init__(self, model, fields):
+    # pylint: disable=protected-access
+    builder = get_json_builder(model)
+    self.model = model
+    self.mapper = model._sa_class_manager.mapper
+    self.columns = [model.id]
+    self.getters = []
+    self.fallback_fields = []
+    published = set(builder._publish_attrs)
+    include_links = set(builder._include_links)
+    for field in fields:
+      if field not in published and field not in BASE_PROPERTIES:
+        continue
+      getter = None
+      if field in published and field not in include_links and \
+         not _has_custom_publish(model, field):
+        getter = self._get_getter(field)
+      if getter is None:
+        self.fallback_fields.append(field)
+      else:
+        self.getters.append((field, getter))
+    self.updated_at_index = None
+    if hasattr(model, "updated_at"):
+      self.updated_at_index = self._add_column(model.updated_at)
+
+  def _add_column(self, column):
+    """Add column to the query and get its index in the row."""
+    for index, existing in enumerate(self.columns):
+      if existing is column:
+        return index
+    self.columns.append(column)
+    return len(self.columns) - 1
+
+  def _get_getter(self, field):
+    """Get function publishing the field from the row or None."""
+    if field == "type":
+      if len(list(self.mapper.self_and_descendants)) > 1:
+        return None
+      return lambda row: self.model.__name__
+    class_attr = getattr(self.model, field, None)
+    if not isinstance(class_attr, InstrumentedAttribute):
+      return None
+    prop = class_attr.property
+    if isinstance(prop, ColumnProperty):
+      index = self._add_column(class_attr)
+      return lambda row: row[index]
+    if isinstance(prop, RelationshipProperty):
+      target_mapper = prop.mapper.class_.__mapper__
+      if prop.uselist or prop.backref or \
+         target_mapper.polymorphic_on is not None:
+        return None
+      column = list(prop.local_columns)[0]
+      column_attr = self.mapper.get_property_by_column(column).class_attribute
+      return _stub_getter(target_mapper.class_.__name__,
+                          self._add_column(column_attr))
+    return None
+
+  def query(self, ids):
+    """Get query of the columns of objects with the ids."""
+    return db.session.query(*self.columns).filter(self.model.id.in_(ids))
+
+  def publish_row(self, row):
+    """Publish projected fields from a row of the query."""
+    return {field: getter(row) for field, getter in self.getters}
+
+  def get_updated_at(self, row):
+    """Get updated_at value from a row of the query."""
+    if self.updated_at_index is None:
+      return None
+    return row[self.updated_at_index]
 
 
 class Builder(AttributeInfo):
@@ -172,6 +172,9 @@ class Cache(object):
   def add_multi(self, *_):
     return None
 
+  def set_multi(self, *_):
+    return None
+
   def update_multi(self, *_):
     return None
 
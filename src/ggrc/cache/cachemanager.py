@@ -141,27 +141,42 @@ class CacheManager:
     else:
       return False
 
-  def bulk_get(self, data):
+  def bulk_get(self, data, key_prefix=''):
     """Perform Bulk Get operations in cache for specified data.
 
     Args:
       data: keys for bulk get
+      key_prefix: prefix prepended to all keys
     Returns:
      Result of cache get_multi
     """
-    return self.cache_object.get_multi(data)
+    return self.cache_object.get_multi(data, key_prefix=key_prefix)
 
-  def bulk_add(self, data, expiration_time=0):
+  def bulk_add(self, data, expiration_time=0, key_prefix=''):
     """Perform Bulk Add operations in cache for specified data.
 
     Args:
       data: keys for bulk add
+      key_prefix: prefix prepended to all keys
     Returns:
      Result of cache add_multi
     """
-    return self.cache_object.add_multi(data, expiration_time)
+    return self.cache_object.add_multi(data, expiration_time,
+                                       key_prefix=key_prefix)
 
-  def bulk_update(self, data, expiration_time=0):
+  def bulk_set(self, data, expiration_time=0, key_prefix=''):
+    """Perform Bulk Set operations in cache for specified data.
+
+    Args:
+      data: keys for bulk set
+      key_prefix: prefix prepended to all keys
+    Returns:
+     Result of cache set_multi
+    """
+    return self.cache_object.set_multi(data, expiration_time,
+                                       key_prefix=key_prefix)
+
+  def bulk_update(self, data, expiration_time=0, key_prefix=''):
     """Perform Bulk update operations in cache for specified data.
 
     Does a bulk get on all the items in data and then performs bulk update only
@@ -169,25 +184,31 @@ class CacheManager:
 
     Args:
       data: keys for bulk update
+      key_prefix: prefix prepended to all keys
     Returns:
      Result of cache update_multi
     """
-    get_result = self.cache_object.get_multi(data.keys())
+    get_result = self.cache_object.get_multi(data.keys(),
+                                             key_prefix=key_prefix)
     for data_key, data_value in data.items():
-      for update_key, update_value in data_value.items():
-        if data_key in get_result:
-          get_result[data_key][update_key] = update_value
-    return self.cache_object.update_multi(get_result, expiration_time)
-
-  def bulk_delete(self, data, lockadd_seconds):
+      if data_key in get_result:
+        get_result[data_key].update(data_value)
+    if not get_result:
+      return []
+    return self.cache_object.update_multi(get_result, expiration_time,
+                                          key_prefix=key_prefix)
+
+  def bulk_delete(self, data, lockadd_seconds, key_prefix=''):
     """Perform Bulk Delete operations in cache for specified data.
 
     Args:
-      data: keys for bulk delete
+      data: keys for bulk delete, duplicates are deleted once
+      key_prefix: prefix prepended to all keys
     Returns:
      Result of cache remove_multi
     """
-    return self.cache_object.remove_multi(data, lockadd_seconds)
+    return self.cache_object.remove_multi(sorted(set(data)), lockadd_seconds,
+                                          key_prefix=key_prefix)
 
   def clean(self):
     """Cleanup cache manager resources."""
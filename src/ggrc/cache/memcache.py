@@ -39,6 +39,8 @@ class MemCache(cache.Cache):
   def get(self, category, resource, filter):
     """ get items from mem cache for specified filter
 
+    All items are fetched with a single get_multi call.
+
     Args:
       category: collection or stub
       resource: regulation, controls, etc.
@@ -52,40 +54,39 @@ class MemCache(cache.Cache):
 
     if not self.is_caching_supported(category, resource):
       return None
-    # TODO(dan): use memcache.Client.get_multi() instead of gets()
-    #
-    data = OrderedDict()
     cache_key = self.get_key(category, resource)
     if cache_key is None:
       return None
     ids, attrs = self.parse_filter(filter)
-    if ids is None and attrs is None:
+    if ids is None:
       return None
-    else:
-      if ids is None:
-        return None
+    cached = self.memcache_client.get_multi(
+        [str(id_) for id_ in ids], key_prefix=cache_key + ":", for_cas=True)
+    data = OrderedDict()
     for id_ in ids:
-      attrvalues = self.memcache_client.gets(cache_key + ":" + str(id_))
-      if attrvalues is not None:
-        if attrs is None:
-          data[id_] = attrvalues
-        else:
-          attr_dict = OrderedDict()
-          for attr in attrs:
-            if attr in attrvalues:
-              attr_dict[attr] = deepcopy(attrvalues.get(attr))
-          data[id_] = attr_dict
-      else:
+      attrvalues = cached.get(str(id_))
+      if attrvalues is None:
         # All or None policy is enforced, if one of the objects
         # is not available in cache, then we return empty
         # TODO(dan): cannot distinguish network failures vs
         # id not found in memcache, both scenarios return empty list
         return None
+      if attrs is None:
+        data[id_] = attrvalues
+      else:
+        attr_dict = OrderedDict()
+        for attr in attrs:
+          if attr in attrvalues:
+            attr_dict[attr] = deepcopy(attrvalues.get(attr))
+        data[id_] = attr_dict
     return data
 
   def add(self, category, resource, data, expiration_time=0):
     """ add data to mem cache
 
+    Entries missing in cache are added with a single add_multi call and
+    existing entries are replaced with a single cas_multi call.
+
     Args:
       category: collection or stub
       resource: regulation, controls, etc.
@@ -97,41 +98,34 @@ class MemCache(cache.Cache):
     """
     if not self.is_caching_supported(category, resource):
       return None
-    entries = {}
     cache_key = self.get_key(category, resource)
     if cache_key is None:
       return None
-    # TODO(dan): use memcache.Client.add_multi() instead of add()
-    for key in data.keys():
-      cache_key = cache_key + ":" + str(key)
-      cache_data = self.memcache_client.gets(cache_key)
-      if cache_data is None:
-        if self.memcache_client.add(cache_key,
-                                    data.get(key),
-                                    expiration_time) is False:
-          # We stop processing any further
-          # TODO(ggrcdev): Should we throw exceptions
-          # and/or log critical events
-          return None
-        else:
-          entries[key] = data
-      else:
-        # This could occur on import scenarios
-        #
-        if self.memcache_client.cas(cache_key,
-                                    data.get(key),
-                                    expiration_time) is False:
-          # We stop processing any further
-          # TODO(ggrcdev): Should we throw exceptions
-          # and/or log critical events
-          return None
-        else:
-          entries[key] = data
-    return entries
+    key_prefix = cache_key + ":"
+    mapping = {str(key): value for key, value in data.iteritems()}
+    cached = self.memcache_client.get_multi(
+        mapping.keys(), key_prefix=key_prefix, for_cas=True)
+    new_entries = {key: value for key, value in mapping.iteritems()
+                   if key not in cached}
+    # Existing entries could occur on import scenarios
+    existing_entries = {key: value for key, value in mapping.iteritems()
+                        if key in cached}
+    if new_entries and self.memcache_client.add_multi(
+        new_entries, expiration_time, key_prefix=key_prefix):
+      # We stop processing any further
+      # TODO(ggrcdev): Should we throw exceptions
+      # and/or log critical events
+      return None
+    if existing_entries and self.memcache_client.cas_multi(
+        existing_entries, expiration_time, key_prefix=key_prefix):
+      return None
+    return {key: data for key in data}
 
   def update(self, category, resource, data, expiration_time):
     """ Update items from mem cache for specified data
 
+    All items are compared and set with a single cas_multi call.
+
     Args:
       category: collection or stub
       resource: regulation, controls, etc.
@@ -143,28 +137,23 @@ class MemCache(cache.Cache):
     """
     if not self.is_caching_supported(category, resource):
       return None
-    entries = {}
     cache_key = self.get_key(category, resource)
     if cache_key is None:
       return None
-    # TODO(ggrcdev): use memcache.Client.cas_multi(),
-    # get_multi() instead of cas(), gets()
-    #
-    for key in data.keys():
-      id_ = cache_key + ":" + str(key)
-      if self.memcache_client.cas(id_,
-                                  data.get(key),
-                                  expiration_time) is False:
-        # RPC Error or value is not id is not found in cache.
-        # Cannot proceed further with update (All or None) policy
-        return None
-      else:
-        entries[key] = data
-    return entries
+    mapping = {str(key): value for key, value in data.iteritems()}
+    if self.memcache_client.cas_multi(mapping, expiration_time,
+                                      key_prefix=cache_key + ":"):
+      # RPC Error or value is not id is not found in cache.
+      # Cannot proceed further with update (All or None) policy
+      return None
+    return {key: data for key in data}
 
   def remove(self, category, resource, data, lockadd_seconds=0):
     """ delete items from mem cache for specified data
 
+    All items are deleted with a single delete_multi call, items missing in
+    cache (could be expired) are treated as deleted.
+
     Args:
       category: collection or stub
       resource: regulation, controls, etc.
@@ -176,43 +165,24 @@ class MemCache(cache.Cache):
     """
     if not self.is_caching_supported(category, resource):
       return None
-    entries = {}
     cache_key = self.get_key(category, resource)
     if cache_key is None:
       return None
-    # TODO(dan): use memcache.Client.delete_multi(),
-    # get_multi() instead of delete(), gets()
-    #
-    for key in data.keys():
-      id_ = cache_key + ":" + str(key)
-      retvalue = self.memcache_client.delete(id_, lockadd_seconds)
-      # Log the event of delete failures
-      if retvalue == 0:
-        # retvalue of 0 indicates Network failure,
-        # Cannot proceed further with delete (All or None) policy
-        return None
-      elif retvalue == 2:
-        # retvalue of 2 indicates Success
-        entries[key] = data
-      elif retvalue == 1:
-        # retvalue of 1 indicates id_ is not present in memcache
-        # (could be expired), proceed with next entry
-        continue
-      else:
-        # Any other return value,
-        # Cannot proceed further with delete (All or None) policy
-        #
-        return None
-    return entries
+    if not self.memcache_client.delete_multi(
+        [str(key) for key in data], lockadd_seconds,
+        key_prefix=cache_key + ":"):
+      # Network failure,
+      # Cannot proceed further with delete (All or None) policy
+      return None
+    return {key: data for key in data}
 
-  def add_multi(self, data, expiration_time=0):
+  def add_multi(self, data, expiration_time=0, key_prefix=''):
     """ Add multiple entries to memcache
     There are limits to size of data in memcache
 
     Args:
-      category: collection or stub
-      resource: regulation, controls, etc.
       data: dictionary containing ids and dictionary of attrs
+      key_prefix: prefix prepended to all keys
 
     Returns:
       memcache client API add_multi
@@ -220,48 +190,62 @@ class MemCache(cache.Cache):
     # TODO(dan): import scenarios, add will return non-empty list,
     # we should invoke update_multi for those items
     #
-    return self.memcache_client.add_multi(data, expiration_time)
+    return self.memcache_client.add_multi(data, expiration_time,
+                                          key_prefix=key_prefix)
 
-  def get_multi(self, data):
+  def get_multi(self, data, key_prefix=''):
     """ Get multiple entries from memcache
     There are limits to size of data in memcache
 
     Args:
-      category: collection or stub
-      resource: regulation, controls, etc.
       data: dictionary containing ids
+      key_prefix: prefix prepended to all keys
 
     Returns:
       memcache client API get_multi
     """
-    return self.memcache_client.get_multi(data, '', None, True)
+    return self.memcache_client.get_multi(data, key_prefix, None, True)
 
-  def update_multi(self, data, expiration_time=0):
+  def set_multi(self, data, expiration_time=0, key_prefix=''):
+    """ Set multiple entries to memcache
+    There are limits to size of data in memcache
+
+    Args:
+      data: dictionary containing ids and dictionary of attrs
+      key_prefix: prefix prepended to all keys
+
+    Returns:
+      memcache client API set_multi
+    """
+    return self.memcache_client.set_multi(data, expiration_time,
+                                          key_prefix=key_prefix)
+
+  def update_multi(self, data, expiration_time=0, key_prefix=''):
     """ update multiple entries to memcache
     There are limits to size of data in memcache
 
     Args:
-      category: collection or stub
-      resource: regulation, controls, etc.
       data: dictionary containing ids and dictionary of attrs
+      key_prefix: prefix prepended to all keys
 
     Returns:
       memcache client API cas_multi (compare and set)
     """
-    return self.memcache_client.cas_multi(data, expiration_time)
+    return self.memcache_client.cas_multi(data, expiration_time,
+                                          key_prefix=key_prefix)
 
-  def remove_multi(self, data, lockadd_seconds):
+  def remove_multi(self, data, lockadd_seconds, key_prefix=''):
     """ delete multiple entries to memcache
 
     Args:
-      category: collection or stub
-      resource: regulation, controls, etc.
       data:  list of keys
+      key_prefix: prefix prepended to all keys
 
     Returns:
       memcache client API delete_multi
     """
-    return self.memcache_client.delete_multi(data, lockadd_seconds)
+    return self.memcache_client.delete_multi(data, lockadd_seconds,
+                                             key_prefix=key_prefix)
 
   def clean(self):
     """ flush everything from memcache """
@@ -0,0 +1,321 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Two-tier cache of hot reference data.
+
+Results of decorated functions are kept in a process-local LRU cache with a
+TTL in front of memcache. Every cache depends on version stamps of the data
+it is built from. Stamps are stored in memcache and read once per request, so
+changing the data on any instance invalidates the cached results everywhere
+by bumping the stamp:
+
+  @tiered.cached("access_control_roles_json",
+                 stamps=(tiered.ACCESS_CONTROL_ROLES,))
+  def get_access_control_roles_json():
+    ...
+
+  tiered.invalidate(tiered.ACCESS_CONTROL_ROLES)
+
+Stamps of models registered with `invalidate_on_commit` are bumped after
+every commit changing their rows through the ORM. Without memcache the stamps
+are process-local and the TTL bounds the staleness of the other processes.
+"""
+
+import collections
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+import flask
+import sqlalchemy as sa
+from google.appengine.api import memcache
+
+from ggrc import settings
+from ggrc.cache.memcache import has_memcache
+
+
+logger = logging.getLogger(__name__)
+
+ACCESS_CONTROL_ROLES = "access_control_roles"
+CUSTOM_ATTRIBUTE_DEFINITIONS = "custom_attribute_definitions"
+PEOPLE = "people"
+
+VERSION_PREFIX = "TieredVersion:"
+VALUE_PREFIX = "Tiered:"
+MAX_KEY_LENGTH = 250
+
+_CACHES = {}
+_LOCAL_VERSIONS = {}
+_SESSION_INFO_KEY = "tiered_cache_stamps"
+
+
+def enabled():
+  """Check if results of decorated functions are cached."""
+  return settings.TIERED_CACHE_TTL > 0
+
+
+def _new_version():
+  return uuid.uuid4().hex
+
+
+def _memcache_client():
+  """Get memcache client if memcache is used."""
+  if not has_memcache():
+    return None
+  return memcache.Client()
+
+
+def _request_versions():
+  """Get dict of stamp versions read during the current request."""
+  if not flask.has_app_context():
+    return {}
+  if not hasattr(flask.g, "tiered_cache_versions"):
+    flask.g.tiered_cache_versions = {}
+  return flask.g.tiered_cache_versions
+
+
+def get_versions(stamps):
+  """Get current versions of the stamps.
+
+  Versions missing in memcache are created, so all instances agree on them.
+  Versions are read at most once per request.
+
+  Returns:
+    tuple of versions in the order of stamps.
+  """
+  versions = _request_versions()
+  missing = [stamp for stamp in stamps if stamp not in versions]
+  if missing:
+    client = _memcache_client()
+    if client is None:
+      for stamp in missing:
+        versions[stamp] = _LOCAL_VERSIONS.setdefault(stamp, _new_version())
+    else:
+      stored = client.get_multi(missing, key_prefix=VERSION_PREFIX)
+      new = {stamp: _new_version() for stamp in missing
+             if stamp not in stored}
+      if new:
+        not_added = client.add_multi(new, key_prefix=VERSION_PREFIX)
+        if not_added:
+          # Another instance has created the versions in the meantime.
+          stored.update(client.get_multi(not_added,
+                                         key_prefix=VERSION_PREFIX))
+        new.update(stored)
+        stored = new
+      versions.update(stored)
+  # Stamps unavailable due to memcache errors get versions matching nothing.
+  return tuple(versions.get(stamp) or _new_version() for stamp in stamps)
+
+
+def invalidate(*stamps):
+  """Bump versions of the stamps and drop results depending on them."""
+  new = {stamp: _new_version() for stamp in stamps}
+  _LOCAL_VERSIONS.update(new)
+  client = _memcache_client()
+  if client is not None:
+    client.set_multi(new, key_prefix=VERSION_PREFIX)
+  _request_versions().update(new)
+  stamps = set(stamps)
+  for cache in _CACHES.values():
+    if stamps & set(cache.stamps):
+      cache.clear()
+
+
+class LRUCache(object):
+  """Thread safe LRU cache with a TTL of entries."""
+
+  def __init__(self, maxsize, ttl):
+    self.maxsize = maxsize
+    self.ttl = ttl
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def __len__(self):
+    return len(self._entries)
+
+  def get(self, key, version):
+    """Get value of a live entry stored with the version or None."""
+    with self._lock:
+      entry = self._entries.pop(key, None)
+      if entry is None:
+        return None
+      expires, entry_version, value = entry
+      if expires < time.time() or entry_version != version:
+        return None
+      self._entries[key] = entry
+      return value
+
+  def set(self, key, version, value):
+    """Store the value and evict the least recently used entries."""
+    with self._lock:
+      self._entries.pop(key, None)
+      self._entries[key] = (time.time() + self.ttl, version, value)
+      while len(self._entries) > self.maxsize:
+        self._entries.popitem(last=False)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+
+class _Decorated(object):
+  """Function with results cached in the process and in memcache."""
+
+  def __init__(self, function, name, stamps, maxsize, ttl, shared):
+    self.function = function
+    self.name = name
+    self.stamps = tuple(stamps)
+    self.shared = shared
+    self._maxsize = maxsize
+    self._ttl = ttl
+    self._local = None
+    self.hits = collections.Counter()
+    self.misses = 0
+
+  @property
+  def ttl(self):
+    return self._ttl or settings.TIERED_CACHE_TTL
+
+  @property
+  def local(self):
+    """Process-local tier, created with the settings of the first call."""
+    if self._local is None:
+      self._local = LRUCache(self._maxsize or settings.TIERED_CACHE_SIZE,
+                             self.ttl)
+    return self._local
+
+  def get_key(self, *args, **kwargs):
+    """Return key of the cached result of the arguments."""
+    key_args = list(args)
+    for pair in sorted(kwargs.iteritems()):
+      key_args.extend(pair)
+    return u",".join(unicode(arg) for arg in key_args)
+
+  def _shared_key(self, key, versions):
+    """Return memcache key of the result, hashed if it is too long."""
+    shared_key = u"{}:{}:{}".format(self.name, ":".join(versions), key)
+    shared_key = shared_key.encode("utf-8")
+    if len(VALUE_PREFIX) + len(shared_key) > MAX_KEY_LENGTH:
+      shared_key = hashlib.sha1(shared_key).hexdigest()
+    return VALUE_PREFIX + shared_key
+
+  def __call__(self, *args, **kwargs):
+    if not enabled():
+      return self.function(*args, **kwargs)
+    key = self.get_key(*args, **kwargs)
+    versions = get_versions(self.stamps)
+    value = self.local.get(key, versions)
+    if value is not None:
+      self.hits["local"] += 1
+      return value
+    client = _memcache_client() if self.shared else None
+    if client is not None:
+      shared_key = self._shared_key(key, versions)
+      value = client.get(shared_key)
+      if value is not None:
+        self.hits["shared"] += 1
+        self.local.set(key, versions, value)
+        return value
+    self.misses += 1
+    value = self.function(*args, **kwargs)
+    if value is not None:
+      self.local.set(key, versions, value)
+      if client is not None:
+        client.set(shared_key, value, time=self.ttl)
+    return value
+
+  def clear(self):
+    if self._local is not None:
+      self._local.clear()
+
+  def stats(self):
+    """Get hit ratio and size metrics of the cache."""
+    hits = sum(self.hits.values())
+    requests = hits + self.misses
+    return {
+        "local_hits": self.hits["local"],
+        "shared_hits": self.hits["shared"],
+        "misses": self.misses,
+        "hit_ratio": float(hits) / requests if requests else None,
+        "size": len(self._local) if self._local is not None else 0,
+        "maxsize": self._maxsize or settings.TIERED_CACHE_SIZE,
+    }
+
+
+def cached(name, stamps, maxsize=None, ttl=None, shared=True):
+  """Cache results of the decorated function in two tiers.
+
+  Args:
+    name: unique name of the cache used in metrics and memcache keys;
+    stamps: names of version stamps of the data the results are built from;
+    maxsize: number of results kept in the process, TIERED_CACHE_SIZE setting
+      by default;
+    ttl: seconds the results are kept for, TIERED_CACHE_TTL setting by
+      default;
+    shared: store results in memcache too. Results which are not picklable
+      or not worth a memcache RPC are kept in the process only.
+
+  None results are not cached. Results are shared by all callers, so they
+  must not be modified.
+  """
+  def decorator(function):
+    if name in _CACHES:
+      raise ValueError("Tiered cache {} is already defined".format(name))
+    decorated = _Decorated(function, name, stamps, maxsize, ttl, shared)
+    _CACHES[name] = decorated
+    return decorated
+  return decorator
+
+
+def stats():
+  """Get metrics of all caches of the current process."""
+  return {name: cache.stats() for name, cache in _CACHES.iteritems()}
+
+
+def log_stats():
+  """Log metrics of all caches of the current process."""
+  for name, cache_stats in sorted(stats().iteritems()):
+    logger.info("Tiered cache %s: %s", name, cache_stats)
+
+
+def _mark_stamps(stamps, mapper, connection, target):
+  """Mark stamps of the changed row to be bumped after commit."""
+  # pylint: disable=unused-argument
+  session = sa.orm.object_session(target)
+  if session is not None:
+    session.info.setdefault(_SESSION_INFO_KEY, set()).update(stamps)
+
+
+def _bump_stamps(session):
+  """Bump stamps of rows changed by the committed transaction."""
+  stamps = session.info.pop(_SESSION_INFO_KEY, None)
+  if stamps:
+    invalidate(*stamps)
+
+
+def _drop_stamps(session, previous_transaction):
+  """Drop stamps of rows changed by the rolled back transaction."""
+  # pylint: disable=unused-argument
+  session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def invalidate_on_commit(model, stamps,
+                         events=("after_insert", "after_update",
+                                 "after_delete")):
+  """Bump the stamps after commits changing rows of the model.
+
+  Args:
+    model: model class whose rows the cached data is built from;
+    stamps: names of the version stamps;
+    events: mapper events changing the cached data.
+  """
+  def mark(mapper, connection, target):
+    _mark_stamps(stamps, mapper, connection, target)
+  for event in events:
+    sa.event.listen(model, event, mark)
+
+
+sa.event.listen(sa.orm.session.Session, "after_commit", _bump_stamps)
+sa.event.listen(sa.orm.session.Session, "after_soft_rollback", _drop_stamps)
@@ -4,17 +4,20 @@
 """Common operations on cache managers."""
 
 import logging
+import uuid
 
 import flask
 
 from ggrc import cache
 import ggrc.models
-from ggrc.utils.memcache import blob_get_chunk_keys
 from ggrc.cache.memcache import has_memcache
 
 
 logger = logging.getLogger(__name__)
 
+# Prefix of keys of status entries of memcache entries being deleted.
+DELETE_OP_PREFIX = 'DeleteOp:'
+
 
 def get_cache_manager():
   """Returns an instance of CacheManager."""
@@ -132,11 +135,11 @@ def update_memcache_before_commit(context, modified_objects, expiry_time):
 
   status_entries = {}
   for key in context.cache_manager.marked_for_delete:
-    build_cache_status(status_entries, 'DeleteOp:' + key,
-                       expiry_time, 'InProgress')
+    build_cache_status(status_entries, key, expiry_time, 'InProgress')
   if status_entries:
     logger.info("CACHE: status entries: %s", status_entries)
-    ret = context.cache_manager.bulk_add(status_entries, expiry_time)
+    ret = context.cache_manager.bulk_add(status_entries, expiry_time,
+                                         key_prefix=DELETE_OP_PREFIX)
     if ret is not None and not ret:
       pass
     else:
@@ -172,7 +175,8 @@ def update_memcache_after_commit(context):
       related_objs.append((obj_list[0], None))
   memcache_mark_for_deletion(context, related_objs)
 
-  # TODO(dan): check for duplicates in marked_for_delete
+  # Entries are deleted before their status entries, duplicate keys are
+  # deleted once by bulk_delete.
   if cache_manager.marked_for_delete:
     delete_result = cache_manager.bulk_delete(
         cache_manager.marked_for_delete, 0)
@@ -181,17 +185,13 @@ def update_memcache_after_commit(context):
     if delete_result is not True:
       logger.error("CACHE: Failed to remove collection from cache")
 
-  status_entries = []
-  for key in cache_manager.marked_for_delete:
-    status_entries.append('DeleteOp:' + str(key))
-  if status_entries:
-    delete_result = cache_manager.bulk_delete(status_entries, 0)
+    delete_result = cache_manager.bulk_delete(
+        cache_manager.marked_for_delete, 0, key_prefix=DELETE_OP_PREFIX)
     # TODO(dan): handling failure including network errors,
     #            currently we log errors
     if delete_result is not True:
       logger.error("CACHE: Failed to remove status entries from cache")
 
-  clear_permission_cache()
   cache_manager.clear_cache()
 
 
@@ -210,21 +210,47 @@ def build_cache_status(data, key, expiry_timeout, status):
   data[key] = {'expiry': expiry_timeout, 'status': status}
 
 
+PERMISSIONS_VERSION_KEY = "permissions:version"
+
+
+def _user_permissions_version_key(user_id):
+  return "permissions:version:{}".format(user_id)
+
+
+def _new_permissions_version():
+  return uuid.uuid4().hex
+
+
+def get_permissions_key(client, user_id):
+  """Get memcache key of cached permissions of the user.
+
+  The key contains the global and the user permissions versions, so changing
+  any of them makes the previously cached permissions unreachable. A missing
+  version is replaced with a new random one, so an evicted version never
+  points to an old entry.
+  """
+  version_keys = [PERMISSIONS_VERSION_KEY,
+                  _user_permissions_version_key(user_id)]
+  versions = client.get_multi(version_keys)
+  missing = {key: _new_permissions_version()
+             for key in version_keys if not versions.get(key)}
+  if missing:
+    client.add_multi(missing)
+    versions.update(client.get_multi(missing.keys()))
+  return "permissions:{}:{}:{}".format(
+      user_id,
+      versions.get(PERMISSIONS_VERSION_KEY),
+      versions.get(_user_permissions_version_key(user_id)),
+  )
+
+
 def clear_permission_cache():
   """Drop cached permissions for all users."""
   if not has_memcache():
     return
 
   client = get_cache_manager().cache_object.memcache_client
-
-  # We delete all the cached user permissions as well as
-  # the permissions:list value itself
-  keys_to_delete = list('permissions:list')
-  for user_key in client.get('permissions:list') or set():
-    keys_to_delete.append(user_key)
-    keys_to_delete.extend(blob_get_chunk_keys(client, user_key))
-
-  client.delete_multi(keys_to_delete)
+  client.set(PERMISSIONS_VERSION_KEY, _new_permissions_version())
 
 
 def clear_users_permission_cache(user_ids):
@@ -233,18 +259,10 @@ def clear_users_permission_cache(user_ids):
     return
 
   client = get_cache_manager().cache_object.memcache_client
-
-  keys_to_delete = list()
-  cached_keys_set = client.get('permissions:list') or set()
-  for user_id in user_ids:
-    key = 'permissions:{}'.format(user_id)
-    if key in cached_keys_set:
-      cached_keys_set.remove(key)
-      keys_to_delete.append(key)
-      keys_to_delete.extend(blob_get_chunk_keys(client, key))
-
-  client.set('permissions:list', cached_keys_set)
-  client.delete_multi(keys_to_delete)
+  client.set_multi({
+      _user_permissions_version_key(user_id): _new_permissions_version()
+      for user_id in user_ids
+  })
 
 
 def clear_memcache():
@@ -3,11 +3,16 @@
 
 """Base objects for csv file converters."""
 
+import functools
+import threading
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
+import flask
 from flask import g
 from google.appengine.ext import deferred
 
+from ggrc import db
 from ggrc import login
 from ggrc import settings
 from ggrc.utils import benchmark
@@ -27,11 +32,22 @@ class BaseConverter(object):
   """Base class for csv converters."""
   # pylint: disable=too-few-public-methods
   def __init__(self):
-    self.new_objects = defaultdict(structures.CaseInsensitiveDict)
+    self._local = threading.local()
     self.shared_state = {}
     self.response_data = []
     self.exportable = get_exportables()
 
+  @property
+  def new_objects(self):
+    """Cache of objects found or created by the import.
+
+    Objects are bound to the db session of the thread that loaded them, so
+    every thread importing blocks has its own cache.
+    """
+    if not hasattr(self._local, "new_objects"):
+      self._local.new_objects = defaultdict(structures.CaseInsensitiveDict)
+    return self._local.new_objects
+
   def get_info(self):
     raise NotImplementedError()
 
@@ -88,16 +104,120 @@ class ImportConverter(BaseConverter):
     """Process import and post import jobs."""
 
     revision_ids = []
-    for converter in self.initialize_block_converters():
-      if not converter.ignore:
-        converter.import_csv_data()
-        revision_ids.extend(converter.revision_ids)
+    use_workers = (settings.IMPORT_BLOCK_WORKERS > 1 and not self.dry_run and
+                   flask.has_request_context())
+    if use_workers:
+      block_converters = self._import_blocks_in_parallel()
+    else:
+      block_converters = self._import_blocks()
+    for converter in block_converters:
+      revision_ids.extend(converter.revision_ids)
       self.response_data.append(converter.get_info())
     self._start_compute_attributes_job(revision_ids)
     if not self.dry_run and settings.ISSUE_TRACKER_ENABLED:
       self._start_issuetracker_update(revision_ids)
     self.drop_cache()
 
+  def _import_blocks(self):
+    """Import blocks one by one and yield them."""
+    for converter in self.initialize_block_converters():
+      if not converter.ignore:
+        converter.import_csv_data()
+      yield converter
+
+  def _import_blocks_in_parallel(self):
+    """Import blocks without shared objects in parallel threads.
+
+    Blocks are imported by levels. Blocks of one level do not reference
+    objects of each other and are imported by IMPORT_BLOCK_WORKERS threads,
+    each of them works in a copy of the current request context and thus has
+    its own db session. Dry run imports are never parallel, as they resolve
+    references to objects created by other blocks through the session.
+
+    Returns:
+      list of all block converters in the order of the csv file.
+    """
+    block_converters = list(self.initialize_block_converters())
+    levels = self.get_import_levels(
+        [converter for converter in block_converters if not converter.ignore]
+    )
+    for index, level in enumerate(levels):
+      workers = min(settings.IMPORT_BLOCK_WORKERS, len(level))
+      with benchmark("Import level {}: {} blocks with {} workers".format(
+          index, len(level), workers)):
+        if workers < 2:
+          level[0].import_csv_data()
+          continue
+        self._create_people(level)
+        tasks = [
+            flask.copy_current_request_context(
+                functools.partial(self._import_block_worker, converter)
+            )
+            for converter in level
+        ]
+        pool = ThreadPool(workers)
+        try:
+          pool.map(lambda task: task(), tasks)
+        finally:
+          pool.close()
+          pool.join()
+    return block_converters
+
+  def _import_block_worker(self, block_converter):
+    """Import a block in a worker thread with an empty objects cache."""
+    self._local.new_objects = defaultdict(structures.CaseInsensitiveDict)
+    try:
+      block_converter.import_csv_data()
+    finally:
+      del self._local.new_objects
+
+  @staticmethod
+  def get_import_levels(block_converters):
+    """Group blocks into levels of blocks that can be imported in parallel.
+
+    Each block goes to the level after the last level containing an earlier
+    block it conflicts with, so conflicting blocks are imported in the order
+    of the csv file.
+
+    Returns:
+      list of lists of block converters.
+    """
+    levels = []
+    block_levels = []
+    for index, converter in enumerate(block_converters):
+      level = 0
+      for previous, previous_level in zip(block_converters[:index],
+                                          block_levels):
+        if converter.conflicts_with(previous):
+          level = max(level, previous_level + 1)
+      block_levels.append(level)
+      if level == len(levels):
+        levels.append([])
+      levels[level].append(converter)
+    return levels
+
+  @staticmethod
+  def _create_people(block_converters):
+    """Find or create people of the blocks before importing them.
+
+    People can be created by user lookups when the integration service is
+    used. Creating them here prevents parallel workers from creating the same
+    people in different sessions.
+    """
+    if not settings.INTEGRATION_SERVICE_URL:
+      return
+    from ggrc.utils import user_generator
+    emails = set()
+    for converter in block_converters:
+      emails.update(converter.get_people_emails())
+    for email in sorted(emails):
+      try:
+        user_generator.find_user(email)
+      except ValueError:
+        # Invalid emails are reported by the row converters.
+        continue
+    db.session.commit()
+
   def _start_issuetracker_update(self, revision_ids):
     """Create or update issuetracker tickets for all imported instances."""
 
@@ -136,6 +256,9 @@ class ExportConverter(BaseConverter):
   blocks and columns are handled in the correct order.
   """
 
+  # Size of CSV data chunks produced by the streaming export, in bytes.
+  CSV_CHUNK_SIZE = 1024 * 1024
+
   def __init__(self, ids_by_type, exportable_queries=None):
     super(ExportConverter, self).__init__()
     self.dry_run = True  # TODO: fix ColumnHandler to not use it for exports
@@ -188,8 +311,29 @@ class ExportConverter(BaseConverter):
       except ValueError:
         return ""
 
+  def stream_csv_data(self):
+    """Export csv data as a generator of CSV string chunks.
+
+    Block converters are initialized right away, so object names are
+    available before the data is generated.
+    """
+    with benchmark("Initialize block converters."):
+      self.initialize_block_converters()
+    if not self.block_converters:
+      return iter([])
+    return self.stream_csv_from_row_data()
+
   def build_csv_from_row_data(self):
     """Export each block separated by empty lines."""
+    return "".join(self.stream_csv_from_row_data())
+
+  def stream_csv_from_row_data(self):
+    """Export each block separated by empty lines by chunks.
+
+    Rows are encoded into the CSV buffer one by one and the buffer is flushed
+    every time it exceeds CSV_CHUNK_SIZE, so the memory usage does not depend
+    on the export size.
+    """
     table_width = max([converter.block_width
                        for converter in self.block_converters])
     table_width += 1  # One line for 'Object line' column
@@ -206,11 +350,13 @@ class ExportConverter(BaseConverter):
       for line in block_converter.generate_row_data():
         line.insert(0, "")
         csv_string_builder.append_line(line)
+        if csv_string_builder.size >= self.CSV_CHUNK_SIZE:
+          yield csv_string_builder.pop_csv_string()
 
       csv_string_builder.append_line([])
       csv_string_builder.append_line([])
 
-    return csv_string_builder.get_csv_string()
+    yield csv_string_builder.pop_csv_string()
 
   def _get_exportable_queries(self):
     """Get a list of filtered object queries regarding exportable items.
@@ -7,6 +7,7 @@ Each import block should contain data for one Object type. The blocks are
 separated in the csv file with empty lines.
 """
 
+import re
 from logging import getLogger
 from collections import defaultdict
 from collections import OrderedDict
@@ -20,6 +21,8 @@ from flask import _app_ctx_stack
 
 from ggrc import db
 from ggrc import models
+from ggrc import settings
+from ggrc.cache import tiered
 from ggrc.models import reflection
 from ggrc.rbac import permissions
 from ggrc.utils import benchmark
@@ -28,11 +31,15 @@ from ggrc.utils import list_chunks
 from ggrc.converters import errors
 from ggrc.converters import get_shared_unique_rules
 from ggrc.converters import base_row
+from ggrc.converters import get_exportables
+from ggrc.converters.handlers import handlers
+from ggrc.converters.handlers import multi_object
 from ggrc.converters.import_helper import get_column_order
 from ggrc.converters.import_helper import get_object_column_definitions
 from ggrc.models.mixins import issue_tracker as issue_tracker_mixins
 from ggrc.models.exceptions import ReservedNameError
 from ggrc.services import signals
+from ggrc.snapshotter.rules import Types
 from ggrc_workflows.models.cycle_task_group_object_task import \
     CycleTaskGroupObjectTask
 
@@ -40,6 +47,27 @@ from ggrc_workflows.models.cycle_task_group_object_task import \
 logger = getLogger(__name__)
 
 
+@tiered.cached("import_global_ca_definitions",
+               stamps=(tiered.CUSTOM_ATTRIBUTE_DEFINITIONS,), shared=False)
+def _get_global_ca_definitions(definition_type):
+  """Get global custom attribute definitions of the type.
+
+  Definitions are detached copies, so they can be kept across sessions. They
+  have to be merged into the session with load=False before use.
+  """
+  cad = models.CustomAttributeDefinition
+  copies = sa.orm.Session()
+  definitions = [
+      copies.merge(definition, load=False)
+      for definition in cad.eager_query().filter(
+          cad.definition_type == definition_type,
+          cad.definition_id.is_(None),
+      )
+  ]
+  copies.close()
+  return definitions
+
+
 class BlockConverter(object):
   # pylint: disable=too-many-public-methods
   # pylint: disable=too-many-instance-attributes
@@ -125,17 +153,24 @@ class BlockConverter(object):
     cad = models.CustomAttributeDefinition
     gca_prefix = reflection.AttributeInfo.CUSTOM_ATTR_PREFIX
     lca_prefix = reflection.AttributeInfo.OBJECT_CUSTOM_ATTR_PREFIX
-    defs = cad.eager_query().filter(
+    titles = {
+        v["attr_name"]
+        for k, v in self.headers.items()
+        if k.startswith(gca_prefix) or k.startswith(lca_prefix)
+    }
+    defs = [
+        db.session.merge(d, load=False)
+        for d in _get_global_ca_definitions(self.table_singular)
+        if d.mandatory or d.title in titles
+    ]
+    defs.extend(cad.eager_query().filter(
         cad.definition_type == self.table_singular,
+        cad.definition_id.isnot(None),
         sa.or_(
             cad.mandatory,
-            cad.title.in_(
-                v["attr_name"]
-                for k, v in self.headers.items()
-                if k.startswith(gca_prefix) or k.startswith(lca_prefix)
-            ),
+            cad.title.in_(titles),
         ),
-    )
+    ))
     return {(d.definition_id, d.title): d for d in defs}
 
   def get_ca_definitions_cache(self):
@@ -401,14 +436,74 @@ class ImportBlockConverter(BlockConverter):
                       line=self.offset + 2,
                       s="")
 
+  @cached_property
+  def shared_classes(self):
+    """Classes sharing unique values state with the block object class."""
+    return set(get_shared_unique_rules().get(self.object_class,
+                                             (self.object_class,)))
+
+  @cached_property
+  def referenced_classes(self):
+    """Classes of objects that the block rows can create, find or change.
+
+    Returns:
+      set of model classes or None if some block column can reference objects
+      of unknown classes.
+    """
+    classes = set(self.shared_classes)
+    if self.object_class is models.all_models.Audit:
+      classes.add(models.all_models.Snapshot)
+      classes.update(getattr(models.all_models, name) for name in Types.all)
+    exportables = get_exportables()
+    for header in self.headers.itervalues():
+      handler = header["handler"]
+      if issubclass(handler, handlers.UserColumnHandler):
+        classes.add(models.all_models.Person)
+      elif issubclass(handler, handlers.ParentColumnHandler):
+        classes.add(handler.parent)
+      elif issubclass(handler, handlers.MappingColumnHandler):
+        mapping_class = exportables.get(header.get("attr_name"))
+        if mapping_class is None:
+          return None
+        classes.add(mapping_class)
+      elif issubclass(handler, multi_object.ObjectsColumnHandler):
+        classes.update(getattr(models.all_models, name)
+                       for name in handler.MAPABLE_OBJECTS)
+    return classes
+
+  def conflicts_with(self, other):
+    """Check if the block can not be imported in parallel with other block."""
+    if self.referenced_classes is None or other.referenced_classes is None:
+      return True
+    return bool(self.referenced_classes & other.shared_classes or
+                other.referenced_classes & self.shared_classes)
+
+  def get_people_emails(self):
+    """Get all emails from people columns of the block."""
+    indexes = [
+        index for index, header in enumerate(self.headers.itervalues())
+        if issubclass(header["handler"], handlers.UserColumnHandler)
+    ]
+    emails = set()
+    for row in self.rows:
+      for index in indexes:
+        emails.update(re.split("[, ;\n]+", row[index].lower().strip()))
+    emails.discard("")
+    return emails
+
   def row_converters_from_csv(self):
     """ Generate a row converter object for every csv row """
     if self.ignore:
       return
-    for i, row in enumerate(self.rows):
-      line = self.csv_lines[i]
-      yield base_row.ImportRowConverter(self, self.object_class, row=row,
-                                        headers=self.headers, line=line)
+    for i in xrange(len(self.rows)):
+      yield self._make_row_converter(i)
+
+  def _make_row_converter(self, index):
+    """Make a row converter for the csv row with the given index."""
+    return base_row.ImportRowConverter(self, self.object_class,
+                                       row=self.rows[index],
+                                       headers=self.headers,
+                                       line=self.csv_lines[index])
 
   @property
   def handle_fields(self):
@@ -426,19 +521,15 @@ class ImportBlockConverter(BlockConverter):
   def import_csv_data(self):
     """Perform import sequence for the block."""
     try:
-      for row in self.row_converters_from_csv():
-        try:
-          row.process_row()
-        except ReservedNameError:
-          db.session.rollback()
-          row.add_error(errors.DUPLICATE_CAD_NAME)
-          logger.exception(errors.DUPLICATE_CAD_NAME)
-        except Exception:  # pylint: disable=broad-except
-          db.session.rollback()
-          row.add_error(errors.UNKNOWN_ERROR)
-          logger.exception("Unexpected error on import")
-        self._update_info(row)
-        _app_ctx_stack.top.sqlalchemy_queries = []
+      if self.bulk_commit_size > 1 and not self.ignore:
+        for indexes in list_chunks(range(len(self.rows)),
+                                   self.bulk_commit_size):
+          self._import_rows_batch(indexes)
+          _app_ctx_stack.top.sqlalchemy_queries = []
+      else:
+        for row in self.row_converters_from_csv():
+          self._import_row(row)
+          _app_ctx_stack.top.sqlalchemy_queries = []
     except Exception:  # pylint: disable=broad-except
       logger.exception("Unexpected error on import")
     finally:
@@ -447,6 +538,116 @@ class ImportBlockConverter(BlockConverter):
       if is_final_commit_required:
         db.session.commit()
 
+  @property
+  def bulk_commit_size(self):
+    """Number of rows committed together, 1 for per row commits.
+
+    Audit rows are always committed separately as snapshot creation for them
+    needs its own import event.
+    """
+    if self.converter.dry_run or self.object_class is models.all_models.Audit:
+      return 1
+    return settings.IMPORT_BULK_COMMIT_SIZE
+
+  def _import_row(self, row):
+    """Import a single row with its own commit."""
+    try:
+      row.process_row()
+    except ReservedNameError:
+      db.session.rollback()
+      row.add_error(errors.DUPLICATE_CAD_NAME)
+      logger.exception(errors.DUPLICATE_CAD_NAME)
+    except Exception:  # pylint: disable=broad-except
+      db.session.rollback()
+      row.add_error(errors.UNKNOWN_ERROR)
+      logger.exception("Unexpected error on import")
+    self._update_info(row)
+
+  def _import_rows_batch(self, indexes):
+    """Import rows with the given indexes with a single commit.
+
+    If any of the rows can not be committed together with the others, all
+    batch changes are rolled back and both halves of the batch are imported
+    separately. A batch of a single row is imported with its own commit, so
+    errors are reported for the row exactly as with per row commits.
+    """
+    if len(indexes) == 1:
+      self._import_row(self._make_row_converter(indexes[0]))
+      return
+    state = self._get_import_state()
+    rows = self._process_rows_batch(indexes)
+    if rows is None:
+      db.session.rollback()
+      self._set_import_state(state)
+      middle = len(indexes) // 2
+      self._import_rows_batch(indexes[:middle])
+      self._import_rows_batch(indexes[middle:])
+      return
+    for row in rows:
+      self._update_info(row)
+
+  def _process_rows_batch(self, indexes):
+    """Process and commit rows together.
+
+    Returns:
+      list of committed row converters or None if the rows have not been
+      committed and have to be imported separately.
+    """
+    transaction = db.session.transaction
+    rows = []
+    try:
+      for index in indexes:
+        row = self._make_row_converter(index)
+        row.process_row(commit=False)
+        # Rows with errors and deleted rows roll back or commit the session
+        # on their own, so they can not be part of a batch.
+        if row.ignore or row.is_delete or \
+           db.session.transaction is not transaction:
+          return None
+        rows.append(row)
+      with benchmark("Commit import batch of {} rows".format(len(rows))):
+        import_event, modified_objects = \
+            base_row.ImportRowConverter.commit_rows_changes(self, rows)
+    except Exception:  # pylint: disable=broad-except
+      logger.info("Import batch failed, importing rows separately",
+                  exc_info=True)
+      return None
+    # The rows are committed, so errors after the commit are reported for
+    # every row, the rows are still counted and never imported again.
+    try:
+      base_row.ImportRowConverter.after_commit_rows(self, import_event,
+                                                    modified_objects)
+    except Exception:  # pylint: disable=broad-except
+      db.session.rollback()
+      logger.exception("Unexpected error after import batch commit")
+      self.row_errors.extend(errors.UNKNOWN_ERROR.format(line=row.line)
+                             for row in rows)
+      return rows
+    for row in rows:
+      row.send_post_commit_signals(event=import_event)
+    return rows
+
+  def _get_import_state(self):
+    """Get a copy of the block state changed by row processing."""
+    return (
+        len(self.row_errors),
+        len(self.row_warnings),
+        {key: structures.CaseInsensitiveDict(value)
+         for key, value in self.converter.new_objects.iteritems()},
+        {key: structures.CaseInsensitiveDict(value)
+         for key, value in self.unique_values.iteritems()},
+    )
+
+  def _set_import_state(self, state):
+    """Restore the block state saved with _get_import_state."""
+    errors_count, warnings_count, new_objects, unique_values = state
+    del self.row_errors[errors_count:]
+    del self.row_warnings[warnings_count:]
+    self.converter.new_objects.clear()
+    self.converter.new_objects.update(new_objects)
+    self.unique_values.clear()
+    self.unique_values.update(unique_values)
+
   def get_unique_values_dict(self, object_class):
     """Get the varible to storing row numbers for unique values.
 
@@ -246,8 +246,13 @@ class ImportRowConverter(RowConverter):
       logger.exception("Import failed with: %s", err.message)
       self.add_error(errors.UNKNOWN_ERROR)
 
-  def process_row(self):
-    """Parse, set, validate and commit data specified in self.row."""
+  def process_row(self, commit=True):
+    """Parse, set, validate and commit data specified in self.row.
+
+    Args:
+      commit: if False the row changes are only flushed, so they can be
+        committed together with other rows with commit_rows.
+    """
     self._handle_raw_data()
     self._check_mandatory_fields()
     if self.ignore:
@@ -265,7 +270,8 @@ class ImportRowConverter(RowConverter):
       return
     self.flush_object()
     self.setup_secondary_objects()
-    self.commit_object()
+    if commit:
+      self.commit_object()
 
   def _check_object(self):
     """Check object if it has any pre commit checks.
@@ -328,35 +334,71 @@ class ImportRowConverter(RowConverter):
     if self.block_converter.converter.dry_run or self.ignore:
       return
     try:
-      if not self.is_new:
-        cache.Cache.add_to_cache(self.obj)
-      modified_objects = get_modified_objects(db.session)
-      import_event = log_event(db.session, None)
-      cache_utils.update_memcache_before_commit(
-          self.block_converter,
-          modified_objects,
-          self.block_converter.CACHE_EXPIRY_IMPORT,
-      )
-      try:
-        self.send_before_commit_signals(import_event)
-      except StatusValidationError as exp:
-        status_alias = self.headers.get("status", {}).get("display_name")
-        self.add_error(errors.VALIDATION_ERROR,
-                       column_name=status_alias,
-                       message=exp.message)
-      db.session.commit_hooks_enable_flag.disable()
-      db.session.commit()
-      self.block_converter.store_revision_ids(import_event)
-      cache_utils.update_memcache_after_commit(self.block_converter)
-      update_snapshot_index(modified_objects)
+      import_event = self.commit_rows(self.block_converter, [self])
     except exc.SQLAlchemyError as err:
       db.session.rollback()
       logger.exception("Import failed with: %s", err.message)
       self.block_converter.add_errors(errors.UNKNOWN_ERROR,
-                                      line=self.offset + 2)
+                                      line=self.line)
     else:
       self.send_post_commit_signals(event=import_event)
 
+  @classmethod
+  def commit_rows(cls, block_converter, row_converters):
+    """Commit flushed changes of several rows at once.
+
+    All rows share one import event, memcache update and snapshot index
+    update. Post commit signals are not sent here.
+
+    Returns:
+      Event object logged for the committed rows.
+
+    Raises:
+      SQLAlchemyError if the commit fails, the session is not rolled back.
+    """
+    import_event, modified_objects = cls.commit_rows_changes(
+        block_converter, row_converters)
+    cls.after_commit_rows(block_converter, import_event, modified_objects)
+    return import_event
+
+  @staticmethod
+  def commit_rows_changes(block_converter, row_converters):
+    """Log the import event and commit flushed changes of the rows.
+
+    Returns:
+      tuple of the Event object logged for the committed rows and objects
+      modified by them, to be passed to after_commit_rows.
+    """
+    for row_converter in row_converters:
+      if not row_converter.is_new:
+        cache.Cache.add_to_cache(row_converter.obj)
+    modified_objects = get_modified_objects(db.session)
+    import_event = log_event(db.session, None)
+    cache_utils.update_memcache_before_commit(
+        block_converter,
+        modified_objects,
+        block_converter.CACHE_EXPIRY_IMPORT,
+    )
+    for row_converter in row_converters:
+      try:
+        row_converter.send_before_commit_signals(import_event)
+      except StatusValidationError as exp:
+        status_alias = row_converter.headers.get(
+            "status", {}).get("display_name")
+        row_converter.add_error(errors.VALIDATION_ERROR,
+                                column_name=status_alias,
+                                message=exp.message)
+    db.session.commit_hooks_enable_flag.disable()
+    db.session.commit()
+    return import_event, modified_objects
+
+  @staticmethod
+  def after_commit_rows(block_converter, import_event, modified_objects):
+    """Store revisions, update memcache and index of committed rows."""
+    block_converter.store_revision_ids(import_event)
+    cache_utils.update_memcache_after_commit(block_converter)
+    update_snapshot_index(modified_objects)
+
   def _setup_object(self):
     """ Set the object values or relate object values
 
@@ -278,3 +278,15 @@ class CsvStringBuilder(object):
   def get_csv_string(self):
     """Returns CSV string from buffer."""
     return self.output_buffer.getvalue()
+
+  @property
+  def size(self):
+    """Returns size of CSV buffer in bytes."""
+    return self.output_buffer.tell()
+
+  def pop_csv_string(self):
+    """Returns CSV string from buffer and clears the buffer."""
+    csv_string = self.output_buffer.getvalue()
+    self.output_buffer.seek(0)
+    self.output_buffer.truncate()
+    return csv_string
@@ -25,6 +25,7 @@ import sqlalchemy as sa
 from ggrc import db
 from ggrc import login
 from ggrc import utils
+from ggrc.fulltext import tokens
 from ggrc.utils import revisions as revision_utils, helpers
 from ggrc.utils import benchmark
 from ggrc.models import all_models as models
@@ -562,6 +563,7 @@ def store_data(attributes_data, index_data):
     db.session.execute(ATTRIBUTE_REPLACE_STATEMENT, attributes_data)
   if index_data:
     db.session.execute(INDEX_REPLACE_STATEMENT, index_data)
+    tokens.add_records(index_data)
   db.session.commit()
 
 
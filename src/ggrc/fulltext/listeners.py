@@ -17,7 +17,7 @@ from ggrc.fulltext import mixin
 from ggrc.models.background_task import reindex_on_commit
 from ggrc.utils import benchmark, helpers
 
-ACTIONS = ['after_insert', 'after_delete', 'after_update']
+ACTIONS = ['after_insert', 'after_delete']
 
 
 class ReindexSet(threading.local):
@@ -29,17 +29,40 @@ class ReindexSet(threading.local):
 
   def __init__(self, *args, **kwargs):
     super(ReindexSet, self).__init__(*args, **kwargs)
-    self._pool = set()
+    self._pool = {}
     self.model_ids_to_reindex = defaultdict(set)
-
-  def add(self, item):
-    self._pool.add(item)
+    # Ids of objects that need only some properties to be reindexed:
+    # {type_name: {id: set of property names}}
+    self.model_properties = defaultdict(dict)
+
+  def add(self, item, changed_attrs=None):
+    """Add an object to reindex.
+
+    Args:
+      item: object to reindex;
+      changed_attrs: names of the changed object attributes, None if all
+        object properties have to be reindexed.
+    """
+    if changed_attrs is None or self._pool.get(item, set()) is None:
+      self._pool[item] = None
+    else:
+      self._pool.setdefault(item, set()).update(changed_attrs)
+
+  def _add_model_id(self, type_name, id_value, properties):
+    """Add object id with the properties to reindex to the model ids."""
+    ids = self.model_ids_to_reindex[type_name]
+    partial = self.model_properties[type_name]
+    if properties is None or (id_value in ids and id_value not in partial):
+      partial.pop(id_value, None)
+    else:
+      partial[id_value] = partial.get(id_value, set()) | properties
+    ids.add(id_value)
 
   @helpers.without_sqlalchemy_cache
   def warmup(self):
     """Function on pre-commit that collects objects keychain."""
     while self._pool:
-      for_index = self._pool.pop()
+      for_index, changed_attrs = self._pool.popitem()
       if for_index not in db.session:
         continue
       type_name, id_value = for_index.get_reindex_pair()
@@ -48,7 +71,8 @@ class ReindexSet(threading.local):
       if id_value is None:
         db.session.flush()
         type_name, id_value = for_index.get_reindex_pair()
-      self.model_ids_to_reindex[type_name].add(id_value)
+      properties = for_index.get_fulltext_properties_for(changed_attrs)
+      self._add_model_id(type_name, id_value, properties)
 
   @helpers.without_sqlalchemy_cache
   def indexing_hook(self):
@@ -58,13 +82,39 @@ class ReindexSet(threading.local):
       self.warmup()
       if self.model_ids_to_reindex:
         if reindex_on_commit():
-          update_ft_records(self.model_ids_to_reindex, self.CHUNK_SIZE)
+          update_ft_records(self.model_ids_to_reindex, self.CHUNK_SIZE,
+                            self.model_properties)
       # else: Indexing task will be created in after_request hook
 
 
+def _group_ids_by_properties(ids, properties):
+  """Group ids by the sets of properties to reindex.
+
+  Returns:
+    dict {frozenset of property names or None: list of ids}, None key stands
+    for ids with all properties to reindex.
+  """
+  groups = defaultdict(list)
+  for id_value in ids:
+    if id_value in properties:
+      groups[frozenset(properties[id_value])].append(id_value)
+    else:
+      groups[None].append(id_value)
+  return groups
+
+
 @helpers.without_sqlalchemy_cache
-def update_ft_records(model_ids_to_reindex, chunk_size):
-  """Update fulltext records in DB"""
+def update_ft_records(model_ids_to_reindex, chunk_size,
+                      model_properties=None):
+  """Update fulltext records in DB
+
+  Args:
+    model_ids_to_reindex: dict {type_name: set of ids};
+    chunk_size: number of objects reindexed at once;
+    model_properties: dict {type_name: {id: set of property names}} for
+      objects that need only some properties to be reindexed.
+  """
+  model_properties = model_properties or {}
   with benchmark("indexing. expire objects in session"):
     for obj in db.session:
       if (isinstance(obj, mixin.Indexed) and
@@ -74,13 +124,23 @@ def update_ft_records(model_ids_to_reindex, chunk_size):
   with benchmark("indexing. update ft records in db"):
     for model_name in model_ids_to_reindex.keys():
       ids = model_ids_to_reindex.pop(model_name)
-      chunk_list = utils.list_chunks(list(ids), chunk_size=chunk_size)
-      for ids_chunk in chunk_list:
-        get_model(model_name).bulk_record_update_for(ids_chunk)
-
-
-def _runner(mapper, content, target):  # pylint:disable=unused-argument
-  """Collect all reindex models in session"""
+      properties = model_properties.pop(model_name, {})
+      groups = _group_ids_by_properties(ids, properties)
+      for group_properties, group_ids in groups.iteritems():
+        chunk_list = utils.list_chunks(group_ids, chunk_size=chunk_size)
+        for ids_chunk in chunk_list:
+          get_model(model_name).bulk_record_update_for(
+              ids_chunk, properties=group_properties)
+
+
+def _runner(mapper, content, target,  # pylint:disable=unused-argument
+            changed_attrs=None):
+  """Collect all reindex models in session
+
+  Args:
+    changed_attrs: names of the changed target attributes, None if the
+      target has to be reindexed completely.
+  """
   # with benchmark("collect reindex models in session"):
   ggrc_indexer = fulltext.get_indexer()
   db.session.reindex_set = getattr(db.session, "reindex_set", ReindexSet())
@@ -95,7 +155,15 @@ def _runner(mapper, content, target):  # pylint:disable=unused-argument
     for to_index in to_index_list:
       db.session.reindex_set.add(to_index)
   if isinstance(target, mixin.Indexed):
-    db.session.reindex_set.add(target)
+    db.session.reindex_set.add(target, changed_attrs)
+
+
+def _update_runner(mapper, content, target):
+  """Collect reindex models in session for updated target"""
+  changed_attrs = None
+  if isinstance(target, mixin.Indexed):
+    changed_attrs = get_changed_attrs(target)
+  _runner(mapper, content, target, changed_attrs=changed_attrs)
 
 
 def register_fulltext_listeners():
@@ -116,6 +184,13 @@ def register_fulltext_listeners():
             model.__name__ in ggrc_indexer.indexer_rules:
       for action in ACTIONS:
         event.listen(model, action, _runner)
+      event.listen(model, "after_update", _update_runner)
+
+
+def get_changed_attrs(obj):
+  """Get names of the changed object attributes"""
+  return {attr.key for attr in sa.inspect(obj).attrs
+          if attr.history.has_changes()}
 
 
 def fields_changed(obj, fields):
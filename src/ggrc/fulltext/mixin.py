@@ -2,7 +2,7 @@
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 """Module contains Indexed mixin class"""
 import itertools
-from collections import namedtuple
+from collections import defaultdict, namedtuple
 
 from sqlalchemy import orm
 
@@ -10,6 +10,7 @@ from ggrc import db
 
 from ggrc import fulltext
 from ggrc import utils
+from ggrc.fulltext import tokens
 from ggrc.models.reflection import AttributeInfo
 
 
@@ -39,21 +40,29 @@ class Indexed(object):
     return (self.__class__.__name__, self.id)
 
   @classmethod
-  def insert_records(cls, ids):
-    """Calculate and insert records into fulltext_record_properties table."""
+  def insert_records(cls, ids, table=None):
+    """Calculate and insert records into fulltext_record_properties table.
+
+    Tokens of the records are indexed only if they are inserted into the
+    index table, tokens of the shadow table are rebuilt after the swap.
+
+    Args:
+      ids: ids of the objects to index;
+      table: table to insert records into instead of the index table.
+    """
     instances = cls.indexed_query().filter(cls.id.in_(ids))
     indexer = fulltext.get_indexer()
+    index_tokens = table is None
+    if table is None:
+      table = indexer.record_type.__table__
     rows = itertools.chain(*[indexer.records_generator(i) for i in instances])
     for vals_chunk in utils.iter_chunks(rows, chunk_size=10000):
-      query = """
-          INSERT INTO fulltext_record_properties (
-            `key`, type, tags, property, subproperty, content
-          ) VALUES (:key, :type, :tags, :property, :subproperty, :content)
-      """
       values = list(vals_chunk)
       if not values:
         return
-      db.session.execute(query, values)
+      db.session.execute(table.insert(), values)
+      if index_tokens:
+        tokens.add_records(values)
 
   @classmethod
   def get_delete_query_for(cls, ids):
@@ -76,15 +85,145 @@ class Indexed(object):
               fulltext_record_properties.key IN :obj_ids
     """
     db.session.execute(query, {"obj_type": cls.__name__, "obj_ids": ids})
+    tokens.delete_objects(cls.__name__, ids)
 
   @classmethod
-  def bulk_record_update_for(cls, ids):
-    """Bulky update index records for current class"""
-    if not ids:
+  def get_stored_records(cls, ids, properties=None):
+    """Get stored index records of the objects.
+
+    Returns:
+      dict {(key, property, subproperty): content}.
+    """
+    record_type = fulltext.get_indexer().record_type
+    query = db.session.query(
+        record_type.key,
+        record_type.property,
+        record_type.subproperty,
+        record_type.content,
+    ).filter(
+        record_type.type == cls.__name__,
+        record_type.key.in_(ids),
+    )
+    if properties is not None:
+      query = query.filter(record_type.property.in_(list(properties)))
+    return {(key, prop, subprop): content
+            for key, prop, subprop, content in query}
+
+  @classmethod
+  def write_records_diff(cls, stored, rows):
+    """Write difference between stored and new index records.
+
+    Args:
+      stored: dict of stored records as returned by get_stored_records, it is
+        emptied by this function;
+      rows: iterable of new record dicts.
+    """
+    inserts, updates = [], []
+    rows_by_property = defaultdict(list)
+    for row in rows:
+      rows_by_property[(row["key"], row["property"])].append(row)
+      content = stored.pop((row["key"], row["property"], row["subproperty"]),
+                           None)
+      if content is None:
+        inserts.append(row)
+      elif content != row["content"]:
+        updates.append(row)
+    changed_properties = {(key, prop) for key, prop, _ in stored}
+    changed_properties.update((row["key"], row["property"])
+                              for row in itertools.chain(inserts, updates))
+    if stored:
+      db.session.execute(
+          """
+              DELETE FROM fulltext_record_properties
+              WHERE type = :type AND `key` = :key AND
+                    property = :property AND subproperty = :subproperty
+          """,
+          [{"type": cls.__name__, "key": key, "property": prop,
+            "subproperty": subprop}
+           for key, prop, subprop in stored],
+      )
+    if updates:
+      db.session.execute(
+          """
+              UPDATE fulltext_record_properties SET content = :content
+              WHERE type = :type AND `key` = :key AND
+                    property = :property AND subproperty = :subproperty
+          """,
+          updates,
+      )
+    for vals_chunk in utils.list_chunks(inserts, chunk_size=10000):
+      db.session.execute(
+          """
+              INSERT INTO fulltext_record_properties (
+                `key`, type, tags, property, subproperty, content
+              ) VALUES (:key, :type, :tags, :property, :subproperty, :content)
+          """,
+          vals_chunk,
+      )
+    tokens.replace_properties(
+        cls.__name__,
+        changed_properties,
+        itertools.chain(*[rows_by_property[prop]
+                          for prop in changed_properties]),
+    )
+
+  @classmethod
+  def bulk_record_update_for(cls, ids, properties=None):
+    """Bulky update index records for current class.
+
+    New records of the objects are compared with the stored ones, so only
+    the changed records are written.
+
+    Args:
+      ids: ids of the objects to reindex;
+      properties: names of the properties to reindex, all properties are
+        reindexed if None.
+    """
+    if not ids or properties is not None and not properties:
       return
 
-    cls.delete_records(ids)
-    cls.insert_records(ids)
+    stored = cls.get_stored_records(ids, properties)
+    instances = cls.indexed_query().filter(cls.id.in_(ids))
+    indexer = fulltext.get_indexer()
+    rows = itertools.chain(*[indexer.records_generator(i) for i in instances])
+    if properties is not None:
+      rows = (row for row in rows if row["property"] in properties)
+    cls.write_records_diff(stored, rows)
+
+  @classmethod
+  def get_fulltext_properties_for(cls, changed_attrs):
+    """Get names of the properties that depend on the changed attributes.
+
+    Properties holding a column value are returned only if the column is
+    changed. Properties computed in any other way are always returned.
+    Custom attribute properties are never returned, as custom attribute
+    changes reindex the whole object.
+
+    Args:
+      changed_attrs: names of the changed attributes or None.
+
+    Returns:
+      set of property names or None if all properties have to be reindexed.
+    """
+    if changed_attrs is None:
+      return None
+    columns = set(orm.class_mapper(cls).column_attrs.keys())
+    properties = set()
+    for attr in AttributeInfo.gather_attrs(cls, "_fulltext_attrs"):
+      if isinstance(attr, basestring):
+        source, name = attr, cls.PROPERTY_TEMPLATE.format(attr)
+      else:
+        source, name = None, cls.get_fulltext_attr_name(attr)
+        plain_attr = (
+            type(attr) is fulltext.attributes.FullTextAttr and
+            isinstance(attr.prop_getter, basestring) and
+            attr.subproperties == [fulltext.attributes.EMPTY_SUBPROPERTY_KEY]
+        )
+        if plain_attr:
+          source = attr.prop_getter
+      if source not in columns or source in changed_attrs:
+        properties.add(name)
+    return properties
 
   @classmethod
   def indexed_query(cls):
@@ -11,6 +11,7 @@ from sqlalchemy.sql.expression import select
 from sqlalchemy import event
 
 from ggrc import db
+from ggrc.fulltext import tokens
 from ggrc.fulltext.sql import SqlIndexer
 from ggrc.fulltext.mixin import Indexed
 from ggrc.models import all_models, get_model
@@ -85,7 +86,11 @@ class MysqlIndexer(SqlIndexer):
 
     if not terms:
       return whitelist
-    return sa.and_(whitelist, MysqlRecordProperty.content.contains(terms))
+    return sa.and_(
+        whitelist,
+        tokens.candidates_filter(MysqlRecordProperty, terms),
+        MysqlRecordProperty.content.contains(terms),
+    )
 
   @staticmethod
   def get_permissions_query(model_names, permission_type='read'):
@@ -6,6 +6,8 @@
 import logging
 
 from ggrc import db
+from ggrc import settings
+from ggrc.cache import tiered
 from ggrc.models import all_models
 from ggrc.models.reflection import AttributeInfo
 from ggrc.models.person import Person
@@ -17,6 +19,15 @@ from ggrc.fulltext.mixin import Indexed
 LOGGER = logging.getLogger(__name__)
 
 
+@tiered.cached("person_name_email", stamps=(tiered.PEOPLE,),
+               maxsize=settings.TIERED_CACHE_PEOPLE_SIZE)
+def get_person_name_email(person_id):
+  """Get name and email of the person with the id."""
+  return tuple(db.session.query(Person.name, Person.email).filter_by(
+      id=person_id
+  ).one())
+
+
 class RecordBuilder(object):
   """Basic record builder for full text index table."""
   # pylint: disable=too-few-public-methods
@@ -49,7 +60,8 @@ class RecordBuilder(object):
       if not tgt_class:
         return {}
       attrs = AttributeInfo.gather_attrs(tgt_class, '_fulltext_attrs')
-      return {attr: {"": obj.revision.content.get(attr)} for attr in attrs}
+      return {attr: {"": obj.revision.get_content_value(attr)}
+              for attr in attrs}
 
     if isinstance(obj, Indexed):
       property_tmpl = obj.PROPERTY_TEMPLATE
@@ -68,6 +80,7 @@ class RecordBuilder(object):
     """Get id, name and email for person (either object or dict).
 
     If there is a global people map, get the data from it instead of the DB.
+    People given as dicts are looked up in the tiered cache.
     """
     if isinstance(person, dict):
       person_id = person["id"]
@@ -75,15 +88,11 @@ class RecordBuilder(object):
       person_id = person.id
     if person_id in self.indexer.cache['people_map']:
       person_name, person_email = self.indexer.cache['people_map'][person_id]
+    elif isinstance(person, dict):
+      person_name, person_email = get_person_name_email(person_id)
     else:
-      if isinstance(person, dict):
-        person = db.session.query(Person).filter_by(
-            id=person["id"]
-        ).one()
-      person_id = person.id
       person_name = person.name
       person_email = person.email
-      self.indexer.cache['people_map'][person_id] = (person_name, person_email)
     return person_id, person_name, person_email
 
   def get_ac_role_person_id(self, ac_list):
@@ -0,0 +1,460 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Parallel and resumable reindex of full text records.
+
+Id space of every model is split into ranges of `range_size` ids aligned to
+multiples of `range_size`, so the ranges stay the same when a reindex is
+restarted. Ranges are reindexed by a pool of worker threads, each of them
+uses its own db session. Every reindexed range is recorded in the checkpoint
+table under the id of the background task, so a restarted task skips the
+ranges it has already reindexed.
+
+In shadow table mode the records are written into an empty copy of the index
+table without secondary indexes. When all records are written, the indexes
+are created and the copy replaces the index table with a single atomic
+RENAME TABLE, so searches never see a partially built index. Triggers of
+the index table log objects with changed records into the changes table while
+the shadow table is filled. These objects are reindexed in the shadow table
+before the swap and in the new index table right after it.
+"""
+
+import collections
+import datetime
+import functools
+import logging
+import time
+from multiprocessing.pool import ThreadPool
+
+import flask
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import fulltext
+from ggrc import utils
+from ggrc.models.reindex_checkpoint import ReindexChange
+from ggrc.models.reindex_checkpoint import ReindexCheckpoint
+from ggrc.utils import benchmark
+from ggrc.utils import helpers
+
+
+logger = logging.getLogger(__name__)
+
+# Checkpoint model name marking creation of the shadow table by the task.
+SHADOW_TABLE_MARKER = "__shadow_table__"
+
+# Events of the index table triggers and rows they log changes of.
+CHANGE_TRIGGER_EVENTS = (("INSERT", "NEW"), ("UPDATE", "NEW"),
+                         ("DELETE", "OLD"))
+
+# Max number of catch up passes before the swap, changes made during the
+# last pass are reindexed after the swap.
+CATCH_UP_PASSES = 10
+
+
+def get_id_ranges(model, range_size):
+  """Get start ids of non empty id ranges of the model.
+
+  Returns:
+    sorted list of range start ids, every range contains ids in
+    [start_id, start_id + range_size).
+  """
+  start_id = model.id - model.id % range_size
+  query = db.session.query(start_id).distinct()
+  return sorted(start for start, in query)
+
+
+def get_done_ranges(task_id, model_name):
+  """Get start ids of the ranges reindexed by the task."""
+  query = db.session.query(ReindexCheckpoint.start_id).filter(
+      ReindexCheckpoint.task_id == task_id,
+      ReindexCheckpoint.model_name == model_name,
+  )
+  return {start for start, in query}
+
+
+def delete_checkpoints(task_id):
+  """Delete all checkpoints of the task."""
+  ReindexCheckpoint.query.filter(
+      ReindexCheckpoint.task_id == task_id
+  ).delete(synchronize_session=False)
+  db.session.plain_commit()
+
+
+@helpers.without_sqlalchemy_cache
+def reindex_range(model, start_id, range_size, task_id=None, table=None):
+  """Reindex objects with ids in the range and record the checkpoint.
+
+  Args:
+    table: shadow table to insert records into instead of the index table.
+
+  Returns:
+    number of reindexed objects.
+  """
+  ids = [id_ for id_, in db.session.query(model.id).filter(
+      model.id >= start_id,
+      model.id < start_id + range_size,
+  )]
+  if table is None:
+    model.bulk_record_update_for(ids)
+  elif ids:
+    model.insert_records(ids, table)
+  if task_id is not None:
+    db.session.add(ReindexCheckpoint(
+        task_id=task_id,
+        model_name=model.__name__,
+        start_id=start_id,
+        objects_count=len(ids),
+    ))
+  db.session.plain_commit()
+  return len(ids)
+
+
+def _map(func, args_list, workers):
+  """Call func for every args tuple in worker threads.
+
+  Each thread works in a copy of the current request context and thus has
+  its own db session.
+  """
+  workers = min(workers, len(args_list))
+  if workers < 2 or not flask.has_request_context():
+    return [func(*args) for args in args_list]
+  tasks = [
+      flask.copy_current_request_context(functools.partial(func, *args))
+      for args in args_list
+  ]
+  pool = ThreadPool(workers)
+  try:
+    return pool.map(lambda task: task(), tasks)
+  finally:
+    pool.close()
+    pool.join()
+
+
+def reindex_model(model, range_size, workers=1, task_id=None, table=None):
+  """Reindex all objects of the model skipping ranges done by the task.
+
+  Returns:
+    number of reindexed objects.
+  """
+  model_name = model.__name__
+  ranges = get_id_ranges(model, range_size)
+  if task_id is not None:
+    done = get_done_ranges(task_id, model_name)
+    if done:
+      logger.info("%s: skipping %s of %s ranges reindexed before",
+                  model_name, len(done), len(ranges))
+    ranges = [start for start in ranges if start not in done]
+  db.session.plain_commit()
+
+  start_time = time.time()
+  with benchmark("Create records for %s" % model_name):
+    counts = _map(
+        reindex_range,
+        [(model, start, range_size, task_id, table) for start in ranges],
+        workers,
+    )
+  elapsed = time.time() - start_time
+  objects_count = sum(counts)
+  logger.info(
+      "%s: reindexed %s objects in %s ranges, %.2f s, %.1f objects/sec",
+      model_name, objects_count, len(ranges), elapsed,
+      objects_count / elapsed if elapsed else 0,
+  )
+  return objects_count
+
+
+def reindex_models(models, range_size, workers=1, task_id=None, table=None):
+  """Reindex all objects of the models.
+
+  If task_id is given, reindexed ranges are recorded and skipped when the
+  task is restarted. The caller deletes the checkpoints once the task is
+  done.
+  """
+  for model in sorted(models, key=lambda model: model.__name__):
+    logger.info("Updating index for: %s", model.__name__)
+    reindex_model(model, range_size, workers, task_id, table)
+
+
+def shadow_table_supported():
+  """Check if the db supports the shadow table reindex."""
+  return db.engine.dialect.name == "mysql"
+
+
+def _get_record_table():
+  """Get the index table."""
+  return fulltext.get_indexer().record_type.__table__
+
+
+def get_shadow_table():
+  """Get the shadow table with the same columns as the index table."""
+  record_table = _get_record_table()
+  return sa.Table(
+      "{}_shadow".format(record_table.name),
+      sa.MetaData(),
+      *[column.copy() for column in record_table.columns]
+  )
+
+
+def _get_secondary_indexes(table_name):
+  """Get names and columns of all non primary key indexes of the table."""
+  return sa.inspect(db.engine).get_indexes(table_name)
+
+
+def _create_change_triggers():
+  """Create missing triggers logging changes of the index table."""
+  record_table = _get_record_table()
+  existing = {name for name, in db.session.execute(
+      "SELECT trigger_name FROM information_schema.triggers "
+      "WHERE event_object_schema = DATABASE() AND "
+      "event_object_table = :table",
+      {"table": record_table.name},
+  )}
+  for event, row in CHANGE_TRIGGER_EVENTS:
+    name = "{}_reindex_{}".format(record_table.name, event.lower())
+    if name in existing:
+      continue
+    db.session.execute(
+        "CREATE TRIGGER {name} AFTER {event} ON {records} FOR EACH ROW "
+        "INSERT INTO {changes} (type, `key`) "
+        "VALUES ({row}.type, {row}.`key`)".format(
+            name=name,
+            event=event,
+            records=record_table.name,
+            changes=ReindexChange.__tablename__,
+            row=row,
+        )
+    )
+
+
+def _get_changes():
+  """Get objects with changed index records logged by the triggers.
+
+  Returns:
+    tuple (id of the last read change or None, dict {type: sorted keys}).
+  """
+  last_id = db.session.query(sa.func.max(ReindexChange.id)).scalar()
+  changes = collections.defaultdict(set)
+  if last_id is not None:
+    query = db.session.query(ReindexChange.type, ReindexChange.key).filter(
+        ReindexChange.id <= last_id,
+    ).distinct()
+    for type_, key in query:
+      changes[type_].add(key)
+  return last_id, {type_: sorted(keys) for type_, keys in changes.items()}
+
+
+def _delete_changes(last_id):
+  """Delete changes read by _get_changes."""
+  if last_id is not None:
+    db.session.query(ReindexChange).filter(
+        ReindexChange.id <= last_id
+    ).delete(synchronize_session=False)
+
+
+def prepare_shadow_table(task_id=None):
+  """Create an empty shadow table without secondary indexes.
+
+  If the task has created the shadow table before, the table is kept so the
+  task can continue filling it. Changes of the index table are logged from
+  now on until the swap.
+
+  Returns:
+    tuple (shadow table, UTC time of the shadow table creation).
+  """
+  shadow = get_shadow_table()
+  if task_id is not None:
+    marker = ReindexCheckpoint.query.filter_by(
+        task_id=task_id,
+        model_name=SHADOW_TABLE_MARKER,
+    ).first()
+    if marker is not None and shadow.exists(bind=db.engine):
+      logger.info("Continue filling %s", shadow.name)
+      _create_change_triggers()
+      return shadow, marker.created_at
+    delete_checkpoints(task_id)
+
+  created_at = datetime.datetime.utcnow()
+  record_table = _get_record_table()
+  db.session.query(ReindexChange).delete(synchronize_session=False)
+  _create_change_triggers()
+  db.session.execute("DROP TABLE IF EXISTS {}".format(shadow.name))
+  db.session.execute("CREATE TABLE {} LIKE {}".format(shadow.name,
+                                                      record_table.name))
+  indexes = _get_secondary_indexes(shadow.name)
+  if indexes:
+    db.session.execute("ALTER TABLE {} {}".format(shadow.name, ", ".join(
+        "DROP INDEX {}".format(index["name"]) for index in indexes
+    )))
+  if task_id is not None:
+    db.session.add(ReindexCheckpoint(
+        task_id=task_id,
+        model_name=SHADOW_TABLE_MARKER,
+        start_id=0,
+        objects_count=0,
+        created_at=created_at,
+    ))
+  db.session.plain_commit()
+  return shadow, created_at
+
+
+def _delete_orphan_records(shadow, type_name, ids_query):
+  """Delete shadow records of the objects missing in the ids query."""
+  db.session.execute(shadow.delete().where(
+      shadow.c.type == type_name
+  ).where(
+      shadow.c.key.notin_(ids_query.statement)
+  ))
+
+
+def _catch_up_model(shadow, model, since):
+  """Reindex objects of the model updated since the given time.
+
+  Records of the deleted objects are deleted from the shadow table.
+  """
+  _delete_orphan_records(shadow, model.__name__, db.session.query(model.id))
+  updated_at = getattr(model, "updated_at", None)
+  if updated_at is not None:
+    ids = [id_ for id_, in db.session.query(model.id).filter(
+        updated_at >= since,
+    )]
+    for ids_chunk in utils.list_chunks(ids):
+      db.session.execute(shadow.delete().where(
+          shadow.c.type == model.__name__
+      ).where(
+          shadow.c.key.in_(ids_chunk)
+      ))
+      model.insert_records(ids_chunk, shadow)
+  db.session.plain_commit()
+
+
+def _catch_up_changes(shadow, models, with_snapshots):
+  """Reindex objects with changes logged since the previous catch up.
+
+  Changes of the types that were not reindexed are skipped, their records
+  are copied from the index table later.
+
+  Returns:
+    number of reindexed objects.
+  """
+  from ggrc.snapshotter import indexer as snapshot_indexer
+
+  models_by_name = {model.__name__: model for model in models}
+  last_id, changes = _get_changes()
+  objects_count = 0
+  for type_, keys in changes.iteritems():
+    model = models_by_name.get(type_)
+    if model is None and not (with_snapshots and type_ == "Snapshot"):
+      continue
+    for keys_chunk in utils.list_chunks(keys):
+      db.session.execute(shadow.delete().where(
+          shadow.c.type == type_
+      ).where(
+          shadow.c.key.in_(keys_chunk)
+      ))
+      if model is None:
+        snapshot_indexer.reindex_snapshots(keys_chunk, table=shadow)
+      else:
+        model.insert_records(keys_chunk, shadow)
+    objects_count += len(keys)
+  _delete_changes(last_id)
+  db.session.plain_commit()
+  return objects_count
+
+
+def _reindex_changes():
+  """Reindex objects with changes logged in the replaced index table."""
+  from ggrc.models import get_model
+  from ggrc.snapshotter import indexer as snapshot_indexer
+
+  last_id, changes = _get_changes()
+  for type_, keys in changes.iteritems():
+    model = get_model(type_)
+    for keys_chunk in utils.list_chunks(keys):
+      if type_ == "Snapshot":
+        snapshot_indexer.delete_records(keys_chunk)
+        snapshot_indexer.reindex_snapshots(keys_chunk)
+      elif model is not None:
+        model.bulk_record_update_for(keys_chunk)
+  _delete_changes(last_id)
+  db.session.plain_commit()
+
+
+def swap_shadow_table(shadow, since, models, with_snapshots=False):
+  """Finish the shadow table and replace the index table with it.
+
+  Objects updated after the shadow table creation and objects with changes
+  logged by the index table triggers are reindexed once again, records of
+  the deleted objects are deleted. Records of the types that were not
+  reindexed are copied from the index table, then the indexes are created
+  and the tables are swapped. The triggers are dropped together with the
+  replaced table and the objects changed since the last catch up are
+  reindexed in the new index table.
+
+  Args:
+    shadow: the shadow table filled with reindexed records;
+    since: UTC time of the shadow table creation;
+    models: reindexed models;
+    with_snapshots: True if snapshot records were reindexed as well.
+  """
+  from ggrc.models import all_models
+  from ggrc.snapshotter import indexer as snapshot_indexer
+
+  record_table = _get_record_table()
+  with benchmark("Shadow reindex: catch up changes"):
+    for model in models:
+      _catch_up_model(shadow, model, since)
+    if with_snapshots:
+      _delete_orphan_records(shadow, "Snapshot",
+                             db.session.query(all_models.Snapshot.id))
+      snapshot_indexer.reindex_snapshots(
+          [id_ for id_, in db.session.query(all_models.Snapshot.id).filter(
+              all_models.Snapshot.updated_at >= since
+          )],
+          table=shadow,
+      )
+    for _ in range(CATCH_UP_PASSES):
+      if not _catch_up_changes(shadow, models, with_snapshots):
+        break
+
+  reindexed_types = [model.__name__ for model in models]
+  if with_snapshots:
+    reindexed_types.append("Snapshot")
+  with benchmark("Shadow reindex: copy not reindexed records"):
+    select = sa.select(record_table.columns)
+    if reindexed_types:
+      select = select.where(record_table.c.type.notin_(reindexed_types))
+    db.session.execute(shadow.insert().from_select(
+        [column.name for column in record_table.columns],
+        select,
+    ))
+    db.session.plain_commit()
+
+  with benchmark("Shadow reindex: create indexes"):
+    indexes = _get_secondary_indexes(record_table.name)
+    if indexes:
+      db.session.execute("ALTER TABLE {} {}".format(shadow.name, ", ".join(
+          "ADD {}INDEX {} ({})".format(
+              "UNIQUE " if index["unique"] else "",
+              index["name"],
+              ", ".join("`{}`".format(column)
+                        for column in index["column_names"]),
+          )
+          for index in indexes
+      )))
+
+  old_name = "{}_old".format(record_table.name)
+  with benchmark("Shadow reindex: swap tables"):
+    db.session.execute("DROP TABLE IF EXISTS {}".format(old_name))
+    db.session.execute(
+        "RENAME TABLE {live} TO {old}, {shadow} TO {live}".format(
+            live=record_table.name,
+            old=old_name,
+            shadow=shadow.name,
+        )
+    )
+    db.session.execute("DROP TABLE {}".format(old_name))
+    db.session.plain_commit()
+
+  with benchmark("Shadow reindex: reindex changes made during the swap"):
+    _reindex_changes()
@@ -6,6 +6,7 @@
 from collections import defaultdict
 
 from ggrc import db
+from ggrc.fulltext import tokens
 
 
 class SqlIndexer(object):
@@ -53,8 +54,10 @@ class SqlIndexer(object):
 
   def create_record(self, instance, commit=True):
     """Create records in db."""
-    for db_record in self.records_generator(instance):
+    records = list(self.records_generator(instance))
+    for db_record in records:
       db.session.add(self.record_type(**db_record))
+    tokens.add_records(records)
     if commit:
       db.session.commit()
 
@@ -68,6 +71,7 @@ class SqlIndexer(object):
     ).delete(
         synchronize_session="fetch"
     )
+    tokens.delete_objects(type, [key])
     if commit:
       db.session.commit()
 
@@ -83,6 +87,7 @@ class SqlIndexer(object):
     ).delete(
         synchronize_session="fetch"
     )
+    tokens.delete_objects(type, keys)
     if commit:
       db.session.commit()
 
@@ -0,0 +1,254 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Inverted index of tokens of full text records.
+
+Content of every full text record is split into lower case word tokens. Every
+token is stored with all its prefixes of MIN_TOKEN_LENGTH to MAX_TOKEN_LENGTH
+characters, keyed to (type, key, property) of the record, so both whole word
+and prefix matches are lookups of the token primary key.
+
+Searches use the tokens only to select candidate records and check content of
+the candidates with LIKE, so tokens left from older content merely widen the
+candidate set, while missing tokens would hide matches. Every code path
+writing record content must add tokens of the written records. Tokens of
+deleted objects are deleted with their records and all stale tokens are
+dropped by `rebuild`, which is run by the full reindex.
+
+Terms are matched at the beginning of words: "contr" finds "Control", but
+"ntrol" does not.
+"""
+
+import collections
+import re
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import fulltext
+from ggrc import settings
+from ggrc import utils
+
+
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 16
+
+# Number of token rows written with one executemany call.
+TOKEN_BATCH_SIZE = 10000
+
+SORT_SUBPROPERTY = u"__sort__"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class MysqlRecordToken(db.Model):
+  """Token of a full text record property."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "fulltext_record_tokens"
+
+  token = db.Column(db.String(MAX_TOKEN_LENGTH), primary_key=True)
+  type = db.Column(db.String(64), primary_key=True)
+  key = db.Column(db.Integer, primary_key=True, autoincrement=False)
+  property = db.Column(db.String(250), primary_key=True)
+
+  __table_args__ = (
+      db.Index("ix_fulltext_record_tokens_type_key", "type", "key"),
+  )
+
+
+def enabled():
+  """Check if the token index is maintained and used by searches."""
+  return settings.FULLTEXT_TOKEN_INDEX
+
+
+def _words(text):
+  """Get lower case words of the text truncated to MAX_TOKEN_LENGTH."""
+  return [word[:MAX_TOKEN_LENGTH]
+          for word in TOKEN_RE.findall(text.lower())
+          if len(word) >= MIN_TOKEN_LENGTH]
+
+
+def tokenize(content):
+  """Get set of words of the content and all their indexed prefixes."""
+  tokens = set()
+  for word in set(_words(content)):
+    tokens.update(word[:length]
+                  for length in range(MIN_TOKEN_LENGTH, len(word) + 1))
+  return tokens
+
+
+def query_tokens(terms):
+  """Get distinct tokens the records matching the terms must have."""
+  return sorted(set(_words(unicode(terms or u""))))
+
+
+def token_rows(records):
+  """Get token rows of record dicts.
+
+  Args:
+    records: iterable of dicts with type, key, property, subproperty and
+      content of full text records.
+
+  Returns:
+    set of (token, type, key, property) tuples.
+  """
+  rows = set()
+  for record in records:
+    content = record["content"]
+    if not content or record["subproperty"] == SORT_SUBPROPERTY:
+      continue
+    prefix = (record["type"], record["key"], record["property"])
+    rows.update((token,) + prefix for token in tokenize(unicode(content)))
+  return rows
+
+
+def _insert_rows(rows):
+  """Insert (token, type, key, property) rows skipping existing ones."""
+  inserter = MysqlRecordToken.__table__.insert().prefix_with("IGNORE")
+  for chunk in utils.list_chunks(list(rows), chunk_size=TOKEN_BATCH_SIZE):
+    db.session.execute(inserter, [
+        {"token": token, "type": type_, "key": key, "property": property_}
+        for token, type_, key, property_ in chunk
+    ])
+
+
+def add_records(records):
+  """Add tokens of the written full text records."""
+  if enabled():
+    _insert_rows(token_rows(records))
+
+
+def add_record_tuples(rows, columns):
+  """Add tokens of full text records given as tuples of columns values."""
+  if enabled():
+    add_records(dict(zip(columns, row)) for row in rows)
+
+
+def delete_objects(type_, keys):
+  """Delete tokens of all records of the objects."""
+  if not enabled() or not keys:
+    return
+  table = MysqlRecordToken.__table__
+  for keys_chunk in utils.list_chunks(list(keys)):
+    db.session.execute(table.delete().where(
+        table.c.type == type_
+    ).where(
+        table.c.key.in_(keys_chunk)
+    ))
+
+
+def replace_properties(type_, properties, records):
+  """Replace tokens of the properties with tokens of their new records.
+
+  Args:
+    type_: type of the objects;
+    properties: iterable of (key, property) pairs of the changed properties;
+    records: all new record dicts of the changed properties.
+  """
+  if not enabled():
+    return
+  properties = list(properties)
+  if not properties:
+    return
+  table = MysqlRecordToken.__table__
+  for chunk in utils.list_chunks(properties):
+    db.session.execute(table.delete().where(
+        table.c.type == type_
+    ).where(
+        sa.tuple_(table.c.key, table.c.property).in_(chunk)
+    ))
+  _insert_rows(token_rows(records))
+
+
+def candidates_filter(record, terms):
+  """Get condition selecting records having all tokens of the terms.
+
+  Args:
+    record: full text record model;
+    terms: searched text.
+
+  Returns:
+    condition on the record columns, true() if the token index is disabled
+    or the terms have no indexed tokens and all records must be scanned.
+  """
+  if not enabled():
+    return sa.true()
+  tokens = query_tokens(terms)
+  if not tokens:
+    return sa.true()
+  record_columns = sa.tuple_(record.type, record.key, record.property)
+  return sa.and_(*[
+      record_columns.in_(
+          sa.select([
+              MysqlRecordToken.type,
+              MysqlRecordToken.key,
+              MysqlRecordToken.property,
+          ]).where(
+              MysqlRecordToken.token == token
+          )
+      )
+      for token in tokens
+  ])
+
+
+def _rebuild_objects(record_table, type_, keys):
+  """Replace tokens of the objects with tokens of their current records."""
+  records = db.session.execute(sa.select([
+      record_table.c.type,
+      record_table.c.key,
+      record_table.c.property,
+      record_table.c.subproperty,
+      record_table.c.content,
+  ]).where(
+      record_table.c.type == type_
+  ).where(
+      record_table.c.key.in_(keys)
+  ))
+  rows = token_rows(dict(record) for record in records)
+  table = MysqlRecordToken.__table__
+  db.session.execute(table.delete().where(
+      table.c.type == type_
+  ).where(
+      table.c.key.in_(keys)
+  ))
+  _insert_rows(rows)
+
+
+def rebuild(chunk_size=1000):
+  """Rebuild tokens of all full text records and drop stale tokens.
+
+  Tokens of every chunk of objects are replaced in a single transaction, so
+  searches keep finding the objects during the rebuild.
+
+  Returns:
+    Counter of objects per type.
+  """
+  record_table = fulltext.get_indexer().record_type.__table__
+  table = MysqlRecordToken.__table__
+  counts = collections.Counter()
+  types = [type_ for type_, in db.session.execute(
+      sa.select([record_table.c.type]).distinct()
+  )]
+  for type_ in types:
+    keys = [key for key, in db.session.execute(
+        sa.select([record_table.c.key]).distinct().where(
+            record_table.c.type == type_
+        ).order_by(record_table.c.key)
+    )]
+    for keys_chunk in utils.list_chunks(keys, chunk_size=chunk_size):
+      _rebuild_objects(record_table, type_, keys_chunk)
+      db.session.plain_commit()
+    counts[type_] = len(keys)
+    db.session.execute(table.delete().where(
+        table.c.type == type_
+    ).where(
+        table.c.key.notin_(sa.select([record_table.c.key]).where(
+            record_table.c.type == type_
+        ))
+    ))
+  stale = table.delete()
+  if types:
+    stale = stale.where(table.c.type.notin_(types))
+  db.session.execute(stale)
+  db.session.plain_commit()
+  return counts
@@ -0,0 +1,40 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fulltext reindex checkpoints table
+
+Create Date: 2019-02-14 10:30:12.318742
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4e5f7c2b9a1d'
+down_revision = '57b14cb4a7b4'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'fulltext_reindex_checkpoints',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('task_id', sa.Integer(), nullable=False),
+      sa.Column('model_name', sa.String(length=64), nullable=False),
+      sa.Column('start_id', sa.Integer(), nullable=False),
+      sa.Column('objects_count', sa.Integer(), nullable=False),
+      sa.Column('created_at', sa.DateTime(), nullable=False),
+      sa.PrimaryKeyConstraint('id'),
+      sa.UniqueConstraint('task_id', 'model_name', 'start_id',
+                          name='uq_fulltext_reindex_checkpoints'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('fulltext_reindex_checkpoints')
@@ -0,0 +1,56 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add relationship adjacency table
+
+Create Date: 2019-02-15 09:30:41.204518
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8917e64b0ea1'
+down_revision = '4e5f7c2b9a1d'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'relationship_adjacency',
+      sa.Column('object_type', sa.String(length=250), nullable=False),
+      sa.Column('object_id', sa.Integer(), nullable=False),
+      sa.Column('related_type', sa.String(length=250), nullable=False),
+      sa.Column('related_id', sa.Integer(), nullable=False),
+      sa.Column('relationship_id', sa.Integer(), nullable=False),
+      sa.PrimaryKeyConstraint('object_type', 'object_id', 'related_type',
+                              'related_id', 'relationship_id'),
+      sa.ForeignKeyConstraint(['relationship_id'], ['relationships.id'],
+                              ondelete='CASCADE'),
+  )
+  op.create_index('ix_relationship_adjacency_relationship',
+                  'relationship_adjacency', ['relationship_id'])
+  op.execute("""
+      INSERT IGNORE INTO relationship_adjacency (
+          object_type, object_id, related_type, related_id, relationship_id
+      )
+      SELECT source_type, source_id, destination_type, destination_id, id
+      FROM relationships
+  """)
+  op.execute("""
+      INSERT IGNORE INTO relationship_adjacency (
+          object_type, object_id, related_type, related_id, relationship_id
+      )
+      SELECT destination_type, destination_id, source_type, source_id, id
+      FROM relationships
+  """)
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('relationship_adjacency')
@@ -0,0 +1,45 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add create snapshots bg operation type and operation progress
+
+Create Date: 2019-02-18 10:15:22.513704
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+from ggrc.migrations.utils import migrator
+
+
+# revision identifiers, used by Alembic.
+revision = '3b6c2f1d8e47'
+down_revision = '8917e64b0ea1'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.add_column('background_operations',
+                sa.Column('objects_total', sa.Integer(), nullable=True))
+  op.add_column('background_operations',
+                sa.Column('objects_done', sa.Integer(), nullable=True))
+  connection = op.get_bind()
+  migrator_id = migrator.get_migration_user_id(connection)
+  connection.execute(
+      sa.text("""
+          INSERT INTO background_operation_types(
+            `name`, modified_by_id, created_at, updated_at
+          )
+          VALUES('create_snapshots', :migrator_id, now(), now());
+      """),
+      migrator_id=migrator_id,
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  raise Exception("Downgrade is not supported.")
@@ -0,0 +1,39 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fulltext record tokens table
+
+Create Date: 2019-02-19 14:32:07.318244
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e9a7c1f30'
+down_revision = '3b6c2f1d8e47'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  # The table is filled by the full reindex run after enabling the index.
+  op.create_table(
+      'fulltext_record_tokens',
+      sa.Column('token', sa.String(length=16), nullable=False),
+      sa.Column('type', sa.String(length=64), nullable=False),
+      sa.Column('key', sa.Integer(), nullable=False, autoincrement=False),
+      sa.Column('property', sa.String(length=250), nullable=False),
+      sa.PrimaryKeyConstraint('token', 'type', 'key', 'property'),
+  )
+  op.create_index('ix_fulltext_record_tokens_type_key',
+                  'fulltext_record_tokens', ['type', 'key'])
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('fulltext_record_tokens')
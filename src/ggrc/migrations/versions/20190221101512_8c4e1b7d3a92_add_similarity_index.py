@@ -0,0 +1,43 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add similarity index table
+
+Create Date: 2019-02-21 10:15:12.604318
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e1b7d3a92'
+down_revision = '5d2e9a7c1f30'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  # The table is filled by the rebuild_similarity_index background task run
+  # after enabling the index.
+  op.create_table(
+      'similarity_index',
+      sa.Column('object_type', sa.String(length=250), nullable=False),
+      sa.Column('object_id', sa.Integer(), nullable=False,
+                autoincrement=False),
+      sa.Column('similar_type', sa.String(length=250), nullable=False),
+      sa.Column('similar_id', sa.Integer(), nullable=False,
+                autoincrement=False),
+      sa.PrimaryKeyConstraint('object_type', 'object_id',
+                              'similar_type', 'similar_id'),
+  )
+  op.create_index('ix_similarity_index_similar', 'similarity_index',
+                  ['similar_type', 'similar_id'])
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('similarity_index')
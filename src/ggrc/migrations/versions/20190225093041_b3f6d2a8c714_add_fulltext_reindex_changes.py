@@ -0,0 +1,37 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fulltext reindex changes table
+
+Create Date: 2019-02-25 09:30:41.275903
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f6d2a8c714'
+down_revision = '8c4e1b7d3a92'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  # The table is filled by triggers of the index table while the shadow
+  # table reindex runs.
+  op.create_table(
+      'fulltext_reindex_changes',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('type', sa.String(length=64), nullable=False),
+      sa.Column('key', sa.Integer(), nullable=False),
+      sa.PrimaryKeyConstraint('id'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('fulltext_reindex_changes')
@@ -0,0 +1,38 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add import export chunks table
+
+Create Date: 2019-02-26 11:45:07.183926
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd71a5c3e9b28'
+down_revision = 'b3f6d2a8c714'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'import_export_chunks',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('import_export_id', sa.Integer(), nullable=False),
+      sa.Column('content', mysql.LONGTEXT(), nullable=False),
+      sa.ForeignKeyConstraint(['import_export_id'], ['import_exports.id'],
+                              ondelete='CASCADE'),
+      sa.PrimaryKeyConstraint('id'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('import_export_chunks')
@@ -45,6 +45,7 @@ from ggrc.models.event import Event
 from ggrc.models.evidence import Evidence
 from ggrc.models.facility import Facility
 from ggrc.models.import_export import ImportExport
+from ggrc.models.import_export import ImportExportChunk
 from ggrc.models.issue import Issue
 from ggrc.models.issuetracker_issue import IssuetrackerIssue
 from ggrc.models.key_report import KeyReport
@@ -68,6 +69,8 @@ from ggrc.models.product_group import ProductGroup
 from ggrc.models.program import Program
 from ggrc.models.project import Project
 from ggrc.models.proposal import Proposal
+from ggrc.models.reindex_checkpoint import ReindexChange
+from ggrc.models.reindex_checkpoint import ReindexCheckpoint
 from ggrc.models.relationship import Relationship
 from ggrc.models.requirement import Requirement
 from ggrc.models.revision import Revision
@@ -123,6 +126,7 @@ all_models = [  # pylint: disable=invalid-name
     Evidence,
     Facility,
     ImportExport,
+    ImportExportChunk,
     Issue,
     IssuetrackerIssue,
     KeyReport,
@@ -148,6 +152,8 @@ all_models = [  # pylint: disable=invalid-name
     Project,
     Proposal,
     Regulation,
+    ReindexChange,
+    ReindexCheckpoint,
     Relationship,
     Requirement,
     Review,
@@ -3,8 +3,11 @@
 
 """Custom attribute definition module"""
 
+import collections
+
 import flask
 from sqlalchemy import func
+from sqlalchemy import tuple_
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import validates
 from sqlalchemy.sql.schema import UniqueConstraint
@@ -384,6 +387,67 @@ def get_custom_attributes_for(model_name, instance_id=None):
   return cads
 
 
+def get_custom_attributes_for_many(pairs):
+  """Returns custom attributes jsons for many objects.
+
+  Works as get_custom_attributes_for but loads definitions for all the objects
+  with two queries.
+
+  Args:
+    pairs: set of (model_name, instance_id) tuples.
+
+  Returns:
+    dict with cad jsons lists for every (model_name, instance_id) pair.
+  """
+  from ggrc import models
+  inflector_dict = get_model_name_inflector_dict()
+  definition_types = {}
+  for model_name, _ in pairs:
+    model = models.get_model(model_name)
+    if model and issubclass(model, models.mixins.CustomAttributable):
+      definition_types[model_name] = inflector_dict.get(model_name)
+
+  global_cads = collections.defaultdict(list)
+  if any(definition_types.values()):
+    query = CustomAttributeDefinition.query.filter(
+        CustomAttributeDefinition.definition_type.in_(
+            {type_ for type_ in definition_types.values() if type_}
+        ),
+        CustomAttributeDefinition.definition_id.is_(None),
+    )
+    for cad in query:
+      global_cads[cad.definition_type].append(cad.log_json())
+
+  local_cads = collections.defaultdict(list)
+  local_keys = {
+      (definition_types[model_name], instance_id)
+      for model_name, instance_id in pairs
+      if definition_types.get(model_name) and instance_id is not None and
+      model_name in models.mixins.CustomAttributable.MODELS_WITH_LOCAL_CADS
+  }
+  if local_keys:
+    query = CustomAttributeDefinition.query.filter(tuple_(
+        CustomAttributeDefinition.definition_type,
+        CustomAttributeDefinition.definition_id,
+    ).in_(local_keys))
+    for cad in query:
+      local_cads[(cad.definition_type, cad.definition_id)].append(
+          cad.log_json()
+      )
+
+  result = {}
+  for model_name, instance_id in pairs:
+    definition_type = definition_types.get(model_name)
+    if not definition_type:
+      result[(model_name, instance_id)] = []
+      continue
+    result[(model_name, instance_id)] = (
+        global_cads[definition_type] +
+        local_cads[(definition_type, instance_id)]
+    )
+  return result
+
+
 class CustomAttributeMapable(object):
   # pylint: disable=too-few-public-methods
   # because this is a mixin
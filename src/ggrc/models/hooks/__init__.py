@@ -14,6 +14,7 @@ from ggrc.models.hooks import relationship
 from ggrc.models.hooks import acl
 from ggrc.models.hooks import proposal
 from ggrc.models.hooks import access_control_role
+from ggrc.models.hooks import tiered_cache
 
 
 ALL_HOOKS = [
@@ -26,6 +27,7 @@ ALL_HOOKS = [
     custom_attribute_definition,
     acl,
     common,
+    tiered_cache,
 
     # Keep IssueTracker at the end of list to make sure that all other hooks
     # are already executed and all data is final.
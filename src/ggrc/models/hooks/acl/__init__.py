@@ -8,6 +8,7 @@ This package should have the single hook that should handle all acl propagation
 and deletion.
 """
 import collections
+import itertools
 
 import flask
 import sqlalchemy as sa
@@ -69,6 +70,27 @@ def _get_propagation_entries(session):
           deleted)
 
 
+def _get_permission_changes(session):
+  """Get people and base ACL ids with permissions changed in the session.
+
+  Args:
+    session: db session with all objects
+
+  Returns:
+    set of ids of people added to or removed from ACL entries and set of base
+    ids of deleted ACL entries.
+  """
+  people_ids = set()
+  base_ids = set()
+  for obj in itertools.chain(session.new, session.dirty, session.deleted):
+    if isinstance(obj, all_models.AccessControlPerson):
+      people_ids.add(obj.person_id)
+    elif (isinstance(obj, all_models.AccessControlList) and
+          obj in session.deleted and obj.base_id):
+      base_ids.add(obj.base_id)
+  return people_ids, base_ids
+
+
 def after_flush(session, _):
   """Handle all ACL hooks after after flush."""
   with benchmark("handle ACL hooks after flush"):
@@ -76,10 +98,13 @@ def after_flush(session, _):
       return
 
     acl_ids, relationship_ids, deleted = _get_propagation_entries(session)
+    people_ids, base_ids = _get_permission_changes(session)
 
     _add_or_update("new_acl_ids", acl_ids)
     _add_or_update("new_relationship_ids", relationship_ids)
     _add_or_update("deleted_objects", deleted)
+    _add_or_update("permissions_changed_people", people_ids)
+    _add_or_update("permissions_changed_base_ids", base_ids)
 
 
 def after_commit():
@@ -0,0 +1,310 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Full ACL re-propagation with an in-memory propagation graph.
+
+Access control roles and the relationships that can propagate roles are read
+once into a PropagationGraph. Propagated ACL entries are then computed level
+by level for chunks of base ACL entries: the entries that should exist under
+the parents of the level are compared with the existing ones, stale entries
+are deleted and missing entries are inserted with bulk statements. Deleting
+an entry removes its propagated subtree through the parent_id foreign key.
+"""
+
+import collections
+import logging
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import utils
+from ggrc.models import all_models
+
+logger = logging.getLogger(__name__)
+
+# Number of base ACL entries propagated together. Limits the number of
+# propagated entries kept in memory at once.
+BASE_ACL_CHUNK_SIZE = 10000
+
+RELATIONSHIP = "Relationship"
+
+
+class PropagationGraph(object):
+  """Propagation rules and relationships able to propagate roles.
+
+  ACL entries are passed around as (ac_role_id, object_type, object_id)
+  tuples.
+  """
+
+  def __init__(self, roles):
+    """Build propagation rules from (id, parent_id, object_type) of roles."""
+    roles = list(roles)
+    role_types = {role_id: object_type for role_id, _, object_type in roles}
+    self._child_roles = collections.defaultdict(list)
+    for role_id, parent_id, object_type in roles:
+      if parent_id is not None:
+        self._child_roles[parent_id].append((role_id, object_type))
+
+    # parent role id -> [(relationship role id, types of the other side)]
+    self._relationship_roles = {}
+    self.type_pairs = set()
+    for parent_id, children in self._child_roles.iteritems():
+      for role_id, object_type in children:
+        if object_type != RELATIONSHIP:
+          continue
+        other_types = frozenset(
+            grandchild_type
+            for _, grandchild_type in self._child_roles.get(role_id, ())
+        )
+        if not other_types:
+          continue
+        self._relationship_roles.setdefault(parent_id, []).append(
+            (role_id, other_types)
+        )
+        self.type_pairs.update(
+            (role_types.get(parent_id), other_type)
+            for other_type in other_types
+        )
+
+    self._relationships = {}
+    self._object_relationships = collections.defaultdict(list)
+
+  def add_relationship(self, relationship_id, source_type, source_id,
+                       destination_type, destination_id):
+    """Add relationship to the graph."""
+    self._relationships[relationship_id] = (
+        source_type, source_id, destination_type, destination_id,
+    )
+    self._object_relationships[(source_type, source_id)].append(
+        (relationship_id, destination_type)
+    )
+    if (source_type, source_id) != (destination_type, destination_id):
+      self._object_relationships[(destination_type, destination_id)].append(
+          (relationship_id, source_type)
+      )
+
+  def relationship_acls(self, ac_role_id, object_type, object_id):
+    """Get entries propagated from an object to its relationships."""
+    role_rules = self._relationship_roles.get(ac_role_id)
+    if not role_rules:
+      return set()
+    acls = set()
+    for relationship_id, other_type in self._object_relationships.get(
+        (object_type, object_id), ()):
+      for role_id, other_types in role_rules:
+        if other_type in other_types:
+          acls.add((role_id, RELATIONSHIP, relationship_id))
+    return acls
+
+  def object_acls(self, ac_role_id, relationship_id):
+    """Get entries propagated from a relationship to the mapped objects."""
+    relationship = self._relationships.get(relationship_id)
+    if relationship is None:
+      return set()
+    source_type, source_id, destination_type, destination_id = relationship
+    acls = set()
+    for role_id, object_type in self._child_roles.get(ac_role_id, ()):
+      if object_type == destination_type:
+        acls.add((role_id, destination_type, destination_id))
+      if object_type == source_type:
+        acls.add((role_id, source_type, source_id))
+    return acls
+
+  def propagation_level(self, parents, to_relationships):
+    """Get entries propagated from the parents.
+
+    Args:
+      parents: dict of parent ACL id and (ac_role_id, object_type, object_id);
+      to_relationships: True if the parents are object entries and propagate
+        to relationships, False if the parents are relationship entries.
+
+    Returns:
+      set of (ac_role_id, object_type, object_id, parent_id) tuples.
+    """
+    level = set()
+    for parent_id, (ac_role_id, object_type, object_id) in parents.iteritems():
+      if to_relationships:
+        acls = self.relationship_acls(ac_role_id, object_type, object_id)
+      else:
+        acls = self.object_acls(ac_role_id, object_id)
+      level.update(acl + (parent_id,) for acl in acls)
+    return level
+
+
+def load_graph():
+  """Read roles and relationships into the propagation graph."""
+  role_table = all_models.AccessControlRole.__table__
+  rel_table = all_models.Relationship.__table__
+
+  graph = PropagationGraph(db.session.execute(sa.select([
+      role_table.c.id,
+      role_table.c.parent_id,
+      role_table.c.object_type,
+  ])))
+  if not graph.type_pairs:
+    return graph
+
+  type_pairs = list(graph.type_pairs)
+  query = sa.select([
+      rel_table.c.id,
+      rel_table.c.source_type,
+      rel_table.c.source_id,
+      rel_table.c.destination_type,
+      rel_table.c.destination_id,
+  ]).where(sa.or_(
+      sa.tuple_(rel_table.c.source_type,
+                rel_table.c.destination_type).in_(type_pairs),
+      sa.tuple_(rel_table.c.destination_type,
+                rel_table.c.source_type).in_(type_pairs),
+  ))
+  for row in db.session.execute(query):
+    graph.add_relationship(*row)
+  return graph
+
+
+def _get_base_acls():
+  """Get ids and entries of all not propagated ACL entries."""
+  acl_table = all_models.AccessControlList.__table__
+  query = sa.select([
+      acl_table.c.id,
+      acl_table.c.ac_role_id,
+      acl_table.c.object_type,
+      acl_table.c.object_id,
+  ]).where(
+      acl_table.c.parent_id.is_(None),
+  ).order_by(
+      acl_table.c.id,
+  )
+  return [(row[0], tuple(row[1:])) for row in db.session.execute(query)]
+
+
+def _get_children(parent_ids):
+  """Get existing entries propagated from the parents.
+
+  Returns:
+    dict of (ac_role_id, object_type, object_id, parent_id) and ACL id.
+  """
+  acl_table = all_models.AccessControlList.__table__
+  children = {}
+  for ids_chunk in utils.list_chunks(list(parent_ids)):
+    query = sa.select([
+        acl_table.c.ac_role_id,
+        acl_table.c.object_type,
+        acl_table.c.object_id,
+        acl_table.c.parent_id,
+        acl_table.c.id,
+    ]).where(
+        acl_table.c.parent_id.in_(ids_chunk),
+    )
+    children.update(
+        (tuple(row[:4]), row[4]) for row in db.session.execute(query)
+    )
+  return children
+
+
+def _delete_acls(acl_ids):
+  """Delete ACL entries together with their propagated subtrees."""
+  acl_table = all_models.AccessControlList.__table__
+  for ids_chunk in utils.list_chunks(list(acl_ids)):
+    db.session.execute(acl_table.delete().where(
+        acl_table.c.id.in_(ids_chunk),
+    ))
+  db.session.plain_commit()
+
+
+def _insert_acls(acls, base_ids, user_id):
+  """Insert propagated ACL entries.
+
+  Args:
+    acls: (ac_role_id, object_type, object_id, parent_id) tuples;
+    base_ids: dict of parent id and base id of the parent;
+    user_id: id of the user running the propagation.
+  """
+  acl_table = all_models.AccessControlList.__table__
+  inserter = acl_table.insert().prefix_with("IGNORE")
+  now = db.session.execute(sa.select([sa.func.now()])).scalar()
+  for chunk in utils.list_chunks(list(acls), chunk_size=10000):
+    db.session.execute(inserter, [
+        {
+            "ac_role_id": ac_role_id,
+            "object_id": object_id,
+            "object_type": object_type,
+            "created_at": now,
+            "modified_by_id": user_id,
+            "updated_at": now,
+            "parent_id": parent_id,
+            "parent_id_nn": parent_id,
+            "base_id": base_ids[parent_id],
+        }
+        for ac_role_id, object_type, object_id, parent_id in chunk
+    ])
+    db.session.plain_commit()
+
+
+def _propagate_base_acls(graph, base_acls, user_id, depth_limit, counts):
+  """Bring entries propagated from the base entries up to date.
+
+  Args:
+    graph: PropagationGraph;
+    base_acls: dict of base ACL id and (ac_role_id, object_type, object_id);
+    user_id: id of the user running the propagation;
+    depth_limit: maximum number of propagation levels;
+    counts: Counter of inserted, deleted and kept entries.
+  """
+  parents = base_acls
+  base_ids = {acl_id: acl_id for acl_id in base_acls}
+  for depth in range(depth_limit):
+    if not parents:
+      return
+    expected = graph.propagation_level(parents, depth % 2 == 0)
+    existing = _get_children(parents)
+
+    stale_ids = [acl_id for key, acl_id in existing.iteritems()
+                 if key not in expected]
+    missing = [key for key in expected if key not in existing]
+    counts["deleted"] += len(stale_ids)
+    counts["inserted"] += len(missing)
+    counts["kept"] += len(existing) - len(stale_ids)
+    if stale_ids:
+      _delete_acls(stale_ids)
+    if missing:
+      _insert_acls(missing, base_ids, user_id)
+      existing.update(_get_children({key[3] for key in missing}))
+
+    parents = {}
+    child_base_ids = {}
+    for key in expected:
+      acl_id = existing.get(key)
+      if acl_id is None:
+        continue
+      parents[acl_id] = key[:3]
+      child_base_ids[acl_id] = base_ids[key[3]]
+    base_ids = child_base_ids
+
+  if parents:
+    raise Exception("Propagation depth limit exceeded. Check the propagation "
+                    "tree for cycles, invalid entries or too deep entries.")
+
+
+def propagate_all(user_id, depth_limit):
+  """Re-evaluate propagation of all base ACL entries.
+
+  Base ids of all base entries must be set before the propagation.
+
+  Returns:
+    Counter of inserted, deleted and kept propagated entries.
+  """
+  with utils.benchmark("Load ACL propagation graph"):
+    graph = load_graph()
+  with utils.benchmark("Get non propagated acl entries"):
+    base_acls = _get_base_acls()
+  counts = collections.Counter()
+  propagated_count = 0
+  for chunk in utils.list_chunks(base_acls, chunk_size=BASE_ACL_CHUNK_SIZE):
+    propagated_count += len(chunk)
+    logger.info("Propagating ACL entries: %s/%s",
+                propagated_count, len(base_acls))
+    _propagate_base_acls(graph, dict(chunk), user_id, depth_limit, counts)
+  logger.info("ACL propagation done: %s inserted, %s deleted, %s kept",
+              counts["inserted"], counts["deleted"], counts["kept"])
+  return counts
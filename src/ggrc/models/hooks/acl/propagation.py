@@ -15,11 +15,14 @@ import sqlalchemy as sa
 
 from ggrc import db
 from ggrc import login
+from ggrc import settings
 from ggrc import utils
+from ggrc.cache import utils as cache_utils
 from ggrc.utils import helpers
 from ggrc.access_control import utils as acl_utils
 from ggrc.models import all_models
 from ggrc.models.hooks import access_control_role
+from ggrc.models.hooks.acl import graph_propagation
 
 logger = logging.getLogger(__name__)
 
@@ -339,6 +342,50 @@ def _delete_propagated_acls(acl_ids):
   db.session.plain_commit()
 
 
+def _get_acl_people(condition):
+  """Get people with permissions given by ACL entries.
+
+  People get permissions of all the ACL entries propagated from the base ACL
+  entries they are assigned to, so the people are found through base ids of
+  the ACL entries.
+
+  Args:
+    condition: condition selecting the ACL entries.
+
+  Returns:
+    set of person ids.
+  """
+  if not cache_utils.has_memcache():
+    return set()
+  acl_table = all_models.AccessControlList.__table__
+  acp_table = all_models.AccessControlPerson.__table__
+  query = sa.select([acp_table.c.person_id]).select_from(
+      acl_table.join(acp_table, acp_table.c.ac_list_id == acl_table.c.base_id)
+  ).where(condition).distinct()
+  return {person_id for person_id, in db.session.execute(query)}
+
+
+def _clear_permission_cache(people_ids):
+  """Drop cached permissions of people with changed ACL entries.
+
+  Args:
+    people_ids: ids of people with permissions changed by propagation.
+  """
+  acl_table = all_models.AccessControlList.__table__
+  people_ids = set(people_ids)
+  people_ids.update(getattr(flask.g, "permissions_changed_people", ()))
+  base_ids = getattr(flask.g, "permissions_changed_base_ids", None)
+  if getattr(flask.g, "permissions_changed_all", False):
+    cache_utils.clear_permission_cache()
+  else:
+    if base_ids:
+      people_ids.update(_get_acl_people(acl_table.c.base_id.in_(base_ids)))
+    cache_utils.clear_users_permission_cache(people_ids)
+  flask.g.permissions_changed_people = set()
+  flask.g.permissions_changed_base_ids = set()
+  flask.g.permissions_changed_all = False
+
+
 def _set_empty_base_ids():
   """Set base_id for new entries."""
   db.session.execute(
@@ -359,7 +406,15 @@ def propagate():
           hasattr(flask.g, "deleted_objects")):
     return
 
+  acl_table = all_models.AccessControlList.__table__
+  changed_people_ids = set()
   if flask.g.deleted_objects:
+    changed_people_ids.update(_get_acl_people(
+        sa.tuple_(
+            acl_table.c.object_type,
+            acl_table.c.object_id,
+        ).in_(flask.g.deleted_objects)
+    ))
     with utils.benchmark("Delete internal ACL entries for deleted objects"):
       _delete_orphan_acl_entries(flask.g.deleted_objects)
 
@@ -380,6 +435,18 @@ def propagate():
     with utils.benchmark("Propagate new ACL entries"):
       _propagate(flask.g.new_acl_ids, current_user_id)
 
+  with utils.benchmark("Drop cached permissions of affected people"):
+    if flask.g.new_relationship_ids:
+      changed_people_ids.update(_get_acl_people(sa.and_(
+          acl_table.c.object_type == all_models.Relationship.__name__,
+          acl_table.c.object_id.in_(flask.g.new_relationship_ids),
+      )))
+    if flask.g.new_acl_ids:
+      changed_people_ids.update(_get_acl_people(
+          acl_table.c.id.in_(flask.g.new_acl_ids)
+      ))
+    _clear_permission_cache(changed_people_ids)
+
   del flask.g.new_acl_ids
   del flask.g.new_relationship_ids
   del flask.g.deleted_objects
@@ -401,29 +468,51 @@ def _add_missing_acl_entries():
     access_control_role.handle_role_acls(role)
 
 
+def _propagate_all_by_chunks():
+  """Delete and propagate again entries of small chunks of base ACLs."""
+  with utils.benchmark("Get non propagated acl ids"):
+    query = db.session.query(
+        all_models.AccessControlList.id,
+    ).filter(
+        all_models.AccessControlList.parent_id.is_(None),
+    )
+    all_acl_ids = [acl.id for acl in query]
+
+  with utils.benchmark("Propagate normal acl entries"):
+    count = len(all_acl_ids)
+    propagated_count = 0
+    for acl_ids in utils.list_chunks(all_acl_ids, chunk_size=50):
+      propagated_count += len(acl_ids)
+      logger.info("Propagating ACL entries: %s/%s", propagated_count, count)
+      _delete_propagated_acls(acl_ids)
+
+      flask.g.new_acl_ids = acl_ids
+      flask.g.new_relationship_ids = set()
+      flask.g.deleted_objects = set()
+      propagate()
+
+
+def _propagate_all_with_graph():
+  """Bring all propagated entries up to date using the propagation graph."""
+  _set_empty_base_ids()
+  with utils.benchmark("Propagate normal acl entries with graph"):
+    graph_propagation.propagate_all(
+        login.get_current_user_id(),
+        PROPAGATION_DEPTH_LIMIT,
+    )
+
+
 @helpers.without_sqlalchemy_cache
 def propagate_all():
-  """Re-evaluate propagation for all objects."""
+  """Re-evaluate propagation for all objects.
+
+  The propagation engine is selected with ACL_PROPAGATION_ENGINE setting.
+  """
   with utils.benchmark("Run propagate_all"):
     with utils.benchmark("Add missing acl entries"):
       _add_missing_acl_entries()
-    with utils.benchmark("Get non propagated acl ids"):
-      query = db.session.query(
-          all_models.AccessControlList.id,
-      ).filter(
-          all_models.AccessControlList.parent_id.is_(None),
-      )
-      all_acl_ids = [acl.id for acl in query]
-
-    with utils.benchmark("Propagate normal acl entries"):
-      count = len(all_acl_ids)
-      propagated_count = 0
-      for acl_ids in utils.list_chunks(all_acl_ids, chunk_size=50):
-        propagated_count += len(acl_ids)
-        logger.info("Propagating ACL entries: %s/%s", propagated_count, count)
-        _delete_propagated_acls(acl_ids)
-
-        flask.g.new_acl_ids = acl_ids
-        flask.g.new_relationship_ids = set()
-        flask.g.deleted_objects = set()
-        propagate()
+    if settings.ACL_PROPAGATION_ENGINE == "graph":
+      _propagate_all_with_graph()
+    else:
+      _propagate_all_by_chunks()
+    cache_utils.clear_permission_cache()
@@ -14,6 +14,8 @@ from ggrc import db
 from ggrc.models.hooks import assessment
 from ggrc.services import signals
 from ggrc.models import all_models
+from ggrc.models import relationship_adjacency
+from ggrc.models import similarity_index
 from ggrc.models.comment import Commentable
 from ggrc.models.mixins.base import ChangeTracked
 from ggrc.models import exceptions
@@ -330,6 +332,18 @@ def init_hook():  # noqa
       'before_delete',
       all_models.Relationship.validate_delete)
 
+  # Keep the relationship adjacency index in sync.
+  sa.event.listen(all_models.Relationship, "after_insert",
+                  relationship_adjacency.handle_relationship_insert)
+  sa.event.listen(all_models.Relationship, "after_update",
+                  relationship_adjacency.handle_relationship_update)
+  sa.event.listen(all_models.Relationship, "after_delete",
+                  relationship_adjacency.handle_relationship_delete)
+
+  # Keep the similarity index in sync with the flushed relationships.
+  sa.event.listen(sa.orm.session.Session, "after_flush",
+                  similarity_index.handle_flush)
+
   @signals.Restful.model_deleted.connect_via(all_models.Relationship)
   def handle_cascade_delete(sender, obj, service):
     """Process cascade removing of relationship."""
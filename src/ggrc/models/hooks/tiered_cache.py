@@ -0,0 +1,18 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Invalidation hooks of the tiered cache of reference data."""
+
+from ggrc.cache import tiered
+from ggrc.models import all_models
+
+
+def init_hook():
+  """Bump version stamps after commits changing the cached data."""
+  tiered.invalidate_on_commit(all_models.AccessControlRole,
+                              (tiered.ACCESS_CONTROL_ROLES,))
+  tiered.invalidate_on_commit(all_models.CustomAttributeDefinition,
+                              (tiered.CUSTOM_ATTRIBUTE_DEFINITIONS,))
+  # New people are never cached, so only changes of existing ones matter.
+  tiered.invalidate_on_commit(all_models.Person, (tiered.PEOPLE,),
+                              events=("after_update", "after_delete"))
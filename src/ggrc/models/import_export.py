@@ -7,6 +7,7 @@ import json
 from datetime import datetime, timedelta
 from logging import getLogger
 
+import sqlalchemy as sa
 from sqlalchemy.dialects import mysql
 
 from ggrc import db
@@ -63,6 +64,9 @@ class ImportExport(Identifiable, db.Model):
   title = db.Column(db.Text)
   content = db.Column(mysql.LONGTEXT)
   gdrive_metadata = db.Column('gdrive_metadata', db.Text)
+  chunks = db.relationship('ImportExportChunk',
+                           cascade='all, delete-orphan',
+                           passive_deletes=True)
 
   def log_json(self, is_default=False):
     """JSON representation"""
@@ -85,6 +89,20 @@ class ImportExport(Identifiable, db.Model):
     return res
 
 
+class ImportExportChunk(Identifiable, db.Model):
+  """Chunk of content of ImportExport entry written by chunks."""
+  # pylint: disable=too-few-public-methods
+
+  __tablename__ = 'import_export_chunks'
+
+  import_export_id = db.Column(
+      db.Integer,
+      db.ForeignKey('import_exports.id', ondelete='CASCADE'),
+      nullable=False,
+  )
+  content = db.Column(mysql.LONGTEXT, nullable=False)
+
+
 def create_import_export_entry(**kwargs):
   """Create ImportExport entry"""
   meta = json.dumps(kwargs['gdrive_metadata']) if 'gdrive_metadata' in kwargs \
@@ -105,6 +123,71 @@ def create_import_export_entry(**kwargs):
   return ie_job
 
 
+def write_content(ie_job, chunks):
+  """Write content of ImportExport entry chunk by chunk.
+
+  Every chunk is stored in a separate row of the chunks table, so the whole
+  content is never kept in memory or sent in a single statement. Chunks
+  written before are replaced.
+
+  Args:
+    ie_job: ImportExport instance to write content to.
+    chunks: iterable of utf-8 encoded content string chunks.
+
+  Raises:
+    ValueError: if the stored chunks differ from the written ones.
+  """
+  table = ImportExportChunk.__table__
+  db.session.execute(
+      table.delete().where(table.c.import_export_id == ie_job.id)
+  )
+  chunks_count = size = 0
+  for chunk in chunks:
+    if not chunk:
+      continue
+    db.session.execute(table.insert().values(import_export_id=ie_job.id,
+                                             content=chunk))
+    chunks_count += 1
+    size += len(chunk)
+  stored_count, stored_size = db.session.query(
+      sa.func.count(ImportExportChunk.id),
+      sa.func.sum(sa.func.length(ImportExportChunk.content)),
+  ).filter(
+      ImportExportChunk.import_export_id == ie_job.id,
+  ).one()
+  if (stored_count, stored_size or 0) != (chunks_count, size):
+    raise ValueError(
+        "Content of {} job ID:{} is not stored: {} chunks of {} bytes "
+        "written, {} chunks of {} bytes stored".format(
+            ie_job.job_type, ie_job.id, chunks_count, size,
+            stored_count, stored_size,
+        )
+    )
+  db.session.expire(ie_job, ["chunks"])
+
+
+def read_content(ie_job):
+  """Read content of ImportExport entry chunk by chunk.
+
+  Content written by chunks is read one chunk per query, so the whole
+  content is never kept in memory.
+
+  Returns:
+    iterable of content string chunks.
+  """
+  if ie_job.content is not None:
+    return [ie_job.content]
+  ids = [id_ for id_, in db.session.query(ImportExportChunk.id).filter(
+      ImportExportChunk.import_export_id == ie_job.id,
+  ).order_by(ImportExportChunk.id)]
+  return (
+      db.session.query(ImportExportChunk.content).filter(
+          ImportExportChunk.id == id_,
+      ).scalar()
+      for id_ in ids
+  )
+
+
 def get_jobs(job_type, ids=None):
   """Get list of jobs by type and/or ids"""
   conditions = [ImportExport.created_by == get_current_user(),
@@ -4,13 +4,16 @@
 """Contains WithSimilarityScore mixin.
 
 This defines a procedure of getting "similar" objects which have similar
-relationships.
+relationships. If the similarity index is enabled, similar objects are looked
+up in the index instead of being collected from relationships.
 """
 
 import sqlalchemy as sa
 
 from ggrc import db
+from ggrc.models import similarity_index
 from ggrc.models.relationship import Relationship
+from ggrc.models.similarity_index import SimilarityIndex
 from ggrc.models.snapshot import Snapshot
 
 DEFAULT_WEIGHT = 1
@@ -33,14 +36,93 @@ class WithSimilarityScore(object):
         the id of similar objects.
     """
     from ggrc.snapshotter.rules import Types
+    indexed = similarity_index.enabled()
     if cls.__name__ in Types.all and type_ in Types.scoped:
+      if indexed:
+        return cls._indexed_obj_assessment(type_, id_)
       return cls._similar_obj_assessment(type_, id_)
     elif cls.__name__ in Types.scoped and type_ in Types.scoped:
+      if indexed:
+        return cls._indexed_asmnt_assessment(type_, id_)
       return cls._similar_asmnt_assessment(type_, id_)
     elif cls.__name__ in Types.scoped and type_ in Types.trans_scope:
+      if indexed:
+        return cls._indexed_asmnt_similar(type_, id_)
       return cls._similar_asmnt_issue(type_, id_)
     return []
 
+  @classmethod
+  def _indexed_obj_assessment(cls, type_, id_):
+    """Look up similar Assessments for object in the similarity index.
+
+    Args:
+        type_: Object type.
+        id_: Object id.
+
+    Returns:
+        SQLAlchemy query that yields results [(similar_id,)] - the id of
+        similar objects.
+    """
+    from ggrc.models import all_models
+    return db.session.query(SimilarityIndex.similar_id).join(
+        all_models.Assessment,
+        sa.and_(
+            all_models.Assessment.assessment_type == cls.__name__,
+            all_models.Assessment.id == SimilarityIndex.similar_id,
+        )
+    ).filter(
+        SimilarityIndex.object_type == cls.__name__,
+        SimilarityIndex.object_id == id_,
+        SimilarityIndex.similar_type == type_,
+    )
+
+  @classmethod
+  def _indexed_asmnt_similar(cls, type_, id_):
+    """Look up objects similar to objects snapshotted in Assessment.
+
+    Args:
+        type_: Type of similar objects.
+        id_: Assessment id.
+
+    Returns:
+        SQLAlchemy query that yields results [(similar_id,)] - the id of
+        similar objects.
+    """
+    asmnt_mapped = cls.mapped_to_assessment([id_]).subquery()
+    return db.session.query(SimilarityIndex.similar_id).join(
+        asmnt_mapped,
+        sa.and_(
+            SimilarityIndex.object_type == asmnt_mapped.c.obj_type,
+            SimilarityIndex.object_id == asmnt_mapped.c.obj_id,
+        )
+    ).filter(
+        SimilarityIndex.similar_type == type_,
+    )
+
+  @classmethod
+  def _indexed_asmnt_assessment(cls, type_, id_):
+    """Look up similar Assessments for Assessment in the similarity index.
+
+    Args:
+        type_: Assessment type.
+        id_: Assessment id.
+
+    Returns:
+        SQLAlchemy query that yields results [(similar_id,)] - the id of
+        similar objects.
+    """
+    from ggrc.models import all_models
+    asmnt = all_models.Assessment
+    return cls._indexed_asmnt_similar(type_, id_).join(
+        asmnt,
+        sa.and_(
+            asmnt.assessment_type == SimilarityIndex.object_type,
+            asmnt.id == SimilarityIndex.similar_id,
+        )
+    ).filter(
+        asmnt.id != id_,
+    )
+
   @classmethod
   def _similar_obj_assessment(cls, type_, id_):
     """Find similar Assessments for object.
@@ -0,0 +1,40 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Models for checkpoints of the full text reindex."""
+
+import datetime
+
+from ggrc import db
+from ggrc.models.mixins.base import Identifiable
+
+
+class ReindexCheckpoint(Identifiable, db.Model):
+  """Id range of a model reindexed by a background task."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "fulltext_reindex_checkpoints"
+
+  task_id = db.Column(db.Integer, nullable=False)
+  model_name = db.Column(db.String(64), nullable=False)
+  start_id = db.Column(db.Integer, nullable=False)
+  objects_count = db.Column(db.Integer, nullable=False)
+  created_at = db.Column(db.DateTime, nullable=False,
+                         default=datetime.datetime.utcnow)
+
+  __table_args__ = (
+      db.UniqueConstraint("task_id", "model_name", "start_id",
+                          name="uq_fulltext_reindex_checkpoints"),
+  )
+
+
+class ReindexChange(Identifiable, db.Model):
+  """Object with index records changed during the shadow table reindex.
+
+  Rows are inserted by triggers of the index table created for the time of
+  the reindex.
+  """
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "fulltext_reindex_changes"
+
+  type = db.Column(db.String(64), nullable=False)
+  key = db.Column(db.Integer, nullable=False)
@@ -6,7 +6,6 @@
 import logging
 
 import collections
-import sqlalchemy as sa
 from sqlalchemy import or_, and_
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import validates
@@ -17,6 +16,7 @@ from ggrc.models.mixins import base
 from ggrc.models.mixins import Base
 from ggrc.models.mixins import ScopeObject
 from ggrc.models import reflection
+from ggrc.models import relationship_adjacency
 from ggrc.models.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
@@ -293,37 +293,14 @@ class RelationshipsCache(object):
     self.cache = collections.defaultdict(set)
 
   def populate_cache(self, stubs):
-    """Fetch all mappings for objects in stubs, cache them in self.cache."""
-    # Union is here to convince mysql to use two separate indices and
-    # merge te results. Just using `or` results in a full-table scan
-    # Manual column list avoids loading the full object which would also try to
-    # load related objects
-    cols = db.session.query(
-        Relationship.source_type, Relationship.source_id,
-        Relationship.destination_type, Relationship.destination_id)
-    relationships = cols.filter(
-        sa.tuple_(
-            Relationship.source_type,
-            Relationship.source_id
-        ).in_(
-            [(s.type, s.id) for s in stubs]
-        )
-    ).union_all(
-        cols.filter(
-            sa.tuple_(
-                Relationship.destination_type,
-                Relationship.destination_id
-            ).in_(
-                [(s.type, s.id) for s in stubs]
-            )
-        )
-    ).all()
-    for (src_type, src_id, dst_type, dst_id) in relationships:
-      src = Stub(src_type, src_id)
-      dst = Stub(dst_type, dst_id)
-      # only store a neighbor if we queried for it since this way we know
-      # we'll be storing complete neighborhood by the end of the loop
-      if src in stubs:
-        self.cache[src].add(dst)
-      if dst in stubs:
-        self.cache[dst].add(src)
+    """Fetch all mappings for objects in stubs, cache them in self.cache.
+
+    Every stub gets a cache entry, so stubs without mappings are not fetched
+    again.
+    """
+    stubs = set(stubs)
+    for stub in stubs:
+      self.cache.setdefault(stub, set())
+    for obj_type, obj_id, related_type, related_id in \
+        relationship_adjacency.neighbors(stubs):
+      self.cache[Stub(obj_type, obj_id)].add(Stub(related_type, related_id))
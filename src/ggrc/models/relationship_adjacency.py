@@ -0,0 +1,178 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Symmetric adjacency index of relationships.
+
+Every relationship is stored in the index twice, once for each side, so all
+mappings of an object are found with a single range scan of the primary key
+instead of a union of source and destination lookups.
+
+Relationships created and deleted through the ORM are synced by the
+relationship hooks. Code inserting relationships with plain SQL must call
+`add_relationships` for them, which refreshes the similarity index as well.
+Deleted relationships are removed from the index by the foreign key as well.
+"""
+
+import collections
+
+import sqlalchemy as sa
+
+from ggrc import db
+
+
+class RelationshipAdjacency(db.Model):
+  """Object mapped to a related object by a relationship."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "relationship_adjacency"
+
+  object_type = db.Column(db.String(250), primary_key=True)
+  object_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+  related_type = db.Column(db.String(250), primary_key=True)
+  related_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+  relationship_id = db.Column(
+      db.Integer,
+      db.ForeignKey("relationships.id", ondelete="CASCADE"),
+      primary_key=True,
+      autoincrement=False,
+  )
+
+  __table_args__ = (
+      db.Index("ix_relationship_adjacency_relationship", "relationship_id"),
+  )
+
+
+def objects_filter(stubs):
+  """Get condition selecting index rows of the given objects.
+
+  Ids are grouped by type, so every group is a range scan of the primary key.
+
+  Args:
+    stubs: iterable of (type, id) tuples.
+  """
+  ids_by_type = collections.defaultdict(set)
+  for type_, id_ in stubs:
+    ids_by_type[type_].add(id_)
+  if not ids_by_type:
+    return sa.false()
+  return sa.or_(*[
+      sa.and_(RelationshipAdjacency.object_type == type_,
+              RelationshipAdjacency.object_id.in_(ids))
+      for type_, ids in ids_by_type.iteritems()
+  ])
+
+
+def neighbors(stubs, related_types=None):
+  """Get query of mappings of the given objects.
+
+  Args:
+    stubs: iterable of (type, id) tuples;
+    related_types: types of related objects to return, all if None.
+
+  Returns:
+    query of (object_type, object_id, related_type, related_id) rows.
+  """
+  query = db.session.query(
+      RelationshipAdjacency.object_type,
+      RelationshipAdjacency.object_id,
+      RelationshipAdjacency.related_type,
+      RelationshipAdjacency.related_id,
+  ).filter(
+      objects_filter(stubs),
+  )
+  if related_types is not None:
+    query = query.filter(
+        RelationshipAdjacency.related_type.in_(list(related_types))
+    )
+  return query
+
+
+def related_ids_query(object_type, related_type, related_ids):
+  """Get query of ids of objects of object_type mapped to the related ones.
+
+  Args:
+    object_type: type of the returned objects;
+    related_type: type of the objects the returned ones are mapped to;
+    related_ids: ids of the related objects or a query returning them.
+  """
+  return db.session.query(RelationshipAdjacency.related_id).filter(
+      RelationshipAdjacency.object_type == related_type,
+      RelationshipAdjacency.object_id.in_(related_ids),
+      RelationshipAdjacency.related_type == object_type,
+  )
+
+
+def _adjacency_select(rel_table, condition, reverse=False):
+  """Select index rows of one side of the relationships."""
+  source = [rel_table.c.source_type, rel_table.c.source_id]
+  destination = [rel_table.c.destination_type, rel_table.c.destination_id]
+  if reverse:
+    source, destination = destination, source
+  return sa.select(source + destination + [rel_table.c.id]).where(condition)
+
+
+def add_relationships(condition):
+  """Add relationships inserted with plain SQL to the index.
+
+  Args:
+    condition: condition selecting rows of the relationships table.
+  """
+  from ggrc.models.relationship import Relationship
+  rel_table = Relationship.__table__
+  adjacency_table = RelationshipAdjacency.__table__
+  columns = ["object_type", "object_id", "related_type", "related_id",
+             "relationship_id"]
+  inserter = adjacency_table.insert().prefix_with("IGNORE")
+  for reverse in (False, True):
+    db.session.execute(inserter.from_select(
+        columns,
+        _adjacency_select(rel_table, condition, reverse),
+    ))
+  from ggrc.models import similarity_index
+  similarity_index.add_relationships(condition)
+
+
+def _rows(relationship):
+  """Get index rows of both sides of the relationship."""
+  source = (relationship.source_type, relationship.source_id)
+  destination = (relationship.destination_type, relationship.destination_id)
+  sides = {(source, destination), (destination, source)}
+  return [
+      dict(zip(("object_type", "object_id", "related_type", "related_id"),
+               first + second),
+           relationship_id=relationship.id)
+      for first, second in sides
+  ]
+
+
+def _delete_rows(connection, relationship_id):
+  """Delete index rows of the relationship."""
+  adjacency_table = RelationshipAdjacency.__table__
+  connection.execute(adjacency_table.delete().where(
+      adjacency_table.c.relationship_id == relationship_id
+  ))
+
+
+def handle_relationship_insert(mapper, connection, target):
+  """Add rows of a new relationship to the index."""
+  # pylint: disable=unused-argument
+  connection.execute(RelationshipAdjacency.__table__.insert(), _rows(target))
+
+
+def handle_relationship_update(mapper, connection, target):
+  """Replace index rows of a relationship with changed sides."""
+  # pylint: disable=unused-argument
+  changed = any(
+      sa.inspect(target).attrs[name].history.has_changes()
+      for name in ("source_type", "source_id",
+                   "destination_type", "destination_id")
+  )
+  if not changed:
+    return
+  _delete_rows(connection, target.id)
+  connection.execute(RelationshipAdjacency.__table__.insert(), _rows(target))
+
+
+def handle_relationship_delete(mapper, connection, target):
+  """Delete index rows of a deleted relationship."""
+  # pylint: disable=unused-argument
+  _delete_rows(connection, target.id)
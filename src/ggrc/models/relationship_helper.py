@@ -11,6 +11,7 @@ from ggrc.extensions import get_extension_modules
 from ggrc import models
 from ggrc.models import Snapshot
 from ggrc.models import all_models
+from ggrc.models import relationship_adjacency
 from ggrc.models.relationship import Relationship
 from ggrc.snapshotter.rules import Types
 
@@ -213,22 +214,8 @@ def get_ids_related_to(object_type, related_type, related_ids=None):
     return _parent_object_mappings(
         object_type, related_type, related_ids)
 
-  destination_ids = db.session.query(Relationship.destination_id).filter(
-      and_(
-          Relationship.destination_type == object_type,
-          Relationship.source_type == related_type,
-          Relationship.source_id.in_(related_ids),
-      )
-  )
-  source_ids = db.session.query(Relationship.source_id).filter(
-      and_(
-          Relationship.source_type == object_type,
-          Relationship.destination_type == related_type,
-          Relationship.destination_id.in_(related_ids),
-      )
-  )
-
-  queries = [destination_ids, source_ids]
+  queries = [relationship_adjacency.related_ids_query(
+      object_type, related_type, related_ids)]
   queries.extend(get_extension_mappings(
       object_type, related_type, related_ids))
   queries.extend(get_special_mappings(
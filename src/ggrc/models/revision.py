@@ -3,6 +3,8 @@
 
 """Defines a Revision model for storing snapshots."""
 
+import copy
+
 from ggrc import builder
 from ggrc import db
 from ggrc.models.mixins import base
@@ -72,6 +74,23 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
       'destination_id',
   ]
 
+  # Steps populating the stored content in the order of application: method
+  # name, method arguments and content keys the step can set.
+  _POPULATE_STEPS = (
+      ("populate_acl", (), ("access_control_list",)),
+      ("populate_reference_url", (), ("reference_url",)),
+      ("populate_folder", (), ("folder",)),
+      ("populate_labels", (), ("labels",)),
+      ("populate_status", (), ("status",)),
+      ("populate_review_status", (), ("review_status",)),
+      ("_document_evidence_hack", (), ("documents_file",)),
+      ("populate_categoies", ("categories",), ("categories",)),
+      ("populate_categoies", ("assertions",), ("assertions",)),
+      ("populate_cad_default_values", (), ("custom_attribute_definitions",)),
+      ("populate_cavs", (), ("custom_attribute_values",
+                             "custom_attribute_definitions")),
+  )
+
   @classmethod
   def eager_query(cls):
     from sqlalchemy import orm
@@ -236,16 +255,19 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
   @classmethod
   def _populate_acl_with_people(cls, access_control_list):
     """Add person property with person stub on access control list."""
-    for acl in access_control_list:
-      if "person" not in acl:
-        acl["person"] = {"id": acl.get("person_id"), "type": "Person"}
-    return access_control_list
+    return [
+        acl if "person" in acl else dict(
+            acl,
+            person={"id": acl.get("person_id"), "type": "Person"},
+        )
+        for acl in access_control_list
+    ]
 
   def populate_acl(self):
     """Add access_control_list info for older revisions."""
     roles_dict = role.get_custom_roles_for(self.resource_type)
     reverted_roles_dict = {n: i for i, n in roles_dict.iteritems()}
-    access_control_list = self._content.get("access_control_list") or []
+    access_control_list = list(self._content.get("access_control_list") or [])
     map_field_to_role = {
         "principal_assessor": reverted_roles_dict.get("Principal Assignees"),
         "secondary_assessor": reverted_roles_dict.get("Secondary Assignees"),
@@ -400,12 +422,13 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
     """
     if "document_evidence" not in self._content:
       return {}
-    document_evidence = self._content.get("document_evidence")
-    for evidence in document_evidence:
-      evidence[u"display_name"] = u"{link} {title}".format(
-          link=evidence.get("link"),
-          title=evidence.get("title"),
-      ).strip()
+    document_evidence = [
+        dict(evidence, display_name=u"{link} {title}".format(
+            link=evidence.get("link"),
+            title=evidence.get("title"),
+        ).strip())
+        for evidence in self._content.get("document_evidence")
+    ]
     return {u"documents_file": document_evidence}
 
   def populate_categoies(self, key_name):
@@ -439,9 +462,7 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
     """Setup cads in cav list if they are not presented in content
 
     but now they are associated to instance."""
-    from ggrc.models import custom_attribute_definition
-    cads = custom_attribute_definition.get_custom_attributes_for(
-        self.resource_type, self.resource_id)
+    cads = self._get_cads()
     cavs = {int(i["custom_attribute_id"]): i for i in self._get_cavs()}
     for cad in cads:
       custom_attribute_id = int(cad["id"])
@@ -449,7 +470,10 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
         # Old revisions can contain falsy values for a Checkbox
         if cad["attribute_type"] == "Checkbox" \
                 and not cavs[custom_attribute_id]["attribute_value"]:
-          cavs[custom_attribute_id]["attribute_value"] = cad["default_value"]
+          cavs[custom_attribute_id] = dict(
+              cavs[custom_attribute_id],
+              attribute_value=cad["default_value"],
+          )
         continue
       if cad["attribute_type"] == "Map:Person":
         value = "Person"
@@ -477,22 +501,25 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
     cads = []
     for cad in self._content["custom_attribute_definitions"]:
       if "default_value" not in cad:
-        cad["default_value"] = (
+        cad = dict(cad, default_value=(
             all_models.CustomAttributeDefinition.get_default_value_for(
                 cad["attribute_type"]
             )
-        )
+        ))
       cads.append(cad)
     return {"custom_attribute_definitions": cads}
 
-  def populate_requirements(self, populated_content):  # noqa pylint: disable=too-many-branches
+  # Requirement old names
+  _REQUIREMENT_OLD_TYPES = ("Section", "Clause")
+
+  def populate_requirements(self, populated_content):
     """Populates revision content for Requirement models and models with fields
 
     that can contain Requirement old names. This fields would be checked and
-    updated where necessary
+    updated where necessary. Access control list and custom attribute values
+    of Requirement revisions are updated by _populate_requirement_items.
     """
-    # change to add Requirement old names
-    requirement_type = ["Section", "Clause"]
+    requirement_type = self._REQUIREMENT_OLD_TYPES
     # change to add models and fields that can contain Requirement old names
     affected_models = {
         "AccessControlList": ["object_type", ],
@@ -541,45 +568,118 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
     if obj_type == "Requirement":
       populated_content["type"] = "Requirement"
 
-      acls = populated_content.get("access_control_list", {})
-      if acls:
-        for acl in acls:
-          if acl.get("object_type") in requirement_type:
-            acl["object_type"] = "Requirement"
-        populated_content["access_control_list"] = acls
+  def _populate_requirement_items(self, populated):
+    """Replace Requirement old names in ACL and CAVs of populate step result.
+
+    Args:
+      populated: dict returned by a populate step, changed in place. Changed
+        ACL and CAV entries are replaced with updated copies.
+    """
+    if self.resource_type != "Requirement":
+      return
+    for key, field in (("access_control_list", "object_type"),
+                       ("custom_attribute_values", "attributable_type")):
+      if not populated.get(key):
+        continue
+      populated[key] = [
+          dict(item, **{field: "Requirement"})
+          if item.get(field) in self._REQUIREMENT_OLD_TYPES else item
+          for item in populated[key]
+      ]
 
-      cavs = populated_content.get("custom_attribute_values", {})
-      if cavs:
-        for cav in cavs:
-          if cav.get("attributable_type") in requirement_type:
-            cav["attributable_type"] = "Requirement"
-        populated_content["custom_attribute_values"] = cavs
+  def _get_populate_cache(self):
+    """Get populate results cached for the current stored content.
+
+    Stored content is never changed by populate steps, so the results stay
+    valid until a new content is assigned to the revision.
+    """
+    cache = getattr(self, "_populate_cache", None)
+    if cache is None or cache["content"] is not self._content:
+      cache = {"content": self._content, "steps": {}}
+      self._populate_cache = cache
+    return cache
+
+  def _get_cads(self):
+    """Get custom attribute definitions of the revision object."""
+    from ggrc.models import custom_attribute_definition
+    cache = self._get_populate_cache()
+    if "cads" not in cache:
+      cache["cads"] = custom_attribute_definition.get_custom_attributes_for(
+          self.resource_type, self.resource_id)
+    return cache["cads"]
+
+  def _get_base_content(self):
+    """Get stored content with populated plain fields.
+
+    The returned dict is cached and must not be changed.
+    """
+    cache = self._get_populate_cache()
+    if "base" not in cache:
+      base_content = self._content.copy()
+      self.populate_requirements(base_content)
+      # remove custom_attributes,
+      # it's old style interface and now it's not needed
+      base_content.pop("custom_attributes", None)
+      cache["base"] = base_content
+    return cache["base"]
+
+  def _run_populate_step(self, index):
+    """Get cached result of the populate step with the given index."""
+    steps = self._get_populate_cache()["steps"]
+    if index not in steps:
+      method_name, args, _ = self._POPULATE_STEPS[index]
+      populated = getattr(self, method_name)(*args)
+      self._populate_requirement_items(populated)
+      steps[index] = populated
+    return steps[index]
+
+  def get_content_value(self, key, default=None):
+    """Get a single value of the populated content.
+
+    Only populate steps that can set the key are run, so it is cheaper than
+    reading the key from the content property. The value is a copy of the
+    cached one, so it can be changed by the caller.
+    """
+    value = self._get_base_content().get(key, default)
+    for index, (_, _, keys) in enumerate(self._POPULATE_STEPS):
+      if key in keys:
+        value = self._run_populate_step(index).get(key, value)
+    return copy.deepcopy(value)
+
+  @classmethod
+  def preload_content(cls, revisions):
+    """Populate content of many revisions at once.
+
+    Custom attribute definitions of all revision objects are loaded with
+    batched queries instead of per revision queries. The populated content
+    is cached on the revisions.
+    """
+    from ggrc.models import custom_attribute_definition
+    revisions = [revision for revision in revisions if revision is not None]
+    cads = custom_attribute_definition.get_custom_attributes_for_many({
+        (revision.resource_type, revision.resource_id)
+        for revision in revisions
+    })
+    for revision in revisions:
+      cache = revision._get_populate_cache()
+      cache.setdefault(
+          "cads", cads[(revision.resource_type, revision.resource_id)]
+      )
+      for index in range(len(cls._POPULATE_STEPS)):
+        revision._run_populate_step(index)
 
   @builder.simple_property
   def content(self):
     """Property. Contains the revision content dict.
 
-    Updated by required values, generated from saved content dict."""
-    # pylint: disable=too-many-locals
-    populated_content = self._content.copy()
-    populated_content.update(self.populate_acl())
-    populated_content.update(self.populate_reference_url())
-    populated_content.update(self.populate_folder())
-    populated_content.update(self.populate_labels())
-    populated_content.update(self.populate_status())
-    populated_content.update(self.populate_review_status())
-    populated_content.update(self._document_evidence_hack())
-    populated_content.update(self.populate_categoies("categories"))
-    populated_content.update(self.populate_categoies("assertions"))
-    populated_content.update(self.populate_cad_default_values())
-    populated_content.update(self.populate_cavs())
-
-    self.populate_requirements(populated_content)
-    # remove custom_attributes,
-    # it's old style interface and now it's not needed
-    populated_content.pop("custom_attributes", None)
-
-    return populated_content
+    Updated by required values, generated from saved content dict. Results of
+    populate steps are cached on the revision, every call returns a deep copy
+    of them so it can be changed by the caller.
+    """
+    populated_content = self._get_base_content().copy()
+    for index in range(len(self._POPULATE_STEPS)):
+      populated_content.update(self._run_populate_step(index))
+    return copy.deepcopy(populated_content)
 
   @content.setter
   def content(self, value):
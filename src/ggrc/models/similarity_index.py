@@ -0,0 +1,325 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Maintained index of objects similar to snapshottable objects.
+
+For every snapshottable object the index stores the objects WithSimilarityScore
+finds similar to it:
+
+  - Assessments mapped to a snapshot of the object or of an object of the
+    same type mapped to it;
+  - Issues mapped to a snapshot of the object or mapped to the object itself.
+
+Objects similar to an Assessment are the objects similar to the objects
+snapshotted in it, so similarity queries become lookups of the index primary
+key instead of multi-hop unions of relationships.
+
+Rows of an object are rebuilt from the relationship adjacency index whenever
+a relationship which may change them is created or deleted. Relationships and
+snapshots flushed through the ORM are handled by the session hook and code
+inserting relationships with plain SQL refreshes the index through
+`relationship_adjacency.add_relationships`. The whole index is rebuilt by the
+rebuild_similarity_index background task, which has to be run after enabling
+the index.
+"""
+
+import collections
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import settings
+from ggrc import utils
+from ggrc.models import inflector
+from ggrc.models import relationship_adjacency
+from ggrc.models.relationship_adjacency import RelationshipAdjacency
+
+
+class SimilarityIndex(db.Model):
+  """Object similar to a snapshottable object."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "similarity_index"
+
+  object_type = db.Column(db.String(250), primary_key=True)
+  object_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+  similar_type = db.Column(db.String(250), primary_key=True)
+  similar_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+
+  __table_args__ = (
+      db.Index("ix_similarity_index_similar", "similar_type", "similar_id"),
+  )
+
+
+def enabled():
+  """Check if the index is maintained and used by similarity queries."""
+  return settings.SIMILARITY_INDEX
+
+
+def _types():
+  """Get snapshotter types, imported lazily to avoid import cycles."""
+  from ggrc.snapshotter.rules import Types
+  return Types
+
+
+def _snapshot_table():
+  """Get table of snapshots."""
+  from ggrc.models.snapshot import Snapshot
+  return Snapshot.__table__
+
+
+def _insert_selects(object_type, object_ids):
+  """Get selects of index rows of the objects.
+
+  Returns:
+    list of selects of (object_type, object_id, similar_type, similar_id).
+  """
+  types = _types()
+  snapshots = _snapshot_table()
+  adjacency = RelationshipAdjacency.__table__
+  mapped = adjacency.alias("mapped")
+  base_snapshot = sa.and_(
+      adjacency.c.object_type == "Snapshot",
+      adjacency.c.object_id == snapshots.c.id,
+  )
+  return [
+      # Object <-> Snapshot of Object <-> Assessment or Issue
+      sa.select([
+          snapshots.c.child_type,
+          snapshots.c.child_id,
+          adjacency.c.related_type,
+          adjacency.c.related_id,
+      ]).select_from(
+          snapshots.join(adjacency, base_snapshot)
+      ).where(
+          snapshots.c.child_type == object_type
+      ).where(
+          snapshots.c.child_id.in_(object_ids)
+      ).where(
+          adjacency.c.related_type.in_(list(types.scoped | types.trans_scope))
+      ),
+      # Object <-> Object2 <-> Snapshot of Object2 <-> Assessment
+      sa.select([
+          mapped.c.object_type,
+          mapped.c.object_id,
+          adjacency.c.related_type,
+          adjacency.c.related_id,
+      ]).select_from(
+          mapped.join(
+              snapshots,
+              sa.and_(snapshots.c.child_type == mapped.c.related_type,
+                      snapshots.c.child_id == mapped.c.related_id),
+          ).join(adjacency, base_snapshot)
+      ).where(
+          mapped.c.object_type == object_type
+      ).where(
+          mapped.c.object_id.in_(object_ids)
+      ).where(
+          mapped.c.related_type == object_type
+      ).where(
+          adjacency.c.related_type.in_(list(types.scoped))
+      ),
+      # Object <-> Issue
+      sa.select([
+          mapped.c.object_type,
+          mapped.c.object_id,
+          mapped.c.related_type,
+          mapped.c.related_id,
+      ]).where(
+          mapped.c.object_type == object_type
+      ).where(
+          mapped.c.object_id.in_(object_ids)
+      ).where(
+          mapped.c.related_type.in_(list(types.trans_scope))
+      ),
+  ]
+
+
+def _refresh_objects(object_type, object_ids):
+  """Replace index rows of the objects with their current similar objects."""
+  table = SimilarityIndex.__table__
+  db.session.execute(table.delete().where(
+      table.c.object_type == object_type
+  ).where(
+      table.c.object_id.in_(object_ids)
+  ))
+  inserter = table.insert().prefix_with("IGNORE")
+  columns = ["object_type", "object_id", "similar_type", "similar_id"]
+  for select in _insert_selects(object_type, object_ids):
+    db.session.execute(inserter.from_select(columns, select))
+
+
+def refresh(stubs):
+  """Rebuild index rows of the objects.
+
+  Args:
+    stubs: iterable of (type, id) tuples, objects of types that are not
+      snapshottable are skipped.
+  """
+  snapshottable = _types().all
+  ids_by_type = collections.defaultdict(set)
+  for type_, id_ in stubs:
+    if type_ in snapshottable:
+      ids_by_type[type_].add(id_)
+  for type_, ids in ids_by_type.iteritems():
+    for ids_chunk in utils.list_chunks(sorted(ids)):
+      _refresh_objects(type_, ids_chunk)
+
+
+def _with_same_type_mapped(stubs):
+  """Get the objects and all objects of the same type mapped to them.
+
+  Assessments mapped to snapshots of an object are similar to the objects of
+  the same type mapped to it as well.
+  """
+  stubs = set(stubs)
+  if not stubs:
+    return stubs
+  mapped = relationship_adjacency.neighbors(
+      stubs, {type_ for type_, _ in stubs}
+  )
+  stubs.update(
+      (related_type, related_id)
+      for object_type, _, related_type, related_id in mapped
+      if object_type == related_type
+  )
+  return stubs
+
+
+def affected_objects(relationships):
+  """Get objects whose similar objects depend on the relationships.
+
+  Args:
+    relationships: iterable of (source_type, source_id, destination_type,
+      destination_id) tuples.
+
+  Returns:
+    tuple of set of (type, id) stubs of the affected objects and set of ids
+    of snapshots whose children and their same type mappings are affected.
+  """
+  types = _types()
+  similar_types = types.scoped | types.trans_scope
+  stubs = set()
+  snapshot_ids = set()
+  for source_type, source_id, destination_type, destination_id in \
+      relationships:
+    sides = ((source_type, source_id, destination_type),
+             (destination_type, destination_id, source_type))
+    for type_, id_, other_type in sides:
+      if type_ == "Snapshot" and other_type in similar_types:
+        snapshot_ids.add(id_)
+      elif type_ in types.all and (other_type == type_ or
+                                   other_type in types.trans_scope):
+        stubs.add((type_, id_))
+  return stubs, snapshot_ids
+
+
+def _snapshot_children(snapshot_ids):
+  """Get (child_type, child_id) stubs of the snapshots."""
+  if not snapshot_ids:
+    return set()
+  snapshots = _snapshot_table()
+  children = set()
+  for ids_chunk in utils.list_chunks(sorted(snapshot_ids)):
+    children.update(tuple(row) for row in db.session.execute(
+        sa.select([snapshots.c.child_type, snapshots.c.child_id]).where(
+            snapshots.c.id.in_(ids_chunk)
+        )
+    ))
+  return children
+
+
+def refresh_relationships(relationships, snapshot_children=()):
+  """Rebuild index rows of objects affected by the relationships.
+
+  Args:
+    relationships: iterable of (source_type, source_id, destination_type,
+      destination_id) tuples of created or deleted relationships;
+    snapshot_children: (child_type, child_id) stubs of deleted snapshots.
+  """
+  stubs, snapshot_ids = affected_objects(relationships)
+  children = _snapshot_children(snapshot_ids) | set(snapshot_children)
+  refresh(stubs | _with_same_type_mapped(children))
+
+
+def add_relationships(condition):
+  """Refresh the index for relationships inserted with plain SQL.
+
+  Args:
+    condition: condition selecting rows of the relationships table.
+  """
+  if not enabled():
+    return
+  from ggrc.models.relationship import Relationship
+  rel_table = Relationship.__table__
+  types = _types()
+  similar_types = list(types.scoped | types.trans_scope)
+  relationships = db.session.execute(sa.select([
+      rel_table.c.source_type,
+      rel_table.c.source_id,
+      rel_table.c.destination_type,
+      rel_table.c.destination_id,
+  ]).where(condition).where(sa.or_(
+      rel_table.c.source_type == rel_table.c.destination_type,
+      rel_table.c.source_type.in_(similar_types),
+      rel_table.c.destination_type.in_(similar_types),
+  )))
+  refresh_relationships(list(relationships))
+
+
+def handle_flush(session, flush_context):
+  """Refresh the index for relationships and snapshots of the flush.
+
+  The session hook runs after the relationships are written, so rows are
+  rebuilt from the new state of the adjacency index.
+  """
+  # pylint: disable=unused-argument
+  if not enabled():
+    return
+  from ggrc.models.relationship import Relationship
+  from ggrc.models.snapshot import Snapshot
+  relationships = [
+      (obj.source_type, obj.source_id, obj.destination_type,
+       obj.destination_id)
+      for obj in list(session.new) + list(session.deleted)
+      if isinstance(obj, Relationship)
+  ]
+  snapshot_children = [
+      (obj.child_type, obj.child_id)
+      for obj in session.deleted
+      if isinstance(obj, Snapshot)
+  ]
+  if relationships or snapshot_children:
+    refresh_relationships(relationships, snapshot_children)
+
+
+def rebuild(chunk_size=1000):
+  """Rebuild the whole index and drop rows of deleted objects.
+
+  Rows of every chunk of objects are replaced in a single transaction, so
+  similarity queries keep returning results during the rebuild.
+
+  Returns:
+    Counter of objects per type.
+  """
+  table = SimilarityIndex.__table__
+  snapshottable = sorted(_types().all)
+  counts = collections.Counter()
+  for type_ in snapshottable:
+    model = inflector.get_model(type_)
+    if model is None:
+      continue
+    ids = [id_ for id_, in db.session.query(model.id).order_by(model.id)]
+    for ids_chunk in utils.list_chunks(ids, chunk_size=chunk_size):
+      _refresh_objects(type_, ids_chunk)
+      db.session.plain_commit()
+    counts[type_] = len(ids)
+    db.session.execute(table.delete().where(
+        table.c.object_type == type_
+    ).where(
+        table.c.object_id.notin_(sa.select([model.__table__.c.id]))
+    ))
+  db.session.execute(table.delete().where(
+      table.c.object_type.notin_(snapshottable)
+  ))
+  db.session.plain_commit()
+  return counts
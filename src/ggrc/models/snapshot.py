@@ -23,6 +23,7 @@ from ggrc.login import get_current_user_id
 from ggrc.models import mixins
 from ggrc.models import reflection
 from ggrc.models import relationship
+from ggrc.models import relationship_adjacency
 from ggrc.models import revision
 from ggrc.models.deferred import deferred
 from ggrc.models.mixins import base
@@ -346,6 +347,12 @@ def _insert_program_relationships(relationship_stubs):
           for relationship_stub in relationship_stubs
       ])
   )
+  rel_table = relationship.Relationship.__table__
+  relationship_adjacency.add_relationships(
+      tuple_(rel_table.c.source_id, rel_table.c.source_type,
+             rel_table.c.destination_id, rel_table.c.destination_type)
+      .in_(relationship_stubs)
+  )
 
 
 def _set_latest_revisions(objects):
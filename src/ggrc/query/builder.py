@@ -9,11 +9,15 @@ This class is used to build SqlAlchemy queries and fetch the result ids.
 # flake8: noqa
 import collections
 import datetime
+import functools
+from multiprocessing.pool import ThreadPool
 
+import flask
 import sqlalchemy as sa
 
 from ggrc import db
 from ggrc import models
+from ggrc import settings
 from ggrc.models import inflector
 from ggrc.utils import benchmark
 from ggrc.rbac import permissions
@@ -43,6 +47,9 @@ class QueryHelper(object):
         }
       ]
       limit: [from, to] - limit the result list to a slice result[from, to]
+      cursor: optional; if present, keyset pagination is used: null for the
+              first page or the cursor returned with the previous page; only
+              the page size is taken from limit in this case
       filters: {
         relevant_filters:
           these filters will return all ids of the "search class name" object
@@ -72,6 +79,8 @@ class QueryHelper(object):
       object_name: search class name,
       (all other object query fields)
       ids: [ list of filtered objects ids ]
+      cursor: cursor of the next page or null for the last page (present
+              if cursor was requested)
     }
   ]
 
@@ -82,6 +91,7 @@ class QueryHelper(object):
 
   def __init__(self, query):
     self.query = self._clean_query(query)
+    self._type_queries = {}
 
   def _get_snapshot_child_type(self, object_query):
     """Return child_type for snapshot from a query"""
@@ -203,11 +213,113 @@ class QueryHelper(object):
     Returns:
       list of dicts: same query as the input with all ids that match the filter
     """
-    for object_query in self.query:
-      ids = self._get_ids(object_query)
-      object_query["ids"] = ids
+    self._get_batched_ids(expose_ids=lambda _: True)
     return self.query
 
+  def _get_batched_ids(self, expose_ids):
+    """Get ids for all object queries, running independent ones together.
+
+    Object queries are split into levels by `_get_query_levels`. All queries
+    of one level are independent of each other, so they are executed at once
+    by `_execute_level`, after their permission filters are resolved.
+
+    Args:
+      expose_ids: callable that receives an object query and returns True if
+        the ids must be stored in it, so that the following queries can refer
+        to them with `__previous__` relevant filters.
+
+    Returns:
+      list of ids lists in the same order as self.query.
+    """
+    results = [None] * len(self.query)
+    for level in self._get_query_levels():
+      object_queries = [self.query[index] for index in level]
+      with benchmark("Get permissions: _get_batched_ids > _get_type_query"):
+        for object_query in object_queries:
+          self._get_permission_filter(object_query)
+      with benchmark("Get ids of {} queries: _get_batched_ids".format(
+          len(object_queries))):
+        level_results = self._execute_level(object_queries)
+      for index, object_query, ids in zip(level, object_queries,
+                                          level_results):
+        results[index] = ids
+        if expose_ids(object_query):
+          object_query["ids"] = ids
+    return results
+
+  def _get_query_levels(self):
+    """Group object queries into levels of independent queries.
+
+    An object query depends on the previous one if it has a `relevant` filter
+    with `__previous__` object name. Such query is placed to the level that
+    follows the levels of all queries it depends on.
+
+    Returns:
+      list of lists of object query indexes, in order of execution.
+    """
+    levels = []
+    query_levels = {}
+    for index, object_query in enumerate(self.query):
+      expression = object_query.get("filters", {}).get("expression")
+      dependencies = self._get_previous_dependencies(expression)
+      level = max([query_levels[dependency] + 1
+                   for dependency in dependencies
+                   if dependency in query_levels] or [0])
+      query_levels[index] = level
+      if level == len(levels):
+        levels.append([])
+      levels[level].append(index)
+    return levels
+
+  def _get_previous_dependencies(self, expression):
+    """Get indexes of object queries referenced by `__previous__` filters."""
+    if not isinstance(expression, dict):
+      return set()
+    dependencies = set()
+    if (expression.get("op", {}).get("name") == "relevant" and
+            expression.get("object_name") == "__previous__" and
+            expression.get("ids")):
+      dependencies.add(expression["ids"][0])
+    for node in (expression.get("left"), expression.get("right")):
+      dependencies.update(self._get_previous_dependencies(node))
+    return dependencies
+
+  def _execute_level(self, object_queries):
+    """Get ids for independent object queries.
+
+    If QUERY_API_WORKERS setting allows it, the queries are executed in
+    parallel threads. Each thread works in a copy of the current request
+    context and thus has its own db session and connection from the pool.
+
+    Returns:
+      list of ids lists in the same order as object_queries.
+    """
+    workers = min(settings.QUERY_API_WORKERS, len(object_queries))
+    if workers < 2 or not flask.has_request_context():
+      return [self._get_ids(object_query) for object_query in object_queries]
+    tasks = [
+        flask.copy_current_request_context(
+            functools.partial(self._get_ids, object_query)
+        )
+        for object_query in object_queries
+    ]
+    pool = ThreadPool(workers)
+    try:
+      return pool.map(lambda task: task(), tasks)
+    finally:
+      pool.close()
+      pool.join()
+
+  def _get_permission_filter(self, object_query):
+    """Get permission filter for object query, resolved once per model."""
+    object_class = inflector.get_model(object_query["object_name"])
+    if object_class is None:
+      return None
+    key = (object_class, object_query.get("permissions", "read"))
+    if key not in self._type_queries:
+      self._type_queries[key] = self._get_type_query(*key)
+    return self._type_queries[key]
+
   @staticmethod
   def _get_type_query(model, permission_type):
     """Filter by contexts and resources
@@ -229,11 +341,17 @@ class QueryHelper(object):
 
     return model.id.in_(resources) if resources else sa.sql.false()
 
-  def _get_objects(self, object_query):
-    """Get a set of objects described in the filters."""
+  def _get_objects(self, object_query, ids=None):
+    """Get a set of objects described in the filters.
+
+    Args:
+      object_query: object query to get objects for.
+      ids: already fetched ids of the objects, if any.
+    """
 
-    with benchmark("Get ids: _get_objects -> _get_ids"):
-      ids = self._get_ids(object_query)
+    if ids is None:
+      with benchmark("Get ids: _get_objects -> _get_ids"):
+        ids = self._get_ids(object_query)
     if not ids:
       return set()
 
@@ -268,9 +386,8 @@ class QueryHelper(object):
       child_type = self._get_snapshot_child_type(object_query)
       tgt_class = getattr(models.all_models, child_type, object_class)
 
-    requested_permissions = object_query.get("permissions", "read")
     with benchmark("Get permissions: _get_ids > _get_type_query"):
-      type_query = self._get_type_query(object_class, requested_permissions)
+      type_query = self._get_permission_filter(object_query)
       if type_query is not None:
         query = query.filter(type_query)
     with benchmark("Parse filter query: _get_ids > _build_expression"):
@@ -282,6 +399,22 @@ class QueryHelper(object):
       )
       if filter_expression is not None:
         query = query.filter(filter_expression)
+    if "cursor" in object_query:
+      with benchmark("Keyset pagination: _get_ids > get_keyset_page"):
+        query, sort_keys = pagination.apply_sort_keys(
+            object_class,
+            query,
+            object_query.get("order_by"),
+            tgt_class,
+        )
+        ids, object_query["cursor"] = pagination.get_keyset_page(
+            query,
+            sort_keys,
+            object_query["cursor"],
+            object_query.get("limit"),
+        )
+        object_query["total"] = pagination.get_total_count(query)
+      return ids
     if object_query.get("order_by"):
       with benchmark("Sorting: _get_ids > order_by"):
         query = pagination.apply_order_by(
@@ -293,9 +426,7 @@ class QueryHelper(object):
     with benchmark("Apply limit"):
       limit = object_query.get("limit")
       if limit:
-        limit_query = pagination.apply_limit(query, limit)
-        total = pagination.get_total_count(query)
-        ids = [obj.id for obj in limit_query]
+        ids, total = pagination.get_limited_ids_and_total(query, limit)
       else:
         ids = [obj.id for obj in query]
         total = len(ids)
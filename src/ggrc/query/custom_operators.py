@@ -9,18 +9,22 @@ import functools
 
 import sqlalchemy
 from sqlalchemy.orm import aliased
-from sqlalchemy.orm import load_only
 
 from ggrc import db
+from ggrc import settings
 from ggrc.models import all_models
+from ggrc.fulltext import tokens
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
 from ggrc.models import inflector
+from ggrc.models import relationship_adjacency
 from ggrc.models import relationship_helper
+from ggrc.models import similarity_index
 from ggrc.models.mixins.filterable import Filterable
 from ggrc.query import autocast
 from ggrc.query import my_objects
 from ggrc.query.exceptions import BadQueryException
 from ggrc.snapshotter import rules
+from ggrc.utils import benchmark
 from ggrc.utils import revisions_diff
 
 
@@ -92,8 +96,15 @@ def build_op_shortcut(predicate):
 @validate("left", "right")
 @build_op_shortcut
 def like(left, right):
-  """Handle ~ operator with SQL LIKE."""
-  return left.ilike(u"%{}%".format(right))
+  """Handle ~ operator with SQL LIKE.
+
+  Content of full text records is checked only in the candidate records
+  having all tokens of the searched text.
+  """
+  condition = left.ilike(u"%{}%".format(right))
+  if left is Record.content:
+    return sqlalchemy.and_(tokens.candidates_filter(Record, right), condition)
+  return condition
 
 
 def reverse(operation):
@@ -217,6 +228,7 @@ def text_search(exp, object_class, target_class, query):
       db.session.query(Record.key).filter(
           Record.type == object_class.__name__,
           Record.subproperty != '__sort__',
+          tokens.candidates_filter(Record, exp['text']),
           Record.content.ilike(u"%{}%".format(exp['text'])),
       ),
   )
@@ -246,6 +258,8 @@ def similar(exp, object_class, target_class, query):
       id_=exp['ids'][0],
       type_=object_class.__name__,
   )
+  if similarity_index.enabled() and similar_objects_query:
+    return ids_filter(object_class, similar_objects_query, u"similar")
   similar_objects_ids = {obj[0] for obj in similar_objects_query}
   if similar_objects_ids:
     return object_class.id.in_(similar_objects_ids)
@@ -266,46 +280,64 @@ def relevant(exp, object_class, target_class, query):
   check_direct = (not check_snapshots or
                   object_class.__name__ in rules.Types.trans_scope)
 
-  result = set()
+  queries = []
 
   if check_direct:
-    result.update(*relationship_helper.get_ids_related_to(
+    queries.append(relationship_helper.get_ids_related_to(
         object_class.__name__,
         object_name,
         ids,
     ))
 
   if check_snapshots:
-    snapshot_qs = all_models.Snapshot.query.filter(
+    snapshot_ids = db.session.query(all_models.Snapshot.id).filter(
         all_models.Snapshot.parent_type == all_models.Audit.__name__,
         all_models.Snapshot.child_type == object_name,
         all_models.Snapshot.child_id.in_(ids),
-    ).options(
-        load_only(all_models.Snapshot.id),
-    ).distinct(
-    ).subquery(
-        "snapshot"
     )
-    dest_qs = db.session.query(all_models.Relationship.source_id).filter(
-        all_models.Relationship.destination_id == snapshot_qs.c.id,
-        all_models.Relationship.destination_type ==
+    ids_qs = relationship_adjacency.related_ids_query(
+        object_class.__name__,
         all_models.Snapshot.__name__,
-        all_models.Relationship.source_type == object_class.__name__,
-    )
-    source_qs = db.session.query(
-        all_models.Relationship.destination_id
-    ).filter(
-        all_models.Relationship.source_id == snapshot_qs.c.id,
-        all_models.Relationship.source_type == all_models.Snapshot.__name__,
-        all_models.Relationship.destination_type == object_class.__name__,
+        snapshot_ids,
     )
-    ids_qs = dest_qs.union(source_qs)
-    result.update(*ids_qs.all())
+    queries.append(ids_qs)
 
-  if not result:
-    return sqlalchemy.sql.false()
+  return ids_filter(object_class, queries[0].union(*queries[1:]),
+                    u"relevant {} to {}".format(object_class.__name__,
+                                                object_name))
 
-  return object_class.id.in_(result)
+
+def ids_filter(object_class, ids_query, name):
+  """Get filter of objects with ids returned by the query.
+
+  The ids are sent back to the DB as a list only if there are at most
+  RELEVANT_IDS_THRESHOLD of them. Larger id sets stay on the DB side in a
+  derived table, which MySQL materializes once per statement.
+
+  Args:
+    object_class: class of the filtered objects;
+    ids_query: query returning ids of the objects;
+    name: name of the filter used in the benchmark log.
+  """
+  threshold = settings.RELEVANT_IDS_THRESHOLD
+  ids = None
+  if threshold > 0:
+    with benchmark(u"{}: fetch up to {} ids".format(name, threshold)):
+      ids = {id_ for id_, in ids_query.limit(threshold + 1).all()}
+    if len(ids) > threshold:
+      ids = None
+
+  if ids is not None:
+    with benchmark(u"{}: id list strategy, {} ids".format(name, len(ids))):
+      if not ids:
+        return sqlalchemy.sql.false()
+      return object_class.id.in_(ids)
+
+  with benchmark(u"{}: derived table strategy".format(name)):
+    derived = ids_query.subquery()
+    return object_class.id.in_(
+        sqlalchemy.select([list(derived.c)[0]]).select_from(derived)
+    )
 
 
 @validate("object_name", "ids")
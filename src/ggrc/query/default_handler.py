@@ -49,10 +49,25 @@ class DefaultHandler(QueryHelper):
       if query_type not in {"values", "ids", "count"}:
         raise NotImplementedError("Only 'values', 'ids' and 'count' queries "
                                   "are supported now")
+    with benchmark("Get result set: get_results > _get_batched_ids"):
+      all_ids = self._get_batched_ids(
+          expose_ids=lambda object_query: object_query.get(
+              "type", "values") == "ids",
+      )
+    for object_query, ids in zip(self.query, all_ids):
+      query_type = object_query.get("type", "values")
       model = inflector.get_model(object_query["object_name"])
-      if query_type == "values":
+      if query_type == "values" and object_query.get("fields"):
+        with benchmark("get_results > _get_projected_values"):
+          values, last_modified = self._get_projected_values(
+              object_query, model, ids,
+          )
+        object_query["count"] = len(values)
+        object_query["last_modified"] = last_modified
+        object_query["values"] = values
+      elif query_type == "values":
         with benchmark("Get result set: get_results > _get_objects"):
-          objects = self._get_objects(object_query)
+          objects = self._get_objects(object_query, ids)
         object_query["count"] = len(objects)
         with benchmark("get_results > _get_last_modified"):
           object_query["last_modified"] = self._get_last_modified(model,
@@ -63,12 +78,8 @@ class DefaultHandler(QueryHelper):
               object_query.get("fields"),
           )
       else:
-        with benchmark("Get result set: get_results -> _get_ids"):
-          ids = self._get_ids(object_query)
         object_query["count"] = len(ids)
         object_query["last_modified"] = None  # synonymous to now()
-        if query_type == "ids":
-          object_query["ids"] = ids
     return self.query
 
   @staticmethod
@@ -81,6 +92,42 @@ class DefaultHandler(QueryHelper):
                       for o in objects_json]
     return objects_json
 
+  def _get_projected_values(self, object_query, model, ids):
+    """Get JSON representations of the requested fields of objects.
+
+    Fields that can be published from table columns are read with a single
+    query of these columns. Objects are loaded and published only if some of
+    the fields need them, and then only these fields are published.
+
+    Returns:
+      tuple of the list of representations and the time of last update.
+    """
+    if ids is None:
+      ids = self._get_ids(object_query)
+    if not ids:
+      return [], None
+    fields = object_query["fields"]
+    projection = json.FieldsProjection(model, fields)
+    with benchmark("Get projected columns: _get_projected_values"):
+      rows = {row[0]: row for row in projection.query(ids)}
+    ids = [id_ for id_ in ids if id_ in rows]
+
+    published = {id_: projection.publish_row(rows[id_]) for id_ in ids}
+    if projection.fallback_fields:
+      with benchmark("Publish fallback fields: _get_projected_values"):
+        for obj in self._get_objects(object_query, ids):
+          published[obj.id].update(json.publish(
+              obj,
+              attribute_whitelist=projection.fallback_fields,
+          ))
+    values = [{field: published[id_].get(field) for field in fields}
+              for id_ in ids]
+    values = json.publish_representation(values)
+
+    updated_at = [projection.get_updated_at(row) for row in rows.values()]
+    last_modified = max(updated_at) if any(updated_at) else None
+    return values, last_modified
+
   @staticmethod
   def _get_last_modified(model, objects):
     """Get the time of last update of an object in the list."""
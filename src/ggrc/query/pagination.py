@@ -11,6 +11,7 @@ from ggrc.fulltext.mysql import MysqlRecordProperty as Record
 from ggrc.query import custom_operators
 from ggrc.query.exceptions import BadQueryException
 from ggrc.utils import benchmark
+from ggrc.utils import keyset
 
 
 def _get_limit(limit):
@@ -61,6 +62,59 @@ def get_total_count(query):
   return total
 
 
+# Minimal server versions supporting window functions, by dialect name.
+WINDOW_FUNCTIONS_MIN_VERSIONS = {
+    "mysql": (8, 0, 2),
+    "postgresql": (8, 4),
+    "sqlite": (3, 25),
+}
+
+MARIADB_WINDOW_FUNCTIONS_MIN_VERSION = (10, 2)
+
+
+def supports_window_functions(engine=None):
+  """Check if the database engine supports `COUNT(*) OVER ()` syntax."""
+  dialect = (engine or db.engine).dialect
+  version = dialect.server_version_info
+  if version is None:
+    return False
+  if "MariaDB" in version:
+    return version >= MARIADB_WINDOW_FUNCTIONS_MIN_VERSION
+  min_version = WINDOW_FUNCTIONS_MIN_VERSIONS.get(dialect.name)
+  return min_version is not None and version >= min_version
+
+
+def get_limited_ids_and_total(query, limit):
+  """Get ids of the requested page and total count of objects.
+
+  If the database supports window functions, the page ids and the total are
+  fetched with a single statement using `COUNT(*) OVER ()`, so the filter
+  expression is evaluated only once. Otherwise a separate count query is used.
+
+  Args:
+    query: filter query selecting object ids;
+    limit: a tuple of indexes in format (from, to).
+
+  Returns:
+    a tuple (ids, total) of the page object ids and total count of objects.
+  """
+  if not supports_window_functions():
+    with benchmark("Apply limit: get_limited_ids_and_total > separate count"):
+      ids = [obj.id for obj in apply_limit(query, limit)]
+      return ids, get_total_count(query)
+
+  with benchmark("Apply limit: get_limited_ids_and_total > window count"):
+    total_column = sa.func.count().over().label("window_total")
+    rows = apply_limit(query.add_columns(total_column), limit).all()
+    if rows:
+      return [row.id for row in rows], rows[0].window_total
+    _, first = _get_limit(limit)
+    if not first:
+      return [], 0
+    # The requested page is beyond the result set, window total is unknown.
+    return [], get_total_count(query)
+
+
 def _joins_and_order(counter, clause, model, tgt_class):
   """Get join operations and ordering field from item of order_by list.
 
@@ -69,10 +123,11 @@ def _joins_and_order(counter, clause, model, tgt_class):
               "desc": reverse sort on this field if True}
 
   Returns:
-    ([joins], order) - a tuple of joins required for this ordering to work
-                        and ordering clause itself; join is None if no join
-                        required or [(aliased entity, relationship field)]
-                        if joins required.
+    ([joins], order, desc) - a tuple of joins required for this ordering to
+                        work, ordering expression itself and reverse sort
+                        flag; join is None if no join required or
+                        [(aliased entity, relationship field)] if joins
+                        required.
   """
 
   def by_fulltext():
@@ -116,10 +171,7 @@ def _joins_and_order(counter, clause, model, tgt_class):
     # Snapshot or non object attributes are treated as custom attributes
     joins, order = by_fulltext()
 
-  if clause.get("desc", False):
-    order = order.desc()
-
-  return joins, order
+  return joins, order, clause.get("desc", False)
 
 
 def apply_order_by(model, query, order_by, tgt_class):
@@ -146,13 +198,59 @@ def apply_order_by(model, query, order_by, tgt_class):
     the query with sorting parameters.
   """
 
-  join_pairs = [
-      _joins_and_order(counter, clause, model, tgt_class)
-      for counter, clause in enumerate(order_by)
-  ]
-  join_lists, orders = zip(*join_pairs)
-  join_lists = [join_list for join_list in join_lists if join_list is not None]
-  for join_list in join_lists:
-    query = query.outerjoin(*join_list)
+  query, sort_keys = _apply_order_joins(model, query, order_by, tgt_class)
+  return keyset.order_by_keys(query, sort_keys)
+
+
+def _apply_order_joins(model, query, order_by, tgt_class):
+  """Add joins required for ordering and get the (order, desc) sort keys."""
+  sort_keys = []
+  for counter, clause in enumerate(order_by):
+    joins, order, desc = _joins_and_order(counter, clause, model, tgt_class)
+    if joins is not None:
+      query = query.outerjoin(*joins)
+    sort_keys.append((order, desc))
+  return query, sort_keys
+
+
+def apply_sort_keys(model, query, order_by, tgt_class):
+  """Add joins required for ordering and get keyset sort keys.
+
+  Args are the same as for `apply_order_by`.
+
+  Returns:
+    a tuple (query, sort_keys) of the query with joins required for sorting
+    and the list of (expression, desc) sort keys, ending with the object id
+    to make the ordering unique.
+  """
+  query, sort_keys = _apply_order_joins(model, query, order_by or [],
+                                        tgt_class)
+  sort_keys.append((model.id, False))
+  return query, sort_keys
+
 
-  return query.order_by(*orders)
+def get_keyset_page(query, sort_keys, cursor, limit):
+  """Get ids of objects that follow the cursor.
+
+  Only the page size is taken from the limit, the page start is defined by
+  the cursor.
+
+  Args:
+    query: filter query selecting object ids;
+    sort_keys: sort keys returned by `apply_sort_keys`;
+    cursor: opaque cursor returned with the previous page, None for the
+      first page;
+    limit: a tuple of indexes in format (from, to).
+
+  Returns:
+    a tuple (ids, next_cursor) of page object ids and the cursor for the next
+    page, which is None for the last page.
+  """
+  if not limit:
+    raise BadQueryException("`limit` is required for cursor pagination.")
+  page_size, _ = _get_limit(limit)
+  try:
+    rows, next_cursor = keyset.get_page(query, sort_keys, cursor, page_size)
+  except ValueError as error:
+    raise BadQueryException(error.message)
+  return [row.id for row in rows], next_cursor
@@ -0,0 +1,122 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Compiled index of user permissions.
+
+The permissions dict built by the permissions provider is nested by action,
+resource type and kind of the entry, and keeps contexts in lists. The index
+flattens it into (action, resource_type) keyed frozensets, so every check is
+a couple of dict lookups and set membership tests.
+"""
+
+ADMIN_ACTION = "__GGRC_ADMIN__"
+ALL_RESOURCES = "__GGRC_ALL__"
+
+_EMPTY = frozenset()
+
+
+class PermissionIndex(object):
+  """Immutable index of a permissions dict.
+
+  The index is built for the given permissions dict and does not follow its
+  later changes. `permissions` attribute keeps the source dict, so the index
+  can be rebuilt when the dict is replaced.
+  """
+  # pylint: disable=too-many-instance-attributes
+
+  __slots__ = (
+      "permissions",
+      "_contexts",
+      "_resources",
+      "_conditions",
+      "_no_context_conditions",
+      "_system_wide",
+      "_types",
+      "admin_conditions",
+      "is_admin",
+  )
+
+  def __init__(self, permissions):
+    self.permissions = permissions
+    contexts = {}
+    resources = {}
+    conditions = {}
+    no_context_conditions = {}
+    system_wide = set()
+    types = set()
+    for action, type_permissions in (permissions or {}).iteritems():
+      if not isinstance(type_permissions, dict):
+        continue
+      for resource_type, entry in type_permissions.iteritems():
+        if not entry or not isinstance(entry, dict):
+          continue
+        key = (action, resource_type)
+        types.add(key)
+        contexts[key] = frozenset(entry.get("contexts") or ())
+        resources[key] = frozenset(entry.get("resources") or ())
+        if None in contexts[key]:
+          system_wide.add(key)
+        if entry.get("conditions"):
+          conditions[key] = {
+              context_id: tuple(
+                  (str(condition["condition"]), condition.get("terms", {}))
+                  for condition in context_conditions
+              )
+              for context_id, context_conditions in
+              entry["conditions"].iteritems()
+          }
+          no_context_conditions[key] = conditions[key].get(None, ())
+
+    self._contexts = contexts
+    self._resources = resources
+    self._conditions = conditions
+    self._no_context_conditions = no_context_conditions
+    self._system_wide = frozenset(system_wide)
+    self._types = frozenset(types)
+    self.is_admin = self.match(ADMIN_ACTION, ALL_RESOURCES, None, 0)
+    self.admin_conditions = no_context_conditions.get(
+        (ADMIN_ACTION, ALL_RESOURCES), ()
+    )
+
+  def contexts(self, action, resource_type):
+    """Get frozenset of context ids where the action is allowed."""
+    return self._contexts.get((action, resource_type), _EMPTY)
+
+  def resources(self, action, resource_type):
+    """Get frozenset of resource ids where the action is allowed."""
+    return self._resources.get((action, resource_type), _EMPTY)
+
+  def has_type(self, action, resource_type):
+    """Check if there are any permissions for the action and resource type."""
+    return (action, resource_type) in self._types
+
+  def is_system_wide(self, action, resource_type):
+    """Check if the action is allowed in all contexts."""
+    return (action, resource_type) in self._system_wide
+
+  def has_conditions(self, action, resource_type):
+    """Check if the action on the resource type has any conditions."""
+    return (action, resource_type) in self._conditions
+
+  def conditions(self, action, resource_type, context_id):
+    """Get conditions applied in the context and without any context.
+
+    Returns:
+      tuple of (condition name, terms) tuples.
+    """
+    key = (action, resource_type)
+    no_context = self._no_context_conditions.get(key, ())
+    if context_id is None:
+      return no_context
+    return no_context + self._conditions.get(key, {}).get(context_id, ())
+
+  def match(self, action, resource_type, resource_id, context_id):
+    """Check if the permissions contain the given permission."""
+    key = (action, resource_type)
+    if key in self._system_wide:
+      return True
+    return (
+        resource_id in self._resources.get(key, _EMPTY) or
+        context_id in self._contexts.get(key, _EMPTY) or
+        context_id in self._contexts.get((action, ALL_RESOURCES), _EMPTY)
+    )
@@ -154,11 +154,9 @@ def has_conditions(action, resource):
   Checks if the resource has a condition that needs to be checked with
   is_allowed_for.
   """
-  # pylint disable=protected-access
-  _permissions = permissions_for()._permissions()
-  return bool(_permissions.get(action, {})
-              .get(resource, {})
-              .get('conditions', {}))
+  # pylint: disable=protected-access
+  index = permissions_for()._permission_index()
+  return index.has_conditions(action, resource)
 
 
 def get_context_resource(model_name, permission_type='read'):
@@ -7,6 +7,7 @@ from flask import g
 from flask.ext.login import current_user
 
 from ggrc.app import db
+from ggrc.rbac import permission_index
 from ggrc.rbac.permissions import permissions_for as find_permissions
 from ggrc.rbac.permissions import is_allowed_create
 from ggrc.models import get_model, all_models
@@ -232,103 +233,73 @@ class DefaultUserPermissions(object):
         None,
         context_id)
 
-  def _permission_match(self, permission, permissions):
-    """Check if the user has the given permission"""
-
-    if None in \
-        permissions\
-            .get(permission.action, {})\
-            .get(permission.resource_type, {})\
-            .get('contexts', []):
-      return True
-    return \
-        permission.resource_id in permissions\
-        .get(permission.action, {})\
-        .get(permission.resource_type, {})\
-        .get('resources', [])\
-        or permission.context_id in \
-        permissions\
-        .get(permission.action, {})\
-        .get(permission.resource_type, {})\
-        .get('contexts', [])\
-        or permission.context_id in \
-        permissions\
-        .get(permission.action, {})\
-        .get(self.ADMIN_PERMISSION.resource_type, {})\
-        .get('contexts', [])
-
   @staticmethod
   def _permissions():
     """Returns request permission from the global scope"""
     return getattr(g, '_request_permissions', {})
 
-  def _is_allowed(self, permission):
+  def _permission_index(self):
+    """Returns compiled index of the request permissions.
+
+    The index is rebuilt whenever the request permissions dict is replaced.
+    """
     permissions = self._permissions()
+    index = getattr(g, '_request_permission_index', None)
+    if index is None or index.permissions is not permissions:
+      index = permission_index.PermissionIndex(permissions)
+      setattr(g, '_request_permission_index', index)
+    return index
+
+  def _is_allowed(self, permission):
+    index = self._permission_index()
     if permission.context_id \
        and self._is_allowed(permission._replace(context_id=None)):
       return True
-    if self._permission_match(permission, permissions):
+    if index.match(*permission):
       return True
-    if self._permission_match(self.ADMIN_PERMISSION, permissions):
+    if index.is_admin:
       return True
-    return self._permission_match(
-        self._admin_permission_for_context(permission.context_id),
-        permissions)
+    return index.match(*self._admin_permission_for_context(
+        permission.context_id
+    ))
 
   @staticmethod
   def _check_conditions(instance, action, conditions):
-    """Check if any condition is valid for the instance."""
-    for condition in conditions:
-      func = _CONDITIONS_MAP[str(condition['condition'])]
-      terms = condition.setdefault('terms', {})
+    """Check if any condition is valid for the instance.
+
+    Args:
+      conditions: iterable of (condition name, terms) tuples.
+    """
+    for condition, terms in conditions:
+      func = _CONDITIONS_MAP[condition]
       if func(instance, _current_action=action, **terms):
         return True
     return False
 
   def _is_allowed_for(self, instance, action):
-    permissions = self._permissions()
+    index = self._permission_index()
     # Check for admin permission
-    if self._permission_match(self.ADMIN_PERMISSION, permissions):
-      conditions = permissions[self.ADMIN_PERMISSION.action]\
-          .get(self.ADMIN_PERMISSION.resource_type)\
-          .get("conditions", {})\
-          .get(None, [])
-      if not conditions:
+    if index.is_admin:
+      if not index.admin_conditions:
         return True
-      return self._check_conditions(instance, action, conditions)
-    if (not permissions.get(action) or
-       not permissions[action].get(instance._inflector.model_singular)):
+      return self._check_conditions(instance, action, index.admin_conditions)
+    resource_type = instance._inflector.model_singular
+    if not index.has_type(action, resource_type):
       return False
-    resources = self._permissions()\
-        .setdefault(action, {})\
-        .setdefault(instance._inflector.model_singular, {})\
-        .setdefault('resources', [])
-    contexts = self._permissions()\
-        .setdefault(action, {})\
-        .setdefault(instance._inflector.model_singular, {})\
-        .setdefault('contexts', [])
+    if instance.id in index.resources(action, resource_type):
+      return True
     # We can't use instance.context_id, because it requires the
     # object <-> context mapping to be created,
     # which isn't the case when creating objects
     context_id = None
     if hasattr(instance, 'context') and hasattr(instance.context, 'id'):
       context_id = instance.context.id
-    if instance.id in resources:
-      return True
-    no_context_conditions = self._permissions()\
-        .setdefault(action, {})\
-        .setdefault(instance._inflector.model_singular, {})\
-        .setdefault('conditions', {})\
-        .setdefault(None, [])
-
-    context_conditions = self._permissions()\
-        .setdefault(action, {})\
-        .setdefault(instance._inflector.model_singular, {})\
-        .setdefault('conditions', {})\
-        .setdefault(context_id, [])
-    conditions = no_context_conditions + context_conditions
+    conditions = index.conditions(action, resource_type, context_id)
     # Check any conditions applied per resource
-    if (None in contexts or context_id in contexts) and not conditions:
+    if not conditions and (
+        index.is_system_wide(action, resource_type) or
+        context_id in index.contexts(action, resource_type)
+    ):
       return True
     return self._check_conditions(instance, action, conditions)
 
@@ -375,9 +346,9 @@ class DefaultUserPermissions(object):
   def _get_resources_for(self, action, resource_type):
     """Get resources resources (object ids) for a given action and
     resource_type"""
-    permissions = self._permissions()
+    index = self._permission_index()
 
-    if self._permission_match(self.ADMIN_PERMISSION, permissions):
+    if index.is_admin:
       return None
 
     # Get the list of resources for a given resource type and any
@@ -386,19 +357,15 @@ class DefaultUserPermissions(object):
 
     ret = []
     for resource_type in resource_types:
-      ret.extend(
-          permissions
-          .get(action, {})
-          .get(resource_type, {})
-          .get('resources', set()))
+      ret.extend(index.resources(action, resource_type))
     return ret
 
   def _get_contexts_for(self, action, resource_type):
     # FIXME: (Security) When applicable, we should explicitly assert that no
     #   permissions are expected (e.g. that every user has ADMIN_PERMISSION).
-    permissions = self._permissions()
+    index = self._permission_index()
 
-    if self._permission_match(self.ADMIN_PERMISSION, permissions):
+    if index.is_admin:
       return None
 
     # Get the list of contexts for a given resource type and any
@@ -407,18 +374,16 @@ class DefaultUserPermissions(object):
 
     ret = []
     for resource_type in resource_types:
-      ret.extend(permissions.get(action, {})
-                            .get(resource_type, {})
-                            .get('contexts', []))
+      if index.is_system_wide(action, resource_type):
+        return None
+      ret.extend(index.contexts(action, resource_type))
 
     # Extend with the list of all contexts for which the user is an ADMIN
-    admin_list = list(
-        permissions.get(self.ADMIN_PERMISSION.action, {})
-        .get(self.ADMIN_PERMISSION.resource_type, {})
-        .get('contexts', ()))
-    ret.extend(admin_list)
-    if None in ret:
+    admin_contexts = index.contexts(self.ADMIN_PERMISSION.action,
+                                    self.ADMIN_PERMISSION.resource_type)
+    if None in admin_contexts:
       return None
+    ret.extend(admin_contexts)
     return ret
 
   def create_contexts_for(self, resource_type):
@@ -35,6 +35,7 @@ from ggrc import db
 from ggrc import gdrive
 from ggrc import utils
 from ggrc.utils import as_json, benchmark, dump_attrs
+from ggrc.utils import keyset
 from ggrc.utils.log_event import log_event
 from ggrc.fulltext import get_indexer
 from ggrc.login import get_current_user_id, get_current_user
@@ -267,7 +268,19 @@ class ModelView(View):
             search_query, [self.model], get_current_user_id())
       search_subquery = search_query.subquery()
       query = query.filter(self.model.id.in_(search_subquery))
-    order_properties = []
+    query = keyset.order_by_keys(query, self.get_sort_keys())
+    if '__limit' in request.args:
+      try:
+        limit = int(request.args['__limit'])
+        query = query.limit(limit)
+      except (TypeError, ValueError):
+        pass
+    query = query.distinct()
+    return query
+
+  def get_sort_keys(self):
+    """Get (attribute, desc) sort keys of the collection request."""
+    sort_keys = []
     if '__sort' in request.args:
       sort_attrs = request.args['__sort'].split(",")
       sort_desc = request.args.get('__sort_desc', False)
@@ -278,24 +291,14 @@ class ModelView(View):
           sort_attr = sort_attr[1:]
         order_property = getattr(self.model, sort_attr, None)
         if order_property and hasattr(order_property, 'desc'):
-          if attr_desc:
-            order_property = order_property.desc()
-          order_properties.append(order_property)
+          sort_keys.append((order_property, bool(attr_desc)))
         else:
           # Possibly throw an exception instead,
           # if sorting by invalid attribute?
           pass
-    order_properties.append(self.modified_attr.desc())
-    order_properties.append(self.model.id.desc())
-    query = query.order_by(*order_properties)
-    if '__limit' in request.args:
-      try:
-        limit = int(request.args['__limit'])
-        query = query.limit(limit)
-      except (TypeError, ValueError):
-        pass
-    query = query.distinct()
-    return query
+    sort_keys.append((self.modified_attr, True))
+    sort_keys.append((self.model.id, True))
+    return sort_keys
 
   def get_object(self, obj_id):
     # This could also use `self.pk`
@@ -728,6 +731,8 @@ class Resource(ModelView):
     page_size = min(
         int(request.args.get('__page_size', self.DEFAULT_PAGE_SIZE)),
         self.MAX_PAGE_SIZE)
+    if '__cursor' in request.args:
+      return self.apply_keyset_paging(matches_query, page_size)
     if '__page_only' in request.args:
       page_number = int(request.args.get('__page', 0))
       matches = []
@@ -749,6 +754,27 @@ class Resource(ModelView):
     }
     return matches, collection_extras
 
+  def apply_keyset_paging(self, matches_query, page_size):
+    """Get the page of matches that follows `__cursor` request argument.
+
+    Empty `__cursor` requests the first page.
+    """
+    matches_query = matches_query.limit(None).order_by(None)
+    try:
+      matches, next_cursor = keyset.get_page(
+          matches_query,
+          self.get_sort_keys(),
+          request.args['__cursor'],
+          page_size,
+      )
+    except ValueError as error:
+      raise BadRequest(error.message)
+    collection_extras = {
+        'paging': self.build_cursor_page_object_for_json(next_cursor,
+                                                         page_size)
+    }
+    return matches, collection_extras
+
   def get_matched_resources(self, matches):
     cache_objs = {}
     if self.has_cache():
@@ -789,7 +815,8 @@ class Resource(ModelView):
       matches_query = self.get_collection_matches(
           self.model, filter_by_contexts)
     with benchmark("dispatch_request > collection_get > Query Data"):
-      if '__page' in request.args or '__page_only' in request.args:
+      if ('__page' in request.args or '__page_only' in request.args or
+              '__cursor' in request.args):
         with benchmark("Query matches with paging"):
           matches, extras = self.apply_paging(matches_query)
       else:
@@ -845,29 +872,36 @@ class Resource(ModelView):
     # invalidation logic so we have to disabling memcache.
     if self.model.__name__ == 'BackgroundTask':
       return resources
-    # Skip right to memcache
+    # Skip right to memcache, all matches are fetched with one get_multi call
     memcache_client = self.request.cache_manager.cache_object.memcache_client
-    for match in matches:
-      key = cache_utils.get_cache_key(None, id_=match[0], type_=match[1])
-      val = memcache_client.get(key)
+    keys = {
+        cache_utils.get_cache_key(None, id_=match[0], type_=match[1]): match
+        for match in matches
+    }
+    if not keys:
+      return resources
+    for key, val in memcache_client.get_multi(keys.keys()).iteritems():
       if val:
         val = json.loads(val)
       else:
         val = {}
       if "selfLink" in val:
-        resources[match] = val
+        resources[keys[key]] = val
     return resources
 
   def add_resources_to_cache(self, match_obj_pairs):
     """Add resources to cache if they are not blocked by DeleteOp entries"""
-    # Skip right to memcache
+    # Skip right to memcache, all resources are added with one add_multi call
     cache_manager = self.request.cache_manager
     memcache_client = cache_manager.cache_object.memcache_client
-    for match, obj in match_obj_pairs.items():
-      if obj.__class__.__name__ in cache_manager.supported_classes:
-        memcache_client.add(
-            cache_utils.get_cache_key(None, id_=match[0], type_=match[1]),
-            as_json(obj))
+    entries = {
+        cache_utils.get_cache_key(None, id_=match[0], type_=match[1]):
+            as_json(obj)
+        for match, obj in match_obj_pairs.iteritems()
+        if obj.__class__.__name__ in cache_manager.supported_classes
+    }
+    if entries:
+      memcache_client.add_multi(entries)
 
   def invalidate_cache_to(self, obj):
     """Invalidate api cache for sent object."""
@@ -1358,6 +1392,19 @@ class Resource(ModelView):
     paging_obj['total'] = paging.total
     return paging_obj
 
+  def build_cursor_page_object_for_json(self, next_cursor, per_page):
+    """Build paging links for keyset pagination."""
+    def page_url(cursor):
+      params = dict([(k, unicode(v)) for k, v in request.args.items()])
+      params['__cursor'] = cursor
+      params['__page_size'] = per_page
+      return base_url + '?' + urlencode(utils.encoded_dict(params))
+    base_url = self.url_for()
+    paging_obj = {'first': page_url('')}
+    if next_cursor:
+      paging_obj['next'] = page_url(next_cursor)
+    return paging_obj
+
   def get_resources_from_database(self, matches):
     # FIXME: This is cheating -- `matches` should be allowed to be any model
     model = self.model
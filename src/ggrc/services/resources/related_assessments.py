@@ -113,13 +113,16 @@ class RelatedAssessmentsResource(common.Resource):
 
     if limit:
       objs = pagination.apply_limit(query, limit).all()
-      total = query.count()
+      total = db.session.query(models.Assessment.id).filter(
+          models.Assessment.id.in_(ids_query)
+      ).count()
     else:
       objs = query.all()
       total = len(objs)
 
     # note that using pagination.get_total_count here would return wrong counts
-    # due to query being an eager query.
+    # due to query being an eager query, and its count() would join all the
+    # eager loaded tables, so the total is counted by ids only.
 
     return objs, total
 
@@ -49,8 +49,10 @@ class SnapshotResource(common.ExtendedResource):
             "child": _stub(child),
             "revision:": {
                 "content": {
-                    "title": obj.revision.content.get("title", ""),
-                    "updated_at": obj.revision.content.get("updated_at", "")}}
+                    "title": obj.revision.get_content_value("title", ""),
+                    "updated_at": obj.revision.get_content_value(
+                        "updated_at", ""
+                    )}}
         })
       data[obj.type].append(obj_data)
     return self.json_success_response(data, )
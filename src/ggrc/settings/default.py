@@ -131,6 +131,82 @@ USE_APP_ENGINE_ASSETS_SUBDOMAIN = False
 
 BACKGROUND_COLLECTION_POST_SLEEP = 0
 
+# Number of threads used to execute independent object queries of a single
+# /query request in parallel. Values lower than 2 disable parallel execution.
+QUERY_API_WORKERS = int(os.environ.get("GGRC_QUERY_API_WORKERS", "0"))
+
+# Number of imported rows committed together with a single import event.
+# Values lower than 2 make import commit every row separately.
+IMPORT_BULK_COMMIT_SIZE = int(os.environ.get("GGRC_IMPORT_BULK_COMMIT_SIZE",
+                                             "0"))
+
+# Number of threads importing independent csv blocks in parallel. Values
+# lower than 2 disable parallel import.
+IMPORT_BLOCK_WORKERS = int(os.environ.get("GGRC_IMPORT_BLOCK_WORKERS", "0"))
+
+# Number of threads reindexing id ranges of a model during the full text
+# reindex. Values lower than 2 disable parallel reindex.
+REINDEX_WORKERS = int(os.environ.get("GGRC_REINDEX_WORKERS", "0"))
+
+# Build the full text index in a shadow table and swap it with the index
+# table when done, so searches keep using the old index during the reindex.
+# Works with MySQL only.
+FULLTEXT_SHADOW_REINDEX = bool(os.environ.get("GGRC_FULLTEXT_SHADOW_REINDEX"))
+
+# Maintain the inverted index of full text record tokens and use it to
+# select candidate records for text searches. Terms are then matched at the
+# beginning of words only. The full reindex has to be run after enabling.
+FULLTEXT_TOKEN_INDEX = bool(os.environ.get("GGRC_FULLTEXT_TOKEN_INDEX"))
+
+# Maintain the index of objects similar to snapshottable objects and use it
+# for similarity queries. The rebuild_similarity_index background task has to
+# be run after enabling.
+SIMILARITY_INDEX = bool(os.environ.get("GGRC_SIMILARITY_INDEX"))
+
+# Seconds results of the tiered cache of reference data are kept in the
+# process and in memcache. 0 disables the tiered cache.
+TIERED_CACHE_TTL = int(os.environ.get("GGRC_TIERED_CACHE_TTL", "300"))
+
+# Number of results kept in the process by each tiered cache and by the
+# tiered cache of names and emails of people.
+TIERED_CACHE_SIZE = int(os.environ.get("GGRC_TIERED_CACHE_SIZE", "64"))
+TIERED_CACHE_PEOPLE_SIZE = int(os.environ.get("GGRC_TIERED_CACHE_PEOPLE_SIZE",
+                                              "10000"))
+
+# Maximum number of ids of relevant objects sent back to the DB as a list by
+# the relevant query filter. Larger sets of ids are filtered by a derived
+# table. 0 always uses the derived table.
+RELEVANT_IDS_THRESHOLD = int(os.environ.get("GGRC_RELEVANT_IDS_THRESHOLD",
+                                            "1000"))
+
+# Engine used for the full ACL re-propagation: "sql" propagates small chunks
+# of ACL entries with INSERT ... SELECT statements, "graph" walks roles and
+# relationships loaded into memory and applies the difference in bulk.
+ACL_PROPAGATION_ENGINE = os.environ.get("GGRC_ACL_PROPAGATION_ENGINE", "sql")
+
+# Audits with at least this many objects in scope get their snapshots created
+# in chunks by a background task. 0 disables the background creation.
+SNAPSHOT_BULK_THRESHOLD = int(os.environ.get("GGRC_SNAPSHOT_BULK_THRESHOLD",
+                                             "0"))
+
+# Number of snapshots created, indexed and committed together by the
+# background snapshot creation.
+SNAPSHOT_BULK_CHUNK_SIZE = int(os.environ.get("GGRC_SNAPSHOT_BULK_CHUNK_SIZE",
+                                              "1000"))
+
+# Number of object stubs (type, id, context_id) kept by the process wide
+# cache of rendered stubs and seconds the stubs are kept. Stubs changed by
+# other processes are rendered stale until they expire. 0 disables the
+# process wide cache, stubs are still cached for the current request.
+STUB_CACHE_SIZE = int(os.environ.get("GGRC_STUB_CACHE_SIZE", "0"))
+STUB_CACHE_TTL = int(os.environ.get("GGRC_STUB_CACHE_TTL", "60"))
+
+# Number of workflows whose recurring cycles are built, flushed and committed
+# together by the cron job, with one event per batch. 0 builds the cycles of
+# every workflow with the ORM and commits them one workflow at a time.
+CYCLE_BULK_BATCH_SIZE = int(os.environ.get("GGRC_CYCLE_BULK_BATCH_SIZE",
+                                           "0"))
+
 
 LOGGING_HANDLER = {
     "class": "logging.StreamHandler",
@@ -16,9 +16,11 @@ from sqlalchemy.sql.expression import bindparam
 
 from ggrc import db
 from ggrc import models
+from ggrc import utils
 from ggrc.models.hooks import acl
 from ggrc.login import get_current_user_id
 from ggrc.models import all_models
+from ggrc.models import relationship_adjacency
 from ggrc.utils import benchmark
 
 from ggrc.snapshotter.datastructures import Attr
@@ -36,6 +38,26 @@ from ggrc.snapshotter.rules import get_rules
 logger = getLogger(__name__)
 
 
+def _snapshot_relationships_condition(snapshot_condition):
+  """Get condition selecting relationships between the selected snapshots.
+
+  Args:
+    snapshot_condition: condition selecting rows of the snapshots table.
+  """
+  rel_table = all_models.Relationship.__table__
+  snapshot_ids = sa.select([all_models.Snapshot.__table__.c.id]).where(
+      snapshot_condition
+  )
+  return sa.and_(
+      rel_table.c.source_type == all_models.Snapshot.__name__,
+      rel_table.c.destination_type == all_models.Snapshot.__name__,
+      sa.or_(
+          rel_table.c.source_id.in_(snapshot_ids),
+          rel_table.c.destination_id.in_(snapshot_ids),
+      ),
+  )
+
+
 class SnapshotGenerator(object):
   """Geneate snapshots per rules of all connected objects"""
 
@@ -78,39 +100,13 @@ class SnapshotGenerator(object):
   def _fetch_neighborhood(self, parent_object, objects):
     """Fetch relationships for objects and parent."""
     with benchmark("Snapshot._fetch_object_neighborhood"):
-      query_pairs = set()
-
-      for obj in objects:
-        for snd_obj in self.rules.rules[parent_object.type]["snd"]:
-          query_pairs.add((obj.type, obj.id, snd_obj))
-
-      columns = db.session.query(
-          models.Relationship.source_type,
-          models.Relationship.source_id,
-          models.Relationship.destination_type,
-          models.Relationship.destination_id)
-
-      relationships = columns.filter(
-          tuple_(
-              models.Relationship.destination_type,
-              models.Relationship.destination_id,
-              models.Relationship.source_type,
-          ).in_(query_pairs)).union(
-          columns.filter(tuple_(
-              models.Relationship.source_type,
-              models.Relationship.source_id,
-              models.Relationship.destination_type,
-          ).in_(query_pairs)))
-
+      query = relationship_adjacency.neighbors(
+          objects,
+          related_types=self.rules.rules[parent_object.type]["snd"],
+      )
       neighborhood = set()
-      for (stype, sid, dtype, did) in relationships:
-        source = Stub(stype, sid)
-        destination = Stub(dtype, did)
-
-        if source in objects:
-          neighborhood.add(destination)
-        else:
-          neighborhood.add(source)
+      for _, _, related_type, related_id in query:
+        neighborhood.add(Stub(related_type, related_id))
       return neighborhood
 
   def _get_snapshottable_objects(self, obj):
@@ -334,10 +330,14 @@ class SnapshotGenerator(object):
     if data and not self.dry_run:
       db.session.execute(operation, data)
 
-  def create(self, event, revisions, _filter=None):
+  def create(self, event, revisions, _filter=None, for_create=None):
     """Create snapshots of parent object's neighborhood per provided rules
-    and split in chuncks if there are too many snapshottable objects."""
-    for_create, _ = self.analyze()
+    and split in chuncks if there are too many snapshottable objects.
+
+    Pairs to create snapshots of are analyzed unless for_create is given.
+    """
+    if for_create is None:
+      for_create, _ = self.analyze()
     result = self._create(
         for_create=for_create, event=event,
         revisions=revisions, _filter=_filter)
@@ -348,6 +348,40 @@ class SnapshotGenerator(object):
       self._create_audit_relationships()
     return result
 
+  def create_in_chunks(self, event, chunk_size, progress_callback=None):
+    """Create snapshots of parent objects neighborhood chunk by chunk.
+
+    Snapshots, their revisions and relationships are written with multi-row
+    statements, indexed and committed for every chunk, so snapshots created
+    before a failure are kept and skipped when the creation is restarted.
+
+    Args:
+      event: A ggrc.models.Event instance
+      chunk_size: number of snapshots created in one chunk
+      progress_callback: function called with the numbers of processed and
+        all snapshots before every chunk is committed
+    Returns:
+      OperationResponse
+    """
+    for_create, _ = self.analyze()
+    pairs = sorted(for_create)
+    created = set()
+    for chunk in utils.list_chunks(pairs, chunk_size):
+      with benchmark("Snapshot.create_in_chunks.chunk"):
+        result = self._create(for_create=set(chunk), event=event,
+                              revisions=set(), _filter=None)
+        created.update(result.response)
+        if not self.dry_run:
+          snapshot_ids = result.data.get("snapshot_ids", [])
+          indexer.reindex_pairs(result.response)
+          self._copy_snapshot_relationships(snapshot_ids)
+          self._create_audit_relationships(snapshot_ids)
+        if progress_callback:
+          progress_callback(len(created), len(pairs))
+        if not self.dry_run:
+          db.session.commit()
+    return OperationResponse("create", True, created, {})
+
   def _create(self, for_create, event, revisions, _filter):
     """Create snapshots of parent objects neighhood and create revisions for
     snapshots.
@@ -405,7 +439,8 @@ class SnapshotGenerator(object):
         )
 
       with benchmark("Snapshot._create.retrieve inserted snapshots"):
-        snapshots = get_snapshots(for_create)
+        snapshots = list(get_snapshots(for_create))
+        response_data["snapshot_ids"] = [snapshot.id for snapshot in snapshots]
 
       with benchmark("Snapshot._create.create revision payload"):
         with benchmark("Snapshot._create.create snapshots revision payload"):
@@ -420,13 +455,27 @@ class SnapshotGenerator(object):
         self._execute(models.Revision.__table__.insert(), revision_payload)
       return OperationResponse("create", True, for_create, response_data)
 
-  def _copy_snapshot_relationships(self):
+  def _copy_snapshot_relationships(self, snapshot_ids=None):
     """Add relationships between snapshotted objects.
 
     Create relationships between individual snapshots if a relationship exists
     between a pair of object that was snapshotted. These relationships get
     created for all objects inside a single parent scope.
+
+    Args:
+      snapshot_ids: ids of snapshots to create the relationships for, all
+        snapshots of the parents if None.
     """
+    snapshot_table = all_models.Snapshot.__table__
+    snapshot_filter = ""
+    if snapshot_ids is not None:
+      if not snapshot_ids:
+        return
+      # ids are integers from the snapshots table, so they are safe to format
+      snapshot_filter = "AND (snap_1.id IN ({ids}) OR snap_2.id IN ({ids}))"
+      snapshot_filter = snapshot_filter.format(
+          ids=", ".join(str(int(id_)) for id_ in snapshot_ids)
+      )
     for parent in self.parents:
       query = """
           INSERT IGNORE INTO relationships (
@@ -458,48 +507,76 @@ class SnapshotGenerator(object):
           WHERE
               snap_1.parent_id = :parent_id AND
               snap_2.parent_id = :parent_id
-          """
+              {snapshot_filter}
+          """.format(snapshot_filter=snapshot_filter)
       db.session.execute(query, {
           "user_id": get_current_user_id(),
           "parent_id": parent.id
       })
+      snapshot_condition = snapshot_table.c.parent_id == parent.id
+      if snapshot_ids is not None:
+        snapshot_condition = sa.and_(
+            snapshot_condition,
+            snapshot_table.c.id.in_(snapshot_ids),
+        )
+      relationship_adjacency.add_relationships(
+          _snapshot_relationships_condition(snapshot_condition)
+      )
 
   @classmethod
-  def _get_audit_relationships(cls, audit_ids):
+  def _get_audit_relationships(cls, audit_ids, snapshot_ids=None):
     """Get all relationship ids for the give audits.
     Args:
       audit_ids: list or set of audit ids.
+      snapshot_ids: ids of snapshots to get the relationships of, all
+        relationships of the audits if None.
 
     Returns:
       set of relationship ids for the given audits.
     """
     relationships_table = all_models.Relationship.__table__
+    destination_filter = [
+        relationships_table.c.destination_id.in_(audit_ids),
+        relationships_table.c.destination_type == all_models.Audit.__name__
+    ]
+    source_filter = [
+        relationships_table.c.source_id.in_(audit_ids),
+        relationships_table.c.source_type == all_models.Audit.__name__
+    ]
+    if snapshot_ids is not None:
+      destination_filter += [
+          relationships_table.c.source_type == all_models.Snapshot.__name__,
+          relationships_table.c.source_id.in_(snapshot_ids),
+      ]
+      source_filter += [
+          relationships_table.c.destination_type ==
+          all_models.Snapshot.__name__,
+          relationships_table.c.destination_id.in_(snapshot_ids),
+      ]
     select_statement = sa.select([
         relationships_table.c.id
     ]).where(
-        sa.and_(
-            relationships_table.c.destination_id.in_(audit_ids),
-            relationships_table.c.destination_type == all_models.Audit.__name__
-        )
+        sa.and_(*destination_filter)
     ).union(
         sa.select([
             relationships_table.c.id
         ]).where(
-            sa.and_(
-                relationships_table.c.source_id.in_(audit_ids),
-                relationships_table.c.source_type == all_models.Audit.__name__
-            )
+            sa.and_(*source_filter)
         )
     )
     id_rows = db.session.execute(select_statement).fetchall()
 
     return {row.id for row in id_rows}
 
-  def _create_audit_relationships(self):
+  def _create_audit_relationships(self, snapshot_ids=None):
     """Create relationships between snapshot objects and audits.
 
     Generally snapshots are related to audits by default, but we also duplicate
     this data in relationships table for ACL propagation.
+
+    Args:
+      snapshot_ids: ids of snapshots to create the relationships for, all
+        snapshots of the audits if None.
     """
 
     relationships_table = all_models.Relationship.__table__
@@ -507,10 +584,10 @@ class SnapshotGenerator(object):
     inserter = relationships_table.insert().prefix_with("IGNORE")
 
     audit_ids = {parent.id for parent in self.parents}
-    if not audit_ids:
+    if not audit_ids or snapshot_ids is not None and not snapshot_ids:
       return
 
-    old_ids = self._get_audit_relationships(audit_ids)
+    old_ids = self._get_audit_relationships(audit_ids, snapshot_ids)
 
     select_statement = sa.select([
         sa.literal(get_current_user_id()),
@@ -525,6 +602,10 @@ class SnapshotGenerator(object):
     ).where(
         snapshot_table.c.parent_id.in_(audit_ids)
     )
+    if snapshot_ids is not None:
+      select_statement = select_statement.where(
+          snapshot_table.c.id.in_(snapshot_ids)
+      )
 
     db.session.execute(
         inserter.from_select(
@@ -541,8 +622,12 @@ class SnapshotGenerator(object):
         )
     )
 
-    new_ids = self._get_audit_relationships(audit_ids)
+    new_ids = self._get_audit_relationships(audit_ids, snapshot_ids)
     created_ids = new_ids.difference(old_ids)
+    if created_ids:
+      relationship_adjacency.add_relationships(
+          relationships_table.c.id.in_(created_ids)
+      )
     acl.add_relationships(created_ids)
 
   def _remove_lost_snapshot_mappings(self):
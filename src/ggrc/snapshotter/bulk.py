@@ -0,0 +1,99 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Background creation of snapshots for audits with large scopes.
+
+Snapshots of audits with at least SNAPSHOT_BULK_THRESHOLD objects in scope
+are created by a background task. The task creates, indexes and commits the
+snapshots in chunks of SNAPSHOT_BULK_CHUNK_SIZE and reports the progress in
+the background operation of the audit.
+"""
+
+import logging
+
+import flask
+
+from ggrc import db
+from ggrc import settings
+from ggrc.app import app
+from ggrc.models import all_models
+from ggrc.models import background_task
+from ggrc.models import inflector
+from ggrc.snapshotter import SnapshotGenerator
+from ggrc.utils import benchmark
+
+
+logger = logging.getLogger(__name__)
+
+OPERATION_TYPE = "create_snapshots"
+
+
+def create_audit_snapshots(obj, event):
+  """Create snapshots of the object scope now or in a background task.
+
+  Returns:
+    OperationResponse if the snapshots were created, created BackgroundTask
+    otherwise.
+  """
+  generator = SnapshotGenerator(dry_run=False)
+  db.session.add(obj)
+  generator.add_parent(obj)
+  for_create = None
+  if settings.SNAPSHOT_BULK_THRESHOLD > 0:
+    for_create, _ = generator.analyze()
+    if len(for_create) >= settings.SNAPSHOT_BULK_THRESHOLD:
+      logger.info("Creating %s snapshots of %s %s in background",
+                  len(for_create), obj.type, obj.id)
+      return create_snapshots_bg(obj, event)
+  with benchmark("Snapshot.create_audit_snapshots.create"):
+    return generator.create(event=event, revisions=set(),
+                            for_create=for_create)
+
+
+def create_snapshots_bg(obj, event):
+  """Create snapshots of the object scope in a background task."""
+  task = background_task.create_task(
+      name=OPERATION_TYPE,
+      url=flask.url_for(run_create_snapshots_bg.__name__),
+      parameters={
+          "parent": {"type": obj.type, "id": obj.id},
+          "event_id": event.id if event else None,
+      },
+      queued_callback=run_create_snapshots_bg,
+      operation_type=OPERATION_TYPE,
+  )
+  db.session.commit()
+  return task
+
+
+def _update_progress(bg_operation, done, total):
+  """Store the number of created snapshots in the background operation."""
+  if bg_operation is None:
+    return
+  bg_operation.objects_done = done
+  bg_operation.objects_total = total
+  db.session.add(bg_operation)
+
+
+@app.route("/_background_tasks/create_snapshots_bg", methods=["POST"])
+@background_task.queued_task
+def run_create_snapshots_bg(task):
+  """Create snapshots of the task parent scope chunk by chunk."""
+  parent = task.parameters.get("parent", {})
+  model = inflector.get_model(parent.get("type"))
+  obj = model.query.get(parent.get("id"))
+  event_id = task.parameters.get("event_id")
+  event = all_models.Event.query.get(event_id) if event_id else None
+
+  generator = SnapshotGenerator(dry_run=False)
+  generator.add_parent(obj)
+  with benchmark("Snapshot.run_create_snapshots_bg"):
+    result = generator.create_in_chunks(
+        event=event,
+        chunk_size=settings.SNAPSHOT_BULK_CHUNK_SIZE,
+        progress_callback=lambda done, total: _update_progress(
+            task.bg_operation, done, total),
+    )
+  logger.info("Created %s snapshots of %s %s",
+              len(result.response), obj.type, obj.id)
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
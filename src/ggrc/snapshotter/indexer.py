@@ -6,7 +6,6 @@
 import logging
 from collections import defaultdict
 from functools import partial
-import itertools
 
 import flask
 from sqlalchemy.sql.expression import tuple_
@@ -15,14 +14,19 @@ from sqlalchemy import orm
 from ggrc import db
 from ggrc import models
 from ggrc.app import app
+from ggrc.cache import tiered
 from ggrc.models import all_models, background_task
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
 from ggrc.fulltext import get_indexer
+from ggrc.fulltext import tokens
 from ggrc.models.reflection import AttributeInfo
 from ggrc.utils import generate_query_chunks, helpers
 
 from ggrc.snapshotter.rules import Types
 from ggrc.snapshotter.datastructures import Pair
+from ggrc.snapshotter.record_builder import RECORD_COLUMNS
+from ggrc.snapshotter.record_builder import SnapshotRecordBuilder
+from ggrc.snapshotter.record_builder import custom_attribute_entry
 from ggrc.fulltext.attributes import FullTextAttr
 
 
@@ -53,19 +57,17 @@ def _get_class_properties():
 CLASS_PROPERTIES = _get_class_properties()
 
 
-TAG_TMPL = u"{parent_type}-{parent_id}-{child_type}"
-PARENT_PROPERTY_TMPL = u"{parent_type}-{parent_id}"
-CHILD_PROPERTY_TMPL = u"{child_type}-{child_id}"
-
-
+@tiered.cached("snapshot_custom_attributes",
+               stamps=(tiered.CUSTOM_ATTRIBUTE_DEFINITIONS,))
 def _get_custom_attribute_dict():
   """Get fulltext indexable properties for all snapshottable objects
 
   Args:
     None
   Returns:
-    custom_attribute_definitions dict - representing dictionary of custom
-                                        attribute definition attributes.
+    custom_attribute_definitions dict - representing dictionary of
+                                        custom_attribute_entry tuples of
+                                        every snapshottable type.
   """
   # pylint: disable=protected-access
   cadef_klass_names = {
@@ -79,37 +81,10 @@ def _get_custom_attribute_dict():
   ).options(orm.undefer('title'))
   cads = defaultdict(list)
   for cad in query:
-    cads[cadef_klass_names[cad.definition_type]].append(cad)
-  return cads
-
-
-def get_searchable_attributes(attributes, cads, content):
-  """Get all searchable attributes for a given object that should be indexed
-
-  Args:
-    attributes: Attributes that should be extracted from some model
-    cads: list of CAD instances
-    content: dictionary (JSON) representation of an object
-  Return:
-    Dict of "key": "value" from objects revision
-  """
-  searchable_values = {}
-  for attr in attributes:
-    value = attr.get_attribute_revisioned_value(content)
-    searchable_values[attr.alias] = value
-
-  cav_dict = {v["custom_attribute_id"]: v
-              for v in content.get("custom_attribute_values", [])}
-  for cad in cads:
-    cav = cav_dict.get(cad.id)
-    if not cav:
-      value = cad.get_indexed_value(cad.default_value)
-    elif cad.attribute_type == "Map:Person":
-      value = cav.get("attribute_object")
-    else:
-      value = cad.get_indexed_value(cav["attribute_value"])
-    searchable_values[cad.title] = value
-  return searchable_values
+    cads[cadef_klass_names[cad.definition_type]].append(
+        custom_attribute_entry(cad)
+    )
+  return dict(cads)
 
 
 def get_options():
@@ -130,8 +105,12 @@ def get_options():
 
 
 @helpers.without_sqlalchemy_cache
-def reindex():
-  """Reindex all snapshots."""
+def reindex(table=None):
+  """Reindex all snapshots.
+
+  Args:
+    table: table to insert records into instead of the index table.
+  """
   columns = db.session.query(
       models.Snapshot.parent_type,
       models.Snapshot.parent_id,
@@ -144,11 +123,11 @@ def reindex():
     handled += query_chunk.count()
     logger.info("Snapshot: %s/%s", handled, all_count)
     pairs = {Pair.from_4tuple(p) for p in query_chunk}
-    reindex_pairs(pairs)
+    reindex_pairs(pairs, table)
     db.session.commit()
 
 
-def reindex_snapshots(snapshot_ids):
+def reindex_snapshots(snapshot_ids, table=None):
   """Reindex selected snapshots"""
   if not snapshot_ids:
     return
@@ -160,7 +139,7 @@ def reindex_snapshots(snapshot_ids):
   ).filter(models.Snapshot.id.in_(snapshot_ids))
   for query_chunk in generate_query_chunks(columns):
     pairs = {Pair.from_4tuple(p) for p in query_chunk}
-    reindex_pairs(pairs)
+    reindex_pairs(pairs, table)
     db.session.commit()
 
 
@@ -174,192 +153,41 @@ def delete_records(snapshot_ids):
       Record.type == "Snapshot",
       Record.key.in_(snapshot_ids)
   ).delete(synchronize_session=False)
+  tokens.delete_objects("Snapshot", snapshot_ids)
   db.session.commit()
 
 
-def insert_records(payload):
-  """Insert records to full text table.
-
-  Args:
-    payload: List of dictionaries that represent records entries.
-  """
-  engine = db.engine
-  engine.execute(Record.__table__.insert(), payload)
-  db.session.commit()
-
-
-def get_person_data(rec, person):
-  """Get list of Person properties for fulltext indexing
-  """
-  indexer = get_indexer()
-  builder = indexer.get_builder(models.Person)
-  subprops = builder.build_person_subprops(person)
-  for key, val in subprops.items():
-    newrec = rec.copy()
-    newrec.update({"subproperty": key, "content": val})
-    yield newrec
+def insert_rows(rows, table=None):
+  """Insert record rows with a single executemany call.
 
-
-def get_person_sort_subprop(rec, people):
-  """Get a special subproperty for sorting
-  """
-  indexer = get_indexer()
-  builder = indexer.get_builder(models.Person)
-  subprops = builder.build_list_sort_subprop(people)
-  for key, val in subprops.items():
-    newrec = rec.copy()
-    newrec.update({"subproperty": key, "content": val})
-    yield newrec
-
-
-def get_access_control_role_data(rec, ac_list_item):
-  """Get list of access control data for fulltext indexing
-  """
-  indexer = get_indexer()
-  builder = indexer.get_builder(models.Person)
-  ac_role_name, person_id = (builder.get_ac_role_person_id(ac_list_item))
-  if ac_role_name:
-    for key, val in builder.build_person_subprops({"id": person_id}).items():
-      newrec = rec.copy()
-      newrec.update({"property": ac_role_name,
-                     "subproperty": key,
-                     "content": val})
-      yield newrec
-
-
-def get_access_control_sort_subprop(rec, access_control_list):
-  """Get a special access_control_list subproperty for sorting
-  """
-  builder = get_indexer().get_builder(models.Person)
-  collection = defaultdict(list)
-  for ac_list_item in access_control_list:
-    ac_role_name, person_id = builder.get_ac_role_person_id(ac_list_item)
-    if ac_role_name:
-      collection[ac_role_name].append({"id": person_id})
-  for ac_role_name, people in collection.iteritems():
-    for prop in get_person_sort_subprop({"property": ac_role_name}, people):
-      newrec = rec.copy()
-      newrec.update(prop)
-      yield newrec
-
-
-def get_display_name_sort_subprop(rec, category_list):
-  """Get a display_name list subproperty for sorting
-  """
-  newrec = rec.copy()
-  newrec.update({
-      "content": ":".join(sorted([c.get("display_name", None)
-                                  for c in category_list])),
-      "subproperty": "__sort__",
-  })
-  yield newrec
-
-
-def get_display_name_data(rec, category_item, subproperty_name):
-  """Get display name for fulltext indexing
-  """
-  newrec = rec.copy()
-  newrec.update({
-      "content": category_item.get("display_name"),
-      "subproperty": "{}-{}".format(category_item.get("id"),
-                                    subproperty_name)})
-  yield newrec
-
-
-def get_properties(snapshot):
-  """Return properties for sent revision dict and pair object."""
-  properties = snapshot["revision"].copy()
-  properties.update({
-      "parent": PARENT_PROPERTY_TMPL.format(**snapshot),
-      "child": CHILD_PROPERTY_TMPL.format(**snapshot),
-      "child_type": snapshot["child_type"],
-      "child_id": snapshot["child_id"]
-  })
-  assignees = properties.pop("assignees", None) or []
-  for person, roles in assignees:
-    if person:
-      for role in roles:
-        properties[role] = [person]
-  return properties
-
-
-def get_record_value(prop, val, rec, options):
-  """Return iterable object with record.
-
-  Return iterable object with record
-  as element of that object.
+  Tokens of the records are indexed only if they are inserted into the index
+  table.
 
   Args:
-    prop: prepared data of property.
-    val: content of property.
-    options: dictionary containing {id: title} of
-      all existing options.
-
-  Returns:
-    iterable object with record as element of
-    that object.
+    rows: list of tuples of RECORD_COLUMNS values.
+    table: table to insert records into instead of the index table.
   """
-  if not prop or val is None:
-    return []
-  rec["property"] = prop
-  rec["content"] = val
-  # check custom values at first
-  if isinstance(val, dict) and val.get("type") == "Person":
-    return itertools.chain(get_person_data(rec, val),
-                           get_person_sort_subprop(rec, [val]))
-  if isinstance(val, list):
-    return get_list_record_value(prop, rec, val)
-  # Option.title isn't included into content for old revisions.
-  # It will be filled from currently existing options.
-  if isinstance(val, dict):
-    if "title" in val:
-      rec["content"] = val["title"]
-    elif val.get("type") == "Option" and val["id"] in options:
-      rec["content"] = options[val["id"]]
-  if isinstance(val, (bool, int, long)):
-    rec["content"] = unicode(val)
-  if isinstance(rec["content"], basestring):
-    return [rec]
-  logger.warning(u"Unsupported value for %s #%s in %s %s: %r",
-                 rec["type"], rec["key"], rec["property"],
-                 rec["subproperty"], rec["content"])
-  return []
-
-
-def get_list_record_value(prop, rec, val):
-  """Return itearble object with record as element of that object. val->list"""
-  if val and all([p.get("type") == "Person" for p in val]):
-    sort_getter = get_person_sort_subprop
-    item_getter = get_person_data
-  elif prop == "access_control_list":
-    sort_getter = get_access_control_sort_subprop
-    item_getter = get_access_control_role_data
-  elif prop in ("assertions", "categories"):
-    sort_getter = get_display_name_sort_subprop
-    item_getter = partial(get_display_name_data,
-                          subproperty_name="category")
-  elif prop == "documents_reference_url":
-    sort_getter = get_display_name_sort_subprop
-    item_getter = partial(get_display_name_data,
-                          subproperty_name="link")
-  else:
-    return []
-  results = [item_getter(rec, i) for i in val]
-  results.append(sort_getter(rec, val))
-  return itertools.chain(*results)
+  if table is None:
+    tokens.add_record_tuples(rows, RECORD_COLUMNS)
+    table = Record.__table__
+  statement = u"INSERT INTO {table} ({columns}) VALUES ({values})".format(
+      table=table.name,
+      columns=u", ".join(u"`{}`".format(column) for column in RECORD_COLUMNS),
+      values=u", ".join([u"%s"] * len(RECORD_COLUMNS)),
+  )
+  db.engine.execute(statement, rows)
 
 
-def reindex_pairs(pairs):
+def reindex_pairs(pairs, table=None):
   """Reindex selected snapshots.
 
   Args:
     pairs: A list of parent-child pairs that uniquely represent snapshot
     object whose properties should be reindexed.
+    table: table to write records into instead of the index table.
   """
   if not pairs:
     return
-  snapshots = dict()
-  options = get_options()
   snapshot_query = models.Snapshot.query.filter(
       tuple_(
           models.Snapshot.parent_type,
@@ -385,38 +213,35 @@ def reindex_pairs(pairs):
           "revision_id",
       )
   )
-  cad_dict = _get_custom_attribute_dict()
-  for snapshot in snapshot_query:
+  snapshot_list = snapshot_query.all()
+  models.Revision.preload_content(
+      [snapshot.revision for snapshot in snapshot_list]
+  )
+  snapshot_ids = [snapshot.id for snapshot in snapshot_list]
+  if table is None:
+    delete_records(snapshot_ids)
+  else:
+    db.session.execute(table.delete().where(
+        table.c.type == "Snapshot"
+    ).where(
+        table.c.key.in_(snapshot_ids)
+    ))
+    db.session.commit()
+
+  builder = SnapshotRecordBuilder(
+      class_properties=CLASS_PROPERTIES,
+      cads=_get_custom_attribute_dict(),
+      options=get_options(),
+      person_builder=get_indexer().get_builder(models.Person),
+      writer=partial(insert_rows, table=table),
+  )
+  for snapshot in snapshot_list:
     revision = snapshot.revision
-    snapshots[snapshot.id] = {
-        "id": snapshot.id,
-        "parent_type": snapshot.parent_type,
-        "parent_id": snapshot.parent_id,
-        "child_type": snapshot.child_type,
-        "child_id": snapshot.child_id,
-        "revision": get_searchable_attributes(
-            CLASS_PROPERTIES[revision.resource_type],
-            cad_dict[revision.resource_type],
-            revision.content)
-    }
-  search_payload = []
-  for snapshot in snapshots.values():
-    for prop, val in get_properties(snapshot).items():
-      search_payload.extend(
-          get_record_value(
-              prop,
-              val,
-              {
-                  "key": snapshot["id"],
-                  "type": "Snapshot",
-                  "tags": TAG_TMPL.format(**snapshot),
-                  "subproperty": "",
-              },
-              options
-          )
-      )
-  delete_records(snapshots.keys())
-  insert_records(search_payload)
+    builder.add(snapshot.id, snapshot.parent_type, snapshot.parent_id,
+                snapshot.child_type, snapshot.child_id,
+                revision.resource_type, revision.content)
+  builder.flush()
+  db.session.commit()
 
 
 def reindex_pairs_bg(pairs):
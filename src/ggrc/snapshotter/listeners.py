@@ -3,11 +3,14 @@
 
 """Register various listeners needed for snapshot operation"""
 
+import sqlalchemy as sa
+
 from ggrc import db
 from ggrc import models
 from ggrc.login import get_current_user_id
+from ggrc.models import relationship_adjacency
 from ggrc.services import signals
-from ggrc.snapshotter import create_snapshots
+from ggrc.snapshotter import bulk
 from ggrc.snapshotter import upsert_snapshots
 from ggrc.snapshotter.datastructures import Stub
 from ggrc.snapshotter.rules import get_rules
@@ -18,7 +21,7 @@ def create_all(sender, obj=None, src=None, service=None, event=None):  # noqa
   del sender, service  # Unused
   # We use "operation" for non-standard operations (e.g. cloning)
   if not src.get("operation"):
-    create_snapshots(obj, event)
+    bulk.create_audit_snapshots(obj, event)
 
 
 def upsert_all(
@@ -67,6 +70,15 @@ def _copy_snapshot_relationships(*_, **kwargs):
       "parent_id": kwargs.get("obj").parent.id,
       "snapshot_id": kwargs.get("obj").id
   })
+  rel_table = models.Relationship.__table__
+  relationship_adjacency.add_relationships(sa.and_(
+      rel_table.c.source_type == models.Snapshot.__name__,
+      rel_table.c.destination_type == models.Snapshot.__name__,
+      sa.or_(
+          rel_table.c.source_id == kwargs.get("obj").id,
+          rel_table.c.destination_id == kwargs.get("obj").id,
+      ),
+  ))
 
 
 def register_snapshot_listeners():
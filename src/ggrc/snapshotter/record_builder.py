@@ -0,0 +1,232 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Columnar builder of full text records for snapshots.
+
+Searchable attributes and custom attribute definitions of every resource type
+are resolved once into an AttributePlan. SnapshotRecordBuilder turns revision
+contents of snapshots into rows of RECORD_COLUMNS tuples, keeps them in a
+buffer and passes every full batch of rows to the writer.
+"""
+
+import logging
+from collections import defaultdict
+
+from ggrc.fulltext.attributes import FullTextAttr
+
+
+logger = logging.getLogger(__name__)
+
+RECORD_COLUMNS = ("key", "type", "tags", "property", "subproperty", "content")
+
+# Number of rows written with one executemany call.
+RECORD_BATCH_SIZE = 10000
+
+SNAPSHOT_TYPE = u"Snapshot"
+SORT_SUBPROPERTY = u"__sort__"
+TAG_TMPL = u"{}-{}-{}"
+PARENT_PROPERTY_TMPL = u"{}-{}"
+CHILD_PROPERTY_TMPL = u"{}-{}"
+
+DISPLAY_NAME_SUBPROPERTIES = {
+    "assertions": "category",
+    "categories": "category",
+    "documents_reference_url": "link",
+}
+
+
+def custom_attribute_entry(cad):
+  """Get values of the custom attribute definition used for indexing.
+
+  Entries hold plain values only, so they can be cached across sessions.
+
+  Returns:
+    tuple of id, title, Map:Person flag, value mapping and indexed default
+    value of the definition.
+  """
+  return (
+      cad.id,
+      cad.title,
+      cad.attribute_type == "Map:Person",
+      cad.value_mapping,
+      cad.get_indexed_value(cad.default_value),
+  )
+
+
+class AttributePlan(object):
+  """Searchable attributes and custom attributes of a resource type."""
+  # pylint: disable=too-few-public-methods
+
+  def __init__(self, attributes, cads):
+    """Resolve attribute getters and custom attribute defaults.
+
+    Args:
+      attributes: FullTextAttr instances of the resource type;
+      cads: CustomAttributeDefinition instances of the resource type or
+        their custom_attribute_entry tuples.
+    """
+    plain_getter = FullTextAttr.get_attribute_revisioned_value.im_func
+    self.plain_aliases = []
+    self.getters = []
+    for attr in attributes:
+      getter = type(attr).get_attribute_revisioned_value.im_func
+      if getter is plain_getter:
+        self.plain_aliases.append(attr.alias)
+      else:
+        self.getters.append((attr.alias, attr.get_attribute_revisioned_value))
+    self.cads = [
+        cad if isinstance(cad, tuple) else custom_attribute_entry(cad)
+        for cad in cads
+    ]
+
+  def values(self, content):
+    """Get dict of searchable values from the revision content."""
+    values = {alias: content.get(alias) for alias in self.plain_aliases}
+    for alias, getter in self.getters:
+      values[alias] = getter(content)
+    if self.cads:
+      cavs = {cav["custom_attribute_id"]: cav
+              for cav in content.get("custom_attribute_values", [])}
+      for cad_id, title, is_person, mapping, default in self.cads:
+        cav = cavs.get(cad_id)
+        if not cav:
+          value = default
+        elif is_person:
+          value = cav.get("attribute_object")
+        else:
+          value = cav["attribute_value"]
+          value = mapping.get(value, value)
+        values[title] = value
+    return values
+
+
+class SnapshotRecordBuilder(object):
+  """Builder of full text record rows of snapshots."""
+
+  def __init__(self, class_properties, cads, options, person_builder,
+               writer, batch_size=RECORD_BATCH_SIZE):
+    """Prepare the builder.
+
+    Args:
+      class_properties: dict of resource type and its FullTextAttrs;
+      cads: dict of resource type and its custom attribute definitions;
+      options: dict of option id and title;
+      person_builder: fulltext record builder of Person;
+      writer: function writing a list of rows;
+      batch_size: number of rows passed to the writer at once.
+    """
+    # pylint: disable=too-many-arguments
+    self.class_properties = class_properties
+    self.cads = cads
+    self.options = options
+    self.person_builder = person_builder
+    self.writer = writer
+    self.batch_size = batch_size
+    self.plans = {}
+    self.rows = []
+    self.rows_count = 0
+
+  def plan(self, resource_type):
+    """Get attribute plan of the resource type."""
+    plan = self.plans.get(resource_type)
+    if plan is None:
+      plan = AttributePlan(self.class_properties[resource_type],
+                           self.cads.get(resource_type, ()))
+      self.plans[resource_type] = plan
+    return plan
+
+  def add(self, snapshot_id, parent_type, parent_id, child_type, child_id,
+          resource_type, content):
+    """Add rows of a snapshot and write them if the batch is full."""
+    # pylint: disable=too-many-arguments
+    properties = self.plan(resource_type).values(content)
+    properties["parent"] = PARENT_PROPERTY_TMPL.format(parent_type, parent_id)
+    properties["child"] = CHILD_PROPERTY_TMPL.format(child_type, child_id)
+    properties["child_type"] = child_type
+    properties["child_id"] = child_id
+    assignees = properties.pop("assignees", None) or []
+    for person, roles in assignees:
+      if person:
+        for role in roles:
+          properties[role] = [person]
+
+    prefix = (snapshot_id, SNAPSHOT_TYPE,
+              TAG_TMPL.format(parent_type, parent_id, child_type))
+    for prop, val in properties.iteritems():
+      if prop and val is not None:
+        self._add_value(prefix, prop, val)
+    if len(self.rows) >= self.batch_size:
+      self.flush()
+
+  def flush(self):
+    """Write all buffered rows."""
+    if self.rows:
+      self.writer(self.rows)
+      self.rows_count += len(self.rows)
+      del self.rows[:]
+
+  def _add_people(self, prefix, prop, people):
+    """Add rows of person properties and the sort row of the people."""
+    rows = self.rows
+    for person in people:
+      for subprop, content in self.person_builder.build_person_subprops(
+          person).iteritems():
+        rows.append(prefix + (prop, subprop, content))
+    for subprop, content in self.person_builder.build_list_sort_subprop(
+        people).iteritems():
+      rows.append(prefix + (prop, subprop, content))
+
+  def _add_access_control_list(self, prefix, acl):
+    """Add rows of people in access control roles."""
+    people = defaultdict(list)
+    for item in acl:
+      role_name, person_id = self.person_builder.get_ac_role_person_id(item)
+      if role_name:
+        people[role_name].append({"id": person_id})
+    for role_name, role_people in people.iteritems():
+      self._add_people(prefix, role_name, role_people)
+
+  def _add_display_names(self, prefix, prop, items, subprop):
+    """Add rows of display names of list items and their sort row."""
+    rows = self.rows
+    for item in items:
+      rows.append(prefix + (prop, u"{}-{}".format(item.get("id"), subprop),
+                            item.get("display_name")))
+    rows.append(prefix + (
+        prop,
+        SORT_SUBPROPERTY,
+        ":".join(sorted([item.get("display_name", None) for item in items])),
+    ))
+
+  def _add_value(self, prefix, prop, val):
+    """Add rows of a property value."""
+    # pylint: disable=too-many-return-statements
+    if isinstance(val, basestring):
+      self.rows.append(prefix + (prop, u"", val))
+      return
+    if isinstance(val, (bool, int, long)):
+      self.rows.append(prefix + (prop, u"", unicode(val)))
+      return
+    if isinstance(val, list):
+      if val and all([item.get("type") == "Person" for item in val]):
+        self._add_people(prefix, prop, val)
+      elif prop == "access_control_list":
+        self._add_access_control_list(prefix, val)
+      elif prop in DISPLAY_NAME_SUBPROPERTIES:
+        self._add_display_names(prefix, prop, val,
+                                DISPLAY_NAME_SUBPROPERTIES[prop])
+      return
+    content = val
+    if isinstance(val, dict):
+      if val.get("type") == "Person":
+        self._add_people(prefix, prop, [val])
+        return
+      if "title" in val:
+        content = val["title"]
+      elif val.get("type") == "Option" and val["id"] in self.options:
+        content = self.options[val["id"]]
+    if isinstance(content, basestring):
+      self.rows.append(prefix + (prop, u"", content))
+      return
+    logger.warning(u"Unsupported value for %s #%s in %s %s: %r",
+                   prefix[1], prefix[0], prop, u"", content)
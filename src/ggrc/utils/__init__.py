@@ -21,6 +21,7 @@ from sqlalchemy.orm import class_mapper
 import flask
 from ggrc.settings import CUSTOM_URL_ROOT
 from ggrc.utils import benchmarks
+from ggrc.utils import keyset
 
 
 logger = logging.getLogger()
@@ -286,12 +287,40 @@ def iso_to_us_date(date_string):
   return convert_date_format(date_string, DATE_FORMAT_ISO, DATE_FORMAT_US)
 
 
-def generate_query_chunks(query, chunk_size=CHUNK_SIZE):
-  """Make a generator splitting `query` into chunks of size `chunk_size`."""
-  count = query.count()
-  query = query.order_by("id")
-  for offset in range(0, count, chunk_size):
-    yield query.limit(chunk_size).offset(offset)
+def _get_query_id_column(query):
+  """Get id column of the first entity selected by the query."""
+  expr = query.column_descriptions[0]["expr"]
+  return getattr(expr, "class_", expr).id
+
+
+def generate_query_chunks(query, chunk_size=CHUNK_SIZE, key=None):
+  """Make a generator splitting `query` into chunks of size `chunk_size`.
+
+  Chunks are bounded by key ranges found with keyset pagination, so late
+  chunks are as cheap to fetch as the first ones.
+
+  Args:
+    query: query to split, without ordering, limit and offset;
+    chunk_size: maximum number of rows in a chunk;
+    key: unique column used to split the query, defaults to the id of the
+      first entity selected by the query.
+  """
+  if key is None:
+    key = _get_query_id_column(query)
+  sort_keys = [(key, False)]
+  last_key = None
+  while True:
+    chunk = query
+    if last_key is not None:
+      chunk = chunk.filter(keyset.keyset_condition(sort_keys, [last_key]))
+    keys = keyset.order_by_keys(chunk.with_entities(key), sort_keys)
+    upper_key = keys.offset(chunk_size - 1).limit(1).scalar()
+    if upper_key is None:
+      if keys.limit(1).scalar() is not None:
+        yield keyset.order_by_keys(chunk, sort_keys)
+      return
+    yield keyset.order_by_keys(chunk.filter(key <= upper_key), sort_keys)
+    last_key = upper_key
 
 
 def list_chunks(list_, chunk_size=CHUNK_SIZE):
@@ -0,0 +1,140 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Keyset (seek) pagination helpers.
+
+Keyset pagination continues from the sort key of the last returned row instead
+of skipping OFFSET rows, so the cost of a page does not depend on its position.
+
+Sort keys are lists of (expression, desc) tuples. The last sort key must be
+unique (usually the object id), otherwise rows with equal keys can be skipped.
+NULL values are treated as the smallest ones, as MySQL does.
+"""
+
+import base64
+import datetime
+import decimal
+import json
+
+import sqlalchemy as sa
+from sqlalchemy.util import KeyedTuple
+
+
+DATETIME_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S")
+
+
+def _encode_value(value):
+  """Make sort key value JSON serializable."""
+  if isinstance(value, datetime.datetime):
+    return {"datetime": value.isoformat()}
+  if isinstance(value, datetime.date):
+    return {"date": value.isoformat()}
+  if isinstance(value, decimal.Decimal):
+    return {"decimal": str(value)}
+  return value
+
+
+def _decode_value(value):
+  """Restore sort key value encoded with _encode_value."""
+  if not isinstance(value, dict):
+    return value
+  if "date" in value:
+    return datetime.datetime.strptime(value["date"], "%Y-%m-%d").date()
+  if "decimal" in value:
+    try:
+      return decimal.Decimal(value["decimal"])
+    except (TypeError, decimal.InvalidOperation):
+      raise ValueError("Invalid cursor value")
+  for datetime_format in DATETIME_FORMATS:
+    try:
+      return datetime.datetime.strptime(value["datetime"], datetime_format)
+    except (KeyError, TypeError, ValueError):
+      continue
+  raise ValueError("Invalid cursor value")
+
+
+def encode_cursor(values):
+  """Make an opaque cursor from the sort key values of a row."""
+  return base64.urlsafe_b64encode(json.dumps([_encode_value(value)
+                                              for value in values]))
+
+
+def decode_cursor(cursor, length):
+  """Get sort key values from the cursor.
+
+  Raises:
+    ValueError if the cursor is malformed or does not match sort keys.
+  """
+  try:
+    values = json.loads(base64.urlsafe_b64decode(str(cursor)))
+  except (TypeError, ValueError, UnicodeEncodeError):
+    raise ValueError("Invalid cursor")
+  if not isinstance(values, list) or len(values) != length:
+    raise ValueError("Invalid cursor")
+  return [_decode_value(value) for value in values]
+
+
+def keyset_condition(sort_keys, values):
+  """Build the condition selecting rows that follow `values` in sort order."""
+  (column, desc), value = sort_keys[0], values[0]
+  tail = None
+  if len(sort_keys) > 1:
+    tail = keyset_condition(sort_keys[1:], values[1:])
+
+  if value is None:
+    equal = column.is_(None)
+    after = None if desc else column.isnot(None)
+  else:
+    equal = column == value
+    if desc:
+      after = sa.or_(column < value, column.is_(None))
+    else:
+      after = column > value
+
+  conditions = [after] if after is not None else []
+  if tail is not None:
+    conditions.append(sa.and_(equal, tail))
+  if not conditions:
+    return sa.false()
+  return sa.or_(*conditions)
+
+
+def order_by_keys(query, sort_keys):
+  """Order query by the sort keys."""
+  return query.order_by(*[column.desc() if desc else column
+                          for column, desc in sort_keys])
+
+
+def get_page(query, sort_keys, cursor, page_size):
+  """Get one page of query rows that follow the cursor.
+
+  Args:
+    query: query without ordering, limit and offset;
+    sort_keys: list of (expression, desc) tuples ending with a unique key;
+    cursor: cursor returned with the previous page, None for the first page;
+    page_size: maximum number of rows to return.
+
+  Returns:
+    a tuple (rows, next_cursor), next_cursor is None for the last page.
+
+  Raises:
+    ValueError if the cursor is invalid.
+  """
+  if cursor:
+    values = decode_cursor(cursor, len(sort_keys))
+    query = query.filter(keyset_condition(sort_keys, values))
+  labels = ["keyset_{}".format(index) for index in range(len(sort_keys))]
+  query = order_by_keys(query, sort_keys).add_columns(*[
+      column.label(label) for (column, _), label in zip(sort_keys, labels)
+  ])
+  rows = query.limit(page_size + 1).all()
+
+  next_cursor = None
+  if len(rows) > page_size:
+    rows = rows[:page_size]
+    next_cursor = encode_cursor([getattr(rows[-1], label)
+                                 for label in labels])
+  columns_count = len(query.column_descriptions) - len(labels)
+  rows = [KeyedTuple(row[:columns_count], row.keys()[:columns_count])
+          for row in rows]
+  return rows, next_cursor
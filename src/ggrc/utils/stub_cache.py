@@ -0,0 +1,176 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Cache of stub data of objects rendered in JSON representations.
+
+Stub data of an object is keyed by (type, id) of the stub and consists of the
+actual type of the object, its context_id and updated_at. It is looked up in
+
+  * the request cache kept in flask.g for the current request;
+  * objects loaded by utils.referenced_objects for the current request;
+  * the process LRU cache of STUB_CACHE_SIZE entries, every entry lives for
+    STUB_CACHE_TTL seconds.
+
+Entries of objects updated or deleted in a flush of this process are dropped
+from both caches. Changes made by other processes become visible in this
+process when the entries expire.
+"""
+
+import collections
+import threading
+import time
+
+import flask
+import sqlalchemy as sa
+from sqlalchemy.orm.session import Session
+
+from ggrc import settings
+from ggrc.models import inflector
+
+
+StubData = collections.namedtuple(
+    "StubData", ["type", "context_id", "updated_at"])
+
+
+class LRUCache(object):
+  """Thread safe LRU cache with expiring entries."""
+
+  def __init__(self, size, ttl):
+    self.size = size
+    self.ttl = ttl
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key):
+    """Get value of a not expired entry or None."""
+    if self.size <= 0:
+      return None
+    with self._lock:
+      entry = self._entries.pop(key, None)
+      if entry is None:
+        return None
+      value, expires_at = entry
+      if expires_at < time.time():
+        return None
+      self._entries[key] = entry
+      return value
+
+  def set(self, key, value):
+    """Store the value and evict the least recently used entries."""
+    if self.size <= 0:
+      return
+    with self._lock:
+      self._entries.pop(key, None)
+      self._entries[key] = (value, time.time() + self.ttl)
+      while len(self._entries) > self.size:
+        self._entries.popitem(last=False)
+
+  def delete(self, key):
+    """Drop the entry."""
+    with self._lock:
+      self._entries.pop(key, None)
+
+  def clear(self):
+    """Drop all entries."""
+    with self._lock:
+      self._entries.clear()
+
+
+_process_cache = LRUCache(settings.STUB_CACHE_SIZE, settings.STUB_CACHE_TTL)
+
+
+def _request_cache():
+  """Get the stub cache of the current request or None."""
+  if not flask.has_app_context():
+    return None
+  if not hasattr(flask.g, "stub_cache"):
+    flask.g.stub_cache = {}
+  return flask.g.stub_cache
+
+
+def _get_referenced(type_, id_):
+  """Get stub data of an object loaded by referenced_objects."""
+  ref_objects = getattr(flask.g, "referenced_objects", None)
+  if not ref_objects:
+    return None
+  model = inflector.get_model(type_)
+  obj = ref_objects.get(model, {}).get(id_)
+  if obj is None:
+    return None
+  return StubData(type(obj).__name__, obj.context_id, obj.updated_at)
+
+
+def _count(hits, misses):
+  """Add hits and misses to the counters of the current request."""
+  if flask.has_app_context():
+    counters = getattr(flask.g, "stub_cache_counters", None)
+    if counters is None:
+      counters = flask.g.stub_cache_counters = collections.Counter()
+    counters["hits"] += hits
+    counters["misses"] += misses
+
+
+def get_counters():
+  """Get Counter of hits and misses in the current request."""
+  return getattr(flask.g, "stub_cache_counters", collections.Counter())
+
+
+def get_many(keys):
+  """Get cached stub data of the (type, id) keys.
+
+  Returns:
+    dict of found keys and their StubData.
+  """
+  request_cache = _request_cache()
+  found = {}
+  for key in keys:
+    data = request_cache.get(key) if request_cache is not None else None
+    if data is None and flask.has_app_context():
+      data = _get_referenced(*key)
+    if data is None:
+      data = _process_cache.get(key)
+    if data is not None:
+      found[key] = data
+      if request_cache is not None:
+        request_cache[key] = data
+  _count(len(found), len(keys) - len(found))
+  return found
+
+
+def set_many(stubs):
+  """Store dict of (type, id) keys and their StubData."""
+  request_cache = _request_cache()
+  for key, data in stubs.iteritems():
+    if request_cache is not None:
+      request_cache[key] = data
+    _process_cache.set(key, data)
+
+
+def invalidate(type_, id_):
+  """Drop stub data of the object from the caches."""
+  key = (type_, id_)
+  _process_cache.delete(key)
+  request_cache = _request_cache()
+  if request_cache is not None:
+    request_cache.pop(key, None)
+
+
+def clear():
+  """Drop all cached stub data."""
+  _process_cache.clear()
+  if flask.has_app_context() and hasattr(flask.g, "stub_cache"):
+    del flask.g.stub_cache
+
+
+def invalidate_flushed(session, _):
+  """Drop stub data of objects updated or deleted in the flush."""
+  for obj in session.dirty | session.deleted:
+    id_ = getattr(obj, "id", None)
+    if id_ is None:
+      continue
+    # Stubs can be requested by the type of any mapped base class.
+    for mapper in sa.inspect(obj).mapper.iterate_to_root():
+      invalidate(mapper.class_.__name__, id_)
+
+
+sa.event.listen(Session, "after_flush", invalidate_flushed)
@@ -19,10 +19,14 @@ from ggrc import fulltext, login, models, settings, utils as ggrc_utils, \
     extensions as ggrc_extensions, converters as ggrc_converters
 from ggrc.app import app, db
 from ggrc.builder import json as builder_json
+from ggrc.cache import tiered
 from ggrc.cache import utils as cache_utils
 from ggrc.fulltext import mixin
+from ggrc.fulltext import reindex as fulltext_reindex
+from ggrc.fulltext import tokens as fulltext_tokens
 from ggrc.integrations import integrations_errors, issues
 from ggrc.models import background_task, reflection, revision
+from ggrc.models import similarity_index
 from ggrc.models.hooks.issue_tracker import integration_utils
 from ggrc.notifications import common
 from ggrc.query import views as query_views
@@ -67,17 +71,27 @@ def reindex_snapshots(_):
 
 @app.route("/_background_tasks/reindex", methods=["POST"])
 @background_task.queued_task
-def reindex(_):
+def reindex(task):
   """Web hook to update the full text search index."""
-  do_reindex()
+  do_reindex(task_id=task.id)
   return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
 @app.route("/_background_tasks/full_reindex", methods=["POST"])
 @background_task.queued_task
-def full_reindex(_):
+def full_reindex(task):
   """Web hook to update the full text search index for all models."""
-  do_full_reindex()
+  do_full_reindex(task_id=task.id)
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
+@app.route("/_background_tasks/rebuild_similarity_index", methods=["POST"])
+@background_task.queued_task
+def rebuild_similarity_index(_):
+  """Web hook to rebuild the index of similar objects."""
+  with benchmark("Rebuild similarity index"):
+    counts = similarity_index.rebuild()
+  logger.info("Rebuilt similarity index of %s objects", sum(counts.values()))
   return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
@@ -108,8 +122,11 @@ def compute_attributes(task):
 @background_task.queued_task
 def bg_update_ft_records(task):
   """Background indexing endpoint"""
-  fulltext.listeners.update_ft_records(task.parameters.get("models_ids", {}),
-                                       task.parameters.get("chunk_size"))
+  fulltext.listeners.update_ft_records(
+      task.parameters.get("models_ids", {}),
+      task.parameters.get("chunk_size"),
+      task.parameters.get("models_properties"),
+  )
   db.session.plain_commit()
   return app.make_response(('success', 200, [('Content-Type', 'text/html')]))
 
@@ -355,8 +372,14 @@ def generate_wf_tasks_notifications(_):
 
 
 @helpers.without_sqlalchemy_cache
-def do_reindex(with_reindex_snapshots=False):
-  """Update the full text search index."""
+def do_reindex(with_reindex_snapshots=False, task_id=None):
+  """Update the full text search index.
+
+  Args:
+    with_reindex_snapshots: reindex snapshots too;
+    task_id: id of the background task running the reindex. If given,
+      restarted task skips the objects it has already reindexed.
+  """
 
   indexer = fulltext.get_indexer()
   indexed_models = {
@@ -373,33 +396,47 @@ def do_reindex(with_reindex_snapshots=False):
       models.all_models.AccessControlRole.id,
       models.all_models.AccessControlRole.name,
   ))
-  for model_name in sorted(indexed_models.keys()):
-    logger.info("Updating index for: %s", model_name)
-    with benchmark("Create records for %s" % model_name):
-      model = indexed_models[model_name]
-      ids = [id_[0] for id_ in db.session.query(model.id)]
-      ids_count = len(ids)
-      handled_ids = 0
-      ids_chunks = ggrc_utils.list_chunks(ids, chunk_size=REINDEX_CHUNK_SIZE)
-      for ids_chunk in ids_chunks:
-        handled_ids += len(ids_chunk)
-        logger.info("%s: %s / %s", model.__name__, handled_ids, ids_count)
-        model.bulk_record_update_for(ids_chunk)
-        db.session.plain_commit()
+  shadow_table = None
+  if (settings.FULLTEXT_SHADOW_REINDEX and
+          fulltext_reindex.shadow_table_supported()):
+    shadow_table, shadow_created_at = fulltext_reindex.prepare_shadow_table(
+        task_id
+    )
+  fulltext_reindex.reindex_models(
+      indexed_models.values(),
+      range_size=REINDEX_CHUNK_SIZE,
+      workers=settings.REINDEX_WORKERS,
+      task_id=task_id,
+      table=shadow_table,
+  )
 
   if with_reindex_snapshots:
     logger.info("Updating index for: %s", "Snapshot")
     with benchmark("Create records for %s" % "Snapshot"):
-      snapshot_indexer.reindex()
+      snapshot_indexer.reindex(table=shadow_table)
+
+  if shadow_table is not None:
+    fulltext_reindex.swap_shadow_table(
+        shadow_table,
+        shadow_created_at,
+        indexed_models.values(),
+        with_snapshots=with_reindex_snapshots,
+    )
 
+  if fulltext_tokens.enabled():
+    with benchmark("Rebuild full text tokens"):
+      fulltext_tokens.rebuild()
+
+  if task_id is not None:
+    fulltext_reindex.delete_checkpoints(task_id)
   indexer.invalidate_cache()
 
 
 @helpers.without_sqlalchemy_cache
-def do_full_reindex():
+def do_full_reindex(task_id=None):
   """Update the full text search index for all models."""
 
-  do_reindex(with_reindex_snapshots=True)
+  do_reindex(with_reindex_snapshots=True, task_id=task_id)
   start_compute_attributes(revision_ids="all_latest")
 
 
@@ -493,6 +530,8 @@ def get_current_user_json():
     })
 
 
+@tiered.cached("access_control_roles_json",
+               stamps=(tiered.ACCESS_CONTROL_ROLES,))
 def get_access_control_roles_json():
   """Get a list of all access control roles"""
   with benchmark("Get access roles JSON"):
@@ -572,6 +611,9 @@ def get_import_definitions():
     return get_import_types(export_only=False)
 
 
+@tiered.cached("all_attributes_json",
+               stamps=(tiered.ACCESS_CONTROL_ROLES,
+                       tiered.CUSTOM_ATTRIBUTE_DEFINITIONS))
 def get_all_attributes_json(load_custom_attributes=False):
   """Get a list of all attribute definitions
 
@@ -714,6 +756,33 @@ def admin_full_reindex():
                          [('Content-Type', 'text/html')])))
 
 
+@app.route("/admin/rebuild_similarity_index", methods=["POST"])
+@login.login_required
+@login.admin_required
+def admin_rebuild_similarity_index():
+  """Calls a webhook that rebuilds the index of similar objects
+  """
+  bg_task = background_task.create_task(
+      name="rebuild_similarity_index",
+      url=flask.url_for(rebuild_similarity_index.__name__),
+      queued_callback=rebuild_similarity_index,
+  )
+  db.session.commit()
+  return bg_task.make_response(
+      app.make_response(("scheduled %s" % bg_task.name, 200,
+                         [('Content-Type', 'text/html')])))
+
+
+@app.route("/admin/cache_stats", methods=["GET"])
+@login.login_required
+@login.admin_required
+def admin_cache_stats():
+  """Get hit ratio and size of tiered caches of the serving instance."""
+  tiered.log_stats()
+  return app.make_response((json.dumps(tiered.stats()), 200,
+                            [("Content-Type", "application/json")]))
+
+
 @app.route("/admin/compute_attributes", methods=["POST"])
 @login.login_required
 @login.admin_required
@@ -809,6 +878,11 @@ def get_background_task_status(object_type, object_id):
         "operation": task.bg_operation.bg_operation_type.name,
         "errors": task.get_content().get("errors", []),
     }
+    if task.bg_operation.objects_total is not None:
+      body["progress"] = {
+          "total": task.bg_operation.objects_total,
+          "done": task.bg_operation.objects_done or 0,
+      }
     response = app.make_response(
         (json.dumps(body), 200, [("Content-Type", "application/json")])
     )
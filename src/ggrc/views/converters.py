@@ -133,10 +133,14 @@ def handle_export_request():
     export_to = data.get("export_to")
     current_time = data.get("current_time")
   with benchmark("Generate CSV string"):
-    csv_string, object_names = make_export(objects, exportable_objects)
+    csv_chunks, object_names = make_export(objects, exportable_objects,
+                                           stream=True)
   with benchmark("Make response."):
     filename = "{}_{}.csv".format(object_names, current_time)
-    return export_file(export_to, filename, csv_string)
+    if export_to == "csv":
+      return export_file(export_to, filename,
+                         flask.stream_with_context(csv_chunks))
+    return export_file(export_to, filename, "".join(csv_chunks))
 
 
 def get_csv_template(objects):
@@ -163,15 +167,23 @@ def handle_export_csv_template_request():
   return export_file(export_to, filename, csv_string)
 
 
-def make_export(objects, exportable_objects=None):
-  """Make export"""
+def make_export(objects, exportable_objects=None, stream=False):
+  """Make export
+
+  Returns:
+    tuple (CSV string or generator of CSV string chunks if stream is True,
+    object names).
+  """
   query_helper = QueryHelper(objects)
   ids_by_type = query_helper.get_ids()
   converter = ExportConverter(
       ids_by_type=ids_by_type,
       exportable_queries=exportable_objects,
   )
-  csv_data = converter.export_csv_data()
+  if stream:
+    csv_data = converter.stream_csv_data()
+  else:
+    csv_data = converter.export_csv_data()
   object_names = "_".join(converter.get_object_names())
   return csv_data, object_names
 
@@ -250,13 +262,13 @@ def run_export(task):
     ie = import_export.get(ie_id)
     check_for_previous_run()
 
-    content, _ = make_export(objects, exportable_objects)
-    db.session.refresh(ie)
+    csv_chunks, _ = make_export(objects, exportable_objects, stream=True)
+    import_export.write_content(ie, csv_chunks)
+    db.session.refresh(ie, ["status"])
     if ie.status == "Stopped":
       return utils.make_simple_response()
     ie.status = "Finished"
     ie.end_at = datetime.utcnow()
-    ie.content = content
     db.session.commit()
 
     job_emails.send_email(job_emails.EXPORT_COMPLETED, user.email,
@@ -534,7 +546,12 @@ def handle_file_download(id2):
   try:
     export_to = request.args.get("export_to")
     ie = import_export.get(id2)
-    return export_file(export_to, ie.title, ie.content.encode("utf-8"))
+    chunks = (chunk.encode("utf-8")
+              for chunk in import_export.read_content(ie))
+    if export_to == "csv":
+      return export_file(export_to, ie.title,
+                         flask.stream_with_context(chunks))
+    return export_file(export_to, ie.title, "".join(chunks))
   except (Forbidden, NotFound, Unauthorized):
     raise
   except Exception as e:
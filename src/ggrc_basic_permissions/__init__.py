@@ -159,15 +159,6 @@ def query_memcache(cache, key):
       permissions_cache (dict): dict with all permissions or None if there
                                 was a cache miss
   """
-
-  cached_keys_set = cache.get('permissions:list') or set()
-  if key not in cached_keys_set:
-    # We set the permissions:list variable so that we are able to batch
-    # remove all permissions related keys from memcache
-    cached_keys_set.add(key)
-    cache.set('permissions:list', cached_keys_set, PERMISSION_CACHE_TIMEOUT)
-    return None
-
   return memcache.blob_get(cache, key)
 
 
@@ -389,9 +380,11 @@ def load_access_control_list(user, permissions):
 
 
 def store_results_into_memcache(permissions, cache, key):
-  """Load personal context for user
+  """Store permissions of the user into memcache
 
-  This function must only be called if memcahe is enabled
+  This function must only be called if memcahe is enabled. The key contains
+  permission versions read before the permissions were loaded, so the
+  permissions stored after an invalidation are never read.
 
   Args:
       permissions (dict): dict where the permissions will be stored
@@ -401,15 +394,12 @@ def store_results_into_memcache(permissions, cache, key):
   Returns:
       None
   """
-
-  cached_keys_set = cache.get('permissions:list') or set()
-  if key in cached_keys_set and \
-     not memcache.blob_set(
-         cache,
-         key,
-         permissions,
-         exp_time=PERMISSION_CACHE_TIMEOUT,
-     ):
+  if not memcache.blob_set(
+      cache,
+      key,
+      permissions,
+      exp_time=PERMISSION_CACHE_TIMEOUT,
+  ):
     logger.error("Failed to set permissions data into memcache")
 
 
@@ -457,12 +447,11 @@ def load_permissions_for(user):
   'condition' is the string name of a conditional operator, such as 'contains'.
   'terms' are the arguments to the 'condition'.
   """
-  key = 'permissions:{}'.format(user.id)
-
   # try to get cached permissions from memcahe
   with benchmark("load_permissions > query memcache"):
     cache = _get_memcache_client()
     if cache:
+      key = cache_utils.get_permissions_key(cache, user.id)
       result = query_memcache(cache, key)
       if result:
         return result
@@ -553,6 +542,21 @@ def handle_resource_deleted(sender, obj=None, service=None):
         .delete()
 
 
+def handle_user_role_change(mapper, connection, target):
+  # pylint: disable=unused-argument
+  """Drop cached permissions of the user after the changes are committed."""
+  if not flask.has_app_context():
+    return
+  if not hasattr(flask.g, "permissions_changed_people"):
+    flask.g.permissions_changed_people = set()
+  flask.g.permissions_changed_people.add(target.person_id)
+
+
+sa.event.listen(UserRole, "after_insert", handle_user_role_change)
+sa.event.listen(UserRole, "after_update", handle_user_role_change)
+sa.event.listen(UserRole, "after_delete", handle_user_role_change)
+
+
 def contributed_services():
   """The list of all collections provided by this extension."""
   return [
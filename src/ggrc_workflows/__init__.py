@@ -13,6 +13,7 @@ from flask import Blueprint
 from sqlalchemy import inspect, orm
 
 from ggrc import db
+from ggrc import settings
 from ggrc.login import get_current_user
 from ggrc.models import all_models
 from ggrc.models.relationship import Relationship
@@ -210,10 +211,26 @@ def _create_cycle_task(task_group_task, cycle, cycle_task_group, current_user):
   return cycle_task_group_object_task
 
 
-def create_old_style_cycle(cycle, task_group, cycle_task_group, current_user):
+def _map_cycle_task(cycle_task, task_group_object, mappings=None):
+  """Map the cycle task to the object of the task group object.
+
+  If mappings list is given, (cycle_task, object_type, object_id) tuple is
+  appended to it instead of creating the Relationship.
+  """
+  if mappings is None:
+    Relationship(source=cycle_task, destination=task_group_object.object)
+  else:
+    mappings.append((cycle_task,
+                     task_group_object.object_type,
+                     task_group_object.object_id))
+
+
+def create_old_style_cycle(cycle, task_group, cycle_task_group, current_user,
+                           mappings=None):
   """ This function preserves the old style of creating cycles, so each object
   gets its own task assigned to it.
   """
+  # pylint: disable=too-many-arguments
   if len(task_group.task_group_objects) == 0:
     for task_group_task in task_group.task_group_tasks:
       cycle_task_group_object_task = _create_cycle_task(
@@ -221,16 +238,20 @@ def create_old_style_cycle(cycle, task_group, cycle_task_group, current_user):
           current_user)
 
   for task_group_object in task_group.task_group_objects:
-    object_ = task_group_object.object
     for task_group_task in task_group.task_group_tasks:
       cycle_task_group_object_task = _create_cycle_task(
           task_group_task, cycle, cycle_task_group,
           current_user)
-      Relationship(source=cycle_task_group_object_task, destination=object_)
+      _map_cycle_task(cycle_task_group_object_task, task_group_object,
+                      mappings)
+
 
+def build_cycle(workflow, cycle=None, current_user=None, mappings=None):
+  """Build a cycle with it's child objects
 
-def build_cycle(workflow, cycle=None, current_user=None):
-  """Build a cycle with it's child objects"""
+  Mappings of cycle tasks to task group objects are appended to mappings list
+  instead of creating Relationship objects if the list is given.
+  """
   build_failed = False
 
   if not workflow.tasks:
@@ -285,16 +306,16 @@ def build_cycle(workflow, cycle=None, current_user=None):
     # preserve the old cycle creation for old workflows, so each object
     # gets its own cycle task
     if workflow.is_old_workflow:
-      create_old_style_cycle(cycle, task_group, cycle_task_group, current_user)
+      create_old_style_cycle(cycle, task_group, cycle_task_group, current_user,
+                             mappings)
     else:
       for task_group_task in task_group.task_group_tasks:
         cycle_task_group_object_task = _create_cycle_task(
             task_group_task, cycle, cycle_task_group, current_user)
 
         for task_group_object in task_group.task_group_objects:
-          object_ = task_group_object.object
-          Relationship(source=cycle_task_group_object_task,
-                       destination=object_)
+          _map_cycle_task(cycle_task_group_object_task, task_group_object,
+                          mappings)
 
   update_cycle_dates(cycle)
   workflow.repeat_multiplier += 1
@@ -744,6 +765,10 @@ def init_extra_views(app):
 
 def start_recurring_cycles():
   """Start recurring cycles by cron job."""
+  if settings.CYCLE_BULK_BATCH_SIZE > 0:
+    from ggrc_workflows import bulk_cycles
+    bulk_cycles.start_recurring_cycles(settings.CYCLE_BULK_BATCH_SIZE)
+    return
   with benchmark("contributed cron job start_recurring_cycles"):
     today = date.today()
     workflows = models.Workflow.query.filter(
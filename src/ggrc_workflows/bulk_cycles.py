@@ -0,0 +1,179 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Bulk generation of recurring cycles.
+
+Workflows with cycles due today are processed in batches. Task groups, tasks,
+task group objects and people of all workflows in a batch are loaded with a
+few eager queries and the cycles of the whole batch are built in memory and
+flushed together. Mappings of cycle tasks to task group objects are inserted
+with multi-row statements instead of one ORM Relationship per mapping. Every
+batch is logged with its own Event and committed.
+"""
+
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import orm
+
+from ggrc import db
+from ggrc import login
+from ggrc import utils
+from ggrc.models import relationship_adjacency
+from ggrc.models.cache import Cache
+from ggrc.models.hooks import acl
+from ggrc.models.relationship import Relationship
+from ggrc.utils import benchmark
+from ggrc.utils.log_event import log_event
+from ggrc_workflows import build_cycle
+from ggrc_workflows import models
+from ggrc_workflows import notification
+
+
+logger = logging.getLogger(__name__)
+
+# Number of relationships inserted with one multi-row statement.
+RELATIONSHIP_CHUNK_SIZE = 1000
+
+
+def _acl_options(*path):
+  """Get options loading ACL entries and people of roleables on the path."""
+  def acl_option():
+    """Get option loading ACL entries of the objects on the path."""
+    option = orm
+    for attr in path:
+      option = option.subqueryload(attr)
+    return option.subqueryload("_access_control_list")
+  return (
+      acl_option().joinedload("ac_role"),
+      acl_option().joinedload("access_control_people").joinedload("person"),
+  )
+
+
+def get_due_workflow_ids(today):
+  """Get ids of recurring workflows with cycles due on the day."""
+  query = db.session.query(models.Workflow.id).filter(
+      models.Workflow.next_cycle_start_date <= today,
+      models.Workflow.recurrences == True  # noqa
+  ).order_by(models.Workflow.id)
+  return [workflow_id for workflow_id, in query]
+
+
+def load_workflows(workflow_ids):
+  """Load workflows with everything needed to build their cycles."""
+  return models.Workflow.query.options(
+      orm.subqueryload("task_groups").subqueryload("task_group_objects"),
+      *(_acl_options() + _acl_options("task_groups", "task_group_tasks"))
+  ).filter(
+      models.Workflow.id.in_(workflow_ids)
+  ).order_by(
+      models.Workflow.id
+  ).all()
+
+
+def insert_mappings(mappings):
+  """Insert relationships of cycle tasks to the mapped objects.
+
+  Relationships are added to the relationship adjacency index, queued for ACL
+  propagation and logged in the new objects of the session cache, so they are
+  handled as if they were created through the ORM.
+
+  Args:
+    mappings: list of flushed (cycle_task, object_type, object_id) tuples.
+
+  Returns:
+    set of ids of the inserted relationships.
+  """
+  if not mappings:
+    return set()
+  user_id = login.get_current_user_id()
+  now = datetime.utcnow()
+  inserter = Relationship.__table__.insert()
+  for chunk in utils.list_chunks(mappings, chunk_size=RELATIONSHIP_CHUNK_SIZE):
+    db.session.execute(inserter.values([
+        {
+            "id": None,
+            "modified_by_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+            "source_id": task.id,
+            "source_type": task.type,
+            "destination_id": object_id,
+            "destination_type": object_type,
+            "context_id": None,
+            "status": None,
+            "parent_id": None,
+            "automapping_id": None,
+            "is_external": False,
+        }
+        for task, object_type, object_id in chunk
+    ]))
+
+  task_ids = list({task.id for task, _, _ in mappings})
+  task_types = list({task.type for task, _, _ in mappings})
+  condition = (Relationship.source_type.in_(task_types) &
+               Relationship.source_id.in_(task_ids))
+  relationship_adjacency.add_relationships(condition)
+  relationships = Relationship.query.filter(condition).all()
+  relationship_ids = {relationship.id for relationship in relationships}
+  acl.add_relationships(relationship_ids)
+
+  cache = Cache.get_cache(create=True)
+  if cache:
+    cache.new.update(
+        (relationship, relationship.log_json())
+        for relationship in relationships
+    )
+  return relationship_ids
+
+
+def build_workflow_cycles(workflow, mappings):
+  """Build all cycles of the workflow due today.
+
+  Returns:
+    list of built cycles.
+  """
+  cycles = []
+  while workflow.next_cycle_start_date <= date.today():
+    cycle = build_cycle(workflow, mappings=mappings)
+    if not cycle:
+      break
+    db.session.add(cycle)
+    cycles.append(cycle)
+  return cycles
+
+
+def start_batch(workflow_ids):
+  """Build, log and commit cycles of a batch of workflows."""
+  mappings = []
+  workflow_cycles = []
+  workflows = load_workflows(workflow_ids)
+  with benchmark("Build cycles"):
+    for workflow in workflows:
+      workflow_cycles.append(
+          (workflow, build_workflow_cycles(workflow, mappings))
+      )
+  with benchmark("Flush cycles"):
+    db.session.flush()
+  with benchmark("Insert cycle task mappings"):
+    insert_mappings(mappings)
+  with benchmark("Cycle notifications"):
+    # Same notifications as start_recurring_cycles without batches sends:
+    # workflows get them only for built cycles.
+    for workflow, cycles in workflow_cycles:
+      for cycle in cycles:
+        notification.handle_cycle_created(cycle, False)
+        notification.handle_workflow_modify(None, workflow)
+  log_event(db.session)
+  db.session.commit()
+  logger.info("Started %s cycles of %s workflows with %s mappings",
+              sum(len(cycles) for _, cycles in workflow_cycles),
+              len(workflows), len(mappings))
+
+
+def start_recurring_cycles(batch_size):
+  """Start recurring cycles due today in batches of workflows."""
+  with benchmark("contributed cron job start_recurring_cycles bulk"):
+    workflow_ids = get_due_workflow_ids(date.today())
+    for ids_chunk in utils.list_chunks(workflow_ids, chunk_size=batch_size):
+      start_batch(ids_chunk)
@@ -0,0 +1,170 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Local memcache stand-in counting memcache RPCs"""
+
+import collections
+import functools
+
+import mock
+
+from ggrc import settings
+from ggrc.cache import memcache as ggrc_memcache
+
+
+class CountingMemcacheClient(object):
+  """Dict based memcache client counting calls of every RPC method.
+
+  Every method call of the client is a single RPC of the real client, so
+  `rpcs` counts the RPCs sent to memcache and `calls` lists the method and
+  the full keys of every RPC.
+  """
+  # pylint: disable=unused-argument
+
+  def __init__(self):
+    self.data = {}
+    self.cas_keys = set()
+    self.rpcs = collections.Counter()
+    self.calls = []
+
+  def _record(self, method, keys, key_prefix=''):
+    self.rpcs[method] += 1
+    self.calls.append((method, [key_prefix + key for key in keys]))
+
+  def reset_rpcs(self):
+    self.rpcs.clear()
+    del self.calls[:]
+
+  @property
+  def total_rpcs(self):
+    return sum(self.rpcs.values())
+
+  def rpcs_with_prefix(self, prefix):
+    """Count RPCs per method with any of the keys starting with prefix."""
+    return collections.Counter(
+        method for method, keys in self.calls
+        if any(key.startswith(prefix) for key in keys)
+    )
+
+  def get(self, key, namespace=None, for_cas=False):
+    self._record("get", [key])
+    if for_cas and key in self.data:
+      self.cas_keys.add(key)
+    return self.data.get(key)
+
+  def gets(self, key, namespace=None):
+    return self.get(key, namespace, for_cas=True)
+
+  def get_multi(self, keys, key_prefix='', namespace=None, for_cas=False):
+    self._record("get_multi", keys, key_prefix)
+    result = {}
+    for key in keys:
+      full_key = key_prefix + key
+      if full_key in self.data:
+        result[key] = self.data[full_key]
+        if for_cas:
+          self.cas_keys.add(full_key)
+    return result
+
+  def add(self, key, value, time=0, namespace=None):
+    self._record("add", [key])
+    if key in self.data:
+      return False
+    self.data[key] = value
+    return True
+
+  def add_multi(self, mapping, time=0, key_prefix='', namespace=None):
+    self._record("add_multi", mapping.keys(), key_prefix)
+    not_added = []
+    for key, value in mapping.iteritems():
+      full_key = key_prefix + key
+      if full_key in self.data:
+        not_added.append(key)
+      else:
+        self.data[full_key] = value
+    return not_added
+
+  def set(self, key, value, time=0, namespace=None):
+    self._record("set", [key])
+    self.data[key] = value
+    return True
+
+  def set_multi(self, mapping, time=0, key_prefix='', namespace=None):
+    self._record("set_multi", mapping.keys(), key_prefix)
+    for key, value in mapping.iteritems():
+      self.data[key_prefix + key] = value
+    return []
+
+  def cas(self, key, value, time=0, namespace=None):
+    self._record("cas", [key])
+    if key not in self.cas_keys or key not in self.data:
+      return False
+    self.data[key] = value
+    return True
+
+  def cas_multi(self, mapping, time=0, key_prefix='', namespace=None):
+    self._record("cas_multi", mapping.keys(), key_prefix)
+    not_set = []
+    for key, value in mapping.iteritems():
+      full_key = key_prefix + key
+      if full_key not in self.cas_keys or full_key not in self.data:
+        not_set.append(key)
+      else:
+        self.data[full_key] = value
+    return not_set
+
+  def delete(self, key, seconds=0, namespace=None):
+    self._record("delete", [key])
+    if self.data.pop(key, None) is None:
+      return 1
+    return 2
+
+  def delete_multi(self, keys, seconds=0, key_prefix='', namespace=None):
+    self._record("delete_multi", keys, key_prefix)
+    for key in keys:
+      self.data.pop(key_prefix + key, None)
+    return True
+
+  def flush_all(self):
+    self._record("flush_all", [])
+    self.data.clear()
+    return True
+
+
+def with_counting_memcache(cls):
+  """Decorate test class to use a counting memcache stand-in.
+
+  The stand-in is shared by all memcache clients created during a test and
+  is available as `self.memcache_client`. Functions decorated with
+  `ggrc.cache.memcache.cached` hold clients created on import, so they are
+  not cached during the test.
+  """
+
+  base_setup = cls.setUp
+  base_teardown = cls.tearDown
+
+  @functools.wraps(base_setup)
+  def setup_decorator(self):
+    """Replace memcache clients with the stand-in and enable memcache"""
+    # pylint: disable=protected-access
+    self.memcache_client = CountingMemcacheClient()
+    self.memcache_patches = [
+        mock.patch("google.appengine.api.memcache.Client",
+                   return_value=self.memcache_client),
+        mock.patch.object(settings, "MEMCACHE_MECHANISM", True, create=True),
+        mock.patch.object(ggrc_memcache._Decorated, "active", False),
+    ]
+    for patch in self.memcache_patches:
+      patch.start()
+    base_setup(self)
+
+  @functools.wraps(base_teardown)
+  def teardown_decorator(self):
+    """Restore memcache clients"""
+    for patch in self.memcache_patches:
+      patch.stop()
+    base_teardown(self)
+
+  cls.setUp = setup_decorator
+  cls.tearDown = teardown_decorator
+  return cls
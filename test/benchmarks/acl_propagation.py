@@ -0,0 +1,100 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Benchmark of the full ACL re-propagation engines.
+
+"synthetic" mode measures the in-memory propagation walk over a generated
+graph of audits with mapped assessments and evidence. "db" mode runs
+propagate_all with each engine on the configured database, the database must
+be populated beforehand.
+
+Usage (from the test directory):
+
+  python -m benchmarks.acl_propagation [--audits N] [--assessments N]
+  python -m benchmarks.acl_propagation --mode db [--engines sql graph]
+"""
+
+import argparse
+import time
+
+import mock
+
+from ggrc.app import app
+from ggrc import settings
+from ggrc.models.hooks.acl import graph_propagation
+from ggrc.models.hooks.acl import propagation
+
+
+ROLES = [
+    (1, None, "Audit"),
+    (2, 1, "Relationship"),
+    (3, 2, "Assessment"),
+    (4, 3, "Relationship"),
+    (5, 4, "Evidence"),
+]
+
+
+def make_graph(audits, assessments):
+  """Make graph of audits mapped to assessments with evidence each."""
+  graph = graph_propagation.PropagationGraph(ROLES)
+  relationship_id = 0
+  for audit_id in range(audits):
+    for index in range(assessments):
+      assessment_id = audit_id * assessments + index
+      relationship_id += 1
+      graph.add_relationship(relationship_id, "Audit", audit_id,
+                             "Assessment", assessment_id)
+      relationship_id += 1
+      graph.add_relationship(relationship_id, "Evidence", assessment_id,
+                             "Assessment", assessment_id)
+  return graph
+
+
+def run_synthetic(audits, assessments):
+  """Walk the whole propagation tree and return entries per second."""
+  graph = make_graph(audits, assessments)
+  parents = {acl_id: (1, "Audit", acl_id) for acl_id in range(audits)}
+  next_id = audits
+  count = 0
+  start = time.time()
+  for depth in range(propagation.PROPAGATION_DEPTH_LIMIT):
+    if not parents:
+      break
+    level = graph.propagation_level(parents, depth % 2 == 0)
+    count += len(level)
+    parents = {}
+    for next_id, key in enumerate(level, next_id + 1):
+      parents[next_id] = key[:3]
+  elapsed = time.time() - start
+  return count, elapsed
+
+
+def run_db(engine):
+  """Run propagate_all with the engine and return elapsed seconds."""
+  with app.test_request_context():
+    with mock.patch.object(settings, "ACL_PROPAGATION_ENGINE", engine):
+      start = time.time()
+      propagation.propagate_all()
+      return time.time() - start
+
+
+def main():
+  """Parse arguments and print benchmark results."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--mode", choices=("synthetic", "db"),
+                      default="synthetic")
+  parser.add_argument("--audits", type=int, default=2000)
+  parser.add_argument("--assessments", type=int, default=100)
+  parser.add_argument("--engines", nargs="+", default=["sql", "graph"])
+  args = parser.parse_args()
+  if args.mode == "synthetic":
+    count, elapsed = run_synthetic(args.audits, args.assessments)
+    print "{} propagated entries in {:.2f} s, {:.0f} entries/sec".format(
+        count, elapsed, count / elapsed)
+  else:
+    for engine in args.engines:
+      print "{}: {:.2f} s".format(engine, run_db(engine))
+
+
+if __name__ == "__main__":
+  main()
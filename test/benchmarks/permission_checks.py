@@ -0,0 +1,85 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Micro-benchmark of per object permission checks.
+
+Measures checks per second of DefaultUserPermissions for a user with many
+ACL entries and contexts, the way filter_resource checks nested stubs of a
+collection response.
+
+Usage (from the test directory):
+
+  python -m benchmarks.permission_checks [--resources N] [--checks N]
+"""
+
+import argparse
+import random
+import time
+
+import flask
+import mock
+
+from ggrc.app import app
+from ggrc.rbac import permissions_provider
+
+
+TYPES = ("Control", "Risk", "System", "Program", "Audit", "Issue")
+
+
+def make_permissions(resources_count, contexts_count):
+  """Make permissions dict of a user with many ACL entries."""
+  permissions = {}
+  for action in ("read", "update", "delete"):
+    for type_ in TYPES:
+      permissions.setdefault(action, {})[type_] = {
+          "contexts": range(contexts_count),
+          "resources": set(range(0, resources_count * 2, 2)),
+      }
+  permissions["__GGRC_ADMIN__"] = {
+      "__GGRC_ALL__": {"contexts": range(contexts_count, contexts_count * 2)},
+  }
+  return permissions
+
+
+def make_instances(count, resources_count, contexts_count):
+  """Make instance stubs with random ids and contexts."""
+  instances = []
+  for _ in range(count):
+    instance = mock.Mock(id=random.randrange(resources_count * 2))
+    instance._inflector.model_singular = random.choice(TYPES)
+    instance.context = mock.Mock(id=random.randrange(contexts_count * 3))
+    instances.append(instance)
+  return instances
+
+
+def run(resources_count, checks_count, contexts_count):
+  """Run the benchmark and return checks per second."""
+  user_permissions = permissions_provider.DefaultUserPermissions()
+  instances = make_instances(checks_count, resources_count, contexts_count)
+  with app.test_request_context():
+    flask.g._request_permissions = make_permissions(resources_count,
+                                                    contexts_count)
+    start = time.time()
+    for instance in instances:
+      user_permissions.is_allowed_read_for(instance)
+      user_permissions.is_allowed_read(instance._inflector.model_singular,
+                                       instance.id, instance.context.id)
+    elapsed = time.time() - start
+  return checks_count * 2 / elapsed
+
+
+def main():
+  """Parse arguments and print benchmark results."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--resources", type=int, default=5000)
+  parser.add_argument("--contexts", type=int, default=2000)
+  parser.add_argument("--checks", type=int, default=20000)
+  args = parser.parse_args()
+  random.seed(0)
+  rate = run(args.resources, args.checks, args.contexts)
+  print "{:.0f} checks/sec ({} resources, {} contexts per type)".format(
+      rate, args.resources, args.contexts)
+
+
+if __name__ == "__main__":
+  main()
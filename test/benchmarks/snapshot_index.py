@@ -0,0 +1,139 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Benchmark of the snapshot full text record builder.
+
+"synthetic" mode builds records of generated Control snapshots with people,
+access control lists, categories and custom attributes without writing them.
+"db" mode reindexes all snapshots of the configured database, the database
+must be populated beforehand.
+
+Usage (from the test directory):
+
+  python -m benchmarks.snapshot_index [--snapshots N]
+  python -m benchmarks.snapshot_index --mode db
+"""
+
+import argparse
+import time
+
+from ggrc.app import app
+from ggrc import db
+from ggrc.fulltext import get_indexer
+from ggrc.fulltext.mysql import MysqlRecordProperty
+from ggrc.models import all_models
+from ggrc.snapshotter import indexer
+from ggrc.snapshotter import record_builder
+
+
+PEOPLE = 50
+ROLES = {1: "Admin", 2: "Assignee", 3: None}
+CADS = 5
+
+
+class Cad(object):
+  """Text custom attribute definition not stored in the database."""
+  # pylint: disable=too-few-public-methods
+
+  attribute_type = "Text"
+  default_value = u""
+  value_mapping = {}
+
+  def __init__(self, cad_id):
+    self.id = cad_id  # pylint: disable=invalid-name
+    self.title = u"CA {}".format(cad_id)
+
+  def get_indexed_value(self, value):
+    return self.value_mapping.get(value, value)
+
+
+def make_content(index):
+  """Make revision content of a Control."""
+  person = {"id": index % PEOPLE, "type": "Person"}
+  # Date attributes are left out of the content when they are not set.
+  content = {attr.alias: None for attr in indexer.CLASS_PROPERTIES["Control"]
+             if attr.alias not in ("end_date", "last_assessment_date")}
+  content.update({
+      "title": u"Control {}".format(index),
+      "description": u"Description of control {}".format(index),
+      "slug": u"CONTROL-{}".format(index),
+      "status": u"Draft",
+      "key_control": index % 2 == 0,
+      "fraud_related": False,
+      "start_date": u"2019-01-01",
+      "created_at": u"2019-01-01T10:00:00",
+      "updated_at": u"2019-02-01T10:00:00",
+      "modified_by": person,
+      "categories": [
+          {"id": category_id, "display_name": u"Category {}".format(
+              category_id)}
+          for category_id in range(index % 3)
+      ],
+      "access_control_list": [
+          {"ac_role_id": role_id, "person_id": (index + role_id) % PEOPLE}
+          for role_id in ROLES
+      ],
+      "custom_attribute_values": [
+          {"custom_attribute_id": cad_id, "attribute_value": u"value"}
+          for cad_id in range(1, CADS + 1, 2)
+      ],
+  })
+  return content
+
+
+def run_synthetic(snapshots):
+  """Build records of the snapshots and return rows count and seconds."""
+  person_builder = get_indexer().get_builder(all_models.Person)
+  cache = person_builder.indexer.cache
+  for person_id in range(PEOPLE):
+    cache["people_map"][person_id] = (
+        u"User {}".format(person_id),
+        u"user{}@example.com".format(person_id),
+    )
+  cache["ac_role_map"].update(ROLES)
+
+  contents = [make_content(index) for index in range(snapshots)]
+  builder = record_builder.SnapshotRecordBuilder(
+      class_properties=indexer.CLASS_PROPERTIES,
+      cads={"Control": [Cad(cad_id) for cad_id in range(1, CADS + 1)]},
+      options={},
+      person_builder=person_builder,
+      writer=lambda rows: None,
+  )
+  start = time.time()
+  for index, content in enumerate(contents):
+    builder.add(index, "Audit", index % 100, "Control", index, "Control",
+                content)
+  builder.flush()
+  return builder.rows_count, time.time() - start
+
+
+def run_db():
+  """Reindex all snapshots and return rows count and seconds."""
+  with app.test_request_context():
+    start = time.time()
+    indexer.reindex()
+    elapsed = time.time() - start
+    count = db.session.query(MysqlRecordProperty).filter(
+        MysqlRecordProperty.type == "Snapshot"
+    ).count()
+  return count, elapsed
+
+
+def main():
+  """Parse arguments and print benchmark results."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--mode", choices=("synthetic", "db"),
+                      default="synthetic")
+  parser.add_argument("--snapshots", type=int, default=100000)
+  args = parser.parse_args()
+  if args.mode == "synthetic":
+    count, elapsed = run_synthetic(args.snapshots)
+  else:
+    count, elapsed = run_db()
+  print "{} rows in {:.2f} s, {:.0f} rows/sec".format(
+      count, elapsed, count / elapsed)
+
+
+if __name__ == "__main__":
+  main()
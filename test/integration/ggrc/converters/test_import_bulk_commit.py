@@ -0,0 +1,55 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for import of rows committed in batches."""
+
+from collections import OrderedDict
+
+import mock
+
+from ggrc.models import all_models
+from integration.ggrc import TestCase
+
+
+@mock.patch("ggrc.settings.IMPORT_BULK_COMMIT_SIZE", 4)
+class TestImportBulkCommit(TestCase):
+  """Tests for batched commits of imported rows."""
+
+  def setUp(self):
+    super(TestImportBulkCommit, self).setUp()
+    self.client.get("/login")
+
+  def _import_markets(self, count):
+    """Import markets with codes market-0 .. market-<count - 1>."""
+    return self.import_data(*[
+        OrderedDict([
+            ("object_type", "Market"),
+            ("code", "market-{}".format(index)),
+            ("title", "Market {}".format(index)),
+            ("Admin", "user@example.com"),
+        ])
+        for index in range(count)
+    ])
+
+  def test_batch_import(self):
+    """Rows committed in batches are created once."""
+    response = self._import_markets(6)
+    self.assertEqual(response[0]["created"], 6)
+    self.assertEqual(all_models.Market.query.count(), 6)
+
+  @mock.patch("ggrc.converters.base_row.update_snapshot_index",
+              side_effect=ValueError)
+  def test_post_commit_error(self, _):
+    """Committed batch is not imported again after a post commit error."""
+    response = self._import_markets(4)
+    self.assertEqual(response[0]["block_errors"], [])
+    self.assertEqual(len(response[0]["row_errors"]), 4)
+    self.assertEqual(response[0]["created"], 4)
+    self.assertEqual(response[0]["updated"], 0)
+    self.assertEqual(all_models.Market.query.count(), 4)
+    self.assertEqual(all_models.Revision.query.filter_by(
+        resource_type="Market").count(), 4)
+    titles = [title for title, in all_models.Market.query.with_entities(
+        all_models.Market.title)]
+    self.assertItemsEqual(titles,
+                          ["Market {}".format(index) for index in range(4)])
@@ -20,6 +20,7 @@ import mock
 
 from ggrc import db
 from ggrc.models import all_models
+from ggrc.models import import_export as import_export_models
 from ggrc.notifications import import_export
 
 from integration.ggrc import api_helper
@@ -324,6 +325,28 @@ class TestImportExports(TestImportExportBase):
     self.assert200(response)
     self.assertEqual(response.data, "test content")
 
+  def test_download_chunks(self):
+    """Test download of export content written by chunks"""
+    user = all_models.Person.query.first()
+    ie_job = factories.ImportExportFactory(
+        job_type="Export",
+        status="Finished",
+        created_at=datetime.now(),
+        created_by=user,
+        title="test.csv")
+    chunks = ["a,b\r\n", u"фыв,d\r\n".encode("utf-8")]
+    import_export_models.write_content(ie_job, iter(chunks))
+    db.session.commit()
+    self.assertEqual(all_models.ImportExportChunk.query.filter_by(
+        import_export_id=ie_job.id).count(), 2)
+    response = self.client.get(
+        "/api/people/{}/exports/{}/download?export_to=csv".format(
+            user.id,
+            ie_job.id),
+        headers=self.headers)
+    self.assert200(response)
+    self.assertEqual(response.data, "".join(chunks))
+
   @ddt.data(u'漢字.csv', u'фыв.csv', u'asd.csv')
   def test_download_unicode_filename(self, filename):
     """Test import history download unicode filename"""
@@ -0,0 +1,67 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for number of memcache RPCs of collection requests."""
+
+from ggrc.models import all_models
+
+from appengine import memcache_stub
+from integration.ggrc import TestCase
+from integration.ggrc.api_helper import Api
+from integration.ggrc.models import factories
+
+
+@memcache_stub.with_counting_memcache
+class TestCollectionMemcacheRpcs(TestCase):
+  """Collection GET uses the same number of RPCs for any collection size."""
+
+  def setUp(self):
+    super(TestCollectionMemcacheRpcs, self).setUp()
+    self.api = Api()
+    with factories.single_commit():
+      self.market_ids = [factories.MarketFactory().id for _ in range(50)]
+
+  def _get_markets(self, count):
+    """Get collection of first count Markets.
+
+    Returns:
+      response and Counter of RPCs per method sent for collection entries.
+    """
+    self.memcache_client.reset_rpcs()
+    response = self.api.get_collection(
+        all_models.Market, ",".join(str(id_)
+                                    for id_ in self.market_ids[:count]))
+    self.assert200(response)
+    markets = response.json["markets_collection"]["markets"]
+    self.assertEqual(len(markets), count)
+    return response, self.memcache_client.rpcs_with_prefix("collection:")
+
+  def test_cache_miss(self):
+    """Missing resources are fetched and added with one RPC each."""
+    response, small_rpcs = self._get_markets(5)
+    self.assertEqual(response.headers.get("X-GGRC-Cache"), "Miss")
+    self.memcache_client.data.clear()
+    response, large_rpcs = self._get_markets(50)
+    self.assertEqual(response.headers.get("X-GGRC-Cache"), "Miss")
+    self.assertEqual(large_rpcs, {"get_multi": 1, "add_multi": 1})
+    self.assertEqual(small_rpcs, large_rpcs)
+
+  def test_cache_hit(self):
+    """Cached resources are fetched with a single RPC."""
+    self._get_markets(50)
+    response, rpcs = self._get_markets(50)
+    self.assertEqual(response.headers.get("X-GGRC-Cache"), "Hit")
+    self.assertEqual(rpcs, {"get_multi": 1})
+
+  def test_put_invalidation(self):
+    """Update invalidates cache with a constant number of RPCs."""
+    self._get_markets(50)
+    market = all_models.Market.query.get(self.market_ids[0])
+    self.memcache_client.reset_rpcs()
+    response = self.api.put(market, {"title": "new title"})
+    self.assert200(response)
+    rpcs = self.memcache_client.rpcs_with_prefix("collection:markets:")
+    self.assertEqual(rpcs["get"], 0)
+    self.assertEqual(rpcs["add"], 0)
+    status_rpcs = self.memcache_client.rpcs_with_prefix("DeleteOp:")
+    self.assertEqual(status_rpcs, {"add_multi": 1, "delete_multi": 1})
@@ -0,0 +1,119 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for bulk generation of recurring cycles."""
+
+import datetime
+
+import freezegun
+import mock
+import sqlalchemy as sa
+
+from ggrc.models import all_models
+from ggrc_workflows import start_recurring_cycles
+from integration.ggrc.models import factories
+from integration.ggrc_workflows.helpers import rbac_helper
+from integration.ggrc_workflows.helpers import workflow_test_case
+from integration.ggrc_workflows.models import factories as wf_factories
+
+
+def _mappings_count(task):
+  """Count relationships of the cycle task."""
+  relationship = all_models.Relationship
+  return relationship.query.filter(sa.or_(
+      sa.and_(relationship.source_type == task.type,
+              relationship.source_id == task.id),
+      sa.and_(relationship.destination_type == task.type,
+              relationship.destination_id == task.id),
+  )).count()
+
+
+class TestBulkCycles(workflow_test_case.WorkflowTestCase):
+  """Bulk generation builds the same cycles as generation through the ORM."""
+
+  def _setup_workflows(self, prefix):
+    """Set up a workflow with and a workflow without an Admin.
+
+    Cycles can not be started for the workflow without Admin.
+    """
+    setup_data = {
+        "WITHOUT_ADMIN": tuple(),
+        "WITH_ADMIN": (rbac_helper.GA_RNAME, ),
+    }
+    with freezegun.freeze_time(datetime.date(2017, 9, 25)):
+      for slug, wfa_g_rnames in setup_data.iteritems():
+        with factories.single_commit():
+          workflow = self.setup_helper.setup_workflow(
+              wfa_g_rnames,
+              slug=prefix + slug,
+              repeat_every=1,
+              unit=all_models.Workflow.MONTH_UNIT,
+          )
+          task_group = wf_factories.TaskGroupFactory(workflow=workflow)
+          wf_factories.TaskGroupTaskFactory(
+              task_group=task_group,
+              start_date=datetime.date(2017, 9, 26),
+              end_date=datetime.date(2017, 9, 30),
+          )
+          wf_factories.TaskGroupObjectFactory(
+              task_group=task_group,
+              object=factories.ControlFactory(),
+          )
+        self.api_helper.put(workflow, {
+            "status": "Active",
+            "recurrences": True,
+        })
+
+  @staticmethod
+  def _summary(prefix):
+    """Get cycles and notifications of workflows with the slug prefix."""
+    summary = {}
+    workflows = all_models.Workflow.query.filter(
+        all_models.Workflow.slug.startswith(prefix))
+    for workflow in workflows:
+      stubs = [("Workflow", workflow.id)]
+      cycles = []
+      for cycle in workflow.cycles:
+        tasks = cycle.cycle_task_group_object_tasks
+        stubs.append(("Cycle", cycle.id))
+        stubs.extend(("CycleTaskGroupObjectTask", task.id) for task in tasks)
+        cycles.append((
+            cycle.start_date,
+            cycle.end_date,
+            sorted((task.start_date, task.end_date, _mappings_count(task))
+                   for task in tasks),
+        ))
+      notification = all_models.Notification
+      notifications = notification.query.filter(
+          sa.tuple_(notification.object_type,
+                    notification.object_id).in_(stubs)
+      )
+      summary[workflow.slug[len(prefix):]] = (
+          workflow.next_cycle_start_date,
+          sorted(cycles),
+          sorted((item.object_type, item.notification_type.name,
+                  item.send_on, item.sent_at, item.repeating)
+                 for item in notifications),
+      )
+    return summary
+
+  @mock.patch("ggrc_workflows.logger")
+  def test_same_cycles_and_notifications(self, _):
+    """Bulk and ORM generation build same cycles and notifications."""
+    self._setup_workflows("ORM_")
+    with freezegun.freeze_time(datetime.date(2017, 10, 25)):
+      with mock.patch("ggrc.settings.CYCLE_BULK_BATCH_SIZE", 0):
+        start_recurring_cycles()
+    orm_summary = self._summary("ORM_")
+
+    self._setup_workflows("BULK_")
+    with freezegun.freeze_time(datetime.date(2017, 10, 25)):
+      with mock.patch("ggrc.settings.CYCLE_BULK_BATCH_SIZE", 10):
+        start_recurring_cycles()
+    bulk_summary = self._summary("BULK_")
+
+    self.assertEqual(len(orm_summary["WITH_ADMIN"][1]), 1)
+    self.assertEqual(orm_summary["WITHOUT_ADMIN"][1], [])
+    self.assertEqual(bulk_summary, orm_summary)
+    # The bulk run must not change workflows processed by the ORM run.
+    self.assertEqual(self._summary("ORM_"), orm_summary)
@@ -0,0 +1,114 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for automappings generator."""
+
+import collections
+import unittest
+
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc import automapper
+from ggrc.models.relationship import Stub
+
+
+class FakeRelationshipsCache(object):
+  """Relationships cache reading neighborhoods from a list of edges."""
+  # pylint: disable=too-few-public-methods
+
+  def __init__(self, edges):
+    self.cache = collections.defaultdict(set)
+    self.edges = edges
+    self.queried = []
+
+  def populate_cache(self, stubs):
+    self.queried.append(set(stubs))
+    for stub in stubs:
+      self.cache.setdefault(stub, set())
+    for src, dst in self.edges:
+      if src in stubs:
+        self.cache[src].add(dst)
+      if dst in stubs:
+        self.cache[dst].add(src)
+
+
+class TestGenerateAutomappings(unittest.TestCase):
+  """Tests for level by level automappings generation."""
+
+  PROGRAM = Stub("Program", 1)
+  CONTROL = Stub("Control", 1)
+
+  def setUp(self):
+    super(TestGenerateAutomappings, self).setUp()
+    self.objectives = [Stub("Objective", i) for i in range(5)]
+    self.requirements = [Stub("Requirement", i) for i in range(5)]
+    edges = [(self.CONTROL, objective) for objective in self.objectives]
+    edges.extend(zip(self.objectives, self.requirements))
+    self.generator = automapper.AutomapperGenerator()
+    self.generator.related_cache = FakeRelationshipsCache(edges)
+
+    rules = collections.defaultdict(set)
+    rules["Program", "Control"] = {"Objective"}
+    rules["Program", "Objective"] = {"Requirement"}
+    patchers = [
+        mock.patch("ggrc.automapper.rules.rules", rules),
+        mock.patch.object(self.generator, "_flush"),
+        mock.patch("ggrc.automapper.permissions.is_allowed_update",
+                   return_value=True),
+    ]
+    for patcher in patchers:
+      patcher.start()
+      self.addCleanup(patcher.stop)
+
+  def generate(self):
+    relationship = mock.Mock(
+        source_type="Program", source_id=1,
+        destination_type="Control", destination_id=1,
+    )
+    self.generator.generate_automappings(relationship)
+
+  def test_automappings(self):
+    """Mappings are generated through all levels."""
+    self.generate()
+    order = automapper.AutomapperGenerator.order
+    self.assertEqual(self.generator.auto_mappings, {
+        order(self.PROGRAM, stub)
+        for stub in self.objectives + self.requirements
+    })
+    self.assertEqual(self.generator.counters["levels"], 2)
+    self.assertEqual(self.generator.counters["edges"], 10)
+
+  def test_single_query_per_level(self):
+    """Neighborhoods of a level are fetched with a single query."""
+    self.generate()
+    self.assertEqual(self.generator.counters["queries"], 3)
+    self.assertEqual(
+        self.generator.related_cache.queried,
+        [
+            {self.PROGRAM, self.CONTROL},
+            set(self.objectives),
+            set(self.requirements),
+        ],
+    )
+
+  def test_permission_checked_once(self):
+    """Update permission is checked once for every object."""
+    with mock.patch("ggrc.automapper.permissions.is_allowed_update",
+                    return_value=True) as is_allowed_update:
+      self.generate()
+    self.assertEqual(is_allowed_update.call_count, 11)
+
+  def test_no_permission(self):
+    """Mappings to objects without update permission are skipped."""
+    denied = self.objectives[0]
+    with mock.patch(
+        "ggrc.automapper.permissions.is_allowed_update",
+        side_effect=lambda type_, id_, _: Stub(type_, id_) != denied,
+    ):
+      self.generate()
+    self.assertNotIn(
+        automapper.AutomapperGenerator.order(self.PROGRAM, denied),
+        self.generator.auto_mappings,
+    )
+    self.assertEqual(len(self.generator.auto_mappings), 8)
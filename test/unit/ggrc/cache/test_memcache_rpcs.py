@@ -0,0 +1,90 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for multi-key memcache operations of the cache layer."""
+
+import unittest
+
+import mock
+
+from appengine import memcache_stub
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.cache import utils as cache_utils
+
+
+@memcache_stub.with_counting_memcache
+class TestMemCacheRpcs(unittest.TestCase):
+  """Tests for RPC counts of the cache layer."""
+
+  IDS = range(1, 101)
+
+  def setUp(self):
+    super(TestMemCacheRpcs, self).setUp()
+    self.manager = cache_utils.get_cache_manager()
+    self.cache = self.manager.cache_object
+    self.data = {id_: {"id": id_, "title": str(id_)} for id_ in self.IDS}
+
+  def test_get(self):
+    """Collection is fetched with a single RPC."""
+    self.cache.add("collection", "controls", self.data)
+    self.memcache_client.reset_rpcs()
+    result = self.cache.get("collection", "controls",
+                            {"ids": self.IDS, "attrs": ["title"]})
+    self.assertEqual(result.keys(), self.IDS)
+    self.assertEqual(result[5], {"title": "5"})
+    self.assertEqual(self.memcache_client.rpcs, {"get_multi": 1})
+
+  def test_get_missing(self):
+    """All or None policy is applied to collections."""
+    self.cache.add("collection", "controls", {1: self.data[1]})
+    self.assertIsNone(self.cache.get("collection", "controls",
+                                     {"ids": [1, 2], "attrs": None}))
+
+  def test_add(self):
+    """New and existing entries are added with an RPC per kind."""
+    self.cache.add("collection", "controls", {1: self.data[1]})
+    self.memcache_client.reset_rpcs()
+    self.assertIsNotNone(self.cache.add("collection", "controls", self.data))
+    self.assertEqual(self.memcache_client.rpcs,
+                     {"get_multi": 1, "add_multi": 1, "cas_multi": 1})
+    self.assertEqual(len(self.memcache_client.data), len(self.IDS))
+
+  def test_remove(self):
+    """Collection is deleted with a single RPC."""
+    self.cache.add("collection", "controls", self.data)
+    self.memcache_client.reset_rpcs()
+    self.assertIsNotNone(
+        self.cache.remove("collection", "controls", self.data))
+    self.assertEqual(self.memcache_client.rpcs, {"delete_multi": 1})
+    self.assertEqual(self.memcache_client.data, {})
+
+  def test_bulk_update(self):
+    """Only cached entries are updated."""
+    self.manager.bulk_set({"a": {"x": 1}})
+    self.memcache_client.reset_rpcs()
+    self.assertEqual(
+        self.manager.bulk_update({"a": {"x": 2}, "b": {"x": 3}}), [])
+    self.assertEqual(self.memcache_client.data, {"a": {"x": 2}})
+    self.assertEqual(self.memcache_client.rpcs,
+                     {"get_multi": 1, "cas_multi": 1})
+
+  @mock.patch("ggrc.cache.utils.flask")
+  def test_commit(self, _):
+    """Entries are invalidated with a constant number of RPCs."""
+    context = mock.Mock()
+    self.manager.marked_for_delete = [
+        "collection:controls:{}".format(id_) for id_ in self.IDS * 2
+    ]
+    with mock.patch.object(cache_utils, "get_cache_manager",
+                           return_value=self.manager):
+      cache_utils.update_memcache_before_commit(context, None, 10)
+    self.assertEqual(self.memcache_client.rpcs, {"add_multi": 1})
+    self.assertEqual(len(self.memcache_client.data), len(self.IDS))
+    self.assertTrue(all(key.startswith(cache_utils.DELETE_OP_PREFIX)
+                        for key in self.memcache_client.data))
+
+    self.memcache_client.reset_rpcs()
+    cache_utils.update_memcache_after_commit(context)
+    self.assertEqual(self.memcache_client.rpcs, {"delete_multi": 2})
+    self.assertEqual(self.memcache_client.data, {})
@@ -0,0 +1,85 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for versioned permission cache keys."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.cache import utils as cache_utils
+
+
+class MemcacheClientStub(object):
+  """Dict based stub of memcache client."""
+
+  def __init__(self):
+    self.data = {}
+
+  def get_multi(self, keys):
+    return {key: self.data[key] for key in keys if key in self.data}
+
+  def add_multi(self, mapping):
+    for key, value in mapping.iteritems():
+      self.data.setdefault(key, value)
+
+  def set(self, key, value):
+    self.data[key] = value
+
+  def set_multi(self, mapping):
+    self.data.update(mapping)
+
+
+class TestPermissionsCacheKeys(unittest.TestCase):
+  """Unit tests for permission cache invalidation by versions."""
+
+  def setUp(self):
+    super(TestPermissionsCacheKeys, self).setUp()
+    self.client = MemcacheClientStub()
+    manager = mock.Mock()
+    manager.cache_object.memcache_client = self.client
+    self.patches = [
+        mock.patch.object(cache_utils, "has_memcache", return_value=True),
+        mock.patch.object(cache_utils, "get_cache_manager",
+                          return_value=manager),
+    ]
+    for patch in self.patches:
+      patch.start()
+
+  def tearDown(self):
+    for patch in self.patches:
+      patch.stop()
+    super(TestPermissionsCacheKeys, self).tearDown()
+
+  def _keys(self):
+    """Get permission keys of users 1 and 2."""
+    return [cache_utils.get_permissions_key(self.client, user_id)
+            for user_id in (1, 2)]
+
+  def test_key_stable(self):
+    """Key does not change without invalidation."""
+    self.assertEqual(self._keys(), self._keys())
+
+  def test_clear_users(self):
+    """Only keys of the given users are changed."""
+    first_key, second_key = self._keys()
+    cache_utils.clear_users_permission_cache([1])
+
+    new_first_key, new_second_key = self._keys()
+    self.assertNotEqual(new_first_key, first_key)
+    self.assertEqual(new_second_key, second_key)
+
+  def test_clear_all(self):
+    """Keys of all users are changed."""
+    keys = self._keys()
+    cache_utils.clear_permission_cache()
+
+    for key, new_key in zip(keys, self._keys()):
+      self.assertNotEqual(key, new_key)
+
+  def test_evicted_version(self):
+    """Evicted version does not make old key valid again."""
+    key = cache_utils.get_permissions_key(self.client, 1)
+    self.client.data.clear()
+    self.assertNotEqual(cache_utils.get_permissions_key(self.client, 1), key)
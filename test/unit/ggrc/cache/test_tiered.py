@@ -0,0 +1,129 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for the two-tier cache of reference data."""
+
+import unittest
+
+import mock
+
+from appengine import memcache_stub
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.cache import tiered
+
+
+STAMP = "test_stamp"
+CALLS = []
+
+
+@tiered.cached("test_tiered_square", stamps=(STAMP,), maxsize=2)
+def square(value):
+  CALLS.append(value)
+  return value * value
+
+
+class TestLRUCache(unittest.TestCase):
+  """Tests for the process-local tier."""
+
+  def test_eviction(self):
+    """Least recently used entries are evicted."""
+    cache = tiered.LRUCache(2, 60)
+    cache.set("a", "v", 1)
+    cache.set("b", "v", 2)
+    self.assertEqual(cache.get("a", "v"), 1)
+    cache.set("c", "v", 3)
+    self.assertIsNone(cache.get("b", "v"))
+    self.assertEqual(cache.get("a", "v"), 1)
+    self.assertEqual(len(cache), 2)
+
+  @mock.patch("ggrc.cache.tiered.time.time")
+  def test_ttl(self, time_):
+    """Expired entries and entries of other versions are not returned."""
+    cache = tiered.LRUCache(2, 60)
+    time_.return_value = 100
+    cache.set("a", "v", 1)
+    self.assertIsNone(cache.get("a", "w"))
+    cache.set("a", "v", 1)
+    time_.return_value = 161
+    self.assertIsNone(cache.get("a", "v"))
+    self.assertEqual(len(cache), 0)
+
+
+@mock.patch("ggrc.settings.TIERED_CACHE_TTL", 60)
+class TestLocalTier(unittest.TestCase):
+  """Tests for the cache without memcache."""
+
+  def setUp(self):
+    super(TestLocalTier, self).setUp()
+    square.clear()
+    square.hits.clear()
+    square.misses = 0
+    del CALLS[:]
+
+  def test_disabled(self):
+    """Results are not cached if the cache is disabled."""
+    with mock.patch("ggrc.settings.TIERED_CACHE_TTL", 0):
+      square(2)
+      square(2)
+    self.assertEqual(CALLS, [2, 2])
+
+  @mock.patch("ggrc.settings.MEMCACHE_MECHANISM", False, create=True)
+  def test_invalidate(self):
+    """Results are cached until the stamp is bumped."""
+    self.assertEqual(square(3), 9)
+    self.assertEqual(square(3), 9)
+    self.assertEqual(CALLS, [3])
+    tiered.invalidate(STAMP)
+    self.assertEqual(square(3), 9)
+    self.assertEqual(CALLS, [3, 3])
+    self.assertEqual(square.stats(), {
+        "local_hits": 1,
+        "shared_hits": 0,
+        "misses": 2,
+        "hit_ratio": 1.0 / 3,
+        "size": 1,
+        "maxsize": 2,
+    })
+
+  def test_bump_on_commit(self):
+    """Stamps marked during the transaction are bumped after commit."""
+    session = mock.Mock(info={})
+    # pylint: disable=protected-access
+    with mock.patch("sqlalchemy.orm.object_session", return_value=session):
+      tiered._mark_stamps((STAMP,), None, None, mock.Mock())
+    with mock.patch("ggrc.cache.tiered.invalidate") as invalidate:
+      tiered._bump_stamps(session)
+      tiered._bump_stamps(session)
+    invalidate.assert_called_once_with(STAMP)
+
+
+@mock.patch("ggrc.settings.TIERED_CACHE_TTL", 60)
+@memcache_stub.with_counting_memcache
+class TestSharedTier(unittest.TestCase):
+  """Tests for the cache with memcache."""
+
+  def setUp(self):
+    super(TestSharedTier, self).setUp()
+    square.clear()
+    square.hits.clear()
+    square.misses = 0
+    del CALLS[:]
+
+  def test_shared_hit(self):
+    """Results are shared by processes through memcache."""
+    square(4)
+    square.clear()
+    self.memcache_client.reset_rpcs()
+    self.assertEqual(square(4), 16)
+    self.assertEqual(CALLS, [4])
+    self.assertEqual(self.memcache_client.rpcs, {"get_multi": 1, "get": 1})
+    self.assertEqual(square.stats()["shared_hits"], 1)
+
+  def test_invalidate(self):
+    """Bumped stamp invalidates results of other processes."""
+    square(5)
+    self.memcache_client.data[tiered.VERSION_PREFIX + STAMP] = "other"
+    square(5)
+    self.assertEqual(CALLS, [5, 5])
+    self.assertEqual(square.stats()["local_hits"], 0)
@@ -0,0 +1,91 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for base csv converters."""
+
+import unittest
+
+import ddt
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.converters import base
+
+
+@ddt.ddt
+class TestExportConverter(unittest.TestCase):
+  """Unit tests for streaming CSV export."""
+
+  @staticmethod
+  def _block_converter(name, rows):
+    """Make block converter mock generating given rows."""
+    block_converter = mock.MagicMock(block_width=2)
+    block_converter.name = name
+    block_converter.generate_csv_header.side_effect = lambda: [
+        ["Code", "Title"], ["Code*", "Title*"],
+    ]
+    block_converter.generate_row_data.side_effect = lambda: (
+        list(row) for row in rows
+    )
+    return block_converter
+
+  @ddt.data(1, 30, 10 ** 6)
+  def test_stream_csv_chunks(self, chunk_size):
+    """Test streamed CSV chunks join into the whole CSV."""
+    with mock.patch("ggrc.converters.base.get_exportables"):
+      converter = base.ExportConverter(ids_by_type=[])
+    converter.block_converters = [
+        self._block_converter("Control", [
+            [u"CONTROL-{}".format(i), u"title \u2713"] for i in range(20)
+        ]),
+        self._block_converter("Risk", [[u"RISK-1", u"risk"]]),
+    ]
+    converter.CSV_CHUNK_SIZE = chunk_size
+
+    chunks = list(converter.stream_csv_from_row_data())
+
+    self.assertEqual("".join(chunks), converter.build_csv_from_row_data())
+    self.assertEqual(len(chunks) > 1, chunk_size < 100)
+    lines = "".join(chunks).splitlines()
+    self.assertEqual(len(lines), 2 + 20 + 2 + 2 + 1 + 2)
+    self.assertEqual(lines[2], "," + "CONTROL-0,title \xe2\x9c\x93")
+
+
+@ddt.ddt
+class TestImportConverter(unittest.TestCase):
+  """Unit tests for parallel import scheduling."""
+
+  @staticmethod
+  def _block_converter(name, referenced):
+    """Make block converter mock referencing given classes."""
+    block_converter = mock.MagicMock()
+    block_converter.name = name
+    block_converter.conflicts_with.side_effect = lambda other: (
+        name in other.referenced or other.name in referenced
+    )
+    block_converter.referenced = referenced
+    return block_converter
+
+  @ddt.data(
+      ([("A", ""), ("B", ""), ("C", "")], ["ABC"]),
+      ([("A", ""), ("B", "A"), ("C", "")], ["AC", "B"]),
+      ([("A", "B"), ("B", ""), ("C", "B")], ["A", "B", "C"]),
+      ([("A", ""), ("B", "A"), ("C", "B"), ("D", "A")], ["A", "BD", "C"]),
+      ([("A", ""), ("A", "")], ["A", "A"]),
+  )
+  @ddt.unpack
+  def test_import_levels(self, blocks, expected_levels):
+    """Conflicting blocks are imported at later levels in csv order."""
+    block_converters = [
+        self._block_converter(name, referenced)
+        for name, referenced in blocks
+    ]
+    for block_converter in block_converters:
+      block_converter.referenced += block_converter.name
+
+    levels = base.ImportConverter.get_import_levels(block_converters)
+
+    self.assertEqual(
+        ["".join(converter.name for converter in level) for level in levels],
+        expected_levels,
+    )
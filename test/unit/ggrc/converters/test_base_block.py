@@ -0,0 +1,172 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for import block converter."""
+
+from collections import defaultdict
+
+import unittest
+
+import ddt
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.converters import base_block
+from ggrc.converters import errors
+from ggrc.models import all_models
+from ggrc.utils import structures
+
+
+@ddt.ddt
+class TestImportBlockBulkCommit(unittest.TestCase):
+  """Unit tests for batched row import."""
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    super(TestImportBlockBulkCommit, self).setUp()
+    self.block = base_block.ImportBlockConverter.__new__(
+        base_block.ImportBlockConverter
+    )
+    self.block.converter = mock.MagicMock(
+        new_objects=defaultdict(structures.CaseInsensitiveDict),
+    )
+    self.block.unique_values = defaultdict(structures.CaseInsensitiveDict)
+    self.block.row_errors = []
+    self.block.row_warnings = []
+    self.block._update_info = mock.MagicMock()
+    self.block._make_row_converter = lambda index: index
+    self.block._import_row = mock.MagicMock()
+
+  def _process_batch(self, failing):
+    """Make batch processing mock failing for batches with failing rows."""
+    def process(indexes):
+      """Add a row error and fail for failing rows."""
+      self.block.row_errors.append("error")
+      self.block.unique_values["slug"]["code-{}".format(indexes[0])] = 1
+      if set(indexes) & failing:
+        return None
+      return indexes
+    return process
+
+  @ddt.data(
+      (set(), []),
+      ({5}, [4, 5]),
+      ({0, 7}, [0, 1, 6, 7]),
+      (set(range(8)), range(8)),
+  )
+  @ddt.unpack
+  def test_bisection(self, failing, separate_rows):
+    """Rows of failing batches are imported separately."""
+    self.block._process_rows_batch = mock.MagicMock(
+        side_effect=self._process_batch(failing),
+    )
+    with mock.patch("ggrc.converters.base_block.db"):
+      self.block._import_rows_batch(range(8))
+
+    self.assertEqual(
+        [call[0][0] for call in self.block._import_row.call_args_list],
+        list(separate_rows),
+    )
+    updated = [call[0][0] for call in self.block._update_info.call_args_list]
+    self.assertEqual(sorted(updated + list(separate_rows)), range(8))
+
+  def test_failed_batch_state(self):
+    """Failed batch errors and unique values are discarded."""
+    self.block.row_errors.append("previous error")
+    self.block._process_rows_batch = mock.MagicMock(
+        side_effect=self._process_batch({2, 3}),
+    )
+    with mock.patch("ggrc.converters.base_block.db") as db_mock:
+      self.block._import_rows_batch(range(4))
+
+    self.assertEqual(db_mock.session.rollback.call_count, 2)
+    self.assertEqual(self.block.row_errors, ["previous error", "error"])
+    self.assertEqual(self.block.unique_values["slug"].keys(), ["code-0"])
+
+
+class TestImportBlockBatchCommit(unittest.TestCase):
+  """Unit tests for commit of a batch of rows."""
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    super(TestImportBlockBatchCommit, self).setUp()
+    self.block = base_block.ImportBlockConverter.__new__(
+        base_block.ImportBlockConverter
+    )
+    self.block.converter = mock.MagicMock(
+        new_objects=defaultdict(structures.CaseInsensitiveDict),
+    )
+    self.block.object_class = all_models.Market
+    self.block.name = "Market"
+    self.block.headers = {}
+    self.block.rows = [[] for _ in range(4)]
+    self.block.csv_lines = [3, 4, 5, 6]
+    self.block.unique_values = defaultdict(structures.CaseInsensitiveDict)
+    self.block.row_errors = []
+    self.block.row_warnings = []
+    self.block.block_errors = []
+    self.block.revision_ids = []
+    self.block.ignore = False
+    self.block._import_info = self.block._make_empty_info()
+    self.block._import_row = mock.MagicMock()
+
+  @mock.patch("ggrc.converters.base_row.cache_utils")
+  @mock.patch("ggrc.converters.base_row.update_snapshot_index",
+              side_effect=ValueError)
+  @mock.patch("ggrc.converters.base_row.ImportRowConverter."
+              "commit_rows_changes",
+              return_value=(None, {}))
+  @mock.patch("ggrc.converters.base_row.ImportRowConverter.process_row",
+              autospec=True)
+  def test_post_commit_error(self, process_row, commit, *_):
+    """Committed rows are not imported again after post commit errors."""
+    with mock.patch("ggrc.converters.base_block.db") as db_mock:
+      self.block._import_rows_batch(range(4))
+
+    self.assertEqual(commit.call_count, 1)
+    self.assertEqual([call[0][0].line for call in process_row.call_args_list],
+                     [3, 4, 5, 6])
+    self.assertFalse(self.block._import_row.called)
+    self.assertEqual(db_mock.session.rollback.call_count, 1)
+    self.assertEqual(self.block._import_info["rows"], 4)
+    self.assertEqual(self.block._import_info["created"], 4)
+    self.assertEqual(self.block._import_info["ignored"], 0)
+    self.assertEqual(self.block.row_errors, [
+        errors.UNKNOWN_ERROR.format(line=line) for line in (3, 4, 5, 6)
+    ])
+    self.assertEqual(self.block.block_errors, [])
+    self.assertFalse(self.block.ignore)
+
+
+@ddt.ddt
+class TestImportBlockConflicts(unittest.TestCase):
+  """Unit tests for detection of blocks that can be imported in parallel."""
+
+  @staticmethod
+  def _block(shared, referenced):
+    """Make block converter with given shared and referenced classes."""
+    block = base_block.ImportBlockConverter.__new__(
+        base_block.ImportBlockConverter
+    )
+    block.shared_classes = set(shared)
+    block.referenced_classes = None
+    if referenced is not None:
+      block.referenced_classes = set(shared) | set(referenced)
+    return block
+
+  @ddt.data(
+      ((["Control"], []), (["Risk"], []), False),
+      ((["Control"], ["Person"]), (["Risk"], ["Person"]), False),
+      ((["Control"], ["Risk"]), (["Risk"], []), True),
+      ((["Control"], []), (["Risk"], ["Control"]), True),
+      ((["Control"], []), (["Control"], []), True),
+      ((["System", "Process"], []), (["Process", "System"], []), True),
+      ((["Control"], None), (["Risk"], []), True),
+  )
+  @ddt.unpack
+  def test_conflicts_with(self, first, second, expected):
+    """Blocks referencing each other's classes conflict."""
+    first, second = self._block(*first), self._block(*second)
+
+    self.assertEqual(first.conflicts_with(second), expected)
+    self.assertEqual(second.conflicts_with(first), expected)
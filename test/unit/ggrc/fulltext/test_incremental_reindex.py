@@ -0,0 +1,116 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for incremental fulltext reindex."""
+
+import unittest
+
+import ddt
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.fulltext import listeners
+from ggrc.models import all_models
+
+
+@ddt.ddt
+class TestReindexSet(unittest.TestCase):
+  """Unit tests for tracking of changed properties in ReindexSet."""
+  # pylint: disable=protected-access
+
+  @ddt.data(
+      ([{"title"}, {"description"}], {"title", "description"}),
+      ([{"title"}, None], None),
+      ([None, {"title"}], None),
+      ([set()], set()),
+  )
+  @ddt.unpack
+  def test_add(self, changes, expected):
+    """Changed attributes of an object are merged."""
+    reindex_set = listeners.ReindexSet()
+    item = object()
+    for changed_attrs in changes:
+      reindex_set.add(item, changed_attrs)
+    self.assertEqual(reindex_set._pool, {item: expected})
+
+  def test_add_model_id(self):
+    """Whole object reindex takes over reindex of some properties."""
+    reindex_set = listeners.ReindexSet()
+    reindex_set._add_model_id("Control", 1, {"title"})
+    reindex_set._add_model_id("Control", 1, {"description"})
+    reindex_set._add_model_id("Control", 2, None)
+    reindex_set._add_model_id("Control", 2, {"title"})
+    reindex_set._add_model_id("Control", 3, {"title"})
+    reindex_set._add_model_id("Control", 3, None)
+
+    self.assertEqual(reindex_set.model_ids_to_reindex["Control"], {1, 2, 3})
+    self.assertEqual(reindex_set.model_properties["Control"],
+                     {1: {"title", "description"}})
+
+  def test_group_ids_by_properties(self):
+    """Ids are grouped by the sets of reindexed properties."""
+    groups = listeners._group_ids_by_properties(
+        [1, 2, 3, 4],
+        {1: {"title"}, 3: {"title"}, 4: {"title", "description"}},
+    )
+    self.assertEqual(groups, {
+        None: [2],
+        frozenset(["title"]): [1, 3],
+        frozenset(["title", "description"]): [4],
+    })
+
+
+class TestIndexedRecordsUpdate(unittest.TestCase):
+  """Unit tests for writing only changed fulltext records."""
+
+  def test_properties_for_changed_columns(self):
+    """Column properties are reindexed only if the column is changed."""
+    properties = all_models.Objective.get_fulltext_properties_for({"title"})
+    self.assertIn("title", properties)
+    self.assertNotIn("description", properties)
+    # Properties computed from other objects are always reindexed
+    self.assertIn("access_control_list", properties)
+    self.assertIsNone(all_models.Objective.get_fulltext_properties_for(None))
+
+  @staticmethod
+  def _row(key, prop, content, subprop=u""):
+    """Make new fulltext record dict."""
+    return {"key": key, "type": "Objective", "tags": "", "property": prop,
+            "subproperty": subprop, "content": content}
+
+  def test_write_records_diff(self):
+    """Only changed records are written."""
+    stored = {
+        (1, u"title", u""): u"old title",
+        (1, u"description", u""): u"description",
+        (1, u"notes", u""): u"notes",
+    }
+    rows = [
+        self._row(1, u"title", u"new title"),
+        self._row(1, u"description", u"description"),
+        self._row(1, u"slug", u"OBJECTIVE-1"),
+    ]
+    with mock.patch("ggrc.fulltext.mixin.db") as db_mock:
+      all_models.Objective.write_records_diff(stored, rows)
+
+    calls = db_mock.session.execute.call_args_list
+    self.assertEqual(len(calls), 3)
+    delete_query, deleted = calls[0][0]
+    update_query, updated = calls[1][0]
+    insert_query, inserted = calls[2][0]
+    self.assertIn("DELETE", delete_query)
+    self.assertEqual(deleted, [{"type": "Objective", "key": 1,
+                                "property": u"notes", "subproperty": u""}])
+    self.assertIn("UPDATE", update_query)
+    self.assertEqual(updated, [rows[0]])
+    self.assertIn("INSERT", insert_query)
+    self.assertEqual(inserted, [rows[2]])
+
+  def test_write_no_changes(self):
+    """Nothing is written for unchanged records."""
+    stored = {(1, u"title", u""): u"title"}
+    with mock.patch("ggrc.fulltext.mixin.db") as db_mock:
+      all_models.Objective.write_records_diff(
+          stored, [self._row(1, u"title", u"title")],
+      )
+    self.assertFalse(db_mock.session.execute.called)
@@ -0,0 +1,163 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for parallel and resumable reindex."""
+
+import unittest
+
+import mock
+import sqlalchemy as sa
+from sqlalchemy import orm
+from sqlalchemy.ext.declarative import declarative_base
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.fulltext import reindex
+
+
+Base = declarative_base()  # pylint: disable=invalid-name
+
+
+class Item(Base):
+  """Indexed model stub."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "items"
+  id = sa.Column(sa.Integer, primary_key=True)
+
+
+class TestReindex(unittest.TestCase):
+  """Unit tests for reindex by id ranges."""
+
+  def setUp(self):
+    super(TestReindex, self).setUp()
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    engine.execute(Item.__table__.insert(),
+                   [{"id": id_} for id_ in [1, 5, 9, 10, 19, 42]])
+    self.session = orm.sessionmaker(bind=engine)()
+    self.db_patch = mock.patch.object(reindex, "db")
+    db_mock = self.db_patch.start()
+    db_mock.session.query = self.session.query
+
+  def tearDown(self):
+    self.db_patch.stop()
+    super(TestReindex, self).tearDown()
+
+  def test_id_ranges(self):
+    """Only non empty ranges are returned."""
+    self.assertEqual(reindex.get_id_ranges(Item, 10), [0, 10, 40])
+
+  def test_reindex_range(self):
+    """Objects of the range are reindexed."""
+    with mock.patch.object(Item, "bulk_record_update_for",
+                           create=True) as update:
+      self.assertEqual(reindex.reindex_range(Item, 10, 10), 2)
+    update.assert_called_once_with([10, 19])
+
+  def test_resume(self):
+    """Ranges reindexed by the task before are skipped."""
+    with mock.patch.object(reindex, "get_done_ranges", return_value={0}), \
+        mock.patch.object(reindex, "reindex_range",
+                          return_value=2) as reindex_range:
+      self.assertEqual(reindex.reindex_model(Item, 10, task_id=1), 4)
+    self.assertEqual(
+        [call[0][1] for call in reindex_range.call_args_list],
+        [10, 40],
+    )
+
+  def test_reindex_range_shadow(self):
+    """Records of the range are inserted into the shadow table."""
+    table = mock.MagicMock()
+    with mock.patch.object(Item, "insert_records", create=True) as insert, \
+        mock.patch.object(Item, "bulk_record_update_for",
+                          create=True) as update:
+      self.assertEqual(reindex.reindex_range(Item, 0, 10, table=table), 3)
+    insert.assert_called_once_with([1, 5, 9], table)
+    self.assertFalse(update.called)
+
+
+class TestShadowTableSwap(unittest.TestCase):
+  """Unit tests for replacing the index table with the shadow table."""
+
+  def setUp(self):
+    super(TestShadowTableSwap, self).setUp()
+    self.record_table = sa.Table(
+        "records", sa.MetaData(),
+        sa.Column("key", sa.Integer, primary_key=True),
+        sa.Column("type", sa.String(64), primary_key=True),
+        sa.Column("tags", sa.String(64)),
+    )
+    self.shadow = sa.Table(
+        "records_shadow", sa.MetaData(),
+        *[column.copy() for column in self.record_table.columns]
+    )
+
+  def test_swap_statements(self):
+    """Indexes are created before the tables are atomically renamed."""
+    indexes = [
+        {"name": "ix_tags", "column_names": ["tags"], "unique": False},
+        {"name": "ix_type", "column_names": ["type", "key"], "unique": True},
+    ]
+    with mock.patch.object(reindex, "db") as db_mock, \
+        mock.patch.object(reindex, "_get_record_table",
+                          return_value=self.record_table), \
+        mock.patch.object(reindex, "_get_secondary_indexes",
+                          return_value=indexes):
+      reindex.swap_shadow_table(self.shadow, None, [])
+
+    statements = [call[0][0]
+                  for call in db_mock.session.execute.call_args_list]
+    self.assertIn("records_shadow", str(statements[0]))
+    self.assertEqual(statements[1:], [
+        "ALTER TABLE records_shadow ADD INDEX ix_tags (`tags`), "
+        "ADD UNIQUE INDEX ix_type (`type`, `key`)",
+        "DROP TABLE IF EXISTS records_old",
+        "RENAME TABLE records TO records_old, records_shadow TO records",
+        "DROP TABLE records_old",
+    ])
+
+  def test_catch_up_changes(self):
+    """Logged changes of the reindexed types are reindexed in shadow."""
+    changes = {"Item": [1, 2], "Other": [3]}
+    with mock.patch.object(reindex, "db") as db_mock, \
+        mock.patch.object(reindex, "_get_changes",
+                          return_value=(7, changes)), \
+        mock.patch.object(reindex, "_delete_changes") as delete_changes, \
+        mock.patch.object(Item, "insert_records", create=True) as insert:
+      # pylint: disable=protected-access
+      self.assertEqual(
+          reindex._catch_up_changes(self.shadow, [Item], False), 2)
+
+    insert.assert_called_once_with([1, 2], self.shadow)
+    delete_changes.assert_called_once_with(7)
+    statements = [call[0][0]
+                  for call in db_mock.session.execute.call_args_list]
+    self.assertEqual(len(statements), 1)
+    statement = statements[0].compile()
+    self.assertEqual(
+        str(statement),
+        "DELETE FROM records_shadow WHERE records_shadow.type = :type_1 "
+        "AND records_shadow.key IN (:key_1, :key_2)",
+    )
+    self.assertEqual(statement.params,
+                     {"type_1": "Item", "key_1": 1, "key_2": 2})
+
+  def test_change_triggers(self):
+    """Missing triggers logging changes of the index table are created."""
+    with mock.patch.object(reindex, "db") as db_mock, \
+        mock.patch.object(reindex, "_get_record_table",
+                          return_value=self.record_table):
+      db_mock.session.execute.side_effect = [
+          [("records_reindex_insert",)], None, None,
+      ]
+      reindex._create_change_triggers()  # pylint: disable=protected-access
+
+    statements = [call[0][0]
+                  for call in db_mock.session.execute.call_args_list]
+    self.assertEqual(statements[1:], [
+        "CREATE TRIGGER records_reindex_update AFTER UPDATE ON records "
+        "FOR EACH ROW INSERT INTO fulltext_reindex_changes (type, `key`) "
+        "VALUES (NEW.type, NEW.`key`)",
+        "CREATE TRIGGER records_reindex_delete AFTER DELETE ON records "
+        "FOR EACH ROW INSERT INTO fulltext_reindex_changes (type, `key`) "
+        "VALUES (OLD.type, OLD.`key`)",
+    ])
@@ -0,0 +1,104 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for the inverted index of full text record tokens."""
+
+import unittest
+
+import ddt
+import mock
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.fulltext import tokens
+from ggrc.fulltext.mysql import MysqlIndexer
+from ggrc.fulltext.mysql import MysqlRecordProperty as Record
+from ggrc.models import all_models
+
+
+def _compile(condition):
+  """Compile condition for MySQL with inlined parameters."""
+  return unicode(condition.compile(dialect=mysql.dialect(),
+                                   compile_kwargs={"literal_binds": True}))
+
+
+@ddt.ddt
+class TestTokenize(unittest.TestCase):
+  """Tests for splitting content into tokens."""
+
+  def test_prefixes(self):
+    """Words are indexed with all their prefixes."""
+    self.assertEqual(tokens.tokenize(u"Key Control"), {
+        u"ke", u"key",
+        u"co", u"con", u"cont", u"contr", u"contro", u"control",
+    })
+
+  def test_short_and_long_words(self):
+    """Too short words are skipped and long words are truncated."""
+    result = tokens.tokenize(u"a " + u"x" * 40)
+    self.assertEqual(
+        result,
+        {u"x" * length for length in range(tokens.MIN_TOKEN_LENGTH,
+                                           tokens.MAX_TOKEN_LENGTH + 1)},
+    )
+
+  @ddt.data(
+      (u"CONTROL-12", [u"12", u"control"]),
+      (u"contr", [u"contr"]),
+      (u"a", []),
+      (u"%", []),
+      (None, []),
+      (42, [u"42"]),
+      (u"\u00dcber Check", [u"check", u"\u00fcber"]),
+  )
+  @ddt.unpack
+  def test_query_tokens(self, terms, expected):
+    """Search terms are split into lower case tokens."""
+    self.assertEqual(tokens.query_tokens(terms), expected)
+
+  def test_token_rows(self):
+    """Sort and empty records are not indexed."""
+    records = [
+        {"type": "Control", "key": 1, "property": "title",
+         "subproperty": u"", "content": u"Key"},
+        {"type": "Control", "key": 1, "property": "title",
+         "subproperty": u"__sort__", "content": u"sorted"},
+        {"type": "Control", "key": 1, "property": "notes",
+         "subproperty": u"", "content": u""},
+    ]
+    self.assertEqual(tokens.token_rows(records), {
+        (u"ke", "Control", 1, "title"),
+        (u"key", "Control", 1, "title"),
+    })
+
+
+class TestCandidatesFilter(unittest.TestCase):
+  """Tests for the candidate records filter."""
+
+  @mock.patch("ggrc.settings.FULLTEXT_TOKEN_INDEX", False)
+  def test_disabled(self):
+    """All records are scanned if the token index is disabled."""
+    condition = tokens.candidates_filter(Record, u"control")
+    self.assertIs(condition, sa.true())
+
+  @mock.patch("ggrc.settings.FULLTEXT_TOKEN_INDEX", True)
+  def test_no_tokens(self):
+    """All records are scanned if the terms have no indexed tokens."""
+    self.assertIs(tokens.candidates_filter(Record, u"%"), sa.true())
+
+  @mock.patch("ggrc.settings.FULLTEXT_TOKEN_INDEX", True)
+  def test_all_tokens(self):
+    """Candidate records must have every token of the terms."""
+    sql = _compile(tokens.candidates_filter(Record, u"Key contr"))
+    self.assertEqual(sql.count(u"fulltext_record_tokens.token ="), 2)
+    self.assertIn(u"fulltext_record_tokens.token = 'key'", sql)
+    self.assertIn(u"fulltext_record_tokens.token = 'contr'", sql)
+
+  @mock.patch("ggrc.settings.FULLTEXT_TOKEN_INDEX", True)
+  def test_search_filter(self):
+    """Global search checks content of the candidate records only."""
+    sql = _compile(MysqlIndexer.get_filter_query(u"key",
+                                                 all_models.Control))
+    self.assertIn(u"fulltext_record_tokens.token = 'key'", sql)
+    self.assertIn(u"LIKE", sql)
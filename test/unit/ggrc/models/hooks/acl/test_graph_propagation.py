@@ -0,0 +1,183 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for ACL propagation with the in-memory propagation graph."""
+
+import collections
+import unittest
+
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.models.hooks.acl import graph_propagation
+
+
+# (id, parent_id, object_type) of roles: Audit role propagates to mapped
+# assessments and further to the evidence mapped to those assessments.
+ROLES = [
+    (1, None, "Audit"),
+    (2, 1, "Relationship"),
+    (3, 2, "Assessment"),
+    (4, 3, "Relationship"),
+    (5, 4, "Evidence"),
+    (6, None, "Control"),
+]
+
+RELATIONSHIPS = [
+    (100, "Audit", 1, "Assessment", 10),
+    (101, "Evidence", 20, "Assessment", 10),
+    (102, "Audit", 1, "Control", 30),
+]
+
+
+def make_graph():
+  """Make the propagation graph of the test roles and relationships."""
+  graph = graph_propagation.PropagationGraph(ROLES)
+  for relationship in RELATIONSHIPS:
+    graph.add_relationship(*relationship)
+  return graph
+
+
+class FakeAclTable(object):
+  """In-memory ACL table replacing the db helpers of the engine."""
+
+  def __init__(self, rows):
+    # id -> (ac_role_id, object_type, object_id, parent_id)
+    self.rows = dict(rows)
+    self.next_id = max(self.rows) + 1
+
+  def get_children(self, parent_ids):
+    parent_ids = set(parent_ids)
+    return {row: acl_id for acl_id, row in self.rows.iteritems()
+            if row[3] in parent_ids}
+
+  def delete(self, acl_ids):
+    acl_ids = set(acl_ids)
+    while acl_ids:
+      for acl_id in acl_ids:
+        self.rows.pop(acl_id, None)
+      acl_ids = {acl_id for acl_id, row in self.rows.iteritems()
+                 if row[3] in acl_ids}
+
+  def insert(self, acls, base_ids, _):
+    for acl in acls:
+      assert acl[3] in base_ids
+      self.rows[self.next_id] = acl
+      self.next_id += 1
+
+  def tree(self, acl_id):
+    """Get nested (entry, children) structure of the subtree of the entry."""
+    return {
+        row[:3]: self.tree(child_id)
+        for child_id, row in self.rows.iteritems() if row[3] == acl_id
+    }
+
+
+class TestPropagationGraph(unittest.TestCase):
+  """Tests for propagation rules of the graph."""
+
+  def test_type_pairs(self):
+    """Only relationships able to propagate roles are selected."""
+    graph = graph_propagation.PropagationGraph(ROLES)
+    self.assertEqual(graph.type_pairs, {
+        ("Audit", "Assessment"),
+        ("Assessment", "Evidence"),
+    })
+
+  def test_propagation_levels(self):
+    """Entries propagate through relationships level by level."""
+    graph = make_graph()
+    self.assertEqual(
+        graph.propagation_level({7: (1, "Audit", 1)}, True),
+        {(2, "Relationship", 100, 7)},
+    )
+    self.assertEqual(
+        graph.propagation_level({8: (2, "Relationship", 100)}, False),
+        {(3, "Assessment", 10, 8)},
+    )
+    self.assertEqual(
+        graph.propagation_level({9: (3, "Assessment", 10)}, True),
+        {(4, "Relationship", 101, 9)},
+    )
+    self.assertEqual(
+        graph.propagation_level({10: (4, "Relationship", 101)}, False),
+        {(5, "Evidence", 20, 10)},
+    )
+
+  def test_not_propagated(self):
+    """Roles without child roles and relationship base entries stay."""
+    graph = make_graph()
+    self.assertEqual(
+        graph.propagation_level({
+            1: (6, "Control", 30),
+            2: (2, "Relationship", 100),
+            3: (5, "Evidence", 20),
+        }, True),
+        set(),
+    )
+
+
+class TestPropagateBaseAcls(unittest.TestCase):
+  """Tests for applying the propagation difference."""
+  # pylint: disable=protected-access
+
+  def propagate(self, rows):
+    """Propagate base entry 1 on the fake table with the given rows."""
+    table = FakeAclTable(rows)
+    counts = collections.Counter()
+    with mock.patch.multiple(
+        graph_propagation,
+        _get_children=table.get_children,
+        _delete_acls=table.delete,
+        _insert_acls=table.insert,
+    ):
+      graph_propagation._propagate_base_acls(
+          make_graph(), {1: (1, "Audit", 1)}, None, 50, counts,
+      )
+    return table, counts
+
+  def assert_full_tree(self, table):
+    """Check the subtree of the base entry is propagated completely."""
+    self.assertEqual(table.tree(1), {
+        (2, "Relationship", 100): {
+            (3, "Assessment", 10): {
+                (4, "Relationship", 101): {
+                    (5, "Evidence", 20): {},
+                },
+            },
+        },
+    })
+
+  def test_propagate_new(self):
+    """All propagated entries are inserted for a new base entry."""
+    table, counts = self.propagate({1: (1, "Audit", 1, None)})
+    self.assert_full_tree(table)
+    self.assertEqual(counts, {"inserted": 4, "deleted": 0, "kept": 0})
+
+  def test_propagate_diff(self):
+    """Stale entries are deleted and valid ones are kept."""
+    table, counts = self.propagate({
+        1: (1, "Audit", 1, None),
+        2: (2, "Relationship", 100, 1),
+        3: (2, "Relationship", 102, 1),
+        4: (3, "Control", 30, 3),
+    })
+    self.assert_full_tree(table)
+    self.assertIn(2, table.rows)
+    self.assertNotIn(4, table.rows)
+    self.assertEqual(counts, {"inserted": 3, "deleted": 1, "kept": 1})
+
+  def test_depth_limit(self):
+    """Propagation deeper than the limit fails."""
+    table = FakeAclTable({1: (1, "Audit", 1, None)})
+    with mock.patch.multiple(
+        graph_propagation,
+        _get_children=table.get_children,
+        _delete_acls=table.delete,
+        _insert_acls=table.insert,
+    ):
+      with self.assertRaises(Exception):
+        graph_propagation._propagate_base_acls(
+            make_graph(), {1: (1, "Audit", 1)}, None, 3,
+            collections.Counter(),
+        )
@@ -0,0 +1,70 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for relationship adjacency index."""
+
+import unittest
+
+import mock
+import sqlalchemy
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.models import relationship_adjacency
+
+
+class TestRelationshipAdjacency(unittest.TestCase):
+  """Tests for relationship adjacency rows and queries."""
+  # pylint: disable=protected-access
+
+  @staticmethod
+  def _relationship(source, destination):
+    return mock.Mock(
+        id=7,
+        source_type=source[0], source_id=source[1],
+        destination_type=destination[0], destination_id=destination[1],
+    )
+
+  def test_rows(self):
+    """Relationship is indexed for both sides."""
+    rows = relationship_adjacency._rows(
+        self._relationship(("Audit", 1), ("Issue", 2))
+    )
+    self.assertItemsEqual(rows, [
+        {"object_type": "Audit", "object_id": 1, "related_type": "Issue",
+         "related_id": 2, "relationship_id": 7},
+        {"object_type": "Issue", "object_id": 2, "related_type": "Audit",
+         "related_id": 1, "relationship_id": 7},
+    ])
+
+  def test_self_relationship_rows(self):
+    """Relationship of an object to itself is indexed once."""
+    rows = relationship_adjacency._rows(
+        self._relationship(("Control", 1), ("Control", 1))
+    )
+    self.assertEqual(len(rows), 1)
+
+  def test_insert_hook(self):
+    """New relationship rows are inserted on the flush connection."""
+    connection = mock.Mock()
+    relationship_adjacency.handle_relationship_insert(
+        None, connection, self._relationship(("Audit", 1), ("Issue", 2)),
+    )
+    statement, rows = connection.execute.call_args[0]
+    self.assertEqual(statement.table.name, "relationship_adjacency")
+    self.assertEqual(len(rows), 2)
+
+  def test_objects_filter(self):
+    """Objects are selected with an id list per type."""
+    sql = str(relationship_adjacency.objects_filter(
+        [("Audit", 1), ("Audit", 2), ("Issue", 3)],
+    ))
+    self.assertNotIn("relationships.", sql)
+    self.assertEqual(sql.count("relationship_adjacency.object_type ="), 2)
+    self.assertEqual(sql.count("relationship_adjacency.object_id IN"), 2)
+
+  def test_empty_objects_filter(self):
+    """No objects select no rows."""
+    self.assertEqual(
+        str(relationship_adjacency.objects_filter([])),
+        str(sqlalchemy.false()),
+    )
@@ -304,3 +304,96 @@ class TestCheckPopulatedContent(unittest.TestCase):
 
         for acl in revision.content["access_control_list"]:
           self.assertIsNone(acl.get("parent_id"))
+
+
+class TestPopulatedContentCache(unittest.TestCase):
+  """Unittests for caching of populated revision content."""
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    super(TestPopulatedContentCache, self).setUp()
+    obj = mock.Mock()
+    obj.id = 1
+    obj.__class__.__name__ = "Control"
+    self.content = {
+        "title": "control",
+        "status": "Effective",
+        "access_control_list": [{"ac_role_id": 1, "person_id": 2}],
+    }
+    self.revision = all_models.Revision(obj, mock.Mock(), mock.Mock(), {})
+    self.revision.content = self.content
+    self.cads_patch = mock.patch(
+        "ggrc.models.custom_attribute_definition.get_custom_attributes_for",
+        return_value=[],
+    )
+    self.roles_patch = mock.patch(
+        "ggrc.access_control.role.get_custom_roles_for",
+        return_value={1: "Admin"},
+    )
+    self.get_cads = self.cads_patch.start()
+    self.get_roles = self.roles_patch.start()
+
+  def tearDown(self):
+    self.cads_patch.stop()
+    self.roles_patch.stop()
+    super(TestPopulatedContentCache, self).tearDown()
+
+  def test_content_cached(self):
+    """Populate steps run once for many content reads."""
+    first = self.revision.content
+    first["title"] = "changed"
+    second = self.revision.content
+
+    self.assertEqual(second["title"], "control")
+    self.assertEqual(second["status"], "Active")
+    self.assertEqual(self.get_cads.call_count, 1)
+    self.assertEqual(self.get_roles.call_count, 1)
+
+  def test_nested_values_not_shared(self):
+    """Changes of nested content values do not change cached values."""
+    self.revision.content["access_control_list"][0]["person"]["id"] = 3
+    self.revision.get_content_value("access_control_list").append({})
+    content = self.revision.content
+
+    self.assertEqual(content["access_control_list"],
+                     [{"ac_role_id": 1, "person_id": 2,
+                       "person": {"id": 2, "type": "Person"}}])
+    self.assertEqual(self.get_roles.call_count, 1)
+
+  def test_stored_content_not_changed(self):
+    """Populate steps do not change the stored content."""
+    content = self.revision.content
+
+    self.assertEqual(content["access_control_list"][0]["person"],
+                     {"id": 2, "type": "Person"})
+    self.assertNotIn("person", self.content["access_control_list"][0])
+
+  def test_new_content_invalidates_cache(self):
+    """Assigning new content drops cached populate results."""
+    self.assertEqual(self.revision.content["title"], "control")
+    self.revision.content = dict(self.content, title="new")
+
+    self.assertEqual(self.revision.content["title"], "new")
+    self.assertEqual(self.get_cads.call_count, 2)
+
+  def test_content_value(self):
+    """Only populate steps setting the key run for a single value."""
+    self.assertEqual(self.revision.get_content_value("title"), "control")
+    self.assertEqual(self.revision.get_content_value("status"), "Active")
+    self.assertIsNone(self.revision.get_content_value("folder_id"))
+    self.assertFalse(self.get_cads.called)
+    self.assertFalse(self.get_roles.called)
+
+  def test_preload_content(self):
+    """Definitions are loaded for all revisions at once."""
+    with mock.patch(
+        "ggrc.models.custom_attribute_definition."
+        "get_custom_attributes_for_many",
+        return_value={("Control", 1): []},
+    ) as get_cads_for_many:
+      all_models.Revision.preload_content([self.revision, None])
+      content = self.revision.content
+
+    get_cads_for_many.assert_called_once_with({("Control", 1)})
+    self.assertFalse(self.get_cads.called)
+    self.assertEqual(content["custom_attribute_values"], [])
@@ -0,0 +1,115 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for the index of similar objects."""
+
+import unittest
+
+import mock
+from sqlalchemy import orm
+from sqlalchemy.dialects import mysql
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.models import all_models
+from ggrc.models import similarity_index
+
+
+def _compile(statement):
+  """Compile statement for MySQL with inlined parameters."""
+  return unicode(statement.compile(dialect=mysql.dialect(),
+                                   compile_kwargs={"literal_binds": True}))
+
+
+class TestAffectedObjects(unittest.TestCase):
+  """Tests for objects affected by relationships."""
+
+  def test_snapshot_mappings(self):
+    """Snapshots mapped to Assessments and Issues are collected."""
+    stubs, snapshot_ids = similarity_index.affected_objects([
+        ("Snapshot", 1, "Assessment", 10),
+        ("Issue", 11, "Snapshot", 2),
+        ("Snapshot", 3, "Audit", 12),
+    ])
+    self.assertEqual(stubs, set())
+    self.assertEqual(snapshot_ids, {1, 2})
+
+  def test_object_mappings(self):
+    """Objects mapped to the same type or to Issues are collected."""
+    stubs, snapshot_ids = similarity_index.affected_objects([
+        ("Control", 1, "Control", 2),
+        ("Issue", 3, "Market", 4),
+        ("Control", 5, "Market", 6),
+        ("Assessment", 7, "Control", 8),
+    ])
+    self.assertEqual(stubs, {("Control", 1), ("Control", 2), ("Market", 4)})
+    self.assertEqual(snapshot_ids, set())
+
+
+class TestRefresh(unittest.TestCase):
+  """Tests for refreshing rows of objects."""
+
+  @mock.patch("ggrc.models.similarity_index._refresh_objects")
+  def test_ids_per_type(self, refresh_objects):
+    """Rows are refreshed for snapshottable objects of each type."""
+    similarity_index.refresh([("Control", 3), ("Control", 1),
+                              ("Market", 4), ("Assessment", 5)])
+    self.assertItemsEqual(
+        [call[0] for call in refresh_objects.call_args_list],
+        [("Control", [1, 3]), ("Market", [4])],
+    )
+
+  def test_insert_selects(self):
+    """Rows are selected from the relationship adjacency index."""
+    # pylint: disable=protected-access
+    selects = similarity_index._insert_selects("Control", [1, 2])
+    self.assertEqual(len(selects), 3)
+    for select in selects:
+      sql = _compile(select)
+      self.assertIn(u"relationship_adjacency", sql)
+      self.assertNotIn(u"FROM relationships", sql)
+      self.assertIn(u"IN (1, 2)", sql)
+
+
+class TestHandleFlush(unittest.TestCase):
+  """Tests for the session hook."""
+
+  def setUp(self):
+    super(TestHandleFlush, self).setUp()
+    self.session = mock.Mock(
+        new=[mock.Mock(spec=all_models.Relationship,
+                       source_type="Snapshot", source_id=1,
+                       destination_type="Assessment", destination_id=2)],
+        deleted=[mock.Mock(spec=all_models.Snapshot,
+                           child_type="Control", child_id=3)],
+    )
+
+  @mock.patch("ggrc.settings.SIMILARITY_INDEX", False)
+  @mock.patch("ggrc.models.similarity_index.refresh_relationships")
+  def test_disabled(self, refresh_relationships):
+    """Index is not maintained if it is disabled."""
+    similarity_index.handle_flush(self.session, None)
+    self.assertFalse(refresh_relationships.called)
+
+  @mock.patch("ggrc.settings.SIMILARITY_INDEX", True)
+  @mock.patch("ggrc.models.similarity_index.refresh_relationships")
+  def test_flushed_objects(self, refresh_relationships):
+    """Flushed relationships and deleted snapshots are refreshed."""
+    similarity_index.handle_flush(self.session, None)
+    refresh_relationships.assert_called_once_with(
+        [("Snapshot", 1, "Assessment", 2)], [("Control", 3)],
+    )
+
+
+class TestIndexedQueries(unittest.TestCase):
+  """Tests for similarity queries looking up the index."""
+
+  @mock.patch("ggrc.settings.SIMILARITY_INDEX", True)
+  @mock.patch("ggrc.models.mixins.with_similarity_score.db")
+  def test_object_assessments(self, db):
+    """Similar Assessments of an object are a lookup of the index."""
+    db.session.query.side_effect = orm.Query
+    sql = _compile(all_models.Control.get_similar_objects_query(
+        5, "Assessment").statement)
+    self.assertIn(u"FROM similarity_index", sql)
+    self.assertIn(u"similarity_index.object_id = 5", sql)
+    self.assertNotIn(u"UNION", sql)
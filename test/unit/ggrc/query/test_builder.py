@@ -60,3 +60,60 @@ class TestQueryHelper(unittest.TestCase):
 
     for expected_result, expression in expressions:
       self.assertEqual(expected_result, helper._expression_keys(expression))
+
+  def test_query_levels(self):
+    """Test grouping of object queries into independent levels."""
+    # pylint: disable=protected-access
+    def previous(index):
+      return {
+          "object_name": "__previous__",
+          "op": {"name": "relevant"},
+          "ids": [index],
+      }
+
+    helper = builder.QueryHelper([])
+    helper.query = [
+        {"object_name": "Program", "filters": {"expression": {}}},
+        {"object_name": "Audit", "filters": {"expression": previous(0)}},
+        {"object_name": "Control", "filters": {"expression": {}}},
+        {"object_name": "Assessment", "filters": {"expression": {
+            "left": previous(1),
+            "op": {"name": "AND"},
+            "right": previous(2),
+        }}},
+        {"object_name": "Issue"},
+    ]
+    self.assertEqual(helper._get_query_levels(), [[0, 2, 4], [1], [3]])
+
+  @mock.patch("ggrc.query.builder.inflector.get_model")
+  def test_permission_filter_cache(self, get_model):
+    """Test permission filters are resolved once per model and permission."""
+    # pylint: disable=protected-access
+    get_model.side_effect = lambda name: name
+    helper = builder.QueryHelper([])
+    with mock.patch.object(helper, "_get_type_query") as get_type_query:
+      for object_name in ("Audit", "Control", "Audit"):
+        helper._get_permission_filter({"object_name": object_name})
+      helper._get_permission_filter({"object_name": "Audit",
+                                     "permissions": "update"})
+    self.assertEqual(get_type_query.call_args_list, [
+        mock.call("Audit", "read"),
+        mock.call("Control", "read"),
+        mock.call("Audit", "update"),
+    ])
+
+  @mock.patch("ggrc.query.builder.settings.QUERY_API_WORKERS", 0)
+  def test_batched_ids_order(self):
+    """Test batched ids are returned in the original order."""
+    # pylint: disable=protected-access
+    helper = builder.QueryHelper([])
+    helper.query = [{"object_name": "Program"}, {"object_name": "Audit"}]
+    with mock.patch.object(helper, "_get_permission_filter"), \
+        mock.patch.object(helper, "_get_ids",
+                          side_effect=lambda q: [q["object_name"]]):
+      results = helper._get_batched_ids(
+          expose_ids=lambda q: q["object_name"] == "Audit",
+      )
+    self.assertEqual(results, [["Program"], ["Audit"]])
+    self.assertNotIn("ids", helper.query[0])
+    self.assertEqual(helper.query[1]["ids"], ["Audit"])
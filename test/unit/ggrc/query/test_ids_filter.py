@@ -0,0 +1,62 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for the strategies of filtering by queried ids."""
+
+import unittest
+
+import mock
+from sqlalchemy import orm
+from sqlalchemy.dialects import mysql
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.models import all_models
+from ggrc.query import custom_operators
+
+
+def _compile(condition):
+  """Compile condition for MySQL with inlined parameters."""
+  return unicode(condition.compile(dialect=mysql.dialect(),
+                                   compile_kwargs={"literal_binds": True}))
+
+
+class TestIdsFilter(unittest.TestCase):
+  """Tests for ids_filter."""
+
+  def setUp(self):
+    super(TestIdsFilter, self).setUp()
+    self.ids_query = orm.Query(all_models.Relationship.source_id)
+
+  def _ids_filter(self, ids):
+    """Get SQL of the filter of Controls with given queried ids."""
+    with mock.patch.object(orm.Query, "all", return_value=ids):
+      return _compile(custom_operators.ids_filter(
+          all_models.Control, self.ids_query, u"test",
+      ))
+
+  @mock.patch("ggrc.settings.RELEVANT_IDS_THRESHOLD", 3)
+  def test_id_list(self):
+    """Ids are sent as a list below the threshold."""
+    sql = self._ids_filter([(1,), (2,), (3,)])
+    self.assertEqual(sql, u"controls.id IN (1, 2, 3)")
+
+  @mock.patch("ggrc.settings.RELEVANT_IDS_THRESHOLD", 3)
+  def test_no_ids(self):
+    """Nothing is found without ids."""
+    self.assertEqual(self._ids_filter([]), u"0")
+
+  @mock.patch("ggrc.settings.RELEVANT_IDS_THRESHOLD", 3)
+  def test_derived_table(self):
+    """Ids stay in a derived table above the threshold."""
+    sql = self._ids_filter([(1,), (2,), (3,), (4,)])
+    self.assertIn(u"controls.id IN (SELECT", sql)
+    self.assertIn(u"FROM relationships", sql)
+    self.assertNotIn(u"(1, 2, 3, 4)", sql)
+
+  @mock.patch("ggrc.settings.RELEVANT_IDS_THRESHOLD", 0)
+  def test_disabled_threshold(self):
+    """Ids are never fetched without the threshold."""
+    with mock.patch.object(orm.Query, "all") as all_:
+      custom_operators.ids_filter(all_models.Control, self.ids_query,
+                                  u"test")
+    self.assertFalse(all_.called)
@@ -0,0 +1,70 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for query pagination helpers."""
+
+import unittest
+
+import ddt
+import mock
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declarative_base
+
+from ggrc.query import pagination
+
+
+Base = declarative_base()  # pylint: disable=invalid-name
+
+
+class Item(Base):  # pylint: disable=too-few-public-methods
+  __tablename__ = "items"
+  id = sa.Column(sa.Integer, primary_key=True)
+
+
+@ddt.ddt
+class TestPagination(unittest.TestCase):
+  """Tests for window function based pagination."""
+
+  @ddt.data(
+      ("mysql", (5, 7, 22), False),
+      ("mysql", (8, 0, 13), True),
+      ("mysql", (10, 1, 2, "MariaDB"), False),
+      ("mysql", (10, 3, 9, "MariaDB"), True),
+      ("sqlite", (3, 8, 2), False),
+      ("sqlite", (3, 28, 0), True),
+      ("mssql", (14, 0), False),
+      ("mysql", None, False),
+  )
+  @ddt.unpack
+  def test_supports_window_functions(self, name, version, expected):
+    """Test window functions support detection."""
+    engine = mock.MagicMock()
+    engine.dialect.name = name
+    engine.dialect.server_version_info = version
+    self.assertEqual(pagination.supports_window_functions(engine), expected)
+
+  @ddt.data(
+      (True, [0, 3], [1, 2, 3], 5),
+      (True, [3, 10], [4, 5], 5),
+      (False, [3, 10], [4, 5], 5),
+      (True, [10, 20], [], 5),
+      (False, [10, 20], [], 5),
+  )
+  @ddt.unpack
+  def test_limited_ids_and_total(self, window, limit, ids, total):
+    """Test page ids and total are the same for both execution paths."""
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    if window and not pagination.supports_window_functions(engine):
+      self.skipTest("sqlite without window functions support")
+    session = sa.orm.sessionmaker(bind=engine)()
+    session.add_all([Item(id=id_) for id_ in range(1, 6)])
+    session.flush()
+    query = session.query(Item.id).order_by(Item.id)
+    with mock.patch("ggrc.query.pagination.supports_window_functions",
+                    return_value=window), \
+        mock.patch("ggrc.query.pagination.db.session", session):
+      self.assertEqual(
+          pagination.get_limited_ids_and_total(query, limit),
+          (ids, total),
+      )
@@ -0,0 +1,48 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for column projected publishing of /query fields."""
+
+import unittest
+
+from ggrc.app import app
+from ggrc.builder import json
+from ggrc.models import all_models
+
+
+class TestFieldsProjection(unittest.TestCase):
+  """Unit tests for FieldsProjection."""
+
+  def setUp(self):
+    super(TestFieldsProjection, self).setUp()
+    with app.app_context():
+      self.projection = json.FieldsProjection(all_models.Control, [
+          "id", "title", "type", "modified_by", "access_control_list",
+          "selfLink", "not_published",
+      ])
+
+  def test_fields(self):
+    """Fields are split into projected and fallback ones."""
+    self.assertEqual([field for field, _ in self.projection.getters],
+                     ["id", "title", "type", "modified_by"])
+    self.assertEqual(self.projection.fallback_fields,
+                     ["access_control_list", "selfLink"])
+    self.assertEqual(self.projection.columns, [
+        all_models.Control.id,
+        all_models.Control.title,
+        all_models.Control.modified_by_id,
+        all_models.Control.updated_at,
+    ])
+
+  def test_publish_row(self):
+    """Projected fields are published from the row."""
+    published = self.projection.publish_row((3, "Control 3", 5, "date"))
+    stub = published.pop("modified_by")
+    self.assertEqual(published,
+                     {"id": 3, "title": "Control 3", "type": "Control"})
+    self.assertEqual((stub.type, stub.conditions), ("Person", {"id": 5}))
+    self.assertEqual(self.projection.get_updated_at((3, "", 5, "date")),
+                     "date")
+    self.assertIsNone(
+        self.projection.publish_row((3, "", None, None))["modified_by"]
+    )
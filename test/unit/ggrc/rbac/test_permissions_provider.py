@@ -0,0 +1,110 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for permission checks on the compiled permission index."""
+
+import unittest
+
+import ddt
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.rbac import permissions_provider
+
+
+def _instance(type_, id_, context_id=None):
+  """Make instance stub of the given type with the given context."""
+  instance = mock.Mock(id=id_)
+  instance._inflector.model_singular = type_
+  instance.context = mock.Mock(id=context_id) if context_id else None
+  return instance
+
+
+@ddt.ddt
+class TestDefaultUserPermissions(unittest.TestCase):
+  """Unit tests for DefaultUserPermissions."""
+  # pylint: disable=protected-access
+
+  PERMISSIONS = {
+      "read": {
+          "Program": {"contexts": [3], "resources": {7}},
+          "Control": {"contexts": [None]},
+          "Audit": {
+              "contexts": [4],
+              "conditions": {4: [{"condition": "is",
+                                  "terms": {"property_name": "status",
+                                            "value": "Active"}}]},
+          },
+      },
+      "update": {
+          "Program": {"resources": {7}},
+      },
+      "__GGRC_ADMIN__": {
+          "__GGRC_ALL__": {"contexts": [5]},
+      },
+  }
+
+  def setUp(self):
+    super(TestDefaultUserPermissions, self).setUp()
+    self.g_patch = mock.patch.object(permissions_provider, "g",
+                                     mock.Mock(spec=[]))
+    self.g_mock = self.g_patch.start()
+    self.g_mock._request_permissions = self.PERMISSIONS
+    self.permissions = permissions_provider.DefaultUserPermissions()
+
+  def tearDown(self):
+    self.g_patch.stop()
+    super(TestDefaultUserPermissions, self).tearDown()
+
+  @ddt.data(
+      (("Program", 7, None), "read", True),
+      (("Program", 8, 3), "read", True),
+      (("Program", 8, 5), "read", False),
+      (("Program", 8, 6), "read", False),
+      (("Program", 7, None), "update", True),
+      (("Program", 8, 3), "update", False),
+      (("Control", 1, 6), "read", True),
+      (("Control", 1, 6), "delete", False),
+      (("Audit", 1, 3), "read", False),
+  )
+  @ddt.unpack
+  def test_is_allowed_for(self, instance, action, expected):
+    """Instance permissions are checked on resources and contexts."""
+    self.assertEqual(
+        self.permissions._is_allowed_for(_instance(*instance), action),
+        expected,
+    )
+
+  @ddt.data(("Active", True), ("Draft", False))
+  @ddt.unpack
+  def test_conditions(self, status, expected):
+    """Conditions are checked for context permissions."""
+    instance = _instance("Audit", 1, 4)
+    instance.status = status
+    self.assertEqual(self.permissions.is_allowed_read_for(instance), expected)
+
+  def test_is_allowed(self):
+    """Type permissions are checked with admin contexts."""
+    self.assertTrue(self.permissions.is_allowed_read("Program", None, 3))
+    self.assertTrue(self.permissions.is_allowed_read("Risk", None, 5))
+    self.assertTrue(self.permissions.is_allowed_read("Control", None, 9))
+    self.assertFalse(self.permissions.is_allowed_read("Risk", None, 3))
+    self.assertFalse(self.permissions.is_admin())
+
+  def test_contexts_for(self):
+    """Contexts include admin contexts or None for system wide access."""
+    self.assertEqual(sorted(self.permissions.read_contexts_for("Program")),
+                     [3, 5])
+    self.assertIsNone(self.permissions.read_contexts_for("Control"))
+    self.assertEqual(self.permissions.read_resources_for("Program"), [7])
+
+  def test_index_rebuilt(self):
+    """Replaced permissions dict is compiled again."""
+    self.assertFalse(self.permissions.is_admin())
+    self.g_mock._request_permissions = {
+        "__GGRC_ADMIN__": {"__GGRC_ALL__": {"contexts": [0]}},
+    }
+    self.assertTrue(self.permissions.is_admin())
+    self.assertTrue(
+        self.permissions.is_allowed_delete_for(_instance("Risk", 1))
+    )
@@ -0,0 +1,106 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for chunked snapshot creation."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc import snapshotter
+from ggrc.snapshotter import bulk
+from ggrc.snapshotter.datastructures import OperationResponse
+from ggrc.snapshotter.datastructures import Pair
+from ggrc.snapshotter.datastructures import Stub
+
+
+class TestCreateInChunks(unittest.TestCase):
+  """Unit tests for SnapshotGenerator.create_in_chunks."""
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    super(TestCreateInChunks, self).setUp()
+    audit = Stub("Audit", 1)
+    self.pairs = {Pair(audit, Stub("Control", id_)) for id_ in range(1, 6)}
+    self.generator = snapshotter.SnapshotGenerator.__new__(
+        snapshotter.SnapshotGenerator
+    )
+    self.generator.dry_run = False
+    self.generator.analyze = mock.MagicMock(return_value=(self.pairs, set()))
+    self.generator._create = mock.MagicMock(side_effect=self._create)
+    self.generator._copy_snapshot_relationships = mock.MagicMock()
+    self.generator._create_audit_relationships = mock.MagicMock()
+
+  @staticmethod
+  def _create(for_create, **_):
+    """Pretend that snapshot ids are equal to child ids."""
+    return OperationResponse("create", True, for_create, {
+        "snapshot_ids": sorted(pair.child.id for pair in for_create),
+    })
+
+  def test_chunks(self):
+    """Snapshots are created, indexed and committed chunk by chunk."""
+    progress = mock.MagicMock()
+    with mock.patch("ggrc.snapshotter.indexer") as indexer_mock, \
+        mock.patch("ggrc.snapshotter.db") as db_mock:
+      result = self.generator.create_in_chunks(
+          event=mock.MagicMock(), chunk_size=2, progress_callback=progress,
+      )
+
+    self.assertEqual(result.response, self.pairs)
+    self.assertEqual(db_mock.session.commit.call_count, 3)
+    self.assertEqual(indexer_mock.reindex_pairs.call_count, 3)
+    self.assertEqual(
+        [call[0][0] for call in
+         self.generator._copy_snapshot_relationships.call_args_list],
+        [[1, 2], [3, 4], [5]],
+    )
+    self.assertEqual(
+        [call[0][0] for call in
+         self.generator._create_audit_relationships.call_args_list],
+        [[1, 2], [3, 4], [5]],
+    )
+    self.assertEqual([call[0] for call in progress.call_args_list],
+                     [(2, 5), (4, 5), (5, 5)])
+
+  def test_dry_run(self):
+    """Dry run neither writes relationships nor commits."""
+    self.generator.dry_run = True
+    with mock.patch("ggrc.snapshotter.indexer") as indexer_mock, \
+        mock.patch("ggrc.snapshotter.db") as db_mock:
+      result = self.generator.create_in_chunks(event=None, chunk_size=10)
+
+    self.assertEqual(result.response, self.pairs)
+    self.assertFalse(db_mock.session.commit.called)
+    self.assertFalse(indexer_mock.reindex_pairs.called)
+    self.assertFalse(self.generator._create_audit_relationships.called)
+
+  def test_create_analyzed(self):
+    """Scope is not analyzed again if pairs to create are given."""
+    with mock.patch("ggrc.snapshotter.indexer"):
+      result = self.generator.create(event=None, revisions=set(),
+                                     for_create=self.pairs)
+
+    self.assertEqual(result.response, self.pairs)
+    self.assertFalse(self.generator.analyze.called)
+
+
+class TestCreateAuditSnapshots(unittest.TestCase):
+  """Unit tests for creation of audit snapshots in a request."""
+
+  @mock.patch("ggrc.settings.SNAPSHOT_BULK_THRESHOLD", 10)
+  @mock.patch("ggrc.snapshotter.bulk.db")
+  @mock.patch("ggrc.snapshotter.bulk.SnapshotGenerator")
+  def test_analyzed_once(self, generator_cls, _):
+    """Scope analyzed for the threshold is reused for the creation."""
+    generator = generator_cls.return_value
+    for_create = {mock.Mock()}
+    generator.analyze.return_value = (for_create, set())
+    event = mock.Mock()
+
+    bulk.create_audit_snapshots(mock.Mock(), event)
+
+    self.assertEqual(generator.analyze.call_count, 1)
+    generator.create.assert_called_once_with(event=event, revisions=set(),
+                                             for_create=for_create)
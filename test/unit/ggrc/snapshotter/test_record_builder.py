@@ -0,0 +1,107 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for the snapshot full text record builder."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa # pylint: disable=unused-import
+from ggrc.fulltext.attributes import FullTextAttr
+from ggrc.snapshotter import record_builder
+
+
+class FakePersonBuilder(object):
+  """Person record builder not using the database."""
+
+  @staticmethod
+  def build_person_subprops(person):
+    return {"{}-email".format(person["id"]): "user{}@a.com".format(
+        person["id"])}
+
+  @staticmethod
+  def build_list_sort_subprop(people):
+    return {"__sort__": ":".join(sorted(
+        "user{}@a.com".format(person["id"]) for person in people))}
+
+  @staticmethod
+  def get_ac_role_person_id(acl):
+    return {1: "Admin"}.get(acl["ac_role_id"]), acl["person_id"]
+
+
+class TestSnapshotRecordBuilder(unittest.TestCase):
+  """Unit tests for SnapshotRecordBuilder."""
+  # pylint: disable=unnecessary-lambda
+
+  def setUp(self):
+    super(TestSnapshotRecordBuilder, self).setUp()
+    self.batches = []
+    cad = mock.MagicMock(id=7, title="Notes", attribute_type="Text",
+                         value_mapping={}, default_value="")
+    cad.get_indexed_value.side_effect = lambda value: value
+    self.builder = record_builder.SnapshotRecordBuilder(
+        class_properties={"Control": [
+            FullTextAttr("title", "title"),
+            FullTextAttr("status", "status"),
+            FullTextAttr("key_control", "key_control"),
+            FullTextAttr("kind", "kind"),
+            FullTextAttr("categories", "categories"),
+            FullTextAttr("access_control_list", "access_control_list"),
+        ]},
+        cads={"Control": [cad]},
+        options={3: "Option 3"},
+        person_builder=FakePersonBuilder(),
+        writer=lambda rows: self.batches.append(list(rows)),
+        batch_size=100,
+    )
+
+  def _rows(self, content):
+    """Build rows of a Control snapshot with the given content."""
+    self.builder.add(1, "Audit", 2, "Control", 5, "Control", content)
+    self.builder.flush()
+    rows = [row for batch in self.batches for row in batch]
+    for row in rows:
+      self.assertEqual(row[:3], (1, "Snapshot", "Audit-2-Control"))
+    return {row[3:] for row in rows}
+
+  def test_rows(self):
+    """Rows are built for every kind of property value."""
+    rows = self._rows({
+        "title": "Control 5",
+        "status": None,
+        "key_control": True,
+        "kind": {"type": "Option", "id": 3},
+        "categories": [{"id": 4, "display_name": "Cat"}],
+        "access_control_list": [
+            {"ac_role_id": 1, "person_id": 9},
+            {"ac_role_id": 2, "person_id": 8},
+        ],
+        "custom_attribute_values": [],
+    })
+    self.assertEqual(rows, {
+        ("title", "", "Control 5"),
+        ("key_control", "", "True"),
+        ("kind", "", "Option 3"),
+        ("categories", "4-category", "Cat"),
+        ("categories", "__sort__", "Cat"),
+        ("Admin", "9-email", "user9@a.com"),
+        ("Admin", "__sort__", "user9@a.com"),
+        ("Notes", "", ""),
+        ("parent", "", "Audit-2"),
+        ("child", "", "Control-5"),
+        ("child_type", "", "Control"),
+        ("child_id", "", "5"),
+    })
+
+  def test_batches(self):
+    """Full batches of rows are written while snapshots are added."""
+    self.builder.batch_size = 10
+    for snapshot_id in range(3):
+      self.builder.add(snapshot_id, "Audit", 2, "Control", snapshot_id,
+                       "Control", {"title": "Control"})
+    self.assertEqual([len(batch) for batch in self.batches], [12])
+    self.builder.flush()
+    self.assertEqual([len(batch) for batch in self.batches], [12, 6])
+    self.assertEqual(self.builder.rows_count, 18)
+    self.assertEqual(self.builder.rows, [])
@@ -0,0 +1,116 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for keyset pagination helpers."""
+
+import base64
+import datetime
+import decimal
+import json
+import unittest
+
+import ddt
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declarative_base
+
+from ggrc import utils
+from ggrc.utils import keyset
+
+
+Base = declarative_base()  # pylint: disable=invalid-name
+
+
+class Item(Base):  # pylint: disable=too-few-public-methods
+  __tablename__ = "items"
+  id = sa.Column(sa.Integer, primary_key=True)
+  title = sa.Column(sa.String)
+  updated_at = sa.Column(sa.DateTime)
+
+
+@ddt.ddt
+class TestKeyset(unittest.TestCase):
+  """Tests for keyset pagination."""
+
+  def setUp(self):
+    super(TestKeyset, self).setUp()
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    self.session = sa.orm.sessionmaker(bind=engine)()
+    titles = ["b", None, "a", "b", None, "c", "a"]
+    self.session.add_all([
+        Item(id=id_, title=title,
+             updated_at=datetime.datetime(2019, 1, 1, 10, id_ % 3))
+        for id_, title in enumerate(titles, 1)
+    ])
+    self.session.flush()
+
+  def _iterate_pages(self, sort_keys, page_size):
+    """Get all ids by walking through the pages."""
+    query = self.session.query(Item.id)
+    ids, cursor = [], None
+    while True:
+      rows, cursor = keyset.get_page(query, sort_keys, cursor, page_size)
+      self.assertLessEqual(len(rows), page_size)
+      ids.extend(row.id for row in rows)
+      if cursor is None:
+        return ids
+
+  @ddt.data(
+      ([("title", False)], 2),
+      ([("title", True)], 3),
+      ([("updated_at", True), ("title", False)], 1),
+      ([("updated_at", False), ("title", True)], 10),
+  )
+  @ddt.unpack
+  def test_get_page(self, keys, page_size):
+    """Test keyset pages follow the offset based order."""
+    sort_keys = [(getattr(Item, name), desc) for name, desc in keys]
+    sort_keys.append((Item.id, False))
+    expected = [
+        row.id for row in keyset.order_by_keys(
+            self.session.query(Item.id), sort_keys)
+    ]
+    self.assertEqual(self._iterate_pages(sort_keys, page_size), expected)
+
+  def test_page_rows(self):
+    """Test sort key columns are not returned in page rows."""
+    rows, _ = keyset.get_page(self.session.query(Item.id, Item.title),
+                              [(Item.id, False)], None, 2)
+    self.assertEqual([tuple(row) for row in rows], [(1, "b"), (2, None)])
+    self.assertEqual(rows[0].title, "b")
+
+  @ddt.data("", "not a cursor", keyset.encode_cursor([1, 2]))
+  def test_invalid_cursor(self, cursor):
+    """Test invalid cursor raises ValueError."""
+    with self.assertRaises(ValueError):
+      keyset.get_page(self.session.query(Item.id), [(Item.id, False)],
+                      cursor or "e30=", 2)
+
+  def test_cursor_values(self):
+    """Test cursor keeps dates, datetimes and decimals."""
+    values = [datetime.datetime(2019, 1, 1, 10, 3, 5, 7),
+              datetime.datetime(2019, 1, 1, 10, 3),
+              datetime.date(2019, 2, 3), decimal.Decimal("10.50"),
+              u"title", None, 5]
+    cursor = keyset.encode_cursor(values)
+    decoded = keyset.decode_cursor(cursor, len(values))
+    self.assertEqual(decoded, values)
+    self.assertEqual(str(decoded[3]), "10.50")
+
+  def test_invalid_decimal(self):
+    """Test invalid decimal cursor value raises ValueError."""
+    cursor = base64.urlsafe_b64encode(json.dumps([{"decimal": "x"}]))
+    with self.assertRaises(ValueError):
+      keyset.decode_cursor(cursor, 1)
+
+  @ddt.data(1, 2, 3, 7, 10)
+  def test_generate_query_chunks(self, chunk_size):
+    """Test query chunks cover all rows once in id order."""
+    query = self.session.query(Item.title).filter(Item.id != 4)
+    chunks = [list(chunk) for chunk in utils.generate_query_chunks(
+        query, chunk_size=chunk_size)]
+    self.assertTrue(all(0 < len(chunk) <= chunk_size for chunk in chunks))
+    self.assertEqual(
+        [row.title for chunk in chunks for row in chunk],
+        ["b", None, "a", None, "c", "a"],
+    )
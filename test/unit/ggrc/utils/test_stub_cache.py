@@ -0,0 +1,110 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for the stub cache."""
+
+import unittest
+
+import mock
+
+from ggrc.app import app as flask_app
+from ggrc.builder import json as builder_json
+from ggrc.utils import stub_cache
+
+
+class TestLRUCache(unittest.TestCase):
+  """Unit tests for LRUCache."""
+
+  def test_eviction(self):
+    """Least recently used entries are evicted."""
+    cache = stub_cache.LRUCache(size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    self.assertEqual(cache.get("a"), 1)
+    cache.set("c", 3)
+    self.assertIsNone(cache.get("b"))
+    self.assertEqual(cache.get("a"), 1)
+    self.assertEqual(cache.get("c"), 3)
+
+  def test_expiration(self):
+    """Expired entries are not returned."""
+    cache = stub_cache.LRUCache(size=2, ttl=60)
+    with mock.patch("time.time", return_value=100):
+      cache.set("a", 1)
+    with mock.patch("time.time", return_value=159):
+      self.assertEqual(cache.get("a"), 1)
+    with mock.patch("time.time", return_value=161):
+      self.assertIsNone(cache.get("a"))
+
+  def test_disabled(self):
+    """Cache of zero size keeps nothing."""
+    cache = stub_cache.LRUCache(size=0, ttl=60)
+    cache.set("a", 1)
+    self.assertIsNone(cache.get("a"))
+
+
+class TestPublishRepresentation(unittest.TestCase):
+  """Unit tests for stub rendering with the stub cache."""
+
+  def setUp(self):
+    super(TestPublishRepresentation, self).setUp()
+    self.process_cache = stub_cache.LRUCache(size=10, ttl=60)
+    patcher = mock.patch.object(stub_cache, "_process_cache",
+                                self.process_cache)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  @staticmethod
+  def _resource():
+    return {
+        "audit": builder_json.LazyStubRepresentation("Audit", 1),
+        "people": [builder_json.LazyStubRepresentation("Person", 2),
+                   builder_json.LazyStubRepresentation("Person", 3)],
+    }
+
+  def test_misses_only(self):
+    """Only stubs missing in the caches are queried."""
+    self.process_cache.set(("Person", 2), stub_cache.StubData(
+        "Person", None, None))
+    with flask_app.test_request_context():
+      with mock.patch.object(builder_json, "build_stub_union_query",
+                             return_value=({}, {}, None)) as union_mock:
+        resource = builder_json.publish_representation(self._resource())
+      counters = stub_cache.get_counters()
+
+    self.assertEqual(sorted(union_mock.call_args[0][0]),
+                     [("Audit", {"id": 1}), ("Person", {"id": 3})])
+    self.assertEqual(resource["people"][0]["type"], "Person")
+    self.assertEqual(resource["people"][0]["id"], 2)
+    self.assertIsNone(resource["people"][1])
+    self.assertEqual((counters["hits"], counters["misses"]), (1, 2))
+
+  def test_fetched_stubs_cached(self):
+    """Stubs fetched by the union query are cached."""
+    type_columns = {"Audit": {"type": 0, "id": 1, "context_id": 2,
+                              "updated_at": 3}}
+    results = {"Audit": {("id",): {(1,): []}}}
+    query = mock.MagicMock()
+    query.all.return_value = [("Audit", 1, 5, None)]
+    with flask_app.test_request_context():
+      with mock.patch.object(builder_json, "build_stub_union_query",
+                             return_value=(results, type_columns, query)):
+        resource = builder_json.publish_representation(
+            {"audit": builder_json.LazyStubRepresentation("Audit", 1)}
+        )
+
+    self.assertEqual(resource["audit"]["context_id"], 5)
+    self.assertEqual(self.process_cache.get(("Audit", 1)),
+                     stub_cache.StubData("Audit", 5, None))
+
+  def test_invalidate_flushed(self):
+    """Stubs of updated objects are dropped."""
+    from ggrc.models import all_models
+    self.process_cache.set(("Option", 1), stub_cache.StubData(
+        "Option", None, None))
+    option = all_models.Option(id=1)
+    session = mock.MagicMock(dirty={option}, deleted=set())
+    with flask_app.test_request_context():
+      stub_cache.invalidate_flushed(session, None)
+
+    self.assertIsNone(self.process_cache.get(("Option", 1)))
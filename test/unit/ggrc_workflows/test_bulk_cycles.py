@@ -0,0 +1,104 @@
+# Copyright (C) 2019 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for bulk generation of recurring cycles."""
+
+import unittest
+
+import mock
+
+from ggrc.models.relationship import Relationship
+import ggrc_workflows
+from ggrc_workflows import bulk_cycles
+
+
+class TestMapCycleTask(unittest.TestCase):
+  """Tests for mapping cycle tasks to task group objects."""
+
+  def setUp(self):
+    self.task = mock.MagicMock()
+    self.task_group_object = mock.MagicMock(object_type="Control",
+                                            object_id=3)
+
+  @mock.patch("ggrc_workflows.Relationship")
+  def test_collect_mapping(self, relationship):
+    """Mapping is collected if mappings list is given."""
+    mappings = []
+    ggrc_workflows._map_cycle_task(  # pylint: disable=protected-access
+        self.task, self.task_group_object, mappings)
+    self.assertEqual(mappings, [(self.task, "Control", 3)])
+    self.assertFalse(relationship.called)
+
+  @mock.patch("ggrc_workflows.Relationship")
+  def test_create_relationship(self, relationship):
+    """Relationship is created without mappings list."""
+    ggrc_workflows._map_cycle_task(  # pylint: disable=protected-access
+        self.task, self.task_group_object)
+    relationship.assert_called_once_with(
+        source=self.task, destination=self.task_group_object.object)
+
+
+@mock.patch("ggrc_workflows.bulk_cycles.Cache")
+@mock.patch("ggrc_workflows.bulk_cycles.acl")
+@mock.patch("ggrc_workflows.bulk_cycles.relationship_adjacency")
+@mock.patch("ggrc_workflows.bulk_cycles.login")
+@mock.patch("ggrc_workflows.bulk_cycles.db")
+class TestInsertMappings(unittest.TestCase):
+  """Tests for multi-row insert of cycle task mappings."""
+  # pylint: disable=unused-argument
+
+  @staticmethod
+  def _task(task_id):
+    """Get flushed cycle task stub."""
+    return mock.MagicMock(id=task_id, type="CycleTaskGroupObjectTask")
+
+  def test_no_mappings(self, db, *mocks):
+    """Nothing is inserted without mappings."""
+    self.assertEqual(bulk_cycles.insert_mappings([]), set())
+    self.assertFalse(db.session.execute.called)
+
+  @mock.patch("ggrc_workflows.bulk_cycles.RELATIONSHIP_CHUNK_SIZE", 2)
+  def test_insert_in_chunks(self, db, login, adjacency, acl, cache):
+    """Mappings are inserted with one statement per chunk."""
+    tasks = [self._task(1), self._task(2)]
+    mappings = [(tasks[0], "Control", 5), (tasks[0], "Market", 6),
+                (tasks[1], "Control", 5)]
+    relationships = [mock.MagicMock(id=rel_id) for rel_id in (11, 12, 13)]
+    relationship_model = mock.MagicMock(
+        source_type=Relationship.source_type,
+        source_id=Relationship.source_id,
+    )
+    relationship_model.__table__ = Relationship.__table__
+    query = relationship_model.query.filter.return_value
+    query.all.return_value = relationships
+    with mock.patch("ggrc_workflows.bulk_cycles.Relationship",
+                    relationship_model):
+      result = bulk_cycles.insert_mappings(mappings)
+
+    self.assertEqual(result, {11, 12, 13})
+    statements = [call[0][0] for call in db.session.execute.call_args_list]
+    self.assertEqual(len(statements), 2)
+    inserted = [
+        (row["source_id"], row["destination_type"], row["destination_id"])
+        for statement in statements
+        for row in statement.parameters
+    ]
+    self.assertEqual(inserted, [(1, "Control", 5), (1, "Market", 6),
+                                (2, "Control", 5)])
+    self.assertTrue(adjacency.add_relationships.called)
+    acl.add_relationships.assert_called_once_with({11, 12, 13})
+    logged = cache.get_cache.return_value.new.update.call_args[0][0]
+    self.assertEqual([rel for rel, _ in logged], relationships)
+
+
+class TestStartRecurringCycles(unittest.TestCase):
+  """Tests for batching of due workflows."""
+
+  @mock.patch("ggrc_workflows.bulk_cycles.start_batch")
+  @mock.patch("ggrc_workflows.bulk_cycles.get_due_workflow_ids",
+              return_value=[1, 2, 3, 4, 5])
+  def test_batches(self, _, start_batch):
+    """Due workflows are started in batches of the given size."""
+    bulk_cycles.start_recurring_cycles(2)
+    self.assertEqual([call[0][0] for call in start_batch.call_args_list],
+                     [[1, 2], [3, 4], [5]])